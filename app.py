@@ -1,20 +1,179 @@
 import streamlit as st
-import google.generativeai as genai
 import os
+import functools
 import json
 import re
-import urllib.parse
 import time
 import random
-import requests
+import uuid
 from io import BytesIO
-from PIL import Image
+from concurrent.futures import CancelledError
 from datetime import datetime
-import base64
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+# google.generativeai / PIL / requests는 쓰는 함수 안에서 import (콜드 스타트 시 약 1초 절약)
+from mv_core import TURNTABLE_CATEGORIES, CompiledPlan, turntable_key
+from mv_core import ConceptPrefetcher, DEFAULT_PREFETCH_TOP_N, TrendFeed
+from mv_core import analyze_topic_for_auto_settings
+from mv_core import generate_trending_topic, generate_unique_topics, iter_unique_topics
+from mv_core import NoveltyIndex, pick_novel, project_texts
+from mv_core import KeywordFilter, rank_keywords
+from mv_core import FALLBACK_TREND_KEYWORDS, MUSIC_GENRES, VIDEO_GENRES, VISUAL_STYLES
+from mv_core import get_category_profile, get_seasonal_keywords
+from mv_core import (generate_viral_concept_from_keyword, generate_viral_concepts_batch, get_viral_topic_with_ai,
+                     llm_filter_keywords)
+from mv_core import PlanGenerationError, clean_json_text, generate_plan, get_system_prompt
+from mv_core import create_html_export, create_json_export, create_text_export, export_project_json, prepare_project_for_save
+from mv_core import (add_project_to_list, delete_project_from_list, load_project_list_from_jsonbin,
+                     save_project_list_to_jsonbin)
+from mv_core import generate_preview_images, get_preview_size, image_generation_steps
+from mv_core import SpanSink, Tracer, activate_tracer
+from mv_core import GenerationEventStore, sparkline
+from mv_core import SingleFlight
+from mv_core import (AUTO_ENGINE, BENCH_PROMPTS, IMAGE_ENGINES, EngineBenchHistory, benchmark_engines, choose_engine,
+                     engine_stats, summarize_bench)
+from mv_core import DEFAULT_VARIATIONS, MAX_VARIATIONS, generate_variations
+from mv_core import QualityGate
+from mv_core import DEFAULT_MAX_DISTANCE, duplicate_groups, find_near_duplicates, find_reusable, flagged_keys
+from mv_core import JobManifest, project_id, submit_batch
+from mv_core import CallbackQueue, DEFAULT_SCHEDULER_WORKERS, GenerationScheduler
 
 # --- 페이지 설정 ---
 st.set_page_config(page_title="AI MV Director Pro", layout="wide", initial_sidebar_state="collapsed")
 
+# ------------------------------------------------------------------
+# 렌더링 성능 측정 (인터랙션별 스크립트 실행 시간 / 전송 바이트)
+# ------------------------------------------------------------------
+if 'render_metrics' not in st.session_state:
+    st.session_state['render_metrics'] = []
+
+def _attach_byte_counter():
+    """현재 스크립트 실행의 ForwardMsg 전송량 카운터 연결 (실행 컨텍스트당 1회)"""
+    ctx = get_script_run_ctx()
+    # _enqueue는 Streamlit 내부 속성 → 없는 버전에서는 바이트 측정 없이 진행 (0으로 기록)
+    if ctx is None or not hasattr(ctx, '_enqueue'):
+        return None
+    counter = getattr(ctx, '_mv_sent_bytes', None)
+    if counter is None:
+        counter = {'bytes': 0}
+        original_enqueue = ctx._enqueue
+
+        def counting_enqueue(msg):
+            counter['bytes'] += msg.ByteSize()
+            original_enqueue(msg)
+
+        ctx._enqueue = counting_enqueue
+        ctx._mv_sent_bytes = counter
+    return counter
+
+def _is_fragment_rerun():
+    """현재 실행이 프래그먼트 단독 재실행인지 여부"""
+    ctx = get_script_run_ctx()
+    # fragment_ids_this_run도 내부 속성 → 없으면 전체 실행으로 간주 (rerun_fragment는 전체 재실행)
+    return bool(getattr(ctx, 'fragment_ids_this_run', None))
+
+def begin_render_metric(scope):
+    """렌더링 측정 시작
+    scope: 'app' (전체 실행) 또는 프래그먼트 이름 - 프래그먼트는 단독 재실행일 때만 측정
+    """
+    if scope == "app":
+        st.session_state['_fragment_metric_active'] = False
+    elif not _is_fragment_rerun() or st.session_state.get('_fragment_metric_active'):
+        return None
+    else:
+        st.session_state['_fragment_metric_active'] = True
+
+    counter = _attach_byte_counter()
+    return {
+        'scope': scope,
+        'started': time.perf_counter(),
+        'msg_bytes': counter['bytes'] if counter else 0,
+        'image_bytes': st.session_state.get('render_image_bytes', 0)
+    }
+
+def end_render_metric(metric):
+    """렌더링 측정 종료 및 기록 (최근 50개 유지)"""
+    if metric is None:
+        return
+    if metric['scope'] != "app":
+        st.session_state['_fragment_metric_active'] = False
+
+    counter = _attach_byte_counter()
+    metrics = st.session_state.setdefault('render_metrics', [])
+    metrics.append({
+        'time': datetime.now().strftime("%H:%M:%S"),
+        'scope': metric['scope'],
+        'ms': (time.perf_counter() - metric['started']) * 1000,
+        'msg_bytes': (counter['bytes'] if counter else 0) - metric['msg_bytes'],
+        'image_bytes': st.session_state.get('render_image_bytes', 0) - metric['image_bytes']
+    })
+    if len(metrics) > 50:
+        del metrics[:-50]
+
+def measured_fragment(scope):
+    """st.fragment + 렌더링 측정 데코레이터 (버튼 클릭 시 해당 영역만 재실행)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metric = begin_render_metric(scope)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_render_metric(metric)
+        return st.fragment(wrapper)
+    return decorator
+
+def rerun_fragment():
+    """프래그먼트 단독 재실행 중이면 해당 프래그먼트만, 아니면 전체 재실행"""
+    if _is_fragment_rerun():
+        st.rerun(scope="fragment")
+    st.rerun()
+
+def get_image_bytes(img):
+    """표시용 인코딩 바이트 (생성 이미지는 받은 바이트 그대로, PIL 이미지는 1회 인코딩 결과 캐시)"""
+    if isinstance(img, (bytes, bytearray)):
+        return bytes(img)
+    encoded = getattr(img, '_mv_encoded', None)
+    if encoded is None:
+        buf = BytesIO()
+        img_format = img.format if img.format in ("JPEG", "PNG", "WEBP") else "PNG"
+        img.save(buf, format=img_format)
+        encoded = buf.getvalue()
+        img._mv_encoded = encoded
+    return encoded
+
+def show_image(img, **kwargs):
+    """st.image 래퍼 - 인코딩 결과를 재사용하고 브라우저 전송 바이트를 집계"""
+    data = get_image_bytes(img)
+    st.session_state['render_image_bytes'] = st.session_state.get('render_image_bytes', 0) + len(data)
+    st.image(data, **kwargs)
+
+def get_thumbnail_bytes(img, width=128):
+    """썸네일용 소형 JPEG 바이트 (이미지 객체에 폭별로 캐시 {폭: 바이트} - 썸네일 때만 디코딩)
+
+    스트립(128px)과 변형 후보 그리드(192px)가 같은 이미지를 서로 다른 폭으로 요청
+    """
+    thumbs = getattr(img, '_mv_thumbs', None)
+    if thumbs is not None and width in thumbs:
+        return thumbs[width]
+    if isinstance(img, (bytes, bytearray)):
+        from PIL import Image
+        source = Image.open(BytesIO(img))
+        source.draft("RGB", (width, width))  # JPEG는 축소 디코딩
+    else:
+        source = img
+    small = source.convert("RGB")
+    small.thumbnail((width, width))
+    buf = BytesIO()
+    small.save(buf, format="JPEG", quality=70)
+    thumb = buf.getvalue()
+    if hasattr(img, '__dict__'):  # ImageBytes / PIL 이미지 (일반 bytes는 캐시 불가)
+        if thumbs is None:
+            thumbs = img._mv_thumbs = {}
+        thumbs[width] = thumb
+    return thumb
+
+_app_render_metric = begin_render_metric("app")
+
 # --- 스타일링 ---
 st.markdown("""
 <style>
@@ -109,333 +268,202 @@ st.markdown("""
 # ------------------------------------------------------------------
 # 이미지 생성 실시간 로그 시스템
 # ------------------------------------------------------------------
-if 'image_gen_logs' not in st.session_state:
-    st.session_state['image_gen_logs'] = []
+@st.cache_resource
+def get_shared_generation_events():
+    """세션 간 공유되는 공급자/모델별 요청 통계 (지금 어떤 모델이 빠른지)"""
+    return GenerationEventStore()
+
+@st.cache_resource
+def get_single_flight():
+    """세션 간 공유되는 동일 요청 합치기 (같은 이미지/기획안 요청이 동시에 오면 한 번만 호출)"""
+    return SingleFlight()
+
+@st.cache_resource
+def get_generation_scheduler():
+    """세션 간 공유되는 이미지 생성 작업 풀 (클릭 > 보이는 씬 > 프리뷰 > 일괄 > 선생성 순으로 처리)"""
+    return GenerationScheduler(DEFAULT_SCHEDULER_WORKERS)
+
+@st.cache_resource
+def get_quality_gate():
+    """세션 간 공유되는 이미지 품질 게이트 (빈 화면/비율/팔레트 검사, 통계는 서버 전체)"""
+    return QualityGate()
+
+def active_quality_gate():
+    """사이드바 '품질 검사'가 켜져 있으면 공유 게이트, 꺼져 있으면 None"""
+    return get_quality_gate() if st.session_state.get('quality_gate_enabled', True) else None
+
+if 'generation_events' not in st.session_state:
+    st.session_state['generation_events'] = GenerationEventStore()
 
 def add_image_log(message, level="info"):
     """이미지 생성 로그 추가
     level: info, success, warn, error, model
     """
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    st.session_state['image_gen_logs'].append({
-        'time': timestamp,
-        'message': message,
-        'level': level
-    })
-    # 최대 100개 로그 유지
-    if len(st.session_state['image_gen_logs']) > 100:
-        st.session_state['image_gen_logs'] = st.session_state['image_gen_logs'][-100:]
+    st.session_state['generation_events'].log(message, level)
 
-def clear_image_logs():
-    """이미지 생성 로그 초기화"""
-    st.session_state['image_gen_logs'] = []
-
-# --- 확장된 트렌드 키워드 (대폭 확장) ---
-TRENDING_KEYWORDS = {
-    "emotions": [
-        "heartbreak", "hope", "nostalgia", "euphoria", "melancholy", "rage", "peace", "anxiety", "joy", "loneliness",
-        "obsession", "liberation", "despair", "ecstasy", "bittersweet", "rebellion", "serenity", "madness", "yearning", "triumph",
-        "betrayal", "redemption", "devotion", "confusion", "enlightenment", "paranoia", "bliss", "grief", "wonder", "defiance"
-    ],
-    "settings": [
-        "neon city", "abandoned subway", "rooftop at dawn", "underwater palace", "desert highway", "floating islands",
-        "dystopian Tokyo", "cyberpunk Seoul", "ancient temple", "space station", "frozen tundra", "volcanic landscape",
-        "bioluminescent forest", "steampunk factory", "art deco ballroom", "post-apocalyptic wasteland", "crystal cave",
-        "holographic nightclub", "zero gravity station", "ancient ruins", "mirror dimension", "time-frozen city",
-        "neon-lit rain street", "abandoned amusement park", "underground bunker", "floating market", "digital void",
-        "cherry blossom garden", "brutalist architecture", "venetian canals", "himalayan monastery"
-    ],
-    "characters": [
-        "lonely hacker", "rebel artist", "time traveler", "android musician", "street dancer", "wandering poet",
-        "revenge seeker", "fallen angel", "lost astronaut", "phantom thief", "cursed immortal", "dimension hopper",
-        "memory collector", "dream architect", "soul merchant", "reality bender", "shadow assassin", "light keeper",
-        "chaos agent", "harmony seeker", "digital ghost", "analog soul", "future prophet", "past hunter",
-        "emotion vampire", "hope dealer", "fear eater", "love warrior", "death dancer", "life singer"
-    ],
-    "aesthetics": [
-        "retro 80s", "vaporwave dreams", "dark academia", "y2k nostalgia", "minimalist void", "baroque luxury",
-        "glitch art", "neon noir", "pastel goth", "cyberpunk", "afrofuturism", "solarpunk", "dieselpunk",
-        "cottagecore nightmare", "liminal space", "dreamcore", "weirdcore", "ethereal maximalism", "brutalist elegance",
-        "bio-organic tech", "crystal punk", "holographic minimalism", "dark romanticism", "neo-tokyo", "cyber-shamanic",
-        "quantum aesthetic", "retro-futurism", "analog horror", "digital baroque", "neon gothic"
-    ],
-    "actions": [
-        "running through rain", "dancing in fire", "flying over city", "drowning in memories", "breaking free",
-        "searching for light", "falling through time", "rising from ashes", "chasing shadows", "embracing the void",
-        "shattering reality", "rebuilding self", "transcending dimension", "merging with machine", "escaping simulation",
-        "fighting inner demon", "reuniting souls", "sacrificing everything", "discovering truth", "accepting fate",
-        "defying gravity", "manipulating time", "bending light", "controlling elements", "summoning power"
-    ],
-    "times": [
-        "midnight", "golden hour", "endless night", "frozen moment", "parallel timeline", "infinite loop",
-        "last sunrise", "first snowfall", "summer's end", "dawn of chaos", "twilight zone", "eternal dusk",
-        "moment before impact", "second after rebirth", "edge of tomorrow", "yesterday's future", "timeless now",
-        "quantum midnight", "fractal dawn", "crystallized second"
-    ],
-    "trends_2025": [
-        "AI awakening", "metaverse escape", "climate dystopia", "gen-z rebellion", "digital detox", "virtual romance",
-        "blockchain dreams", "quantum love", "hologram memories", "synthetic emotions", "neural link love", "avatar identity",
-        "deep fake reality", "algorithmic fate", "carbon zero future", "biohacked beauty", "crypto collapse", "VR addiction",
-        "AI companion bond", "simulation theory", "consciousness upload", "memory marketplace", "emotion NFT", "dream streaming"
-    ],
-    "cinematic_styles": [
-        "Christopher Nolan epic", "Denis Villeneuve atmosphere", "David Fincher darkness", "Wes Anderson symmetry",
-        "Wong Kar-wai romance", "Park Chan-wook intensity", "Bong Joon-ho social", "Ridley Scott sci-fi",
-        "Guillermo del Toro fantasy", "Terrence Malick poetry", "Nicolas Winding Refn neon", "Gaspar Noé chaos",
-        "Kubrick precision", "Tarkovsky meditation", "Lynch surrealism", "Tarantino stylization"
-    ],
-    "music_moods": [
-        "anthemic euphoria", "melancholic beauty", "aggressive energy", "dreamy float", "dark intensity",
-        "playful chaos", "intimate whisper", "epic grandeur", "haunting mystery", "rebellious defiance",
-        "nostalgic warmth", "futuristic cold", "organic warmth", "synthetic precision", "raw emotion"
-    ]
-}
-
-def generate_trending_topic():
-    """더욱 다양한 주제 생성"""
-    templates = [
-        "{character} experiencing {emotion} in a {setting} during {time}, {aesthetic} style, {action}",
-        "{emotion} journey of a {character} in {setting}, {aesthetic} vibes, {trend}",
-        "{cinematic} inspired: {character} {action} in {setting}, {aesthetic} aesthetic",
-        "{trend} era: {character} feeling {emotion}, {setting}, {time}",
-        "{aesthetic} music video: {character} in {setting}, {emotion} meets {music_mood}",
-        "Visual poem: {character} {action}, {setting} at {time}, {cinematic} cinematography",
-        "{music_mood} energy: {character} confronts {emotion} in {setting}, {trend}",
-        "Experimental: {character} trapped in {setting}, {aesthetic} meets {cinematic}",
-    ]
-    template = random.choice(templates)
-    return template.format(
-        emotion=random.choice(TRENDING_KEYWORDS["emotions"]),
-        setting=random.choice(TRENDING_KEYWORDS["settings"]),
-        character=random.choice(TRENDING_KEYWORDS["characters"]),
-        aesthetic=random.choice(TRENDING_KEYWORDS["aesthetics"]),
-        action=random.choice(TRENDING_KEYWORDS["actions"]),
-        time=random.choice(TRENDING_KEYWORDS["times"]),
-        trend=random.choice(TRENDING_KEYWORDS["trends_2025"]),
-        cinematic=random.choice(TRENDING_KEYWORDS["cinematic_styles"]),
-        music_mood=random.choice(TRENDING_KEYWORDS["music_moods"])
-    )
+def record_image_event(provider, model, outcome, latency_ms=None, attempt=1, http=None, detail="", megapixels=None):
+    """이미지 요청 결과 → 세션 + 서버 공유 저장소"""
+    st.session_state['generation_events'].record(provider, model, outcome, latency_ms, attempt, http, detail,
+                                                  megapixels)
+    get_shared_generation_events().record(provider, model, outcome, latency_ms, attempt, http, detail, megapixels)
 
-def get_viral_topic_with_ai(api_key, model_name):
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
-        prompt = """Generate ONE highly creative, viral-worthy music video concept. 
-        Be specific, cinematic, and emotionally compelling. Include:
-        - Unique character/protagonist
-        - Vivid setting/location
-        - Core emotion/theme
-        - Visual style reference
-        Keep it to 2-3 sentences. Make it feel like a blockbuster movie pitch."""
-        response = model.generate_content(prompt)
-        return response.text.strip().strip('"')
-    except:
-        return generate_trending_topic()
+def clear_image_logs():
+    """이미지 생성 로그 초기화 (통계는 유지)"""
+    st.session_state['generation_events'].clear_log()
+
+LOG_LEVEL_ICONS = {'info': 'ℹ️', 'success': '✅', 'warn': '⚠️', 'error': '❌', 'model': '🤖'}
+
+def generation_stats_html(rows):
+    """공급자/모델별 요약 행 → 통계 HTML (행이 없으면 빈 문자열)"""
+    stats_html = ""
+    for row in rows:
+        level_class = "img-log-success" if (row['success_rate'] or 0) >= 0.8 else "img-log-warn"
+        rate = f"{row['success_rate']:.0%}" if row['success_rate'] is not None else "-"
+        latency = f" · p50≤{row['p50_ms'] / 1000:g}s p95≤{row['p95_ms'] / 1000:g}s" if row['p50_ms'] else ""
+        errors = row['http_error'] + row['exception']
+        extra = ((f" · 오류 {errors}" if errors else "") + (f" · 거부 {row['rejected']}" if row['rejected'] else "")
+                 + (f" · 폴백 {row['fallback']}" if row['fallback'] else ""))
+        stats_html += (f"<div class='img-log-entry {level_class}'><b>{row['provider']} {row['model']}</b> · "
+                       f"{row['requests']}회 성공 {rate}{latency}{extra}"
+                       f"<br><code>{sparkline(row['histogram'])}</code></div>")
+    return stats_html
+
+def generation_log_html(events):
+    """최근 이벤트 → 로그 HTML (시간순, 위→아래)"""
+    log_html = ""
+    for entry in events:
+        if 'message' in entry:
+            message = entry['message']
+        else:
+            latency = f" {entry['latency_ms']:.0f}ms" if entry['latency_ms'] is not None else ""
+            http = f" HTTP {entry['http']}" if entry['http'] else ""
+            message = (f"{entry['provider']} {entry['model']} #{entry['attempt']} {entry['outcome']}"
+                       f"{latency}{http} {entry['detail']}")
+        icon = LOG_LEVEL_ICONS.get(entry['level'], 'ℹ️')
+        log_html += f"<div class='img-log-entry img-log-{entry['level']}'>{icon} <b>[{entry['time']}]</b> {message}</div>"
+    return log_html
+
+@st.fragment(run_every="5s")
+def render_generation_dashboard():
+    """공급자/모델별 성공률·지연 시간 + 최근 로그 (5초마다 이 영역만 갱신)
+
+    통계/로그 HTML은 저장소 version이 바뀐 경우에만 다시 만듦 (변화 없는 5초 갱신은 이전 결과 재사용)
+    프래그먼트 재실행은 출력하지 않은 요소를 지우므로 요소 자체는 매번 출력
+    """
+    scope = st.radio("범위", ["이 세션", "서버 전체"], horizontal=True, key="gen_dash_scope", label_visibility="collapsed")
+    session_events = st.session_state['generation_events']
+    store = session_events if scope == "이 세션" else get_shared_generation_events()
+    signature = (scope, id(store), store.version, session_events.version)
+    rendered = st.session_state.get('_gen_dash_rendered')
+    if rendered is None or rendered[0] != signature:
+        rendered = (signature, generation_stats_html(store.summary()), generation_log_html(session_events.recent(30)))
+        st.session_state['_gen_dash_rendered'] = rendered
+    _, stats_html, log_html = rendered
+
+    if stats_html:
+        st.markdown(stats_html, unsafe_allow_html=True)
+    else:
+        st.caption("이미지를 생성하면 공급자/모델별 성공률과 지연 시간이 표시됩니다")
+    flight_stats = get_single_flight().stats()
+    if any(stat['coalesced'] for stat in flight_stats.values()):
+        labels = {'image': '이미지', 'llm': 'LLM', 'trends': '트렌드'}
+        st.caption("🔗 합쳐진 요청 (서버 전체): " + " · ".join(
+            f"{labels.get(namespace, namespace)} {stat['coalesced']}/{stat['requests']} ({stat['coalesced_rate']:.0%})"
+            for namespace, stat in flight_stats.items()))
+    gate_stats = get_quality_gate().stats()
+    if gate_stats['checked']:
+        reasons = " · ".join(f"{reason} {count}" for reason, count in gate_stats['reasons'].items())
+        st.caption(f"🧪 품질 게이트 (서버 전체): 검사 {gate_stats['checked']} · 거부 {gate_stats['rejected']}"
+                   f"{f' ({reasons})' if reasons else ''} · 평균 {gate_stats['mean_ms']:.1f}ms")
+
+    log_col1, log_col2 = st.columns([3, 1])
+    with log_col1:
+        st.caption("최근 로그")
+    with log_col2:
+        if st.button("🗑️", key="clear_img_log", help="로그 초기화"):
+            clear_image_logs()
+            rerun_fragment()
+    if log_html:
+        st.markdown(log_html, unsafe_allow_html=True)
+    else:
+        st.caption("이미지 생성 시 로그가 여기에 표시됩니다")
 
-# --- Auto Trend Scouter (자동 트렌드 스카우터) ---
-SEASONAL_KEYWORDS = {
-    1: ["새해", "신년", "겨울", "설날", "다이어트", "새출발", "목표", "결심"],
-    2: ["발렌타인", "졸업", "입시", "봄", "설렘", "고백", "초콜릿"],
-    3: ["봄", "벚꽃", "새학기", "입학", "취업", "이직", "새출발"],
-    4: ["봄꽃", "벚꽃", "여행", "피크닉", "청춘", "자연"],
-    5: ["어버이날", "가정의달", "어린이날", "감사", "가족", "선물"],
-    6: ["여름", "휴가", "바다", "페스티벌", "청량", "에너지"],
-    7: ["여름휴가", "바캉스", "해변", "물놀이", "시원함", "열정"],
-    8: ["말복", "여름끝", "가을준비", "개학", "추억", "밤"],
-    9: ["가을", "추석", "단풍", "감성", "쓸쓸함", "회고"],
-    10: ["할로윈", "가을", "단풍", "공포", "미스터리", "변신"],
-    11: ["빼빼로데이", "수능", "가을끝", "쓸쓸함", "위로", "응원"],
-    12: ["크리스마스", "연말", "겨울", "눈", "회고", "송년", "파티", "선물"]
-}
+# ------------------------------------------------------------------
+# 파이프라인 트레이싱 (단계별 스팬 → JSONL + Prometheus 텍스트)
+# ------------------------------------------------------------------
+TRACE_DIR = os.getenv("MV_TRACE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
 
-# 영상 카테고리별 전문 키워드 & 특성
-CATEGORY_PROFILES = {
-    "뮤직비디오": {
-        "keywords": ["퍼포먼스", "안무", "립싱크", "원테이크", "컬러그레이딩", "아티스트", "앨범", "컴백",
-                    "비주얼", "세트", "로케이션", "스토리텔링", "감성", "에너지", "바이브"],
-        "themes": ["사랑", "이별", "자유", "반항", "꿈", "열정", "고독", "희망", "파티", "밤"],
-        "visual_refs": ["Hype Williams", "Dave Meyers", "Joseph Kahn", "Michel Gondry", "Spike Jonze"],
-        "style_guide": "강렬한 비주얼, 아티스트 중심, 음악과 싱크, 감정 극대화"
-    },
-    "단편영화": {
-        "keywords": ["내러티브", "캐릭터", "플롯", "트위스트", "대사", "연기", "촬영", "조명",
-                    "사운드디자인", "편집", "컷", "시퀀스", "클라이맥스", "엔딩"],
-        "themes": ["인간관계", "성장", "상실", "발견", "갈등", "화해", "비밀", "운명", "선택"],
-        "visual_refs": ["Sundance", "Cannes Short", "Korean Short Film", "A24 style"],
-        "style_guide": "15분 이내, 명확한 서사 구조, 강렬한 엔딩, 캐릭터 아크"
-    },
-    "장편영화": {
-        "keywords": ["3막구조", "캐릭터아크", "서브플롯", "장르", "톤", "페이싱", "시네마토그래피",
-                    "프로덕션디자인", "캐스팅", "스코어", "VFX", "로케이션"],
-        "themes": ["영웅의여정", "복수", "사랑", "생존", "정의", "가족", "전쟁", "모험", "미스터리"],
-        "visual_refs": ["Christopher Nolan", "Denis Villeneuve", "Bong Joon-ho", "Park Chan-wook"],
-        "style_guide": "90분 이상, 복잡한 캐릭터, 다층적 스토리, 영화적 스케일"
-    },
-    "실험영화/아트필름": {
-        "keywords": ["추상", "비선형", "시적", "상징", "메타포", "텍스처", "사운드스케이프",
-                    "슬로우시네마", "미니멀", "초현실", "꿈", "무의식", "시간"],
-        "themes": ["존재", "시간", "공간", "기억", "정체성", "죽음", "탄생", "순환", "카오스"],
-        "visual_refs": ["Terrence Malick", "Tarkovsky", "David Lynch", "Maya Deren", "Stan Brakhage"],
-        "style_guide": "실험적 형식, 비선형 내러티브, 시각적 시, 감각적 경험"
-    },
-    "상업광고/CF": {
-        "keywords": ["브랜드", "제품", "USP", "타겟", "CTA", "후킹", "15초", "30초",
-                    "슬로건", "로고", "팩샷", "모델", "라이프스타일"],
-        "themes": ["욕망", "해결책", "변화", "행복", "성공", "젊음", "트렌드", "프리미엄"],
-        "visual_refs": ["Apple", "Nike", "Samsung", "Coca-Cola style"],
-        "style_guide": "짧고 임팩트있게, 브랜드 메시지 명확, 감정 자극, 기억에 남는 비주얼"
-    },
-    "브랜드필름": {
-        "keywords": ["브랜드스토리", "가치", "미션", "비전", "헤리티지", "장인정신",
-                    "인터뷰", "비하인드", "프로세스", "철학", "커뮤니티"],
-        "themes": ["진정성", "장인정신", "혁신", "전통", "미래", "사람", "열정", "품질"],
-        "visual_refs": ["Patagonia", "Apple Behind the Mac", "Nike Origin stories"],
-        "style_guide": "2-5분, 브랜드 철학 전달, 감성적 연결, 다큐멘터리 터치"
-    },
-    "패션필름": {
-        "keywords": ["룩북", "컬렉션", "런웨이", "에디토리얼", "모델", "스타일링", "무드",
-                    "시즌", "트렌드", "하이패션", "스트릿", "꾸뛰르"],
-        "themes": ["아름다움", "욕망", "정체성", "변신", "시대정신", "반항", "우아함"],
-        "visual_refs": ["Nick Knight", "Steven Meisel", "Helmut Newton", "Guy Bourdin"],
-        "style_guide": "비주얼 중심, 옷이 주인공, 무드와 분위기, 아트디렉션 중요"
-    },
-    "애니메이션": {
-        "keywords": ["캐릭터디자인", "스토리보드", "애니메틱", "키프레임", "인비트윈",
-                    "2D", "3D", "스톱모션", "로토스코핑", "셀애니", "모션캡처"],
-        "themes": ["성장", "모험", "우정", "가족", "판타지", "SF", "코미디", "액션"],
-        "visual_refs": ["Pixar", "Studio Ghibli", "Spider-Verse", "Arcane", "Makoto Shinkai"],
-        "style_guide": "캐릭터 매력, 세계관 구축, 움직임의 미학, 컬러 팔레트"
-    },
-    "다큐멘터리": {
-        "keywords": ["인터뷰", "아카이브", "보이스오버", "현장", "리서치", "팩트",
-                    "주제", "시점", "증언", "기록", "관찰", "탐사"],
-        "themes": ["진실", "사회", "환경", "인물", "역사", "문화", "과학", "예술"],
-        "visual_refs": ["Ken Burns", "Werner Herzog", "Netflix Documentary style"],
-        "style_guide": "사실 기반, 깊이있는 리서치, 인간적 스토리, 사회적 임팩트"
-    },
-    "시네마틱 브이로그": {
-        "keywords": ["일상", "여행", "라이프스타일", "ASMR", "POV", "타임랩스",
-                    "드론", "짐벌", "컬러그레이딩", "음악선곡", "보이스오버"],
-        "themes": ["일상의발견", "여행", "도전", "성장", "힐링", "영감", "루틴"],
-        "visual_refs": ["Sam Kolder", "Peter McKinnon", "Casey Neistat", "Korean vlog style"],
-        "style_guide": "개인 시점, 영화적 촬영, 감성 편집, 음악과 조화"
-    },
-    "콘서트/공연영상": {
-        "keywords": ["멀티캠", "라이브", "무대", "조명", "음향", "관객", "앙코르",
-                    "백스테이지", "리허설", "셋리스트", "퍼포먼스"],
-        "themes": ["에너지", "열정", "교감", "감동", "축제", "음악의힘"],
-        "visual_refs": ["Beyoncé Homecoming", "BTS concert films", "Coldplay live"],
-        "style_guide": "다이나믹한 카메라워크, 아티스트와 관객 교감, 음악 중심"
-    },
-    "트레일러/티저": {
-        "keywords": ["후킹", "빌드업", "클라이맥스", "컷", "사운드디자인", "타이틀",
-                    "릴리즈데이트", "미스터리", "서스펜스", "하이라이트"],
-        "themes": ["기대감", "궁금증", "스케일", "충격", "감동예고"],
-        "visual_refs": ["Marvel trailers", "A24 trailers", "Nolan film trailers"],
-        "style_guide": "30초-2분, 핵심만 보여주기, 궁금증 유발, 강렬한 마무리"
-    },
-    "모션그래픽": {
-        "keywords": ["타이포", "인포그래픽", "로고애니메이션", "트랜지션", "이펙트",
-                    "일러스트", "아이콘", "데이터비주얼", "키네틱타이포"],
-        "themes": ["정보전달", "브랜딩", "설명", "강조", "시각화"],
-        "visual_refs": ["Buck Design", "Pentagram", "ManvsMachine", "Ordinary Folk"],
-        "style_guide": "깔끔한 디자인, 명확한 정보 전달, 트렌디한 움직임"
-    },
-    "VFX/시각효과": {
-        "keywords": ["CGI", "합성", "매트페인팅", "파티클", "시뮬레이션", "트래킹",
-                    "로토", "키잉", "3D모델링", "렌더링", "디스트럭션"],
-        "themes": ["불가능을가능하게", "스펙터클", "초현실", "SF", "판타지", "재난"],
-        "visual_refs": ["ILM", "Weta", "Marvel VFX", "Blade Runner 2049"],
-        "style_guide": "시각적 스펙터클, 현실과 CG의 조화, 기술적 완성도"
-    },
-    "드라마/웹드라마": {
-        "keywords": ["에피소드", "시리즈", "캐릭터아크", "클리프행어", "시즌",
-                    "파일럿", "앙상블", "서브플롯", "빌런", "로맨스라인"],
-        "themes": ["사랑", "복수", "성장", "가족", "직장", "학교", "범죄", "판타지"],
-        "visual_refs": ["Netflix K-drama", "HBO style", "웹드라마 vertical format"],
-        "style_guide": "에피소드 구조, 캐릭터 중심, 다음화 기대감, 시리즈 아크"
-    }
-}
+@st.cache_resource
+def get_span_sink():
+    """세션 간 공유 스팬 싱크 (traces/spans.jsonl 추가 기록 + traces/metrics.prom 갱신)"""
+    return SpanSink(os.path.join(TRACE_DIR, "spans.jsonl"), os.path.join(TRACE_DIR, "metrics.prom"))
 
-def get_category_profile(category):
-    """카테고리별 프로필 반환"""
-    return CATEGORY_PROFILES.get(category, CATEGORY_PROFILES["뮤직비디오"])
+if 'tracer' not in st.session_state:
+    st.session_state['tracer'] = Tracer(get_span_sink())
+activate_tracer(st.session_state['tracer'])
 
-def get_seasonal_keywords():
-    """현재 월에 맞는 시즌 키워드 반환"""
-    current_month = datetime.now().month
-    return SEASONAL_KEYWORDS.get(current_month, ["트렌드", "바이럴"])
+# ------------------------------------------------------------------
+# 이미지 엔진 벤치마크 / Auto 엔진
+# ------------------------------------------------------------------
+@st.cache_resource
+def get_engine_bench_history():
+    """세션 간 공유 엔진 벤치마크 기록 (traces/engine_bench.jsonl)"""
+    return EngineBenchHistory(os.path.join(TRACE_DIR, "engine_bench.jsonl"))
+
+def choose_auto_engine():
+    """현재 비주얼 스타일 계열 안에서 가장 빠른 정상 엔진 → (엔진, 사유)"""
+    stats = engine_stats(get_engine_bench_history().load(), get_shared_generation_events().summary())
+    return choose_engine(st.session_state.get('current_visual_style'), stats,
+                         segmind_available=bool(get_api_key("SEGMIND_API_KEY")))
+
+def resolve_image_engine(provider):
+    """Auto 엔진이면 요청마다 엔진 선택, 아니면 그대로"""
+    if provider != AUTO_ENGINE:
+        return provider
+    engine, reason = choose_auto_engine()
+    add_image_log(f"Auto → {engine} ({reason})", "model")
+    return engine
 
-def fetch_google_trends_keywords():
-    """구글 트렌드 급상승 검색어 가져오기 (pytrends 없이 대체)"""
-    try:
-        # pytrends 대신 RSS 피드 사용 (더 안정적)
-        url = "https://trends.google.com/trends/trendingsearches/daily/rss?geo=KR"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            # 간단한 XML 파싱
-            import re
-            titles = re.findall(r'<title>([^<]+)</title>', response.text)
-            # 첫 번째는 피드 제목이므로 제외
-            keywords = [t for t in titles[1:11] if t and len(t) > 1]
-            return keywords if keywords else None
-        return None
-    except:
-        return None
+# --- Auto Trend Scouter (자동 트렌드 스카우터) ---
+@st.cache_resource
+def get_trend_feed():
+    """세션 간 공유되는 트렌드 피드 캐시 (지역별 TTL + 백그라운드 갱신, 지역별 갱신은 요청 합치기)"""
+    return TrendFeed(flight=get_single_flight())
+
+def fetch_google_trends_keywords(geo="KR"):
+    """구글 트렌드 급상승 검색어 가져오기 (캐시된 RSS 피드, 실패 시 이전 결과)"""
+    items = get_trend_feed().get(geo)
+    if items:
+        st.session_state['trend_items'] = items
+    return [item['title'] for item in items] if items else None
 
 def generate_trending_keywords_fallback():
     """구글 트렌드 실패 시 대체 키워드"""
-    base_trends = [
-        "AI", "챗GPT", "메타버스", "NFT", "비트코인", "테슬라",
-        "넷플릭스", "유튜브", "틱톡", "인스타", "K-pop", "BTS",
-        "여행", "맛집", "카페", "패션", "뷰티", "헬스", "명상",
-        "재테크", "부동산", "주식", "창업", "부업", "N잡"
-    ]
     seasonal = get_seasonal_keywords()
-    return random.sample(base_trends, 5) + random.sample(seasonal, min(3, len(seasonal)))
+    return random.sample(FALLBACK_TREND_KEYWORDS, 5) + random.sample(seasonal, min(3, len(seasonal)))
+
+@st.cache_resource
+def get_keyword_filter():
+    """로컬 사전 필터 + LLM 필터 결과 캐시 (세션 간 공유, (키워드 집합 해시, 카테고리)로 캐시)"""
+    return KeywordFilter(llm_filter_keywords)
 
 def filter_keywords_for_channel(keywords, channel_category, api_key, model_name):
-    """LLM으로 채널 카테고리에 맞는 키워드만 필터링 (강화된 버전)"""
+    """채널 카테고리에 맞는 키워드만 필터링 (로컬 관련도 상위 K개만 LLM에 전달)"""
+    profile = get_category_profile(channel_category)
+    keyword_filter = get_keyword_filter()
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
-
-        profile = get_category_profile(channel_category)
-
-        prompt = f"""너는 '{channel_category}' 분야 전문 영상 기획자야.
-
-## 카테고리 특성
-- 핵심 키워드: {', '.join(profile['keywords'][:8])}
-- 주요 테마: {', '.join(profile['themes'][:6])}
-- 스타일 가이드: {profile['style_guide']}
-
-## 작업
-다음 트렌드 키워드에서 '{channel_category}' 영상 콘텐츠로 연결할 수 있는 것만 선택해.
-각 키워드를 '{channel_category}'의 특성에 맞게 어떻게 활용할 수 있는지 구체적으로 제안해.
-
-트렌드 키워드: {keywords}
-
-## 출력 형식 (JSON)
-{{
-    "filtered_keywords": [
-        {{"keyword": "선택한키워드", "angle": "{channel_category}에서의 구체적 활용법", "concept_hint": "영상 콘셉트 힌트"}}
-    ]
-}}
-
-반드시 {channel_category}과 연결 가능한 키워드만 선택하고, 억지 연결은 하지 마."""
-
-        response = model.generate_content(prompt)
-        text = response.text
-
-        # JSON 추출
-        match = re.search(r'\{[\s\S]*\}', text)
-        if match:
-            data = json.loads(match.group())
-            return data.get("filtered_keywords", [])
-        return []
+        filtered, report = keyword_filter.filter(keywords, channel_category, profile, api_key, model_name)
     except Exception as e:
         st.warning(f"키워드 필터링 실패: {str(e)[:50]}")
-        return [{"keyword": kw, "angle": "자동 생성", "concept_hint": ""} for kw in keywords[:5]]
+        sent, _ = rank_keywords(keywords, profile, keyword_filter.top_k)
+        return [{"keyword": kw, "angle": "자동 생성", "concept_hint": ""} for kw in sent[:5]]
+
+    source = "캐시 사용" if report['cache_hit'] else f"{report['keywords_in']}개 중 {report['keywords_sent']}개 전송"
+    st.session_state['keyword_filter_note'] = (
+        f"🎯 키워드 필터: {source} · 약 {report['tokens_saved']:,} 토큰 절약 "
+        f"(누적 {keyword_filter.tokens_saved():,})"
+    )
+    return filtered
 
 def auto_scout_trending_topics(channel_category, api_key, model_name):
     """완전 자동 트렌드 스카우팅 (강화된 버전)"""
@@ -457,7 +485,8 @@ def auto_scout_trending_topics(channel_category, api_key, model_name):
     category_keywords = random.sample(profile['keywords'], min(3, len(profile['keywords'])))
     category_themes = random.sample(profile['themes'], min(2, len(profile['themes'])))
 
-    all_keywords = list(set(google_keywords + seasonal + category_keywords + category_themes))
+    # 순서 유지 중복 제거 (동점이면 앞쪽 = 검색량 높은 트렌드 키워드가 우선)
+    all_keywords = list(dict.fromkeys(google_keywords + seasonal + category_keywords + category_themes))
 
     # 3. 채널 카테고리에 맞게 필터링
     with st.spinner(f"🎯 '{channel_category}' 특성에 맞게 필터링 중..."):
@@ -465,45 +494,53 @@ def auto_scout_trending_topics(channel_category, api_key, model_name):
 
     return filtered
 
-def generate_viral_concept_from_keyword(keyword_data, channel_category, api_key, model_name):
-    """필터링된 키워드로 바이럴 콘셉트 생성 (강화된 버전)"""
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
-
-        keyword = keyword_data.get("keyword", keyword_data) if isinstance(keyword_data, dict) else keyword_data
-        angle = keyword_data.get("angle", "") if isinstance(keyword_data, dict) else ""
-        concept_hint = keyword_data.get("concept_hint", "") if isinstance(keyword_data, dict) else ""
-
-        profile = get_category_profile(channel_category)
-
-        prompt = f"""'{channel_category}' 영상 콘셉트를 만들어줘.
-
-## 카테고리 특성
-- 비주얼 레퍼런스: {', '.join(profile['visual_refs'][:3])}
-- 스타일 가이드: {profile['style_guide']}
-- 주요 테마: {', '.join(profile['themes'][:4])}
-
-## 입력
-- 트렌드 키워드: {keyword}
-- 활용 각도: {angle}
-- 콘셉트 힌트: {concept_hint}
-
-## 요청
-위 정보를 바탕으로 '{channel_category}'에 최적화된 영상 콘셉트를 작성해.
-
-포함할 내용:
-1. 독특한 주인공/캐릭터 또는 피사체
-2. 시각적으로 인상적인 배경/장소
-3. 핵심 감정/테마/메시지
-4. {channel_category}에 맞는 비주얼 스타일
-
-2-3문장으로 영화 같은 콘셉트를 영어로 작성해 (이미지 생성용)."""
-
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except:
-        return f"A {channel_category} inspired visual story about {keyword}, {profile['style_guide']}, cinematic and emotionally compelling"
+@st.cache_resource
+def get_concept_prefetcher():
+    """스카우트 키워드 콘셉트 병렬 선계산기 (세션 간 공유, (keyword, angle, 카테고리)로 캐시)"""
+    return ConceptPrefetcher(generate_viral_concept_from_keyword, batch_fn=generate_viral_concepts_batch)
+
+def concept_prefetch_group():
+    """이 세션의 선계산 그룹 (키워드를 고를 때 다른 세션의 선계산은 취소하지 않도록)"""
+    if 'concept_prefetch_group' not in st.session_state:
+        st.session_state['concept_prefetch_group'] = uuid.uuid4().hex
+    return st.session_state['concept_prefetch_group']
+
+# --- 참신도 인덱스 (과거 주제/제목/로그라인과 비슷한 후보 걸러내기) ---
+NOVELTY_MAX_TRIES = 5
+AI_NOVELTY_MAX_TRIES = 3   # AI 생성은 호출당 비용이 커서 재시도를 줄임
+
+def get_novelty_index():
+    """세션별 참신도 인덱스 (저장된 프로젝트 + 이번 세션에서 기획한 주제, 같은 텍스트는 한 번만 추가됨)"""
+    if 'novelty_index' not in st.session_state:
+        st.session_state['novelty_index'] = NoveltyIndex()
+    index = st.session_state['novelty_index']
+    for project in st.session_state.get('cloud_projects', []):
+        index.add_many(project_texts(project))
+    return index
+
+def remember_planned_topic(topic, plan_data):
+    """기획안을 만든 주제/제목/로그라인을 세션 기록에 추가"""
+    get_novelty_index().add_many(project_texts({"topic": topic, "plan_data": plan_data or {}}))
+
+def note_novelty(attempts):
+    """다시 뽑은 경우 안내 문구 저장"""
+    if attempts > 1:
+        st.session_state['novelty_note'] = f"♻️ 과거 기획과 비슷한 후보 {attempts - 1}개를 건너뜀"
+    else:
+        st.session_state.pop('novelty_note', None)
+
+def generate_novel_topics(count):
+    """중복 없고 과거 기획과도 겹치지 않는 주제 count개 (부족하면 참신도 검사 없이 채움)"""
+    index = get_novelty_index()
+    topics, skipped = [], []
+    for candidate in iter_unique_topics(count * NOVELTY_MAX_TRIES):
+        if index.is_novel(candidate):
+            topics.append(candidate)
+            if len(topics) == count:
+                break
+        else:
+            skipped.append(candidate)
+    return topics + skipped[:count - len(topics)]
 
 # --- API 키 ---
 def get_api_key(key_name):
@@ -511,285 +548,6 @@ def get_api_key(key_name):
     elif os.getenv(key_name): return os.getenv(key_name)
     return None
 
-# --- 프로젝트 저장/불러오기 (JSONBin) ---
-JSONBIN_API_URL = "https://api.jsonbin.io/v3"
-
-def load_project_list_from_jsonbin(bin_id, api_key):
-    """JSONBin에서 프로젝트 리스트 불러오기"""
-    headers = {"X-Master-Key": api_key}
-
-    try:
-        response = requests.get(f"{JSONBIN_API_URL}/b/{bin_id}/latest", headers=headers, timeout=30)
-        if response.status_code == 200:
-            result = response.json()
-            record = result.get("record", {})
-            projects = record.get("projects", [])
-            return projects, None
-        else:
-            return [], f"불러오기 실패: {response.status_code}"
-    except Exception as e:
-        return [], f"불러오기 오류: {str(e)}"
-
-def save_project_list_to_jsonbin(projects, bin_id, api_key):
-    """JSONBin에 프로젝트 리스트 저장 (기존 bin 업데이트)"""
-    headers = {
-        "Content-Type": "application/json",
-        "X-Master-Key": api_key
-    }
-
-    data = {"projects": projects}
-
-    try:
-        response = requests.put(f"{JSONBIN_API_URL}/b/{bin_id}", json=data, headers=headers, timeout=30)
-        if response.status_code == 200:
-            return True, None
-        else:
-            return False, f"저장 실패: {response.status_code} - {response.text[:100]}"
-    except Exception as e:
-        return False, f"저장 오류: {str(e)}"
-
-def add_project_to_list(new_project, projects, max_projects=50):
-    """프로젝트 리스트에 새 프로젝트 추가 (최대 개수 제한)"""
-    # 같은 제목이 있으면 업데이트
-    project_title = new_project.get('plan_data', {}).get('project_title', 'Untitled')
-    updated = False
-    for i, p in enumerate(projects):
-        if p.get('plan_data', {}).get('project_title') == project_title:
-            projects[i] = new_project
-            updated = True
-            break
-
-    if not updated:
-        projects.insert(0, new_project)  # 최신 항목을 맨 앞에
-
-    # 최대 개수 제한
-    if len(projects) > max_projects:
-        projects = projects[:max_projects]
-
-    return projects
-
-def delete_project_from_list(project_index, projects):
-    """프로젝트 리스트에서 삭제"""
-    if 0 <= project_index < len(projects):
-        del projects[project_index]
-    return projects
-
-def prepare_project_for_save(plan_data, topic="", settings=None):
-    """프로젝트 데이터를 저장용으로 준비 (이미지 제외)"""
-    save_data = {
-        "version": "1.0",
-        "saved_at": datetime.now().isoformat(),
-        "topic": topic,
-        "settings": settings or {},
-        "plan_data": plan_data
-    }
-    return save_data
-
-def export_project_json(plan_data, topic="", settings=None):
-    """프로젝트를 JSON 문자열로 내보내기"""
-    save_data = prepare_project_for_save(plan_data, topic, settings)
-    return json.dumps(save_data, ensure_ascii=False, indent=2)
-
-# --- 장르/스타일 (확장) ---
-VIDEO_GENRES = [
-    "Action/Thriller", "Sci-Fi Epic", "Dark Fantasy", "Psychological Horror", "Romantic Drama", 
-    "Neo-Noir", "Cyberpunk", "Post-Apocalyptic", "Surreal/Abstract", "Music Video (Performance)",
-    "Music Video (Narrative)", "Experimental Art Film", "Anime/Animation", "Documentary Style",
-    "Found Footage", "One-Shot/Long Take", "Dance Film", "Visual Poem", "Social Commentary",
-    "Cosmic Horror", "Magical Realism", "Dystopian Future", "Historical Epic", "Slice of Life"
-]
-
-VISUAL_STYLES = [
-    "Photorealistic/Cinematic", "Hyperrealistic 8K", "Anime/Manga", "3D Pixar Style", 
-    "2D Traditional Animation", "Watercolor Painting", "Oil Painting Classical", "Cyberpunk Neon",
-    "Dark Fantasy Gothic", "Pastel Dreamy", "Black & White Film Noir", "Retro 80s VHS",
-    "Vaporwave Aesthetic", "Lo-Fi Indie", "High Fashion Editorial", "Gritty Documentary",
-    "Surrealist Art", "Minimalist Clean", "Maximalist Baroque", "Glitch Art Digital"
-]
-
-MUSIC_GENRES = [
-    "Pop", "Rock", "Hip-Hop/Rap", "Electronic/EDM", "R&B/Soul", "Jazz", "Classical",
-    "Metal", "Indie", "K-Pop", "Lo-Fi", "Trap", "House", "Techno", "Ambient",
-    "Synthwave", "Phonk", "Drill", "Afrobeat", "Latin", "Folk", "Country",
-    "Orchestral/Cinematic", "Experimental", "Post-Rock", "Dream Pop", "Shoegaze"
-]
-
-# --- 자동 영상 설정 (주제 기반) ---
-def analyze_topic_for_auto_settings(topic):
-    """주제를 분석하여 최적의 영상장르, 비주얼스타일, 음악장르 인덱스를 반환"""
-    topic_lower = topic.lower()
-
-    # 키워드 매핑 사전
-    genre_keywords = {
-        0: ["액션", "action", "전쟁", "war", "전투", "battle", "싸움", "fight", "추격", "chase", "폭발", "explosion"],
-        1: ["sf", "sci-fi", "우주", "space", "미래", "future", "로봇", "robot", "외계인", "alien", "우주선"],
-        2: ["판타지", "fantasy", "마법", "magic", "용", "dragon", "기사", "knight", "엘프", "elf", "던전"],
-        3: ["공포", "horror", "호러", "귀신", "ghost", "좀비", "zombie", "무서운", "scary", "심리", "psychological"],
-        4: ["사랑", "love", "연애", "romance", "이별", "breakup", "그리움", "longing", "첫사랑", "고백"],
-        5: ["느와르", "noir", "범죄", "crime", "탐정", "detective", "미스터리", "mystery", "암흑가"],
-        6: ["사이버펑크", "cyberpunk", "네온", "neon", "해커", "hacker", "디스토피아", "매트릭스"],
-        7: ["종말", "apocalypse", "폐허", "ruins", "서바이벌", "survival", "황무지", "wasteland"],
-        8: ["추상", "abstract", "초현실", "surreal", "꿈", "dream", "환각", "무의식"],
-        9: ["퍼포먼스", "performance", "무대", "stage", "라이브", "live", "콘서트", "concert"],
-        10: ["스토리", "story", "이야기", "narrative", "드라마", "drama", "서사"],
-        11: ["실험", "experimental", "아방가르드", "avant-garde", "예술", "art"],
-        12: ["애니메이션", "animation", "애니", "anime", "만화", "cartoon", "일본", "japan"],
-        13: ["다큐", "documentary", "실제", "real", "현실", "reality", "인터뷰"],
-        16: ["댄스", "dance", "춤", "안무", "choreography", "발레", "ballet", "힙합댄스"],
-        17: ["시", "poem", "시적", "poetic", "감성", "emotional", "서정"],
-        18: ["사회", "social", "비판", "critique", "메시지", "message", "현대사회"],
-        19: ["우주공포", "cosmic", "크툴루", "lovecraft", "미지", "unknown"],
-        20: ["마술적", "magical realism", "기묘한", "strange", "일상속비일상"],
-        21: ["미래도시", "dystopia", "통제사회", "빅브라더", "감시"],
-        22: ["역사", "historical", "시대극", "왕조", "중세", "고대"],
-        23: ["일상", "daily", "slice of life", "평범한", "소소한"]
-    }
-
-    visual_keywords = {
-        0: ["실사", "realistic", "영화", "cinematic", "현실적"],
-        1: ["초고화질", "8k", "4k", "하이퍼", "hyper", "극사실"],
-        2: ["애니", "anime", "망가", "manga", "일본애니", "셀애니"],
-        3: ["3d", "픽사", "pixar", "디즈니", "disney", "cg"],
-        4: ["2d", "셀", "전통", "hand-drawn"],
-        5: ["수채화", "watercolor", "파스텔", "부드러운"],
-        6: ["유화", "oil painting", "고전", "classical", "르네상스"],
-        7: ["사이버펑크", "cyberpunk", "네온", "neon", "미래도시"],
-        8: ["다크판타지", "dark fantasy", "고딕", "gothic", "어둠"],
-        9: ["파스텔", "pastel", "dreamy", "몽환", "부드러운"],
-        10: ["흑백", "b&w", "black and white", "모노크롬", "필름누아르"],
-        11: ["레트로", "retro", "80년대", "80s", "vhs", "복고"],
-        12: ["베이퍼웨이브", "vaporwave", "증기파", "핑크", "보라"],
-        13: ["로파이", "lo-fi", "인디", "indie", "그런지"],
-        14: ["패션", "fashion", "하이패션", "에디토리얼", "보그"],
-        15: ["다큐", "documentary", "거친", "gritty", "리얼"],
-        16: ["초현실", "surrealist", "달리", "마그리트", "기묘한"],
-        17: ["미니멀", "minimal", "심플", "simple", "깔끔한"],
-        18: ["맥시멀", "maximalist", "화려한", "바로크", "baroque"],
-        19: ["글리치", "glitch", "디지털", "digital", "노이즈"]
-    }
-
-    music_keywords = {
-        0: ["팝", "pop", "대중", "mainstream"],
-        1: ["록", "rock", "기타", "guitar", "밴드"],
-        2: ["힙합", "hip-hop", "랩", "rap", "비트"],
-        3: ["일렉", "electronic", "edm", "클럽", "club"],
-        4: ["알앤비", "r&b", "소울", "soul", "감미로운"],
-        5: ["재즈", "jazz", "스윙", "swing", "블루스"],
-        6: ["클래식", "classical", "오케스트라", "피아노", "바이올린"],
-        7: ["메탈", "metal", "헤비", "heavy", "하드록"],
-        8: ["인디", "indie", "독립", "alternative"],
-        9: ["케이팝", "k-pop", "kpop", "아이돌", "idol"],
-        10: ["로파이", "lo-fi", "lofi", "잔잔한", "공부"],
-        11: ["트랩", "trap", "808", "베이스"],
-        12: ["하우스", "house", "디스코", "disco"],
-        13: ["테크노", "techno", "언더그라운드"],
-        14: ["앰비언트", "ambient", "분위기", "배경음악"],
-        15: ["신스웨이브", "synthwave", "레트로", "80년대음악"],
-        16: ["퐁크", "phonk", "drift", "드리프트"],
-        17: ["드릴", "drill", "영국", "uk"],
-        18: ["아프로비트", "afrobeat", "아프리카"],
-        19: ["라틴", "latin", "레게톤", "살사"],
-        20: ["포크", "folk", "어쿠스틱", "acoustic"],
-        21: ["컨트리", "country", "미국남부"],
-        22: ["오케스트라", "orchestral", "cinematic", "영화음악", "웅장"],
-        23: ["실험음악", "experimental", "노이즈"],
-        24: ["포스트록", "post-rock", "슬로우"],
-        25: ["드림팝", "dream pop", "몽환적"],
-        26: ["슈게이징", "shoegaze", "노이즈팝"]
-    }
-
-    def find_best_match(keywords_dict, default=0):
-        scores = {idx: 0 for idx in keywords_dict}
-        for idx, keywords in keywords_dict.items():
-            for keyword in keywords:
-                if keyword in topic_lower:
-                    scores[idx] += 1
-
-        max_score = max(scores.values())
-        if max_score > 0:
-            for idx, score in scores.items():
-                if score == max_score:
-                    return idx
-        return default
-
-    genre_idx = find_best_match(genre_keywords, 0)
-    visual_idx = find_best_match(visual_keywords, 0)
-    music_idx = find_best_match(music_keywords, 0)
-
-    # 장르-스타일 연관성 보정
-    genre_visual_mapping = {
-        6: 7,   # Cyberpunk → Cyberpunk Neon
-        2: 8,   # Dark Fantasy → Dark Fantasy Gothic
-        12: 2,  # Anime/Animation → Anime/Manga
-        3: 8,   # Psychological Horror → Dark Fantasy Gothic
-        5: 10,  # Neo-Noir → Black & White Film Noir
-        22: 6,  # Historical Epic → Oil Painting Classical
-    }
-
-    genre_music_mapping = {
-        6: 15,  # Cyberpunk → Synthwave
-        12: 9,  # Anime/Animation → K-Pop or J-Pop related
-        22: 22, # Historical Epic → Orchestral/Cinematic
-        3: 14,  # Psychological Horror → Ambient
-        1: 3,   # Sci-Fi Epic → Electronic/EDM
-    }
-
-    # 스타일이 기본값이면 장르에 맞춰 보정
-    if visual_idx == 0 and genre_idx in genre_visual_mapping:
-        visual_idx = genre_visual_mapping[genre_idx]
-
-    if music_idx == 0 and genre_idx in genre_music_mapping:
-        music_idx = genre_music_mapping[genre_idx]
-
-    return genre_idx, visual_idx, music_idx
-
-# --- 비주얼 스타일 강조 (포토리얼리스틱 대폭 강화) ---
-def get_visual_style_emphasis(visual_style):
-    # 포토리얼리스틱 계열 강력한 프롬프트
-    photo_emphasis = """(EXTREMELY DETAILED REAL PHOTO:1.5), (8k resolution:1.2), (photorealistic:1.4), 
-RAW photo, Fujifilm XT3, shot on 50mm lens, f/1.8, natural skin texture, visible pores, soft lighting, 
-detailed eyes, distinct facial features, hyper-detailed, no CGI, no 3D render look, 
-authentic human imperfections, cinematic lighting, masterpiece, best quality"""
-
-    style_map = {
-        "Photorealistic/Cinematic": photo_emphasis,
-        "Hyperrealistic 8K": photo_emphasis + ", RED V-RAPTOR 8K, documentary style",
-        
-        "Anime/Manga": """anime style, manga illustration, cel-shaded, vibrant anime colors, 
-expressive anime eyes, clean linework, anime aesthetic, Studio Ghibli quality,
-Makoto Shinkai lighting, detailed anime backgrounds""",
-        
-        "3D Pixar Style": """3D rendered, Pixar Animation Studios quality, CGI animation, 
-smooth gradients, subsurface scattering, ray-traced lighting, 
-Disney/Pixar character design, expressive 3D characters""",
-        
-        "Cyberpunk Neon": """cyberpunk aesthetic, neon lights, synthwave colors, 
-futuristic cityscape, rain-slicked streets, holographic advertisements,
-Blade Runner 2049 cinematography, volumetric fog, RGB lighting,
-dark with vibrant neon accents, tech-noir atmosphere""",
-        
-        "Dark Fantasy Gothic": """dark fantasy, gothic architecture, moody atmosphere, 
-dramatic chiaroscuro lighting, mysterious fog, medieval dark aesthetics,
-Game of Thrones visual quality, dark romanticism, ominous shadows""",
-        
-        "Black & White Film Noir": """black and white cinematography, high contrast,
-dramatic shadows, film noir lighting, 1940s Hollywood style,
-venetian blind shadows, fog-filled streets, classic cinema look""",
-        
-        "Retro 80s VHS": """1980s aesthetic, VHS quality, scan lines, chromatic aberration,
-neon colors, analog warmth, retro futurism, Stranger Things vibe,
-practical effects look, vintage film grain""",
-        
-        "High Fashion Editorial": """high fashion photography, Vogue editorial quality,
-dramatic fashion lighting, avant-garde styling, luxury aesthetic,
-shot by Mario Testino, couture fashion, editorial composition""",
-        
-        "Surrealist Art": """surrealist art style, Salvador Dali inspired, 
-dreamlike imagery, impossible geometry, melting reality,
-symbolic visual metaphors, subconscious imagery, Magritte influence"""
-    }
-    return style_map.get(visual_style, f"{visual_style}, high quality, professional")
-
 # --- 사이드바 ---
 with st.sidebar:
     st.header("⚙️ 설정")
@@ -822,21 +580,42 @@ with st.sidebar:
     auto_generate = st.checkbox("자동 이미지 생성", value=False)
     infinite_retry = st.checkbox("무한 재시도", value=False)
     
-    # [수정됨] 이미지 공급자 선택 (세분화된 무료 모델 추가)
-    image_provider = st.selectbox("엔진", [
-        "Pollinations Flux-Realism 📸",   # [추천] 극실사/영화용 (최고 퀄리티)
-        "Pollinations Flux-Anime 🎨",     # 애니메이션/일러스트용
-        "Pollinations Flux-3D 🧊",        # 3D 렌더링/픽사 스타일
-        "Pollinations Dark 🌑",           # 어둡고 분위기 있는 스타일
-        "Pollinations Turbo ⚡",          # 속도 최우선 (퀄리티 낮음)
-        "Segmind (SDXL)"                  # 키 필요
-    ], index=0)
+    # [수정됨] 이미지 공급자 선택 (세분화된 무료 모델 추가, Auto = 요청마다 가장 빠른 정상 엔진)
+    image_provider = st.selectbox("엔진", [AUTO_ENGINE] + IMAGE_ENGINES, index=1)
     
     if not infinite_retry:
         max_retries = st.slider("재시도", 1, 10, 3)
     else:
         max_retries = 999
 
+    # 빈 화면/비율/장소 팔레트가 어긋난 이미지는 재시도 예산 안에서 새 시드로 다시 요청
+    st.checkbox("품질 검사 (자동 재시도)", value=True, key="quality_gate_enabled")
+
+    # 씬 카드의 🎲 변형 버튼이 한 번에 만드는 후보 수 (Segmind는 요청 1번, Pollinations는 시드별 동시 요청)
+    st.slider("변형 후보 수", 2, MAX_VARIATIONS, DEFAULT_VARIATIONS, key="variation_count")
+
+    # 엔진 벤치마크 (고정 프롬프트 세트를 엔진별로 동시에 요청)
+    with st.expander("🏁 엔진 벤치마크", expanded=False):
+        bench_history = get_engine_bench_history()
+        if st.button("벤치마크 실행", key="run_engine_bench", help=f"엔진별 {len(BENCH_PROMPTS)}회 동시 요청"):
+            with st.spinner("엔진별 요청 중..."):
+                bench_history.append(benchmark_engines(segmind_key=segmind_key or get_api_key("SEGMIND_API_KEY")))
+        bench_summary = summarize_bench(bench_history.load())
+        if bench_summary:
+            bench_html = ""
+            for engine, row in sorted(bench_summary.items(), key=lambda item: item[1]['total_p50_ms'] or float('inf')):
+                level_class = "img-log-success" if row['failure_rate'] < 0.3 else "img-log-warn"
+                timing = (f"TTFB {row['ttfb_p50_ms'] / 1000:.1f}s · 전체 {row['total_p50_ms'] / 1000:.1f}s "
+                          f"({row['ms_per_mp_p50'] / 1000:.1f}s/MP) · {row['mean_bytes'] / 1024:.0f}KB · "
+                          f"{row['resolution']}") if row['total_p50_ms'] else "응답 없음"
+                bench_html += (f"<div class='img-log-entry {level_class}'><b>{engine}</b><br>{timing} · "
+                               f"실패 {row['failures']}/{row['runs']}</div>")
+            st.markdown(bench_html, unsafe_allow_html=True)
+        else:
+            st.caption("최근 24시간 벤치마크 기록이 없습니다")
+        auto_engine, auto_reason = choose_auto_engine()
+        st.caption(f"Auto 선택: {auto_engine} ({auto_reason})")
+
     st.markdown("---")
     if st.button("🗑️ 전체 초기화"):
         st.session_state.clear()
@@ -844,28 +623,51 @@ with st.sidebar:
 
     st.markdown("---")
 
-    # 실시간 이미지 생성 로그
+    # 이미지 생성 대시보드 (공급자/모델별 통계 + 실시간 로그)
     with st.expander("📋 이미지 생성 로그", expanded=True):
-        log_col1, log_col2 = st.columns([3, 1])
-        with log_col2:
-            if st.button("🗑️", key="clear_img_log", help="로그 초기화"):
-                clear_image_logs()
-                st.rerun()
-
-        logs = st.session_state.get('image_gen_logs', [])
-        if logs:
-            # 로그를 시간순(위->아래)으로 표시
-            log_html = ""
-            for log_entry in logs[-30:]:
-                level_class = f"img-log-{log_entry['level']}"
-                level_icon = {
-                    'info': 'ℹ️', 'success': '✅', 'warn': '⚠️',
-                    'error': '❌', 'model': '🤖'
-                }.get(log_entry['level'], 'ℹ️')
-                log_html += f"<div class='img-log-entry {level_class}'>{level_icon} <b>[{log_entry['time']}]</b> {log_entry['message']}</div>"
-            st.markdown(log_html, unsafe_allow_html=True)
+        render_generation_dashboard()
+
+    # 인터랙션별 렌더링 성능 (전체 실행 vs 프래그먼트 재실행)
+    with st.expander("⏱️ 렌더링 성능", expanded=False):
+        render_metrics = st.session_state.get('render_metrics', [])
+        if render_metrics:
+            by_scope = {}
+            for m in render_metrics:
+                by_scope.setdefault(m['scope'], []).append(m)
+            for scope, items in by_scope.items():
+                avg_ms = sum(m['ms'] for m in items) / len(items)
+                avg_kb = sum(m['msg_bytes'] + m['image_bytes'] for m in items) / len(items) / 1024
+                st.caption(f"**{scope}** · {len(items)}회 · 평균 {avg_ms:.0f}ms · {avg_kb:.1f}KB")
+            recent_html = ""
+            for m in render_metrics[-10:]:
+                recent_html += (f"<div class='img-log-entry img-log-info'><b>[{m['time']}]</b> {m['scope']} "
+                                f"{m['ms']:.0f}ms · msg {m['msg_bytes']/1024:.1f}KB · img {m['image_bytes']/1024:.1f}KB</div>")
+            st.markdown(recent_html, unsafe_allow_html=True)
+        else:
+            st.caption("인터랙션 후 실행 시간과 전송량이 표시됩니다")
+
+    # 단계별 소요 시간 (현재 세션의 스팬 p50/p95)
+    with st.expander("📊 단계별 소요 시간", expanded=False):
+        tracer = st.session_state['tracer']
+        stage_stats = tracer.stage_stats()
+        if stage_stats:
+            stage_html = ""
+            for stage, stat in stage_stats.items():
+                level_class = "img-log-warn" if stat['errors'] else "img-log-info"
+                error_text = f" · 실패 {stat['errors']}" if stat['errors'] else ""
+                stage_html += (f"<div class='img-log-entry {level_class}'><b>{stage}</b> · {stat['count']}회 · "
+                               f"p50 {stat['p50_ms']:.0f}ms · p95 {stat['p95_ms']:.0f}ms{error_text}</div>")
+            st.markdown(stage_html, unsafe_allow_html=True)
+            trace_col1, trace_col2 = st.columns(2)
+            with trace_col1:
+                st.download_button("JSONL", tracer.to_jsonl(), file_name="spans.jsonl", mime="application/x-ndjson",
+                                   key="download_spans")
+            with trace_col2:
+                st.download_button("Prometheus", get_span_sink().prometheus_text(), file_name="metrics.prom",
+                                   mime="text/plain", key="download_prom")
+            st.caption(f"서버 기록: {TRACE_DIR} (spans.jsonl, metrics.prom)")
         else:
-            st.caption("이미지 생성 시 로그가 여기에 표시됩니다")
+            st.caption("기획안/이미지 생성 후 단계별 p50/p95가 표시됩니다")
 
     st.markdown("---")
 
@@ -1047,6 +849,7 @@ defaults = {
     'random_topic': "",
     'plan_data': None,
     'generated_images': {},
+    'scene_variations': {},
     'turntable_images': {},
     'auto_genre_enabled': False,
     'auto_visual_enabled': False,
@@ -1082,19 +885,25 @@ with st.expander("📝 프로젝트 설정", expanded=True):
     col_t1, col_t2, col_t3, col_t4 = st.columns(4)
     with col_t1:
         if st.button("🎲 랜덤 생성", use_container_width=True):
-            st.session_state.random_topic = generate_trending_topic()
+            topic_text, _, attempts = pick_novel(generate_trending_topic, get_novelty_index(), NOVELTY_MAX_TRIES)
+            st.session_state.random_topic = topic_text
+            note_novelty(attempts)
             apply_auto_style_settings(st.session_state.random_topic)
             st.rerun()
     with col_t2:
         if st.button("🎲🎲 5개 생성", use_container_width=True):
-            topics = [generate_trending_topic() for _ in range(5)]
+            topics = generate_novel_topics(5)
+            st.session_state.pop('novelty_note', None)
             st.session_state.random_topic = "\n---\n".join(topics)
             apply_auto_style_settings(topics[0])  # 첫 번째 주제 기준
             st.rerun()
     with col_t3:
         if st.button("🤖 AI 생성", use_container_width=True):
             if gemini_key:
-                st.session_state.random_topic = get_viral_topic_with_ai(gemini_key, gemini_model)
+                topic_text, _, attempts = pick_novel(lambda: get_viral_topic_with_ai(gemini_key, gemini_model),
+                                                         get_novelty_index(), AI_NOVELTY_MAX_TRIES)
+                st.session_state.random_topic = topic_text
+                note_novelty(attempts)
                 apply_auto_style_settings(st.session_state.random_topic)
                 st.rerun()
             else:
@@ -1107,9 +916,25 @@ with st.expander("📝 프로젝트 설정", expanded=True):
                     filtered_keywords = auto_scout_trending_topics(channel_cat, gemini_key, gemini_model)
 
                     if filtered_keywords:
-                        # 첫 번째 키워드로 콘셉트 생성
+                        # 2~N번째 키워드 콘셉트는 백그라운드 일괄 요청 1회로 미리 생성, 첫 번째만 바로 생성
+                        prefetcher = get_concept_prefetcher()
+                        prefetcher.prefetch(filtered_keywords[1:], channel_cat, gemini_key, gemini_model, top_n=DEFAULT_PREFETCH_TOP_N - 1,
+                                            group=concept_prefetch_group())
                         first_kw = filtered_keywords[0]
-                        concept = generate_viral_concept_from_keyword(first_kw, channel_cat, gemini_key, gemini_model)
+                        concept = prefetcher.get(first_kw, channel_cat, gemini_key, gemini_model)
+                        # 과거 기획과 비슷하면 선계산된 다음 키워드 콘셉트로 교체 (추가 LLM 호출 없음)
+                        index = get_novelty_index()
+                        attempts = 1
+                        if not index.is_novel(concept):
+                            for kw in filtered_keywords[1:DEFAULT_PREFETCH_TOP_N]:
+                                candidate = prefetcher.get(kw, channel_cat, gemini_key, gemini_model)
+                                attempts += 1
+                                if index.is_novel(candidate):
+                                    first_kw, concept = kw, candidate
+                                    break
+                            else:
+                                attempts = 1  # 모두 비슷하면 첫 번째 그대로
+                        note_novelty(attempts)
                         st.session_state.random_topic = concept
                         st.session_state.scouted_keywords = filtered_keywords
                         apply_auto_style_settings(concept)
@@ -1120,25 +945,58 @@ with st.expander("📝 프로젝트 설정", expanded=True):
             else:
                 st.warning("API 키가 필요하거나 Auto Scout가 비활성화되어 있습니다")
 
+    # 브레인스토밍 시트 (중복 없는 대량 주제)
+    with st.expander("📋 브레인스토밍 시트", expanded=False):
+        col_b1, col_b2, col_b3 = st.columns([1, 1, 1])
+        with col_b1:
+            sheet_count = st.number_input("주제 수", min_value=10, max_value=100000, value=1000, step=100, key="sheet_count")
+        with col_b2:
+            sheet_seed = st.number_input("시드 (0 = 랜덤)", min_value=0, value=0, step=1, key="sheet_seed")
+        with col_b3:
+            sheet_balanced = st.checkbox("키워드 골고루 사용", value=True, key="sheet_balanced",
+                                         help="모든 키워드가 한 번씩 쓰이기 전에는 같은 키워드를 다시 쓰지 않음")
+        if st.button("📋 시트 생성", use_container_width=True, key="sheet_generate"):
+            st.session_state['topic_sheet'] = generate_unique_topics(
+                int(sheet_count), seed=int(sheet_seed) or None, balanced=sheet_balanced)
+        if st.session_state.get('topic_sheet'):
+            sheet = st.session_state['topic_sheet']
+            st.caption(f"{len(sheet):,}개 주제 (미리보기 20개)")
+            st.text("\n".join(sheet[:20]))
+            st.download_button("⬇️ 시트 다운로드 (.txt)", "\n".join(sheet), file_name="topic_sheet.txt",
+                               mime="text/plain", use_container_width=True, key="sheet_download")
+
     # 스카우트된 키워드 표시
     if st.session_state.get('scouted_keywords'):
         with st.expander("🔥 스카우트된 트렌드 키워드", expanded=False):
-            for i, kw_data in enumerate(st.session_state.scouted_keywords[:5]):
+            if st.session_state.get('keyword_filter_note'):
+                st.caption(st.session_state['keyword_filter_note'])
+            trend_traffic = {item['title']: item['traffic'] for item in st.session_state.get('trend_items', [])}
+            prefetcher = get_concept_prefetcher()
+            channel_cat = st.session_state.get('channel_category', '뮤직비디오/음악')
+            for i, kw_data in enumerate(st.session_state.scouted_keywords[:DEFAULT_PREFETCH_TOP_N]):
                 keyword = kw_data.get('keyword', kw_data) if isinstance(kw_data, dict) else kw_data
                 angle = kw_data.get('angle', '') if isinstance(kw_data, dict) else ''
+                if trend_traffic.get(keyword):
+                    angle = f"{angle} · 🔥 검색량 {trend_traffic[keyword]}" if angle else f"🔥 검색량 {trend_traffic[keyword]}"
                 col_kw1, col_kw2 = st.columns([1, 3])
                 with col_kw1:
                     if st.button(f"📌 {keyword}", key=f"kw_btn_{i}", use_container_width=True):
                         if gemini_key:
-                            concept = generate_viral_concept_from_keyword(kw_data, st.session_state.get('channel_category', '뮤직비디오/음악'), gemini_key, gemini_model)
+                            # 선계산된 콘셉트 사용 (진행 중이면 완료 대기), 선택 후 남은 대기 작업은 취소
+                            concept = prefetcher.get(kw_data, channel_cat, gemini_key, gemini_model)
+                            prefetcher.cancel_pending(concept_prefetch_group())
                             st.session_state.random_topic = concept
+                            st.session_state.pop('novelty_note', None)
                             apply_auto_style_settings(concept)
                             st.rerun()
                 with col_kw2:
-                    st.caption(angle if angle else "클릭하여 콘셉트 생성")
+                    ready = "⚡ 콘셉트 준비됨 · " if prefetcher.peek(kw_data, channel_cat) else ""
+                    st.caption(ready + (angle if angle else "클릭하여 콘셉트 생성"))
     
     if st.session_state.random_topic:
         st.info(f"💡 {st.session_state.random_topic}")
+        if st.session_state.get('novelty_note'):
+            st.caption(st.session_state['novelty_note'])
     st.markdown("</div>", unsafe_allow_html=True)
 
     # 장르/스타일 랜덤 선택 버튼 (form 밖)
@@ -1235,6 +1093,7 @@ with st.expander("📝 프로젝트 설정", expanded=True):
         with col_g2:
             selected_visual = st.selectbox("🎨 비주얼 스타일", VISUAL_STYLES,
                 index=st.session_state.selected_visual_idx)
+            st.session_state['current_visual_style'] = selected_visual  # Auto 엔진 스타일 계열
         with col_g3:
             selected_music = st.selectbox("🎵 음악 장르", MUSIC_GENRES,
                 index=st.session_state.selected_music_idx)
@@ -1271,1014 +1130,130 @@ with st.expander("📝 프로젝트 설정", expanded=True):
         submit_btn = st.form_submit_button("🚀 프로젝트 생성", use_container_width=True, type="primary")
 
 # ------------------------------------------------------------------
-# JSON 정리 함수 (개선됨)
-# ------------------------------------------------------------------
-def clean_json_text(text):
-    if not text:
-        return ""
-
-    original_text = text
-
-    # 1. ```json ... ``` 블록에서 추출
-    match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-    if match:
-        text = match.group(1)
-    else:
-        # 2. ``` ... ``` 블록에서 추출
-        match = re.search(r"```\s*(.*?)\s*```", text, re.DOTALL)
-        if match:
-            text = match.group(1)
-        else:
-            # 3. { 로 시작하고 } 로 끝나는 JSON 객체 찾기
-            match = re.search(r'(\{[\s\S]*\})', text)
-            if match:
-                text = match.group(1)
-
-    text = text.strip()
-
-    # JSON이 비어있으면 원본에서 다시 시도
-    if not text or text == "":
-        # 원본에서 첫 번째 { 부터 마지막 } 까지 추출
-        start_idx = original_text.find('{')
-        end_idx = original_text.rfind('}')
-        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-            text = original_text[start_idx:end_idx + 1]
-
-    # JSON 정리
-    text = re.sub(r',\s*}', '}', text)
-    text = re.sub(r',\s*]', ']', text)
-    text = re.sub(r'//.*?\n', '\n', text)
-    # 여러 줄 주석 제거
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-
-    # JSON 문자열 내의 제어 문자 이스케이프 처리
-    def escape_control_chars_in_strings(json_str):
-        result = []
-        in_string = False
-        escape_next = False
-
-        for char in json_str:
-            if escape_next:
-                result.append(char)
-                escape_next = False
-                continue
-
-            if char == '\\':
-                result.append(char)
-                escape_next = True
-                continue
-
-            if char == '"':
-                in_string = not in_string
-                result.append(char)
-                continue
-
-            if in_string:
-                if char == '\n':
-                    result.append('\\n')
-                elif char == '\r':
-                    result.append('\\r')
-                elif char == '\t':
-                    result.append('\\t')
-                elif ord(char) < 32:
-                    result.append(f'\\u{ord(char):04x}')
-                else:
-                    result.append(char)
-            else:
-                result.append(char)
-
-        return ''.join(result)
-
-    text = escape_control_chars_in_strings(text)
-    return text
-
-# ------------------------------------------------------------------
-# 시스템 프롬프트 (전문가 수준 - 수정됨)
+# 컴파일된 기획안 (plan_data 교체 시에만 재컴파일)
 # ------------------------------------------------------------------
-def get_system_prompt(topic, scene_count, options, genre, visual_style, music_genre, use_json, expert_mode, seconds_per_scene):
-    story_elements = []
-    if options.get('use_arc'): story_elements.append("three-act structure with setup-confrontation-resolution")
-    if options.get('use_sensory'): story_elements.append("rich sensory details (visual, auditory, tactile)")
-    if options.get('use_dynamic'): story_elements.append("dynamic pacing with rhythm variations")
-    if options.get('use_emotional'): story_elements.append("emotional arc with clear beats")
-    if options.get('use_climax'): story_elements.append("building tension to powerful climax")
-    if options.get('use_trial'): story_elements.append("protagonist trials and obstacles")
-    if options.get('use_symbolic'): story_elements.append("symbolic imagery and visual metaphors")
-    if options.get('use_twist'): story_elements.append("unexpected twist or revelation")
-    
-    story_instruction = ", ".join(story_elements) if story_elements else "cinematic narrative flow"
-    visual_emphasis = get_visual_style_emphasis(visual_style)
-    
-    expert_instruction = ""
-    if expert_mode:
-        expert_instruction = """
-
-EXPERT MODE - INDUSTRY PROFESSIONAL STANDARDS:
-
-You are working at the level of top-tier music video directors (Hype Williams, Dave Meyers, Joseph Kahn, CHEZ, Woogie Kim).
-
-CINEMATOGRAPHY MASTERY:
-- Camera movements: Specify exact dolly/crane/steadicam/gimbal movements with timing
-- Lens choices: Indicate focal length (14mm wide, 50mm standard, 85mm portrait, 200mm telephoto)
-- Depth of field: Specify f-stop for each shot (f/1.4 shallow, f/8 deep)
-- Lighting setups: Key, fill, rim, practical lights with color temperature (2700K warm, 5600K daylight)
-
-COLOR SCIENCE:
-- Color palette: Specify exact HEX codes for dominant, secondary, accent colors
-- LUT reference: Reference specific color grades (Teal & Orange, Film Noir, Kodak Vision3)
-- Contrast ratio: Specify shadow/highlight relationship
-"""
-
-    # 실사 강조 (강력한 규칙 추가)
-    photorealistic_extra = ""
-    if "Photorealistic" in visual_style or "Hyperrealistic" in visual_style:
-        photorealistic_extra = """
-
-CRITICAL - PHOTOREALISTIC REQUIREMENTS (MUST FOLLOW):
-ALL prompts MUST include:
-- "RAW photo, 8k resolution, photorealistic, dslr, soft lighting, high quality, film grain"
-- "REAL HUMAN, natural skin texture, visible pores, imperfections, peach fuzz, realistic eyes"
-- "No CGI, No 3D render look, No illustration style"
-- "Shot on Fujifilm XT3 or ARRI Alexa"
-"""
-
-    json_detail = ""
-    if use_json:
-        json_detail = f"""
-
-ULTRA-DETAILED JSON PROFILES (SOURCE OF TRUTH - STRONGEST ENFORCEMENT):
-
-1. **SOURCE OF TRUTH RULE**: The 'json_profile' field is the ONLY valid source for physical appearance.
-2. **NEGATIVE CONSTRAINT FOR SCENES**: In the 'scenes' -> 'image_prompt' field, you MUST NOT describe the character's appearance (hair color, clothes, face). 
-   - **WRONG**: "A handsome man with blue hair and a leather jacket running in the rain."
-   - **CORRECT**: "A man running in the rain, dynamic angle, intense expression."
-   (The system will automatically INJECT the detailed description from 'json_profile' at the beginning of the prompt. If you repeat it, it causes conflicts.)
-
-3. **MANDATORY**: You MUST generate a turntable entry for **EVERY** single character, location, prop, and vehicle that appears.
-4. **DETAIL**: Provide specific HEX codes, materials, brands, and exact measurements.
-
-For CHARACTERS:
-{{
-  "physical": {{ "age": "exact age", "height_cm": number, "body_type": "detailed", "skin_tone": "#HEX", "skin_texture": "pores/freckles/scars" }},
-  "face": {{ "shape": "...", "eyes": {{"color": "#HEX", "shape": "..."}}, "nose": "...", "lips": "...", "hair": {{"color": "#HEX", "style": "..."}} }},
-  "clothing": {{ "top": {{"color": "#HEX", "material": "..."}}, "bottom": "...", "shoes": "...", "accessories": "..." }},
-  "expression": "default emotional state"
-}}
-
-For LOCATIONS:
-{{
-  "location_type": "exact place",
-  "architecture": "style and materials",
-  "lighting": {{"time": "HH:MM", "source": "sun/neon", "color_temp": "K"}},
-  "palette": {{"dominant": "#HEX", "accent": "#HEX"}}
-}}
-"""
-
-    turntable_instruction = """
-
-TURNTABLE REFERENCE SHEETS (COMPREHENSIVE & MANDATORY):
-
-You MUST create turntable entries for ALL distinct elements.
-
-FOR EACH CHARACTER (Mandatory Views):
-- View 1: "full_turntable" -> PROMPT MUST BE: "character sheet, split screen, 4 distinct views, front view, side view, back view, 3/4 view, same character in all views, full body shot, white background, high resolution"
-- View 2: "face_detail" (Extreme close-up, pore details, eyes)
-- View 3: "expression_sheet" (Neutral, Joy, Anger, Sorrow, Surprise)
-- View 4: "fashion_detail" (Clothing texture, shoes, accessories)
-- View 5: "cinematic_portrait" (Best lighting, shallow depth of field)
-
-FOR EACH LOCATION:
-- View 1: "establishing_shot" (Wide angle, entire scale)
-- View 2: "lighting_study" (Same angle, Day vs Night vs Golden Hour)
-- View 3: "texture_details" (Wall materials, floor, key props)
-
-FOR OBJECTS/VEHICLES:
-- View 1: "studio_product_shot" (Clean background, 3 angles)
-- View 2: "in_situ" (Object in the scene environment)
-"""
-
-    video_prompt_instruction = """
-VIDEO PROMPT UPGRADE (CRITICAL):
-The 'video_prompt' field must be highly detailed for AI Video Generators (Runway Gen-2, Pika, Kling).
-Format: "[Camera Movement] + [Subject Action] + [Physics/Environment] + [Technical Specs]"
-Example: "Slow dolly zoom in on character's eye, tear rolling down cheek, hair blowing gently in wind, rain falling in background, volumetric lighting, 8k resolution, high fidelity, 120fps smooth motion, shallow depth of field."
-NEVER use simple phrases like "Man walking". Be specific about speed, weight, lighting changes, and atmosphere.
-"""
-
-    return f"""You are an ELITE music video director working at the highest industry standards.
-Create an ULTRA-DETAILED production plan in VALID JSON format.
-
-PROJECT BRIEF:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Theme: "{topic}"
-Genre: {genre}
-Visual Style: {visual_style}
-Music Genre: {music_genre}
-Duration: {scene_count} scenes × {seconds_per_scene} seconds
-Story Elements: {story_instruction}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-VISUAL STYLE ENFORCEMENT:
-ALL image prompts MUST begin with: "{visual_emphasis}"
-{photorealistic_extra}
-{expert_instruction}
-{json_detail}
-{turntable_instruction}
-{video_prompt_instruction}
-
-JSON FORMAT RULES:
-- Use double quotes ONLY
-- NO trailing commas
-- NO comments
-- Escape special characters
-
-RETURN THIS EXACT JSON STRUCTURE:
-{{
-  "project_title": "Title in Korean",
-  "project_title_en": "Title in English",
-  "logline": "One-sentence concept in Korean",
-  "logline_en": "One-sentence concept in English",
-  "director_vision": "2-3 sentences about artistic vision",
-  
-  "youtube": {{
-    "title": "Viral title",
-    "description": "SEO description",
-    "hashtags": "tags..."
-  }},
-  
-  "music": {{
-    "style": "Korean description",
-    "style_tags": "genre, mood, bpm",
-    "vocal_direction": "details...",
-    "instrumentation": "details...",
-    "song_structure": "intro-verse-chorus...",
-    "lyrics_full": "lyrics...",
-    "suno_prompt_combined": "full prompt..."
-  }},
-  
-  "turntable": {{
-    "characters": [
-      {{
-        "id": "char1",
-        "name": "Name",
-        "name_en": "Name English",
-        "json_profile": {{ ...FULL PHYSICAL/CLOTHING PROFILE... }},
-        "views": [
-            {{ "view_type": "full_turntable", "prompt": "{visual_emphasis}, character sheet, split screen, 4 distinct views, front view, side view, back view, 3/4 view, same character, full body, white background" }},
-            {{ "view_type": "face_detail", "prompt": "{visual_emphasis}, extreme close up, face detail..." }},
-            {{ "view_type": "expression_sheet", "prompt": "..." }},
-            {{ "view_type": "fashion_detail", "prompt": "..." }},
-            {{ "view_type": "cinematic_portrait", "prompt": "..." }}
-        ]
-      }}
-      // GENERATE OBJECTS FOR ALL CHARACTERS
-    ],
-    "locations": [
-      {{
-        "id": "loc1",
-        "name": "Name",
-        "json_profile": {{ ...FULL LOCATION PROFILE... }},
-        "views": [
-            {{ "view_type": "establishing_shot", "prompt": "..." }},
-            {{ "view_type": "lighting_study", "prompt": "..." }},
-            {{ "view_type": "texture_details", "prompt": "..." }}
-        ]
-      }}
-      // GENERATE OBJECTS FOR ALL LOCATIONS
-    ],
-    "props": [
-      {{
-        "id": "prop1",
-        "name": "Name",
-        "json_profile": {{ ... }},
-        "views": [ ... ]
-      }}
-    ],
-    "vehicles": []
-  }},
-  
-  "scenes": [
-    {{
-      "scene_num": 1,
-      "timecode": "00:00-...",
-      "act": "1",
-      "action": "Description in Korean",
-      "emotion": "Emotion",
-      "camera": {{ "shot_type": "...", "movement": "...", "lens": "..." }},
-      "used_turntables": ["char1", "loc1"],
-      "image_prompt": "{visual_emphasis}, [SCENE ACTION], [CAMERA ANGLE]. (DO NOT describe appearance here. Focus on action.)",
-      "video_prompt": "CRITICAL: Highly detailed prompt for Runway/Pika. Camera movement + Action + Physics + Technicals. Minimum 20 words."
-    }}
-  ]
-}}
-
-Generate exactly {scene_count} scenes.
-ENSURE ALL CHARACTERS/LOCATIONS mentioned in scenes have a corresponding entry in 'turntable'.
-"""
+def get_compiled_plan(plan_data):
+    """현재 plan_data의 CompiledPlan (프로필 텍스트/최종 프롬프트 캐시)"""
+    compiled = st.session_state.get('compiled_plan')
+    if compiled is None or not compiled.is_current(plan_data):
+        compiled = CompiledPlan(plan_data)
+        st.session_state['compiled_plan'] = compiled
+    return compiled
 
 # ------------------------------------------------------------------
-# JSON 프로필 텍스트 변환 (개선된 버전)
+# 일괄 생성 매니페스트 (jobs/<프로젝트 ID>/ - 탭이 닫혀도 완료분은 디스크에 남음)
 # ------------------------------------------------------------------
-def json_profile_to_ultra_detailed_text(profile):
-    """JSON 프로필의 모든 중첩 필드를 상세 텍스트로 변환"""
-    parts = []
-    
-    if not isinstance(profile, dict):
-        return ""
-    
-    # 1. PHYSICAL (Physical Appearance)
-    if 'physical' in profile and isinstance(profile['physical'], dict):
-        phys = profile['physical']
-        phys_desc = []
-        if 'age' in phys: phys_desc.append(f"Age: {phys['age']}")
-        if 'height_cm' in phys: phys_desc.append(f"Height: {phys['height_cm']}cm")
-        if 'body_type' in phys: phys_desc.append(f"Body: {phys['body_type']}")
-        if 'skin_tone' in phys: phys_desc.append(f"Skin Tone: {phys['skin_tone']}")
-        if 'skin_texture' in phys: phys_desc.append(f"Skin Texture: {phys['skin_texture']}")
-        if phys_desc: parts.append("PHYSICAL[" + ", ".join(phys_desc) + "]")
-    
-    # 2. FACE (Facial Details)
-    if 'face' in profile and isinstance(profile['face'], dict):
-        face = profile['face']
-        face_desc = []
-        if 'shape' in face: face_desc.append(f"Face Shape: {face['shape']}")
-        
-        if 'eyes' in face and isinstance(face['eyes'], dict):
-            eyes = face['eyes']
-            eye_str = []
-            if 'color' in eyes: eye_str.append(f"{eyes['color']}")
-            if 'shape' in eyes: eye_str.append(eyes['shape'])
-            if 'size' in eyes: eye_str.append(eyes['size'])
-            if 'special' in eyes: eye_str.append(eyes['special'])
-            face_desc.append(f"Eyes: {' '.join(eye_str)}")
-            
-        if 'lips' in face and isinstance(face['lips'], dict):
-            lips = face['lips']
-            lip_str = []
-            if 'color' in lips: lip_str.append(lips['color'])
-            if 'shape' in lips: lip_str.append(lips['shape'])
-            if 'texture' in lips: lip_str.append(lips['texture'])
-            face_desc.append(f"Lips: {' '.join(lip_str)}")
-            
-        if 'nose' in face: face_desc.append(f"Nose: {face['nose']}")
-        if 'jawline' in face: face_desc.append(f"Jawline: {face['jawline']}")
-        if 'skin_details' in face: face_desc.append(f"Face Details: {face['skin_details']}")
-        
-        if 'hair' in face: # Handle nested hair in face if structured that way
-             if isinstance(face['hair'], dict):
-                 h = face['hair']
-                 face_desc.append(f"Hair: {h.get('color', '')} {h.get('style', '')}")
-        
-        if face_desc: parts.append("FACE[" + ", ".join(face_desc) + "]")
-    
-    # 3. HAIR (Hair Details - Main)
-    if 'hair' in profile and isinstance(profile['hair'], dict):
-        hair = profile['hair']
-        hair_desc = []
-        if 'color_primary' in hair: hair_desc.append(f"Color: {hair['color_primary']}")
-        if 'color_secondary' in hair: hair_desc.append(f"Highlights: {hair['color_secondary']}")
-        if 'length_cm' in hair: hair_desc.append(f"Length: {hair['length_cm']}cm")
-        if 'style' in hair: hair_desc.append(f"Style: {hair['style']}")
-        if 'texture' in hair: hair_desc.append(f"Texture: {hair['texture']}")
-        if hair_desc: parts.append("HAIR[" + ", ".join(hair_desc) + "]")
-    
-    # 4. CLOTHING (Detailed Outfit)
-    if 'clothing' in profile and isinstance(profile['clothing'], dict):
-        cloth = profile['clothing']
-        outfit_desc = []
-        for piece in ['top', 'bottom', 'shoes', 'outerwear']:
-            if piece in cloth and isinstance(cloth[piece], dict):
-                item = cloth[piece]
-                item_details = []
-                if 'color' in item: item_details.append(item['color'])
-                if 'material' in item: item_details.append(item['material'])
-                if 'type' in item: item_details.append(item['type'])
-                if 'fit' in item: item_details.append(f"fit: {item['fit']}")
-                if 'details' in item: item_details.append(f"detail: {item['details']}")
-                if item_details:
-                    outfit_desc.append(f"{piece.upper()}: {' '.join(item_details)}")
-        if outfit_desc: parts.append("OUTFIT[" + ", ".join(outfit_desc) + "]")
-    
-    # 5. ACCESSORIES & FEATURES
-    if 'accessories' in profile and isinstance(profile['accessories'], list) and profile['accessories']:
-        parts.append("ACCESSORIES[" + ", ".join(profile['accessories']) + "]")
-    
-    if 'distinctive_features' in profile and isinstance(profile['distinctive_features'], list) and profile['distinctive_features']:
-        parts.append("FEATURES[" + ", ".join(profile['distinctive_features']) + "]")
-        
-    # 6. LOCATION / ENVIRONMENT
-    if 'location_type' in profile:
-        loc_desc = [f"Type: {profile['location_type']}"]
-        
-        if 'architecture' in profile and isinstance(profile['architecture'], dict):
-            arch = profile['architecture']
-            if 'style' in arch: loc_desc.append(f"Style: {arch['style']}")
-            if 'materials' in arch and isinstance(arch['materials'], list): 
-                loc_desc.append(f"Materials: {', '.join(arch['materials'])}")
-        
-        if 'lighting' in profile and isinstance(profile['lighting'], dict):
-            light = profile['lighting']
-            light_strs = []
-            if 'time' in light: light_strs.append(f"Time: {light['time']}")
-            if 'color_temperature' in light: light_strs.append(light['color_temperature'])
-            if 'key_color' in light: light_strs.append(f"Key: {light['key_color']}")
-            if 'fill_color' in light: light_strs.append(f"Fill: {light['fill_color']}")
-            if 'special_effects' in light: light_strs.append(light['special_effects'])
-            loc_desc.append(f"LIGHTING: {' '.join(light_strs)}")
-            
-        if 'weather' in profile and isinstance(profile['weather'], dict):
-            w = profile['weather']
-            w_strs = []
-            if 'condition' in w: w_strs.append(w['condition'])
-            if 'humidity_percent' in w: w_strs.append(f"Humidity: {w['humidity_percent']}%")
-            loc_desc.append(f"WEATHER: {' '.join(w_strs)}")
-            
-        if 'color_palette' in profile and isinstance(profile['color_palette'], dict):
-            cp = profile['color_palette']
-            cp_strs = []
-            if 'dominant' in cp: cp_strs.append(f"Dom: {cp['dominant']}")
-            if 'secondary' in cp: cp_strs.append(f"Sec: {cp['secondary']}")
-            if 'accent' in cp: cp_strs.append(f"Acc: {cp['accent']}")
-            loc_desc.append(f"PALETTE: {' '.join(cp_strs)}")
-            
-        if 'atmosphere' in profile: loc_desc.append(f"Mood: {profile['atmosphere']}")
-        parts.append("LOCATION[" + " | ".join(loc_desc) + "]")
-
-    # 7. PROPS / VEHICLES
-    if 'make' in profile and 'model' in profile: # Vehicle
-        veh_desc = f"VEHICLE[{profile.get('color', '')} {profile.get('make', '')} {profile.get('model', '')}, {profile.get('year', '')}]"
-        parts.append(veh_desc)
-        
-    if 'dimensions' in profile: # Prop
-        prop_desc = f"PROP[{profile.get('color', '')} {profile.get('material', '')} {profile.get('name', '')}, {profile.get('finish', '')} finish]"
-        parts.append(prop_desc)
-    
-    return " ".join(parts)
+JOB_DIR = os.getenv("MV_JOB_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs")
 
-def apply_json_profiles_to_prompt(base_prompt, used_turntables, turntable_data):
-    """JSON 프로필을 프롬프트에 강력하게 주입"""
-    if not used_turntables or not turntable_data:
-        return base_prompt
-    
-    character_profiles = []
-    location_profiles = []
-    object_profiles = []
-    
-    for tt_ref in used_turntables:
-        found = False
-        # 캐릭터
-        if 'characters' in turntable_data:
-            for item in turntable_data['characters']:
-                if item.get('id') == tt_ref:
-                    name = item.get('name_en', item.get('name', 'Character'))
-                    if 'json_profile' in item:
-                        detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
-                        if detailed:
-                            # 캐릭터 이름과 상세 스펙을 묶어서 전달
-                            character_profiles.append(f"({name}: {detailed})")
-                    found = True
-                    break
-        if found: continue
-
-        # 장소
-        if 'locations' in turntable_data:
-            for item in turntable_data['locations']:
-                if item.get('id') == tt_ref:
-                    if 'json_profile' in item:
-                        detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
-                        if detailed:
-                            location_profiles.append(detailed)
-                    found = True
-                    break
-        if found: continue
-        
-        # 소품/차량
-        for cat in ['props', 'vehicles']:
-            if cat in turntable_data:
-                for item in turntable_data[cat]:
-                    if item.get('id') == tt_ref:
-                         if 'json_profile' in item:
-                            detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
-                            if detailed:
-                                object_profiles.append(detailed)
-                         break
-
-    # 프롬프트 조합: 캐릭터 스펙 -> 장소 스펙 -> 액션(기본 프롬프트)
-    final_parts = []
-    
-    if character_profiles:
-        final_parts.append("**CHARACTERS:** " + ", ".join(character_profiles))
-    
-    if location_profiles:
-        final_parts.append("**LOCATION:** " + " | ".join(location_profiles))
-        
-    if object_profiles:
-        final_parts.append("**OBJECTS:** " + ", ".join(object_profiles))
-        
-    final_parts.append("**SCENE ACTION:** " + base_prompt)
-    
-    return "\n".join(final_parts)
+@st.cache_resource
+def get_job_manifest(project):
+    """세션 간 공유 프로젝트 매니페스트 (같은 기획안을 연 세션끼리 같은 객체)"""
+    return JobManifest(JOB_DIR, project)
 
-# ------------------------------------------------------------------
-# 내보내기 함수들
-# ------------------------------------------------------------------
-def create_json_export(plan_data):
-    return json.dumps(plan_data, ensure_ascii=False, indent=2)
-
-def create_text_export(plan_data):
-    """텍스트 형식 내보내기"""
-    lines = []
-    lines.append("=" * 80)
-    lines.append("AI MV DIRECTOR PRO - 프로젝트 기획서")
-    lines.append("=" * 80)
-    lines.append(f"생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("")
-    
-    lines.append(f"프로젝트: {plan_data.get('project_title', '')}")
-    lines.append(f"Project: {plan_data.get('project_title_en', '')}")
-    lines.append(f"컨셉: {plan_data.get('logline', '')}")
-    lines.append(f"Concept: {plan_data.get('logline_en', '')}")
-    lines.append("")
-    
-    if 'director_vision' in plan_data:
-        lines.append("-" * 40)
-        lines.append("DIRECTOR'S VISION")
-        lines.append("-" * 40)
-        lines.append(plan_data['director_vision'])
-        lines.append("")
-    
-    if 'youtube' in plan_data:
-        yt = plan_data['youtube']
-        lines.append("-" * 40)
-        lines.append("YOUTUBE")
-        lines.append("-" * 40)
-        lines.append(f"제목: {yt.get('title', '')}")
-        lines.append(f"설명:\n{yt.get('description', '')}")
-        lines.append(f"태그: {yt.get('hashtags', '')}")
-        lines.append("")
-    
-    if 'music' in plan_data:
-        music = plan_data['music']
-        lines.append("-" * 40)
-        lines.append("MUSIC / SUNO AI")
-        lines.append("-" * 40)
-        lines.append(f"스타일: {music.get('style', '')}")
-        lines.append("")
-        lines.append("[STYLE TAGS]")
-        lines.append(music.get('style_tags', ''))
-        lines.append("")
-        lines.append("[VOCAL DIRECTION]")
-        lines.append(music.get('vocal_direction', ''))
-        lines.append("")
-        lines.append("[INSTRUMENTATION]")
-        lines.append(music.get('instrumentation', ''))
-        lines.append("")
-        lines.append("[PRODUCTION]")
-        lines.append(music.get('production', ''))
-        lines.append("")
-        lines.append("[SONG STRUCTURE]")
-        lines.append(music.get('song_structure', ''))
-        lines.append("")
-        lines.append("[COMPLETE LYRICS]")
-        lines.append(music.get('lyrics_full', ''))
-        lines.append("")
-    
-    if 'turntable' in plan_data:
-        tt = plan_data['turntable']
-        lines.append("-" * 40)
-        lines.append("TURNTABLE SHEETS")
-        lines.append("-" * 40)
-        
-        for cat in ['characters', 'locations', 'props', 'vehicles']:
-            if cat in tt and tt[cat]:
-                lines.append(f"\n[{cat.upper()}]")
-                for item in tt[cat]:
-                    lines.append(f"\n  {item.get('name', '')} ({item.get('id', '')})")
-                    if 'views' in item:
-                        for view in item['views']:
-                            lines.append(f"    - {view.get('view_type', '')}: {view.get('prompt', '')}")
-        lines.append("")
-    
-    if 'scenes' in plan_data:
-        lines.append("-" * 40)
-        lines.append("STORYBOARD")
-        lines.append("-" * 40)
-        for scene in plan_data['scenes']:
-            lines.append(f"\n[SCENE {scene.get('scene_num', '')}] {scene.get('timecode', '')}")
-            lines.append(f"  액션: {scene.get('action', '')}")
-            if 'camera' in scene and isinstance(scene['camera'], dict):
-                cam = scene['camera']
-                lines.append(f"  카메라: {cam.get('shot_type', '')} / {cam.get('movement', '')} / {cam.get('lens', '')}")
-            lines.append(f"  이미지 프롬프트: {scene.get('image_prompt', '')}")
-            lines.append(f"  비디오 프롬프트: {scene.get('video_prompt', '')}")
-    
-    return "\n".join(lines)
-
-def create_html_export(plan_data):
-    """HTML 형식 내보내기"""
-    html = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{plan_data.get('project_title', 'MV Project')}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Pretendard', -apple-system, sans-serif; background: #0a0a0a; color: #fff; line-height: 1.6; }}
-        .container {{ max-width: 1200px; margin: 0 auto; padding: 40px 20px; }}
-        h1 {{ font-size: 3em; margin-bottom: 10px; background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }}
-        h2 {{ font-size: 1.8em; margin: 40px 0 20px; padding-bottom: 10px; border-bottom: 2px solid #333; }}
-        h3 {{ font-size: 1.3em; margin: 20px 0 10px; color: #667eea; }}
-        .section {{ background: #111; border-radius: 12px; padding: 25px; margin: 20px 0; border: 1px solid #222; }}
-        .meta {{ color: #888; font-size: 0.9em; margin-bottom: 30px; }}
-        .prompt-box {{ background: #1a1a2e; border-left: 4px solid #667eea; padding: 15px; margin: 10px 0; border-radius: 0 8px 8px 0; font-family: monospace; font-size: 0.9em; white-space: pre-wrap; word-break: break-all; }}
-        .scene {{ background: #0f0f1a; border-radius: 8px; padding: 20px; margin: 15px 0; border: 1px solid #1a1a2e; }}
-        .scene-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px; }}
-        .scene-num {{ background: linear-gradient(135deg, #667eea, #764ba2); padding: 5px 15px; border-radius: 20px; font-weight: bold; }}
-        .timecode {{ color: #888; font-family: monospace; }}
-        .tag {{ display: inline-block; background: #222; padding: 4px 12px; border-radius: 15px; margin: 4px; font-size: 0.85em; }}
-        .turntable {{ background: #1a1a0a; border: 2px solid #ffd700; border-radius: 12px; padding: 20px; margin: 15px 0; }}
-        .copy-btn {{ background: #667eea; color: white; border: none; padding: 8px 16px; border-radius: 5px; cursor: pointer; font-size: 0.85em; }}
-        .copy-btn:hover {{ background: #764ba2; }}
-        .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }}
-        pre {{ white-space: pre-wrap; word-wrap: break-word; }}
-        .suno-section {{ background: #1a0a1a; border: 1px solid #722ed1; border-radius: 8px; padding: 15px; margin: 10px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎬 {plan_data.get('project_title', '')}</h1>
-        <p class="meta">{plan_data.get('project_title_en', '')} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
-        
-        <div class="section">
-            <h2>📋 프로젝트 개요</h2>
-            <p><strong>컨셉:</strong> {plan_data.get('logline', '')}</p>
-            <p><strong>Concept:</strong> {plan_data.get('logline_en', '')}</p>
-            <p><strong>Director's Vision:</strong> {plan_data.get('director_vision', '')}</p>
-        </div>
-"""
-    
-    # YouTube
-    if 'youtube' in plan_data:
-        yt = plan_data['youtube']
-        html += f"""
-        <div class="section">
-            <h2>📺 YouTube</h2>
-            <h3>제목</h3>
-            <div class="prompt-box">{yt.get('title', '')}</div>
-            <h3>설명</h3>
-            <div class="prompt-box">{yt.get('description', '')}</div>
-            <h3>해시태그</h3>
-            <div class="prompt-box">{yt.get('hashtags', '')}</div>
-        </div>
-"""
-    
-    # Music
-    if 'music' in plan_data:
-        music = plan_data['music']
-        html += f"""
-        <div class="section">
-            <h2>🎵 Music / Suno AI</h2>
-            <div class="suno-section">
-                <h3>Style Tags</h3>
-                <div class="prompt-box">{music.get('style_tags', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>Vocal Direction</h3>
-                <div class="prompt-box">{music.get('vocal_direction', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>Instrumentation</h3>
-                <div class="prompt-box">{music.get('instrumentation', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>Production</h3>
-                <div class="prompt-box">{music.get('production', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>Song Structure</h3>
-                <div class="prompt-box">{music.get('song_structure', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>Complete Lyrics</h3>
-                <div class="prompt-box">{music.get('lyrics_full', '')}</div>
-            </div>
-            <div class="suno-section">
-                <h3>🎹 Complete Suno Prompt (Copy All)</h3>
-                <div class="prompt-box">{music.get('suno_prompt_combined', '')}</div>
-            </div>
-        </div>
-"""
-    
-    # Turntable
-    if 'turntable' in plan:
-        tt = plan_data['turntable']
-        html += """
-        <div class="section">
-            <h2>🎭 Turntable Reference Sheets</h2>
-"""
-        for cat in ['characters', 'locations', 'props', 'vehicles']:
-            if cat in tt and tt[cat]:
-                html += f"<h3>{cat.upper()}</h3><div class='grid'>"
-                for item in tt[cat]:
-                    html += f"""
-                    <div class="turntable">
-                        <h4>{item.get('name', '')} ({item.get('id', '')})</h4>
-"""
-                    if 'views' in item:
-                        for view in item['views']:
-                            html += f"""
-                        <p><strong>{view.get('view_type', '')}:</strong></p>
-                        <div class="prompt-box">{view.get('prompt', '')}</div>
-"""
-                    html += "</div>"
-                html += "</div>"
-        html += "</div>"
-    
-    # Scenes
-    if 'scenes' in plan_data:
-        html += """
-        <div class="section">
-            <h2>🎬 Storyboard</h2>
-"""
-        for scene in plan_data['scenes']:
-            camera_info = ""
-            if 'camera' in scene and isinstance(scene['camera'], dict):
-                cam = scene['camera']
-                camera_info = f"{cam.get('shot_type', '')} | {cam.get('movement', '')} | {cam.get('lens', '')} | {cam.get('angle', '')}"
-            
-            html += f"""
-            <div class="scene">
-                <div class="scene-header">
-                    <span class="scene-num">Scene {scene.get('scene_num', '')}</span>
-                    <span class="timecode">{scene.get('timecode', '')}</span>
-                </div>
-                <p><strong>Action:</strong> {scene.get('action', '')}</p>
-                <p><strong>Camera:</strong> {camera_info}</p>
-                <p><strong>Emotion:</strong> {scene.get('emotion', '')}</p>
-                <h4>Image Prompt:</h4>
-                <div class="prompt-box">{scene.get('image_prompt', '')}</div>
-                <h4>Video Prompt:</h4>
-                <div class="prompt-box">{scene.get('video_prompt', '')}</div>
-            </div>
-"""
-        html += "</div>"
-    
-    html += """
-    </div>
-    <script>
-        document.querySelectorAll('.prompt-box').forEach(box => {{
-            box.style.cursor = 'pointer';
-            box.title = 'Click to copy';
-            box.addEventListener('click', () => {{
-                navigator.clipboard.writeText(box.textContent);
-                const original = box.style.borderColor;
-                box.style.borderColor = '#00ff00';
-                setTimeout(() => box.style.borderColor = original, 500);
-            }});
-        }});
-    </script>
-</body>
-</html>"""
-    return html
+def current_job_manifest(plan_data):
+    """현재 plan_data의 매니페스트 (프로젝트 ID는 plan_data 교체 시에만 다시 계산)"""
+    cached = st.session_state.get('job_project')
+    if cached is None or cached[0] is not plan_data:
+        cached = (plan_data, project_id(plan_data))
+        st.session_state['job_project'] = cached
+    return get_job_manifest(cached[1])
 
 # ------------------------------------------------------------------
-# 이미지 생성 (Segmind 추가)
+# 코어 호출 래퍼 (로그/진행률/알림을 Streamlit으로 연결)
 # ------------------------------------------------------------------
-def generate_image_segmind(prompt, width, height, api_key):
-    """Segmind API를 사용한 이미지 생성"""
-    if not api_key:
-        add_image_log("Segmind: API 키 없음", "error")
-        return None
-
-    # SDXL 1.0 모델 엔드포인트
-    url = "https://api.segmind.com/v1/sdxl1.0-txt2img"
-    add_image_log("Segmind (SDXL 1.0) 모델 요청 중...", "model")
-
-    payload = {
-        "prompt": prompt,
-        "negative_prompt": "ugly, tiling, poorly drawn hands, poorly drawn feet, poorly drawn face, out of frame, extra limbs, disfigured, deformed, body out of frame, blurry, bad anatomy, blurred, watermark, grainy, signature, cut off, draft",
-        "style": "cinematic",
-        "samples": 1,
-        "scheduler": "UniPC",
-        "num_inference_steps": 25,
-        "guidance_scale": 7.5,
-        "seed": random.randint(1, 10000000),
-        "img_width": width,
-        "img_height": height,
-        "base64": False
-    }
+def notify_streamlit(message, level="info"):
+    """코어 알림 → 경고는 st.warning, 나머지는 토스트"""
+    if level == "warn":
+        st.warning(message)
+    else:
+        st.toast(message)
 
-    headers = {'x-api-key': api_key}
+def image_job(prompt, width, height, provider, max_retries=3, palette=None, seed=None):
+    """작업 스레드에서 돌릴 이미지 생성 함수 + 로그 대기열 (세션 값은 여기서 미리 읽음) → (함수, CallbackQueue)
 
+    함수는 단계 제너레이터를 돌려줌 (스케줄러 제출용, 동기로 실행하려면 run_steps)
+    """
+    queue = CallbackQueue()
+    engine = resolve_image_engine(provider)
+    sg_key = segmind_key or get_api_key("SEGMIND_API_KEY")
+    quality = active_quality_gate()
+
+    def run():
+        # 단계 제너레이터 → 스케줄러가 요청 1건마다 작업자를 놓음 (재시도 간격 동안 다른 작업 실행)
+        return image_generation_steps(prompt, width, height, engine, max_retries, segmind_key=sg_key,
+                                      log=queue.log, event=queue.event, seed=seed, flight=get_single_flight(),
+                                      quality=quality, palette=palette)
+    return run, queue
+
+def try_generate_image_with_fallback(prompt, width, height, provider, max_retries=3, palette=None, seed=None):
+    """이미지 생성 (Segmind 키 + 이미지 로그 + 품질 게이트 연결) → (이미지, 실제 엔진)
+
+    공유 작업 풀에 "interactive"로 제출 → 일괄 생성 중에도 다음 빈자리에서 먼저 처리
+    palette: 장소 color_palette 색 목록 (CompiledPlan.scene_palette / turntable_palette)
+    seed: 중복 재생성처럼 새 시드를 지정할 때 (없으면 요청마다 무작위)
+    """
+    run, queue = image_job(prompt, width, height, provider, max_retries, palette, seed)
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=60)
-        if response.status_code == 200:
-            img = Image.open(BytesIO(response.content))
-            add_image_log(f"Segmind SDXL 1.0 성공! 크기: {img.size[0]}x{img.size[1]}", "success")
-            return img
-        else:
-            add_image_log(f"Segmind 실패: HTTP {response.status_code}", "error")
-    except Exception as e:
-        add_image_log(f"Segmind 예외: {str(e)[:80]}", "error")
-    return None
-
-def try_generate_image_with_fallback(prompt, width, height, provider, max_retries=3):
-    """이미지 생성 시도 및 폴백 로직 (Pollinations 모델 세분화 적용)"""
-    
-    # 프롬프트 보정 (퀄리티 향상)
-    enhanced = f"{prompt}, highly detailed, 8k resolution, cinematic lighting"
-    if "Anime" in provider:
-        enhanced += ", anime style, studio ghibli, makoto shinkai"
-    elif "Realism" in provider:
-        enhanced += ", photorealistic, raw photo, dslr, soft lighting"
-        
-    add_image_log(f"이미지 생성 시작 | 선택 엔진: {provider} | 크기: {width}x{height}", "info")
-
-    # 1. Segmind 시도
-    if "Segmind" in provider:
-        add_image_log("1단계: Segmind (SDXL) 시도", "info")
-        sg_api_key = globals().get('segmind_key') or get_api_key("SEGMIND_API_KEY")
-        if sg_api_key:
-            img = generate_image_segmind(enhanced, width, height, sg_api_key)
-            if img:
-                return img, "Segmind (SDXL 1.0)"
-            add_image_log("Segmind 실패 → Pollinations 폴백 진행", "warn")
-        else:
-            add_image_log("Segmind API 키 없음 → Pollinations 자동 전환", "warn")
-
-    # 2. Pollinations 모델 매핑 (핵심 수정 부분)
-    # provider 이름에 따라 최적 모델 파라미터 설정
-    seed = random.randint(0, 999999)
-    base_url = "https://image.pollinations.ai/prompt/"
-    encoded_prompt = urllib.parse.quote(enhanced)
-    
-    # 모델별 URL 파라미터 설정
-    if "Realism" in provider:
-        poll_model = "flux-realism" # 실사 전용
-    elif "Anime" in provider:
-        poll_model = "flux-anime"   # 애니 전용
-    elif "3D" in provider:
-        poll_model = "flux-3d"      # 3D 전용
-    elif "Dark" in provider:
-        poll_model = "any-dark"     # 다크 판타지 전용
-    elif "Turbo" in provider:
-        poll_model = "turbo"        # 속도 전용
-    else:
-        poll_model = "flux"         # 기본
-        
-    url = f"{base_url}{encoded_prompt}?width={width}&height={height}&model={poll_model}&nologo=true&seed={seed}&enhance=true"
-
-    is_fallback = "Segmind" in provider
-    log_prefix = "폴백 → " if is_fallback else ""
-    add_image_log(f"{log_prefix}Pollinations [{poll_model}] 모델 요청", "model")
-
-    # 재시도 로직
-    for attempt in range(max_retries):
-        try:
-            # 타임아웃을 넉넉히 설정 (고화질 모델은 시간 걸림)
-            response = requests.get(url, timeout=60)
-            
-            if response.status_code == 200 and len(response.content) > 1000:
-                img = Image.open(BytesIO(response.content))
-                if img.size[0] > 100:
-                    actual_provider = f"Pollinations {poll_model}"
-                    if is_fallback:
-                        actual_provider += " (폴백)"
-                    add_image_log(f"생성 성공! ({poll_model})", "success")
-                    return img, actual_provider
-            else:
-                add_image_log(f"응답 오류 ({attempt+1}/{max_retries}): {response.status_code}", "warn")
-                
-        except Exception as e:
-            add_image_log(f"생성 실패 ({attempt+1}/{max_retries}): {str(e)[:30]}", "error")
-            
-        if attempt < max_retries - 1:
-            time.sleep(1.5)
-
-    add_image_log("모든 이미지 생성 시도 실패", "error")
-    return None, None
-
-def get_preview_size(width, height):
-    """프리뷰용 저화질 사이즈 계산 (원본의 50% 또는 최대 512px)"""
-    scale = min(512 / max(width, height), 0.5)
-    preview_w = max(256, int(width * scale))
-    preview_h = max(256, int(height * scale))
-    # 8의 배수로 맞춤 (이미지 생성 모델 요구사항)
-    preview_w = (preview_w // 8) * 8
-    preview_h = (preview_h // 8) * 8
-    return preview_w, preview_h
+        return get_generation_scheduler().submit(run, priority="interactive").result()
+    finally:
+        queue.replay(add_image_log, record_image_event)
+
+def try_generate_variations(prompt, width, height, provider, max_retries=2, palette=None):
+    """씬 변형 후보 묶음 생성 (Segmind 키 + 이미지 로그 + 품질 게이트 연결) → VariationSet"""
+    return generate_variations(prompt, width, height, resolve_image_engine(provider),
+                               st.session_state.get('variation_count', DEFAULT_VARIATIONS), max_retries,
+                               segmind_key=segmind_key or get_api_key("SEGMIND_API_KEY"),
+                               log=add_image_log, event=record_image_event, quality=active_quality_gate(),
+                               palette=palette, scheduler=get_generation_scheduler())
 
 def generate_all_preview_images(plan_data, img_width, img_height, provider, use_json=True, max_retries=2):
-    """모든 씬의 프리뷰 이미지를 자동 생성"""
-    if not plan_data:
+    """모든 씬의 프리뷰 이미지를 자동 생성 (진행률 표시 + 세션에 저장)"""
+    if not plan_data or not plan_data.get('scenes'):
         return
 
-    scenes = plan_data.get('scenes', [])
-    if not scenes:
-        return
-
-    # 프리뷰용 저화질 사이즈
-    preview_w, preview_h = get_preview_size(img_width, img_height)
-
     # 진행 상태 표시
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    generated_count = 0
-    total_scenes = len(scenes)
-
-    for idx, scene in enumerate(scenes):
-        scene_num = scene.get('scene_num', idx + 1)
-        status_text.text(f"🎨 프리뷰 이미지 생성 중... ({idx + 1}/{total_scenes}) - Scene {scene_num}")
-
-        # 이미지 프롬프트 가져오기
-        base_prompt = scene.get('image_prompt', '')
-        if not base_prompt:
-            continue
-
-        # JSON 프로필 적용
-        if use_json and 'used_turntables' in scene:
-            final_prompt = apply_json_profiles_to_prompt(
-                base_prompt,
-                scene['used_turntables'],
-                plan_data.get('turntable', {})
-            )
-        else:
-            final_prompt = base_prompt
-
-        # 프리뷰 이미지 생성
-        img, actual_provider = try_generate_image_with_fallback(final_prompt, preview_w, preview_h, provider, max_retries)
-
-        if img:
-            if 'generated_images' not in st.session_state:
-                st.session_state['generated_images'] = {}
-            st.session_state['generated_images'][scene_num] = img
-            if 'image_providers' not in st.session_state:
-                st.session_state['image_providers'] = {}
-            st.session_state['image_providers'][f"scene_{scene_num}"] = actual_provider
-            generated_count += 1
-
-        progress_bar.progress((idx + 1) / total_scenes)
-        time.sleep(0.3)  # API 부하 방지
+    def on_progress(done, total, message=""):
+        progress_bar.progress(done / total)
+        if message:
+            status_text.text(message)
+
+    def on_image(scene_num, img, actual_provider):
+        st.session_state.setdefault('generated_images', {})[scene_num] = img
+        st.session_state.setdefault('image_providers', {})[f"scene_{scene_num}"] = actual_provider
+
+    generated_count = generate_preview_images(
+        plan_data, img_width, img_height, provider, use_json, max_retries,
+        compiled=get_compiled_plan(plan_data), on_image=on_image,
+        segmind_key=segmind_key or get_api_key("SEGMIND_API_KEY"),
+        log=add_image_log, progress=on_progress, event=record_image_event,
+        pick_provider=(lambda: resolve_image_engine(provider)) if provider == AUTO_ENGINE else None,
+        flight=get_single_flight(), quality=active_quality_gate(), scheduler=get_generation_scheduler()
+    )
 
     progress_bar.empty()
     status_text.empty()
 
     if generated_count > 0:
+        preview_w, preview_h = get_preview_size(img_width, img_height)
         st.toast(f"✅ {generated_count}개 프리뷰 이미지 생성 완료! ({preview_w}x{preview_h})")
 
     return generated_count
 
-# ------------------------------------------------------------------
-# API 생성
-# ------------------------------------------------------------------
-def generate_with_fallback(prompt, api_key, model_name):
-    """원본 작동 버전 기반 - 단순화"""
-    genai.configure(api_key=api_key)
-    models_to_try = [model_name, "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"]
-
-    for model in models_to_try:
-        try:
-            gen_model = genai.GenerativeModel(model)
-            response = gen_model.generate_content(prompt, generation_config={"temperature": 0.8, "max_output_tokens": 8192})
-            return response.text, model
-        except Exception as e:
-            st.toast(f"⚠️ {model} 실패: {str(e)[:30]}...")
-            time.sleep(1)
-    raise Exception("All models failed")
-
 def generate_plan_auto(topic, api_key, model_name, scene_count, options, genre, visual_style, music_genre, use_json, expert_mode, seconds_per_scene):
-    """원본 작동 버전 기반"""
-    for attempt in range(3):
-        try:
-            prompt = get_system_prompt(topic, scene_count, options, genre, visual_style, music_genre, use_json, expert_mode, seconds_per_scene)
-            response_text, used_model = generate_with_fallback(prompt, api_key, model_name)
-
-            cleaned = clean_json_text(response_text)
-            plan_data = json.loads(cleaned)
-            st.toast(f"✅ 생성 완료 ({used_model})")
-            return plan_data
-        except json.JSONDecodeError as e:
-            if attempt < 2:
-                st.warning(f"JSON 파싱 재시도 중... ({attempt+1}/3) - {str(e)[:50]}")
-                time.sleep(2)
-            else:
-                st.error(f"JSON 파싱 실패: {str(e)}")
-                with st.expander("🔍 생성된 원본 응답 확인"):
-                    st.code(response_text[:3000] + "..." if len(response_text) > 3000 else response_text)
-                return None
-        except Exception as e:
-            if attempt < 2:
-                st.warning(f"재시도 중... ({attempt+1}/3) - {str(e)[:100]}")
-                time.sleep(2)
-            else:
-                st.error(f"생성 실패: {e}")
-                if response_text:
-                    with st.expander("🔍 원본 응답 확인"):
-                        st.code(response_text[:2000] if len(response_text) > 2000 else response_text)
-                return None
-    return None
+    """기획안 생성 (실패 시 오류와 원본 응답 표시 후 None)"""
+    try:
+        return generate_plan(topic, api_key, model_name, scene_count, options, genre, visual_style, music_genre,
+                             use_json, expert_mode, seconds_per_scene, notify=notify_streamlit,
+                             flight=get_single_flight())
+    except PlanGenerationError as e:
+        st.error(str(e))
+        if e.raw_text:
+            with st.expander("🔍 생성된 원본 응답 확인"):
+                st.code(e.raw_text[:3000] + "..." if len(e.raw_text) > 3000 else e.raw_text)
+        return None
 
 # ------------------------------------------------------------------
 # 메인 실행
@@ -2314,6 +1289,7 @@ if submit_btn:
                     )
                 
                 if st.session_state['plan_data']:
+                    remember_planned_topic(topic, st.session_state['plan_data'])
                     st.success("✅ 기획안 생성 완료!")
 
                     # 자동 이미지 생성이 켜져 있으면 프리뷰 이미지 생성
@@ -2363,6 +1339,7 @@ if st.session_state.get('show_manual') and 'manual_prompt' in st.session_state:
                 cleaned = clean_json_text(manual_result)
                 st.session_state['plan_data'] = json.loads(cleaned)
                 st.session_state['show_manual'] = False
+                remember_planned_topic(topic, st.session_state['plan_data'])
                 st.success("✅ 적용 완료!")
 
                 # 자동 이미지 생성이 켜져 있으면 프리뷰 이미지 생성
@@ -2383,14 +1360,584 @@ if st.session_state.get('show_manual') and 'manual_prompt' in st.session_state:
             except json.JSONDecodeError as e:
                 st.error(f"JSON 파싱 오류: {e}")
 
+# ------------------------------------------------------------------
+# 결과 표시 프래그먼트 (클릭한 영역만 재실행)
+# ------------------------------------------------------------------
+
+def store_scene_image(scene_num, img, actual_provider):
+    """씬 이미지와 생성 모델을 세션에 저장"""
+    st.session_state.setdefault('generated_images', {})[scene_num] = img
+    st.session_state.setdefault('image_providers', {})[f"scene_{scene_num}"] = actual_provider
+
+def store_turntable_image(tt_key, img, actual_provider):
+    """턴테이블 이미지와 생성 모델을 세션에 저장"""
+    st.session_state.setdefault('turntable_images', {})[tt_key] = img
+    st.session_state.setdefault('image_providers', {})[f"tt_{tt_key}"] = actual_provider
+
+# --- 같은 프롬프트 재사용 / 거의 같은 이미지 검사 (키 = image_providers와 같은 scene_N / tt_KEY) ---
+
+def project_image_requests(compiled, use_json, img_width, img_height):
+    """프로젝트의 모든 이미지 요청 {키: (최종 프롬프트, 가로, 세로)}"""
+    requests = {f"scene_{scene.get('scene_num', idx + 1)}": (compiled.scene_prompt(idx, use_json), img_width, img_height)
+                for idx, scene in enumerate(compiled.scenes)}
+    for tt_key in compiled.turntable_views:
+        requests[f"tt_{tt_key}"] = (compiled.turntable_prompt(tt_key, use_json), 1024, 1024)
+    return requests
+
+def project_images():
+    """세션의 씬 + 턴테이블 이미지 {키: 이미지}"""
+    images = {f"scene_{num}": img for num, img in st.session_state.get('generated_images', {}).items()}
+    images.update({f"tt_{key}": img for key, img in st.session_state.get('turntable_images', {}).items()})
+    return images
+
+def reuse_identical_image(key, requests):
+    """최종 프롬프트와 크기가 완전히 같은 다른 항목의 이미지 → (이미지, 실제 엔진) / 없으면 (None, None)"""
+    images = project_images()
+    other = find_reusable(key, requests, images)
+    if other is None:
+        return None, None
+    add_image_log(f"{key}: {other}와 프롬프트가 같아 이미지 재사용 (생성 생략)", "info")
+    return images[other], st.session_state.get('image_providers', {}).get(other)
+
+# 매니페스트에 함께 저장하는 요청 설정 (세션 키 → 기본값)
+MANIFEST_SETTINGS = {'use_json_profiles': True, 'image_width': 1024, 'image_height': 576}
+
+def restore_from_manifest(plan):
+    """plan_data가 바뀌면 1회: 매니페스트의 요청 설정과 완료 이미지를 세션에 복원 (네트워크 요청 없음) → 복원 개수
+
+    이미지는 저장된 해시 그대로 키별 복원 → 다른 크기/JSON 설정으로 만든 프로젝트도 새 세션에서 복원
+    """
+    if st.session_state.get('restored_plan') is plan:
+        return 0
+    st.session_state['restored_plan'] = plan
+    compiled = get_compiled_plan(plan)
+    manifest = current_job_manifest(plan)
+    for name, value in manifest.settings.items():
+        if name in MANIFEST_SETTINGS:
+            st.session_state[name] = value
+    restored = manifest.restore()
+    scene_nums = {f"scene_{scene.get('scene_num', idx + 1)}": scene.get('scene_num', idx + 1)
+                  for idx, scene in enumerate(compiled.scenes)}
+    for key, (img, actual_provider) in restored.items():
+        if key in scene_nums:
+            store_scene_image(scene_nums[key], img, actual_provider)
+        elif key.startswith("tt_"):
+            store_turntable_image(key[3:], img, actual_provider)
+    if restored:
+        add_image_log(f"매니페스트에서 이미지 {len(restored)}장 복원 (생성 요청 없음)", "success")
+    return len(restored)
+
+# --- 백그라운드 일괄 생성 (공유 작업 풀 + 매니페스트, 화면 반영은 작업 모니터 프래그먼트에서) ---
+
+def store_image_by_key(key, img, actual_provider):
+    """scene_N / tt_KEY 키로 세션에 저장"""
+    kind, target = st.session_state['image_job_targets'][key]
+    (store_scene_image if kind == "scene" else store_turntable_image)(target, img, actual_provider)
+
+def start_background_batch(plan, requests, targets, make_job, resume):
+    """일괄 생성을 공유 작업 풀에 제출하고 바로 반환 (다른 버튼 클릭을 계속 처리)
+
+    targets {키: ("scene", 씬 번호) / ("tt", 턴테이블 키)} / make_job(키) → image_job 결과 (제출할 항목만 호출)
+    - 이미 세션에 같은 요청의 이미지가 있으면 제출하지 않고 재사용, 배치 안에서 같은 요청은 첫 항목만 제출
+    - 현재 페이지에 보이는 항목은 "on_screen", 나머지는 "backfill"
+    """
+    manifest = current_job_manifest(plan)
+    manifest.update_settings(**{name: st.session_state.get(name, default) for name, default in MANIFEST_SETTINGS.items()})
+    keys = manifest.todo(requests) if resume else list(requests)
+    st.session_state.setdefault('image_job_targets', {}).update(targets)
+    leaders, aliases, submit = {}, {}, {}
+    for key in keys:
+        img, actual_provider = reuse_identical_image(key, requests)
+        if img is not None:
+            manifest.record_done(key, requests[key], img, actual_provider)
+            store_image_by_key(key, img, actual_provider)
+        elif requests[key] in leaders:
+            aliases[key] = leaders[requests[key]]
+        else:
+            leaders[requests[key]] = key
+            submit[key] = requests[key]
+    jobs = {key: make_job(key) for key in submit}
+    visible = st.session_state.get('visible_image_keys', set())
+    futures = submit_batch(manifest, submit, lambda key: jobs[key][0](), get_generation_scheduler(),
+                           priority_of=lambda key: "on_screen" if key in visible else "backfill")
+    manifest.start(list(aliases), requests)
+    st.session_state.setdefault('image_job_aliases', {}).update(aliases)
+    st.session_state.setdefault('image_jobs', {}).update(futures)
+    st.session_state.setdefault('image_job_logs', {}).update({key: jobs[key][1] for key in futures})
+    st.session_state['image_job_requests'] = {**st.session_state.get('image_job_requests', {}), **requests}
+    st.session_state['image_job_total'] = st.session_state.get('image_job_total', 0) + len(futures) + len(aliases)
+    add_image_log(f"백그라운드 일괄 생성: {len(futures)}개 제출 (같은 요청 {len(aliases)}개는 결과 공유)", "info")
+
+def drain_background_jobs(plan):
+    """끝난 작업 결과를 세션에 반영 → 반영한 키 목록"""
+    jobs = st.session_state.get('image_jobs', {})
+    logs = st.session_state.get('image_job_logs', {})
+    aliases = st.session_state.get('image_job_aliases', {})
+    manifest = current_job_manifest(plan)
+    finished = []
+    for key, future in list(jobs.items()):
+        if not future.done():
+            continue
+        del jobs[key]
+        logs.pop(key).replay(add_image_log, record_image_event)
+        img, actual_provider = None, None
+        # 재시도 대기 중에 취소된 작업은 CancelledError로 끝남 (시작 전 취소와 같이 조용히 넘김)
+        if not future.cancelled() and not isinstance(future.exception(), CancelledError):
+            if future.exception() is not None:
+                add_image_log(f"{key}: 생성 오류 ({str(future.exception())[:80]})", "error")
+            else:
+                img, actual_provider = future.result()
+        followers = [alias for alias, leader in aliases.items() if leader == key]
+        for alias in followers:
+            del aliases[alias]
+            if img:
+                manifest.record_done(alias, st.session_state['image_job_requests'][alias], img, actual_provider)
+        if img:
+            for target in [key, *followers]:
+                store_image_by_key(target, img, actual_provider)
+                finished.append(target)
+    if not jobs:
+        st.session_state['image_job_total'] = 0
+    return finished
+
+def mark_visible(section, keys):
+    """섹션의 현재 페이지 항목 기록 + 대기 중인 일괄 작업이면 "on_screen"으로 승격"""
+    sections = st.session_state.setdefault('visible_sections', {})
+    sections[section] = set(keys)
+    st.session_state['visible_image_keys'] = set().union(*sections.values())
+    jobs = st.session_state.get('image_jobs')
+    if jobs:
+        get_generation_scheduler().promote([jobs[key] for key in keys if key in jobs], "on_screen")
+
+def cancel_background_jobs():
+    """실행 중이 아닌 일괄 작업 취소 (재시도 대기 포함, 매니페스트에는 pending으로 남아 이어서 생성 가능)"""
+    cancelled = get_generation_scheduler().cancel(list(st.session_state.get('image_jobs', {}).values()))
+    add_image_log(f"일괄 생성 중지: 대기 작업 {cancelled}개 취소", "warn")
+
+@st.fragment(run_every="1s")
+def render_background_jobs(plan):
+    """진행 중인 백그라운드 일괄 생성 상태 (1초마다 결과 반영, 보이는 항목이 끝나면 화면 갱신)"""
+    finished = drain_background_jobs(plan)
+    jobs = st.session_state.get('image_jobs', {})
+    if finished and (not jobs or set(finished) & st.session_state.get('visible_image_keys', set())):
+        st.rerun()
+    if not jobs:
+        return
+    total = max(st.session_state.get('image_job_total', 0), len(jobs))
+    stats = get_generation_scheduler().stats()
+    st.progress(1 - len(jobs) / total, text=f"⏳ 백그라운드 생성 {total - len(jobs)}/{total}")
+    waits = ", ".join(f"{name} {row['wait_p50_ms'] / 1000:.1f}s" for name, row in stats.items()
+                      if row['wait_p50_ms'] is not None)
+    st.caption(f"작업 풀 대기 {sum(row['queued'] for row in stats.values())} · 실행 "
+               f"{sum(row['running'] for row in stats.values())} · 대기 시간 p50: {waits or '-'}")
+    st.button("⏹️ 일괄 생성 중지", key="cancel_jobs", on_click=cancel_background_jobs)
+
+def render_batch_buttons(label, plan, requests, key_prefix):
+    """일괄 생성 버튼 + (완료되지 않은 항목이 있으면) 이어서 생성 버튼 → 누른 버튼 ("all" / "resume" / None)"""
+    running = set(st.session_state.get('image_jobs', {})) | set(st.session_state.get('image_job_aliases', {}))
+    if running & set(requests):
+        st.caption(f"⏳ 백그라운드 생성 중 ({len(running & set(requests))}개 남음) - 다른 씬의 📸는 바로 처리됩니다")
+        return None
+    counts = current_job_manifest(plan).counts(requests)
+    started = counts["done"] + counts["failed"] > 0
+    if not started or counts["done"] == len(requests):
+        return "all" if st.button(label, use_container_width=True, type="primary", key=f"gen_all_{key_prefix}") else None
+    col_all, col_resume = st.columns([3, 2])
+    with col_all:
+        clicked = st.button(label, use_container_width=True, type="primary", key=f"gen_all_{key_prefix}")
+    with col_resume:
+        resume = st.button(f"⏯️ 이어서 생성 (완료 {counts['done']}/{len(requests)})", use_container_width=True,
+                           key=f"resume_{key_prefix}", help=f"실패 {counts['failed']}개 · 대기 {counts['pending']}개만 생성")
+    return "all" if clicked else "resume" if resume else None
+
+def regenerate_flagged(keys, compiled, use_json, img_width, img_height, image_provider, max_retries):
+    """중복으로 표시된 항목만 새 시드로 다시 생성 → 다시 만든 개수"""
+    scene_index = {f"scene_{scene.get('scene_num', idx + 1)}": idx for idx, scene in enumerate(compiled.scenes)}
+    regenerated = 0
+    for key in keys:
+        seed = random.randint(0, 999999)
+        if key in scene_index:
+            idx = scene_index[key]
+            img, actual_provider = try_generate_image_with_fallback(
+                compiled.scene_prompt(idx, use_json), img_width, img_height, image_provider, max_retries,
+                palette=compiled.scene_palette(idx), seed=seed)
+            if img:
+                store_scene_image(compiled.scenes[idx].get('scene_num', idx + 1), img, actual_provider)
+                regenerated += 1
+        elif key.startswith("tt_") and key[3:] in compiled.turntable_views:
+            tt_key = key[3:]
+            img, actual_provider = try_generate_image_with_fallback(
+                compiled.turntable_prompt(tt_key, use_json), 1024, 1024, image_provider, max_retries,
+                palette=compiled.turntable_palette(tt_key), seed=seed)
+            if img:
+                store_turntable_image(tt_key, img, actual_provider)
+                regenerated += 1
+    return regenerated
+
+# --- 페이지 단위 표시 (긴 기획안에서 보이는 카드만 렌더링) ---
+PAGE_SIZE_OPTIONS = [5, 10, 20, 50]
+
+def paginate(total, page_size, page):
+    """0-based 페이지의 (start, end, page_count, page) 계산 (범위 밖 페이지는 보정)"""
+    page_count = max(1, -(-total // page_size))
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page_count, page
+
+def parse_timecode_seconds(text):
+    """'01:30', '1:02:03', '90' 형식 타임코드를 초로 변환 (실패 시 None)"""
+    parts = str(text).strip().split(':')
+    try:
+        values = [float(p) for p in parts]
+    except ValueError:
+        return None
+    seconds = 0.0
+    for v in values:
+        seconds = seconds * 60 + v
+    return seconds
+
+def find_scene_index(scenes, query):
+    """씬 번호(예: 12) 또는 타임코드(예: 01:30)로 씬 인덱스 검색"""
+    query = str(query).strip()
+    if not query:
+        return None
+    if ':' in query:
+        target = parse_timecode_seconds(query)
+        if target is None:
+            return None
+        found = None
+        for idx, scene in enumerate(scenes):
+            start = parse_timecode_seconds(str(scene.get('timecode', '')).split('-')[0])
+            if start is not None and start <= target:
+                found = idx
+        return found
+    for idx, scene in enumerate(scenes):
+        if str(scene.get('scene_num', idx + 1)) == query.lstrip('#'):
+            return idx
+    return None
+
+def find_turntable_index(entries, query):
+    """턴테이블 ID 또는 이름(부분 일치)으로 아이템 인덱스 검색"""
+    query = str(query).strip().lower()
+    if not query:
+        return None
+    for idx, (_, item) in enumerate(entries):
+        if str(item.get('id', '')).lower() == query:
+            return idx
+    for idx, (_, item) in enumerate(entries):
+        if query in str(item.get('name', '')).lower() or query in str(item.get('name_en', '')).lower():
+            return idx
+    return None
+
+def _jump_to_page(prefix, page):
+    st.session_state[f"{prefix}_page"] = page
+
+def _jump_from_query(prefix, find_index):
+    idx = find_index(st.session_state.get(f"{prefix}_jump", ''))
+    st.session_state[f"{prefix}_jump_miss"] = idx is None
+    if idx is not None:
+        page_size = st.session_state.get(f"{prefix}_page_size", PAGE_SIZE_OPTIONS[1])
+        st.session_state[f"{prefix}_page"] = idx // page_size + 1
+
+def render_pager(prefix, total, find_index, jump_placeholder):
+    """페이지 크기 / 페이지 / 바로가기 컨트롤 → 현재 페이지 범위 (start, end)"""
+    page_key = f"{prefix}_page"
+    col_size, col_page, col_jump = st.columns([1, 1, 2])
+    with col_size:
+        page_size = st.selectbox("페이지 크기", PAGE_SIZE_OPTIONS, index=1, key=f"{prefix}_page_size")
+    _, _, page_count, page = paginate(total, page_size, st.session_state.get(page_key, 1) - 1)
+    # 페이지 크기 변경 등으로 범위를 벗어난 페이지 보정 (위젯 생성 전)
+    st.session_state[page_key] = page + 1
+    with col_page:
+        st.number_input(f"페이지 (총 {page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+    with col_jump:
+        st.text_input("바로가기", key=f"{prefix}_jump", placeholder=jump_placeholder,
+                      on_change=_jump_from_query, args=(prefix, find_index))
+        if st.session_state.get(f"{prefix}_jump_miss"):
+            st.caption("⚠️ 일치하는 항목이 없습니다")
+    start, end, _, _ = paginate(total, page_size, st.session_state[page_key] - 1)
+    st.caption(f"{start + 1}–{end} / {total}")
+    return start, end
+
+def render_thumbnail_strip(prefix, entries, page_size, columns=10):
+    """컴팩트 썸네일 스트립 (entries: [(라벨, 이미지 또는 None)]) - 클릭 시 해당 페이지로 이동"""
+    for row_start in range(0, len(entries), columns):
+        cols = st.columns(columns)
+        for offset, (label, img) in enumerate(entries[row_start:row_start + columns]):
+            idx = row_start + offset
+            with cols[offset]:
+                if img is not None:
+                    thumb = get_thumbnail_bytes(img)
+                    st.session_state['render_image_bytes'] = st.session_state.get('render_image_bytes', 0) + len(thumb)
+                    st.image(thumb, use_container_width=True)
+                st.button(label if img is not None else f"⬜ {label}", key=f"{prefix}_thumb_{idx}",
+                          on_click=_jump_to_page, args=(prefix, idx // page_size + 1),
+                          use_container_width=True)
+
+@measured_fragment("turntable")
+def render_turntable_section(plan, use_json, image_provider, max_retries):
+    """턴테이블 섹션 (일괄 생성 + 아이템별 카드)"""
+    st.markdown("## 🎭 Turntable Reference Sheets")
+    compiled = get_compiled_plan(plan)
+    
+    # 전체 생성 / 이어서 생성 버튼 (뷰마다 매니페스트에 기록)
+    requests = project_image_requests(compiled, use_json, st.session_state.get('image_width', 1024),
+                                      st.session_state.get('image_height', 576))
+    tt_requests = {key: request for key, request in requests.items() if key.startswith("tt_")}
+    mode = render_batch_buttons("🎨 모든 턴테이블 이미지 생성", plan, tt_requests, "tt") if tt_requests else None
+    if mode:
+        start_background_batch(plan, tt_requests, {key: ("tt", key[3:]) for key in tt_requests},
+                               lambda key: image_job(compiled.turntable_prompt(key[3:], use_json), 1024, 1024,
+                                                     image_provider, max_retries,
+                                                     palette=compiled.turntable_palette(key[3:])),
+                               resume=mode == "resume")
+        st.rerun()
+    
+    # 카테고리별 표시 (현재 페이지의 아이템만)
+    entries = [(cat, item) for cat in TURNTABLE_CATEGORIES for item in plan['turntable'].get(cat) or []]
+    if not entries:
+        return
+    start, end = render_pager("tt", len(entries), lambda q: find_turntable_index(entries, q), "ID 또는 이름 (예: char1)")
+    mark_visible("tt", [f"tt_{turntable_key(cat, item, view)}" for cat, item in entries[start:end]
+                        for view in item.get('views') or []])
+    current_cat = None
+    for cat, item in entries[start:end]:
+        if cat != current_cat:
+            current_cat = cat
+            st.markdown(f"### {'👤' if cat=='characters' else '🏠' if cat=='locations' else '📦' if cat=='props' else '🚗'} {cat.upper()}")
+        render_turntable_item(compiled, cat, item, use_json, image_provider, max_retries)
+
+@measured_fragment("turntable_item")
+def render_turntable_item(compiled, cat, item, use_json, image_provider, max_retries):
+    """턴테이블 아이템 카드 (뷰별 개별 생성)"""
+    st.markdown(f"<div class='turntable-box'>", unsafe_allow_html=True)
+    st.markdown(f"**{item.get('name', '')}** (ID: {item.get('id', '')})")
+    
+    if 'json_profile' in item:
+        with st.expander("📊 JSON 프로필"):
+            st.json(item['json_profile'])
+    
+    if item.get('views'):
+        cols = st.columns(min(len(item['views']), 4))
+        for idx, view in enumerate(item['views']):
+            with cols[idx % 4]:
+                view_type = view.get('view_type', '')
+                tt_key = turntable_key(cat, item, view)
+                
+                st.caption(view_type.upper())
+                
+                if tt_key in st.session_state.get('turntable_images', {}):
+                    show_image(st.session_state['turntable_images'][tt_key], use_container_width=True)
+                    tt_provider_key = f"tt_{tt_key}"
+                    if tt_provider_key in st.session_state.get('image_providers', {}):
+                        st.caption(f"🤖 {st.session_state['image_providers'][tt_provider_key]}")
+                else:
+                    if st.button(f"📸", key=f"g_{tt_key}"):
+                        img, actual_provider = reuse_identical_image(
+                            f"tt_{tt_key}", project_image_requests(compiled, use_json,
+                                                                   st.session_state.get('image_width', 1024),
+                                                                   st.session_state.get('image_height', 576)))
+                        if img is None:
+                            final_prompt = compiled.turntable_prompt(tt_key, use_json)
+                            with st.spinner("생성 중..."):
+                                img, actual_provider = try_generate_image_with_fallback(
+                                    final_prompt, 1024, 1024, image_provider, max_retries,
+                                    palette=compiled.turntable_palette(tt_key))
+                        if img:
+                            store_turntable_image(tt_key, img, actual_provider)
+                            rerun_fragment()
+                
+                with st.expander("프롬프트"):
+                    st.code(view.get('prompt', ''), language=None)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+@measured_fragment("storyboard")
+def render_storyboard_section(plan, use_json, img_width, img_height, image_provider, max_retries):
+    """스토리보드 섹션 (일괄 생성 + 씬별 카드)"""
+    st.markdown("## 🎬 Storyboard")
+    compiled = get_compiled_plan(plan)
+    
+    # 전체 씬 생성 / 이어서 생성 버튼 (씬마다 매니페스트에 기록)
+    requests = project_image_requests(compiled, use_json, img_width, img_height)
+    scene_index = {f"scene_{scene.get('scene_num', idx + 1)}": (idx, scene.get('scene_num', idx + 1))
+                   for idx, scene in enumerate(plan['scenes'])}
+    scene_requests = {key: requests[key] for key in scene_index}
+    mode = render_batch_buttons("🎨 모든 씬 이미지 생성", plan, scene_requests, "scenes") if scene_requests else None
+    if mode:
+        start_background_batch(plan, scene_requests, {key: ("scene", num) for key, (_, num) in scene_index.items()},
+                               lambda key: image_job(compiled.scene_prompt(scene_index[key][0], use_json), img_width,
+                                                     img_height, image_provider, max_retries,
+                                                     palette=compiled.scene_palette(scene_index[key][0])),
+                               resume=mode == "resume")
+        st.rerun()
+    
+    # 개별 씬 표시 (현재 페이지의 씬만)
+    scenes = plan.get('scenes', [])
+    if not scenes:
+        return
+    start, end = render_pager("sb", len(scenes), lambda q: find_scene_index(scenes, q), "씬 번호 또는 타임코드 (예: 12, 01:30)")
+    mark_visible("sb", [f"scene_{scenes[idx].get('scene_num', idx + 1)}" for idx in range(start, end)])
+
+    if st.toggle("🎞️ 썸네일 스트립", key="sb_thumb_strip"):
+        images = st.session_state.get('generated_images', {})
+        strip = []
+        for idx, scene in enumerate(scenes):
+            scene_num = scene.get('scene_num', idx + 1)
+            strip.append((f"#{scene_num}", images.get(scene_num)))
+        render_thumbnail_strip("sb", strip, st.session_state.get("sb_page_size", PAGE_SIZE_OPTIONS[1]))
+
+    render_duplicate_check(compiled, use_json, img_width, img_height, image_provider, max_retries)
+
+    for idx in range(start, end):
+        render_scene_card(compiled, idx, use_json, img_width, img_height, image_provider, max_retries)
+
+def render_duplicate_check(compiled, use_json, img_width, img_height, image_provider, max_retries):
+    """거의 같은 씬/턴테이블 이미지 묶음 표시 + 표시된 항목만 새 시드로 다시 생성"""
+    images = project_images()
+    if len(images) < 2:
+        return
+    with st.expander("🧬 중복 검사 (거의 같은 이미지)"):
+        max_distance = st.slider("허용 해밍 거리 (64비트 pHash)", 0, 16, DEFAULT_MAX_DISTANCE, key="dedup_distance",
+                                 help="두 이미지 해시의 다른 비트 수가 이 값 이하면 거의 같은 이미지로 표시")
+        pairs = find_near_duplicates(images, max_distance)
+        groups = duplicate_groups(pairs)
+        if not groups:
+            st.caption(f"✅ 이미지 {len(images)}장 중 거의 같은 이미지 없음")
+            return
+        distances = {}
+        for a, b, distance in pairs:
+            distances[b] = min(distance, distances.get(b, distance))
+        for group in groups:
+            cols = st.columns(min(len(group), 6))
+            for offset, key in enumerate(group[:6]):
+                with cols[offset]:
+                    st.image(get_thumbnail_bytes(images[key]), use_container_width=True)
+                    st.caption(f"{key} · 원본" if offset == 0 else f"🚩 {key} · 거리 {distances.get(key, '?')}")
+        flagged = flagged_keys(groups)
+        if st.button(f"🔁 표시된 {len(flagged)}개 새 시드로 다시 생성", key="dedup_regen", type="primary"):
+            with st.spinner(f"{len(flagged)}개 다시 생성 중..."):
+                regenerated = regenerate_flagged(flagged, compiled, use_json, img_width, img_height, image_provider,
+                                                 max_retries)
+            st.toast(f"🔁 {regenerated}/{len(flagged)}개 다시 생성")
+            st.rerun()
+
+def _pick_variation(scene_num, index):
+    variations = st.session_state['scene_variations'][scene_num]
+    store_scene_image(scene_num, *variations.pick(index))
+
+def _discard_variations(scene_num):
+    st.session_state['scene_variations'].pop(scene_num, None)
+
+def render_variation_grid(scene_num, variations, columns=4):
+    """변형 후보 썸네일 그리드 (⭐ = 현재 대표 컷, 클릭 시 대표 컷 교체)"""
+    st.caption(f"🎲 변형 후보 {len(variations)}장 · {variations.total_bytes() / 1024:.0f}KB")
+    for row_start in range(0, len(variations), columns):
+        cols = st.columns(columns)
+        for offset, candidate in enumerate(variations.candidates[row_start:row_start + columns]):
+            idx = row_start + offset
+            with cols[offset]:
+                thumb = get_thumbnail_bytes(candidate["image"], width=192)
+                st.session_state['render_image_bytes'] = st.session_state.get('render_image_bytes', 0) + len(thumb)
+                st.image(thumb, use_container_width=True)
+                is_hero = idx == variations.hero
+                st.button("⭐ 대표" if is_hero else f"#{idx + 1} 선택", key=f"v_pick_{scene_num}_{idx}",
+                          disabled=is_hero, help=f"seed {candidate['seed']} · {candidate['provider']}",
+                          on_click=_pick_variation, args=(scene_num, idx), use_container_width=True)
+    st.button("✅ 대표 컷 확정 (나머지 후보 정리)", key=f"v_done_{scene_num}",
+              on_click=_discard_variations, args=(scene_num,))
+
+@measured_fragment("scene")
+def render_scene_card(compiled, scene_idx, use_json, img_width, img_height, image_provider, max_retries):
+    """씬 카드 (이미지 생성/재생성 시 이 카드만 재실행)"""
+    scene = compiled.scenes[scene_idx]
+    scene_num = scene.get('scene_num', 0)
+    
+    st.markdown(f"<div class='scene-box'>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.markdown(f"**Scene {scene_num}** - {scene.get('timecode', '')}")
+        if 'act' in scene:
+            st.caption(f"Act {scene['act']} | {scene.get('beat', '')}")
+        if 'used_turntables' in scene and scene['used_turntables']:
+            for tt in scene['used_turntables']:
+                st.markdown(f"<span class='turntable-tag'>🎭 {tt}</span>", unsafe_allow_html=True)
+    with col2:
+        if scene_num in st.session_state.get('generated_images', {}):
+            if st.button("🔄", key=f"r_s_{scene_num}"):
+                del st.session_state['generated_images'][scene_num]
+                st.session_state.get('scene_variations', {}).pop(scene_num, None)
+                rerun_fragment()
+        if st.button("🎲", key=f"v_s_{scene_num}",
+                     help=f"변형 후보 {st.session_state.get('variation_count', DEFAULT_VARIATIONS)}장 생성 후 대표 컷 선택"):
+            final = compiled.scene_prompt(scene_idx, use_json)
+            with st.spinner("변형 후보 생성 중..."):
+                variations = try_generate_variations(final, img_width, img_height, image_provider, max_retries,
+                                                     palette=compiled.scene_palette(scene_idx))
+            if len(variations):
+                st.session_state.setdefault('scene_variations', {})[scene_num] = variations
+                store_scene_image(scene_num, *variations.hero_image())
+                rerun_fragment()
+            else:
+                st.warning("변형 후보를 만들지 못했습니다")
+
+    # 변형 후보 그리드 (대표 컷 선택은 저장된 후보만 사용 - 추가 생성 요청 없음)
+    variations = st.session_state.get('scene_variations', {}).get(scene_num)
+    if variations is not None:
+        render_variation_grid(scene_num, variations)
+
+    # 이미지 표시 또는 생성 버튼
+    if scene_num in st.session_state.get('generated_images', {}):
+        show_image(st.session_state['generated_images'][scene_num], use_container_width=True)
+        provider_key = f"scene_{scene_num}"
+        if provider_key in st.session_state.get('image_providers', {}):
+            st.caption(f"🤖 생성 모델: {st.session_state['image_providers'][provider_key]}")
+    else:
+        if st.button(f"📸 이미지 생성", key=f"g_s_{scene_num}"):
+            img, actual_provider = reuse_identical_image(
+                f"scene_{scene_num}", project_image_requests(compiled, use_json, img_width, img_height))
+            if img is None:
+                final = compiled.scene_prompt(scene_idx, use_json)
+                with st.spinner("생성 중..."):
+                    img, actual_provider = try_generate_image_with_fallback(
+                        final, img_width, img_height, image_provider, max_retries,
+                        palette=compiled.scene_palette(scene_idx))
+            if img:
+                store_scene_image(scene_num, img, actual_provider)
+                rerun_fragment()
+    
+    # 씬 정보
+    st.write(f"**액션:** {scene.get('action', '')}")
+    if 'camera' in scene:
+        if isinstance(scene['camera'], dict):
+            cam = scene['camera']
+            st.write(f"**카메라:** {cam.get('shot_type', '')} | {cam.get('movement', '')} | {cam.get('lens', '')} | {cam.get('angle', '')}")
+        else:
+            st.write(f"**카메라:** {scene['camera']}")
+    if 'emotion' in scene:
+        st.write(f"**감정:** {scene['emotion']}")
+    
+    with st.expander("🖼️ 이미지 프롬프트"):
+        # 실제 생성에 사용될 최종 프롬프트 표시
+        st.code(compiled.scene_prompt(scene_idx, use_json))
+    
+    with st.expander("🎬 비디오 프롬프트 (Runway/Pika/Kling 용)"):
+        st.code(scene.get('video_prompt', ''))
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
 # ------------------------------------------------------------------
 # 결과 표시
 # ------------------------------------------------------------------
 if st.session_state.get('plan_data'):
     plan = st.session_state['plan_data']
+    restore_from_manifest(plan)
     use_json = st.session_state.get('use_json_profiles', True)
     img_width = st.session_state.get('image_width', 1024)
     img_height = st.session_state.get('image_height', 576)
+    if st.session_state.get('image_jobs'):
+        render_background_jobs(plan)
     
     st.markdown("---")
     st.header(f"🎬 {plan.get('project_title', 'Project')}")
@@ -2487,212 +2034,16 @@ if st.session_state.get('plan_data'):
     
     # 턴테이블
     if 'turntable' in plan:
-        st.markdown("## 🎭 Turntable Reference Sheets")
-        
-        # 전체 생성 버튼
-        if st.button("🎨 모든 턴테이블 이미지 생성", use_container_width=True, type="primary", key="gen_all_tt"):
-            progress = st.progress(0)
-            status = st.empty()
-            
-            total_views = 0
-            for cat in ['characters', 'locations', 'props', 'vehicles']:
-                if cat in plan['turntable']:
-                    for item in plan['turntable'][cat]:
-                        if 'views' in item:
-                            total_views += len(item['views'])
-            
-            current = 0
-            for cat in ['characters', 'locations', 'props', 'vehicles']:
-                if cat in plan['turntable']:
-                    for item in plan['turntable'][cat]:
-                        if 'views' in item:
-                            for view in item['views']:
-                                item_name = item.get('name', '')
-                                view_type = view.get('view_type', '')
-                                tt_key = f"{cat}_{item.get('id', '')}_{view_type}"
-                                
-                                status.markdown(f"<div class='status-box'>생성 중: {item_name} - {view_type}</div>", unsafe_allow_html=True)
-                                
-                                final_prompt = view.get('prompt', '')
-                                if use_json and 'json_profile' in item:
-                                    detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
-                                    if detailed:
-                                        final_prompt = f"{detailed}, {final_prompt}"
-                                
-                                img, actual_provider = try_generate_image_with_fallback(final_prompt, 1024, 1024, image_provider, max_retries)
-
-                                if img:
-                                    if 'turntable_images' not in st.session_state:
-                                        st.session_state['turntable_images'] = {}
-                                    st.session_state['turntable_images'][tt_key] = img
-                                    if 'image_providers' not in st.session_state:
-                                        st.session_state['image_providers'] = {}
-                                    st.session_state['image_providers'][f"tt_{tt_key}"] = actual_provider
-
-                                current += 1
-                                progress.progress(current / total_views)
-                                time.sleep(0.5)
-
-            status.markdown("<div class='status-box'>✅ 턴테이블 생성 완료!</div>", unsafe_allow_html=True)
-            st.rerun()
-        
-        # 카테고리별 표시
-        for cat in ['characters', 'locations', 'props', 'vehicles']:
-            if cat in plan['turntable'] and plan['turntable'][cat]:
-                st.markdown(f"### {'👤' if cat=='characters' else '🏠' if cat=='locations' else '📦' if cat=='props' else '🚗'} {cat.upper()}")
-                
-                for item in plan['turntable'][cat]:
-                    st.markdown(f"<div class='turntable-box'>", unsafe_allow_html=True)
-                    st.markdown(f"**{item.get('name', '')}** (ID: {item.get('id', '')})")
-                    
-                    if 'json_profile' in item:
-                        with st.expander("📊 JSON 프로필"):
-                            st.json(item['json_profile'])
-                    
-                    if 'views' in item:
-                        cols = st.columns(min(len(item['views']), 4))
-                        for idx, view in enumerate(item['views']):
-                            with cols[idx % 4]:
-                                view_type = view.get('view_type', '')
-                                tt_key = f"{cat}_{item.get('id', '')}_{view_type}"
-                                
-                                st.caption(view_type.upper())
-                                
-                                if tt_key in st.session_state.get('turntable_images', {}):
-                                    st.image(st.session_state['turntable_images'][tt_key], use_container_width=True)
-                                    tt_provider_key = f"tt_{tt_key}"
-                                    if tt_provider_key in st.session_state.get('image_providers', {}):
-                                        st.caption(f"🤖 {st.session_state['image_providers'][tt_provider_key]}")
-                                else:
-                                    if st.button(f"📸", key=f"g_{tt_key}"):
-                                        final_prompt = view.get('prompt', '')
-                                        if use_json and 'json_profile' in item:
-                                            detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
-                                            if detailed:
-                                                final_prompt = f"{detailed}, {final_prompt}"
-                                        
-                                        with st.spinner("생성 중..."):
-                                            img, actual_provider = try_generate_image_with_fallback(final_prompt, 1024, 1024, image_provider, max_retries)
-                                        if img:
-                                            if 'turntable_images' not in st.session_state:
-                                                st.session_state['turntable_images'] = {}
-                                            st.session_state['turntable_images'][tt_key] = img
-                                            if 'image_providers' not in st.session_state:
-                                                st.session_state['image_providers'] = {}
-                                            st.session_state['image_providers'][f"tt_{tt_key}"] = actual_provider
-                                            st.rerun()
-                                
-                                with st.expander("프롬프트"):
-                                    st.code(view.get('prompt', ''), language=None)
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
+        render_turntable_section(plan, use_json, image_provider, max_retries)
     
     st.markdown("---")
     
     # 씬/스토리보드
     if 'scenes' in plan:
-        st.markdown("## 🎬 Storyboard")
-        
-        # 전체 씬 생성 버튼
-        if st.button("🎨 모든 씬 이미지 생성", use_container_width=True, type="primary", key="gen_all_scenes"):
-            scenes = plan['scenes']
-            progress = st.progress(0)
-            status = st.empty()
-            
-            for idx, scene in enumerate(scenes):
-                scene_num = scene.get('scene_num', idx+1)
-                status.markdown(f"<div class='status-box'>Scene {scene_num} 생성 중...</div>", unsafe_allow_html=True)
-                
-                base = scene.get('image_prompt', '')
-                if use_json and 'used_turntables' in scene:
-                    final = apply_json_profiles_to_prompt(base, scene['used_turntables'], plan.get('turntable', {}))
-                else:
-                    final = base
-                
-                img, actual_provider = try_generate_image_with_fallback(final, img_width, img_height, image_provider, max_retries)
-
-                if img:
-                    if 'generated_images' not in st.session_state:
-                        st.session_state['generated_images'] = {}
-                    st.session_state['generated_images'][scene_num] = img
-                    if 'image_providers' not in st.session_state:
-                        st.session_state['image_providers'] = {}
-                    st.session_state['image_providers'][f"scene_{scene_num}"] = actual_provider
-
-                progress.progress((idx + 1) / len(scenes))
-                time.sleep(0.5)
-            
-            status.markdown("<div class='status-box'>✅ 씬 이미지 생성 완료!</div>", unsafe_allow_html=True)
-            st.rerun()
-        
-        # 개별 씬 표시
-        for scene in plan.get('scenes', []):
-            scene_num = scene.get('scene_num', 0)
-            
-            st.markdown(f"<div class='scene-box'>", unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                st.markdown(f"**Scene {scene_num}** - {scene.get('timecode', '')}")
-                if 'act' in scene:
-                    st.caption(f"Act {scene['act']} | {scene.get('beat', '')}")
-                if 'used_turntables' in scene and scene['used_turntables']:
-                    for tt in scene['used_turntables']:
-                        st.markdown(f"<span class='turntable-tag'>🎭 {tt}</span>", unsafe_allow_html=True)
-            with col2:
-                if scene_num in st.session_state.get('generated_images', {}):
-                    if st.button("🔄", key=f"r_s_{scene_num}"):
-                        del st.session_state['generated_images'][scene_num]
-                        st.rerun()
-            
-            # 이미지 표시 또는 생성 버튼
-            if scene_num in st.session_state.get('generated_images', {}):
-                st.image(st.session_state['generated_images'][scene_num], use_container_width=True)
-                provider_key = f"scene_{scene_num}"
-                if provider_key in st.session_state.get('image_providers', {}):
-                    st.caption(f"🤖 생성 모델: {st.session_state['image_providers'][provider_key]}")
-            else:
-                if st.button(f"📸 이미지 생성", key=f"g_s_{scene_num}"):
-                    base = scene.get('image_prompt', '')
-                    if use_json and 'used_turntables' in scene:
-                        final = apply_json_profiles_to_prompt(base, scene['used_turntables'], plan.get('turntable', {}))
-                    else:
-                        final = base
-                    
-                    with st.spinner("생성 중..."):
-                        img, actual_provider = try_generate_image_with_fallback(final, img_width, img_height, image_provider, max_retries)
-                    if img:
-                        if 'generated_images' not in st.session_state:
-                            st.session_state['generated_images'] = {}
-                        st.session_state['generated_images'][scene_num] = img
-                        if 'image_providers' not in st.session_state:
-                            st.session_state['image_providers'] = {}
-                        st.session_state['image_providers'][f"scene_{scene_num}"] = actual_provider
-                        st.rerun()
-            
-            # 씬 정보
-            st.write(f"**액션:** {scene.get('action', '')}")
-            if 'camera' in scene:
-                if isinstance(scene['camera'], dict):
-                    cam = scene['camera']
-                    st.write(f"**카메라:** {cam.get('shot_type', '')} | {cam.get('movement', '')} | {cam.get('lens', '')} | {cam.get('angle', '')}")
-                else:
-                    st.write(f"**카메라:** {scene['camera']}")
-            if 'emotion' in scene:
-                st.write(f"**감정:** {scene['emotion']}")
-            
-            with st.expander("🖼️ 이미지 프롬프트"):
-                # 실제 생성에 사용될 최종 프롬프트 표시
-                final_debug = scene.get('image_prompt', '')
-                if use_json and 'used_turntables' in scene:
-                    final_debug = apply_json_profiles_to_prompt(final_debug, scene['used_turntables'], plan.get('turntable', {}))
-                st.code(final_debug)
-            
-            with st.expander("🎬 비디오 프롬프트 (Runway/Pika/Kling 용)"):
-                st.code(scene.get('video_prompt', ''))
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+        render_storyboard_section(plan, use_json, img_width, img_height, image_provider, max_retries)
 
 # Footer
 st.markdown("---")
 st.caption("🎬 AI MV Director Pro | Powered by Gemini & Nano Banana 🍌 & Segmind & Pollinations")
+
+end_render_metric(_app_render_metric)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+app.py 콜드 스타트 벤치마크
+매 측정마다 새 인터프리터를 띄워 캐시되지 않은 상태에서 측정
+
+- import: app.py 상단 import 블록을 -X importtime으로 실행 → 최상위 모듈 누적 시간 합계 + 상위 모듈
+- 지연 모듈: 위 블록 뒤에 google.generativeai / PIL / requests를 import할 때 추가로 드는 시간
+  (지연 import로 첫 화면에서 빠진 비용)
+- 첫 실행: AppTest로 app.py를 처음 실행해 첫 화면 구성까지 걸린 시간 (import + 스크립트 1회)
+- 서버: streamlit run 기동 → /_stcore/health 응답까지, 이어서 / 첫 바이트(TTFB)까지
+
+결과는 benchmarks/cold_start_history.jsonl에 한 줄씩 추가 (커밋 해시 포함)
+→ 커밋별 추세를 저장소에서 추적
+
+사용법: python benchmarks/bench_cold_start.py [반복횟수] [--no-record]
+"""
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_PATH = os.path.join(ROOT, "app.py")
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "cold_start_history.jsonl")
+DEFERRED_IMPORTS = "import google.generativeai\nimport requests\nfrom PIL import Image\n"
+
+FIRST_RUN_CODE = """
+import sys, time, warnings
+warnings.simplefilter("ignore")
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.secrets["BENCH"] = "1"
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+assert not at.exception, [e.value for e in at.exception]
+print(elapsed)
+"""
+
+
+def app_import_block(path=APP_PATH):
+    """app.py 첫 실행문(st.set_page_config 등) 전까지의 import 문"""
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(("import ", "from ", "#")):
+                break
+            lines.append(line.rstrip("\r\n"))
+    return "\n".join(lines) + "\n"
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → {최상위 모듈: 누적 µs}"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # 들여쓰기 없음 = 최상위 import
+            totals[name.strip()] = totals.get(name.strip(), 0) + int(cumulative)
+    return totals
+
+
+def measure_imports(code, exclude=()):
+    """새 인터프리터에서 code 실행 → {최상위 모듈: 누적 µs} (exclude: 인터프리터 기동 시 모듈)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-W", "ignore", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-500:])
+    return {name: micros for name, micros in parse_importtime(result.stderr).items() if name not in exclude}
+
+
+def measure_first_run():
+    """AppTest 첫 실행 초"""
+    result = subprocess.run([sys.executable, "-c", FIRST_RUN_CODE, APP_PATH],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-500:])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_server(timeout=60):
+    """(기동~health 응답 초, / TTFB 초)"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        start = time.perf_counter()
+        while True:
+            try:
+                with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except OSError:
+                pass
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError("streamlit 서버 기동 시간 초과")
+            time.sleep(0.05)
+        ready = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with urllib.request.urlopen(f"{base_url}/", timeout=10) as response:
+            response.read(1)
+        return ready, time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def current_commit():
+    """짧은 커밋 해시 (커밋 안 된 변경이 있으면 -dirty)"""
+    result = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    repeat = int(args[0]) if args else 3
+    record = "--no-record" not in sys.argv
+
+    block = app_import_block()
+    startup_modules = set(measure_imports("pass"))
+    import_runs, deferred_runs, first_runs, ready_runs, ttfb_runs = [], [], [], [], []
+    top_modules = {}
+    for _ in range(repeat):
+        totals = measure_imports(block, startup_modules)
+        import_runs.append(sum(totals.values()) / 1000)
+        for name, micros in totals.items():
+            top_modules.setdefault(name, []).append(micros / 1000)
+        with_deferred = measure_imports(block + DEFERRED_IMPORTS, startup_modules)
+        deferred_runs.append(sum(with_deferred.values()) / 1000 - import_runs[-1])
+        first_runs.append(measure_first_run() * 1000)
+        ready, ttfb = measure_server()
+        ready_runs.append(ready * 1000)
+        ttfb_runs.append(ttfb * 1000)
+
+    result = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "import_ms": round(statistics.median(import_runs), 1),
+        "deferred_ms": round(statistics.median(deferred_runs), 1),
+        "first_run_ms": round(statistics.median(first_runs), 1),
+        "server_ready_ms": round(statistics.median(ready_runs), 1),
+        "ttfb_ms": round(statistics.median(ttfb_runs), 1),
+    }
+
+    print("=" * 50)
+    print(f"콜드 스타트 벤치마크 (중앙값, {repeat}회)")
+    print("=" * 50)
+    print(f"   app.py import 블록   {result['import_ms']:8.1f} ms")
+    print(f"   지연된 모듈 (미포함) {result['deferred_ms']:8.1f} ms")
+    print(f"   첫 실행 (AppTest)    {result['first_run_ms']:8.1f} ms")
+    print(f"   서버 기동 → health   {result['server_ready_ms']:8.1f} ms")
+    print(f"   / 첫 바이트          {result['ttfb_ms']:8.1f} ms")
+    print("\n[import 상위 모듈]")
+    ranked = sorted(top_modules.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in ranked[:8]:
+        print(f"   {name:<32} {statistics.median(values):8.1f} ms")
+
+    if record:
+        with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"\n기록: {os.path.relpath(HISTORY_PATH, ROOT)}")
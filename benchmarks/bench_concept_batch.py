@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+콘셉트 생성: 키워드별 요청 vs 일괄 요청(JSON 배열) 벤치마크
+로컬 대역 서버(fake_services.py)의 Gemini에 google.generativeai REST 전송으로 연결해 측정
+
+- 키워드별 (순차): 기존 버튼 클릭 경로
+- 키워드별 (병렬 3): ConceptPrefetcher 선계산 경로 (batch_fn 없음)
+- 일괄 1회: ConceptPrefetcher(batch_fn=generate_viral_concepts_batch) 경로 (파싱 실패 항목만 get()에서 키워드별 재요청)
+
+사용법: python benchmarks/bench_concept_batch.py [기본지연초] [토큰당지연초]
+"""
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+warnings.simplefilter("ignore")
+
+import google.generativeai as genai
+
+from benchmarks.fake_services import FakeServices
+from mv_core import CATEGORY_PROFILES, ConceptPrefetcher, build_batch_concept_prompt, build_concept_prompt, parse_concept_array
+
+MODEL_NAME = "gemini-2.0-flash"
+CHANNEL_CATEGORY = "뮤직비디오"
+PROFILE = CATEGORY_PROFILES[CHANNEL_CATEGORY]
+TREND_WORDS = ["뉴진스 컴백", "가을 단풍", "한국시리즈", "할로윈", "AI 작곡", "K-pop 월드투어", "캠핑",
+               "첫눈", "크리스마스 마켓", "러닝 크루", "레트로 게임", "도시 야경", "비 오는 날", "제주 여행",
+               "밴드 붐", "Y2K 패션", "숏폼 챌린지", "별자리", "우주 여행", "새벽 감성"]
+
+
+def make_keywords(count):
+    return [{"keyword": TREND_WORDS[i % len(TREND_WORDS)],
+             "angle": f"{PROFILE['themes'][i % len(PROFILE['themes'])]} 테마의 퍼포먼스 뮤직비디오",
+             "concept_hint": "네온, 원테이크, 군무"} for i in range(count)]
+
+
+def generate_single(keyword_data, channel_category):
+    model = genai.GenerativeModel(MODEL_NAME)
+    return model.generate_content(build_concept_prompt(keyword_data, channel_category, PROFILE)).text.strip()
+
+
+def generate_batch(keyword_list, channel_category):
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = model.generate_content(build_batch_concept_prompt(keyword_list, channel_category, PROFILE))
+    return parse_concept_array(response.text, len(keyword_list))
+
+
+def generate_prefetched(keyword_list, channel_category, workers=3, batch=False):
+    prefetcher = ConceptPrefetcher(generate_single, batch_fn=generate_batch if batch else None, max_workers=workers)
+    prefetcher.prefetch(keyword_list, channel_category, top_n=len(keyword_list))
+    return [prefetcher.get(kw, channel_category) for kw in keyword_list]
+
+
+def measure(services, fn):
+    """(경과 초, 요청 수, 입력 토큰, 출력 토큰)"""
+    before = services.snapshot()["gemini"]
+    start = time.perf_counter()
+    results = fn()
+    elapsed = time.perf_counter() - start
+    assert all(results), "빈 콘셉트"
+    after = services.snapshot()["gemini"]
+    return (elapsed, after["requests"] - before["requests"],
+            after["prompt_tokens"] - before["prompt_tokens"], after["output_tokens"] - before["output_tokens"])
+
+
+if __name__ == "__main__":
+    base_latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    per_token_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.004
+
+    services = FakeServices(faults={"gemini": {"latency": base_latency, "per_token": per_token_latency}})
+    genai.configure(api_key="fake", transport="rest", client_options={"api_endpoint": services.base_url})
+
+    print("=" * 50)
+    print(f"콘셉트 생성 벤치마크 (대역 지연 {base_latency}s + {per_token_latency * 1000:.0f}ms/출력토큰)")
+    print("=" * 50)
+    for count in (5, 10, 20):
+        keywords = make_keywords(count)
+        paths = [
+            ("키워드별 (순차)", lambda: [generate_single(kw, CHANNEL_CATEGORY) for kw in keywords]),
+            ("키워드별 (병렬 3)", lambda: generate_prefetched(keywords, CHANNEL_CATEGORY)),
+            ("일괄 1회", lambda: generate_prefetched(keywords, CHANNEL_CATEGORY, batch=True)),
+        ]
+        print(f"\n[키워드 {count}개]")
+        for label, fn in paths:
+            elapsed, requests_, prompt_tokens, output_tokens = measure(services, fn)
+            print(f"   {label:<14} {elapsed:6.2f}s  요청 {requests_:2d}  "
+                  f"입력 {prompt_tokens:5d} + 출력 {output_tokens:5d} = {prompt_tokens + output_tokens:5d} 토큰")
+
+    services.shutdown()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+코어 핫 패스 pytest-benchmark 모음 (Streamlit 없이 mv_core만 import)
+- JSON 정리 / 시스템 프롬프트 / 프로필 텍스트 변환 / 씬 프롬프트 / 프롬프트 예산 / 내보내기 / 주제 분석 / 참신도 검사
+
+파일 이름이 test_*가 아니라 기본 pytest 실행에서는 수집되지 않음
+
+사용법: python -m pytest benchmarks/bench_core_hot_paths.py --benchmark-only
+        (비교: --benchmark-autosave 후 --benchmark-compare)
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+pytest.importorskip("pytest_benchmark")
+
+from mv_core import (CompiledPlan, NoveltyIndex, analyze_topic_for_auto_settings, budget_prompt, clean_json_text,
+                     create_html_export, create_text_export, enhance_prompt_for_provider, generate_unique_topics,
+                     get_system_prompt, json_profile_to_ultra_detailed_text)
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+PROVIDER = "Pollinations Flux-Realism (실사 특화)"
+OPTIONS = {"use_emotional": True, "use_climax": True, "use_trial": True, "use_symbolic": True, "use_twist": True}
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return json.loads((FIXTURES / "plan_neon_seoul.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def llm_response(plan):
+    """코드 펜스 + 후행 쉼표 + 주석이 섞인 LLM 응답 모양"""
+    body = json.dumps(plan, ensure_ascii=False, indent=2).replace("\n}", ",\n}")
+    return f"기획안입니다.\n```json\n// 생성 결과\n{body}\n```\n"
+
+
+def test_clean_json_text(benchmark, llm_response, plan):
+    assert json.loads(benchmark(clean_json_text, llm_response)) == plan
+
+
+def test_get_system_prompt(benchmark):
+    prompt = benchmark(get_system_prompt, "서울의 밤", 12, OPTIONS, "K-POP", "Photorealistic/Cinematic", "K-POP",
+                       True, True, 5)
+    assert "Generate exactly 12 scenes." in prompt
+
+
+def test_json_profile_to_text(benchmark, plan):
+    profile = plan['turntable']['characters'][0]['json_profile']
+    assert benchmark(json_profile_to_ultra_detailed_text, profile)
+
+
+def test_compile_and_scene_prompts(benchmark, plan):
+    def compile_all():
+        compiled = CompiledPlan(plan)
+        return [compiled.scene_prompt(i, True) for i in range(len(plan['scenes']))]
+
+    assert len(benchmark(compile_all)) == len(plan['scenes'])
+
+
+def test_budget_prompt(benchmark, plan):
+    prompt = enhance_prompt_for_provider(CompiledPlan(plan).scene_prompt(0, True), PROVIDER)
+    result = benchmark(budget_prompt, prompt, PROVIDER)
+    assert result
+
+
+def test_html_export(benchmark, plan):
+    assert "Turntable Reference Sheets" in benchmark(create_html_export, plan)
+
+
+def test_text_export(benchmark, plan):
+    assert plan['project_title'] in benchmark(create_text_export, plan)
+
+
+def test_analyze_topic(benchmark):
+    assert benchmark(analyze_topic_for_auto_settings, "비 오는 밤 네온사인 아래 이별한 연인의 감성 발라드")
+
+
+def test_novelty_nearest(benchmark):
+    index = NoveltyIndex()
+    index.add_many((topic, "주제") for topic in generate_unique_topics(2000, seed=1))
+    query = generate_unique_topics(1, seed=2)[0]
+    score, _, _ = benchmark(index.nearest, query)
+    assert 0.0 <= score <= 1.0
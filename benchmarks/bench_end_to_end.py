@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+전체 파이프라인 벤치마크 (로컬 대역 서버, 네트워크 불필요)
+주제(AI 바이럴 주제) → 기획안 → 모든 씬 프리뷰 + 턴테이블 이미지를 파이프라인 N개 동시에 실행
+대역 서버(fake_services.py)에 지연/오류/429를 주입해 처리량과 단계별 p50/p95 측정
+--shared-topic: 모든 파이프라인이 같은 주제 사용 (데모 주제/같은 프로젝트 재로딩 상황)
+--coalesce: SingleFlight로 동시에 들어온 같은 기획안/이미지 요청 합치기
+
+사용법:
+    python benchmarks/bench_end_to_end.py [--pipelines N] [--concurrency N] [--scenes N] [--latency 초]
+                                          [--image-per-mp 초] [--error-rate 비율] [--rate-limit 비율]
+                                          [--shared-topic] [--coalesce]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+warnings.simplefilter("ignore")
+
+from benchmarks.fake_services import FakeServices
+from mv_core import (CompiledPlan, PlanGenerationError, SingleFlight, Tracer, generate_image_with_fallback,
+                     generate_plan, generate_preview_images, get_preview_size, get_viral_topic_with_ai, span,
+                     use_tracer)
+
+MODEL_NAME = "gemini-2.0-flash"
+PROVIDER = "Pollinations Flux-Realism 📸"
+IMG_SIZE = (1024, 576)
+STORY_OPTIONS = {"use_arc": True, "use_sensory": True, "use_emotional": True}
+REPORT_STAGES = ("pipeline", "llm.call", "plan", "preview.batch", "image.request", "turntable.batch", "sleep",
+                 "singleflight.wait")
+SHARED_TOPIC = "비 내리는 네온 서울, 우산 없이 춤추는 댄서"
+
+
+def run_pipeline(tracer, scene_count, shared_topic=False, flight=None):
+    """파이프라인 1회 → 생성 이미지 수 (기획안 실패 시 0)"""
+    with use_tracer(tracer), span("pipeline", scenes=scene_count) as pipeline:
+        topic = SHARED_TOPIC if shared_topic else get_viral_topic_with_ai("fake", MODEL_NAME)
+        try:
+            plan_data = generate_plan(topic, "fake", MODEL_NAME, scene_count, STORY_OPTIONS, "Cinematic",
+                                      "Photorealistic/Cinematic", "K-Pop", True, False, 5, retry_delay=0.5,
+                                      flight=flight)
+        except PlanGenerationError:
+            pipeline.set(status="plan_failed")
+            return 0
+        compiled = CompiledPlan(plan_data)
+        generated = generate_preview_images(plan_data, *IMG_SIZE, PROVIDER, compiled=compiled, pause=0,
+                                            flight=flight)
+        preview_w, preview_h = get_preview_size(*IMG_SIZE)
+        with span("turntable.batch", views=len(compiled.turntable_views)):
+            for tt_key in compiled.turntable_views:
+                img, _ = generate_image_with_fallback(compiled.turntable_prompt(tt_key), preview_w, preview_h,
+                                                      PROVIDER, max_retries=2, flight=flight)
+                generated += img is not None
+        pipeline.set(images=generated)
+        return generated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 파이프라인 벤치마크")
+    parser.add_argument("--pipelines", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--scenes", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.05, help="서비스 공통 기본 지연 (초)")
+    parser.add_argument("--image-per-mp", type=float, default=0.2, help="이미지 메가픽셀당 추가 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--shared-topic", action="store_true")
+    parser.add_argument("--coalesce", action="store_true")
+    args = parser.parse_args()
+
+    services = FakeServices()
+    services.set_faults("all", latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit)
+    services.set_faults("pollinations", per_mp=args.image_per_mp)
+    services.set_faults("gemini", per_token=0.0005)
+    tracer = Tracer(max_spans=200000)
+    flight = SingleFlight() if args.coalesce else None
+
+    with services.applied():
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            images = list(pool.map(lambda _: run_pipeline(tracer, args.scenes, args.shared_topic, flight),
+                                   range(args.pipelines)))
+        elapsed = time.perf_counter() - started
+    services.shutdown()
+
+    print("=" * 50)
+    print(f"전체 파이프라인 벤치마크 (파이프라인 {args.pipelines}개, 동시 {args.concurrency}, 씬 {args.scenes}개)")
+    print(f"대역 지연 {args.latency}s + 이미지 {args.image_per_mp}s/MP, 오류 {args.error_rate:.0%}, "
+          f"429 {args.rate_limit:.0%}")
+    print("=" * 50)
+    print(f"   주제 {'공유' if args.shared_topic else '파이프라인별'} | 요청 합치기 {'켬' if flight else '끔'}")
+    print(f"   경과 {elapsed:.2f}s | 파이프라인 {args.pipelines / elapsed * 60:.1f}/분 | "
+          f"이미지 {sum(images)}장 ({sum(images) / elapsed:.2f}/s) | 기획안 실패 {images.count(0)}")
+
+    print(f"\n   {'단계':<40} {'횟수':>6} {'p50':>8} {'p95':>8} {'오류':>5}")
+    for stage, row in tracer.stage_stats().items():
+        if stage.split(" · ")[0] in REPORT_STAGES:
+            print(f"   {stage:<40} {row['count']:6d} {row['p50_ms']:7.0f}ms {row['p95_ms']:7.0f}ms {row['errors']:5d}")
+
+    print(f"\n   {'서비스':<14} {'요청':>6} {'500':>5} {'429':>5}")
+    for service, stat in services.snapshot().items():
+        if stat["requests"]:
+            print(f"   {service:<14} {stat['requests']:6d} {stat['errors']:5d} {stat['rate_limited']:5d}")
+
+    if flight:
+        print(f"\n   {'합치기':<14} {'요청':>6} {'실행':>6} {'합쳐짐':>6}")
+        for namespace, stat in flight.stats().items():
+            print(f"   {namespace:<14} {stat['requests']:6d} {stat['executed']:6d} {stat['coalesced']:6d}")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+이미지 엔진 실측 벤치마크 (네트워크 필요)
+고정 프롬프트 세트를 엔진별로 동시에 요청 → TTFB / 전체 지연 / 바이트 / 실패율 / 출력 해상도
+Segmind는 SEGMIND_API_KEY 환경 변수가 있을 때만 요청
+
+결과는 앱과 같은 기록 파일(traces/engine_bench.jsonl, MV_TRACE_DIR로 변경)에 추가 → Auto 엔진이 사용
+
+사용법: python benchmarks/bench_engines.py [--no-record]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import BENCH_PROMPTS, IMAGE_ENGINES, EngineBenchHistory, benchmark_engines, summarize_bench
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+TRACE_DIR = os.getenv("MV_TRACE_DIR") or os.path.join(ROOT, "traces")
+
+
+if __name__ == "__main__":
+    segmind_key = os.getenv("SEGMIND_API_KEY")
+    engines = [engine for engine in IMAGE_ENGINES if segmind_key or "Segmind" not in engine]
+    records = benchmark_engines(engines, segmind_key=segmind_key)
+
+    print("=" * 50)
+    print(f"이미지 엔진 벤치마크 (엔진 {len(engines)}개 × 프롬프트 {len(BENCH_PROMPTS)}개, 동시 요청)")
+    print("=" * 50)
+    print(f"   {'엔진':<30} {'TTFB':>7} {'전체':>7} {'s/MP':>6} {'KB':>6} {'해상도':>9} {'실패':>5}")
+    for engine, row in summarize_bench(records).items():
+        ttfb = f"{row['ttfb_p50_ms'] / 1000:.1f}s" if row['ttfb_p50_ms'] else "-"
+        total = f"{row['total_p50_ms'] / 1000:.1f}s" if row['total_p50_ms'] else "-"
+        per_mp = f"{row['ms_per_mp_p50'] / 1000:.1f}" if row['ms_per_mp_p50'] else "-"
+        print(f"   {engine:<30} {ttfb:>7} {total:>7} {per_mp:>6} {row['mean_bytes'] / 1024:6.0f} "
+              f"{row['resolution'] or '-':>9} {row['failures']}/{row['runs']}")
+
+    if "--no-record" not in sys.argv:
+        history = EngineBenchHistory(os.path.join(TRACE_DIR, "engine_bench.jsonl"))
+        history.append(records)
+        print(f"\n기록: {history.path}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+이미지 응답 검증 벤치마크 (1024px 응답 기준)
+- 기존: 길이 확인 + PIL Image.open + 크기 확인 → 세션에 PIL 이미지 저장 → 표시할 때 디코딩 + 재인코딩
+- 헤더 검증: validate_image (형식/크기/잘림/오류 이미지 해시) → 받은 바이트 그대로 표시
+- 참고: 전체 디코딩 (Image.open + load)
+- 세션 보관 크기: 받은 바이트 vs 표시 후 디코딩된 PIL 이미지 (가로 × 세로 × 3)
+헤더 검증 시간에는 ImageBytes로 감싸는 복사(bytes 하위 클래스) 포함
+
+사용법: python benchmarks/bench_image_validation.py [반복횟수]
+"""
+import os
+import sys
+import timeit
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PIL import Image
+
+from mv_core import validate_image
+
+SIZE = (1024, 1024)
+
+
+def sample_image():
+    """노이즈 + 그라데이션 (실제 생성 이미지와 비슷한 압축률)"""
+    noise = Image.effect_noise(SIZE, 48)
+    gradient = Image.linear_gradient("L").resize(SIZE)
+    return Image.merge("RGB", (noise, gradient, gradient.transpose(Image.Transpose.ROTATE_90)))
+
+
+def encode(img, fmt, **params):
+    buffer = BytesIO()
+    img.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+def legacy_validate(data):
+    if len(data) > 1000:
+        img = Image.open(BytesIO(data))
+        if img.size[0] > 100:
+            return img
+    return None
+
+
+def legacy_validate_and_display(data):
+    """기존 경로 전체 - 표시용 get_image_bytes가 PIL 이미지를 다시 인코딩"""
+    img = legacy_validate(data)
+    buffer = BytesIO()
+    img.save(buffer, format=img.format)
+    return buffer.getvalue()
+
+
+def full_decode(data):
+    img = Image.open(BytesIO(data))
+    img.load()
+    return img
+
+
+def per_call_us(fn, data, repeat):
+    return min(timeit.repeat(lambda: fn(data), number=repeat, repeat=3)) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    img = sample_image()
+    samples = {
+        "JPEG q90": encode(img, "JPEG", quality=90),
+        "PNG": encode(img, "PNG"),
+        "WebP q80": encode(img, "WEBP", quality=80),
+    }
+
+    print("=" * 50)
+    print(f"이미지 응답 검증 벤치마크 ({SIZE[0]}x{SIZE[1]}, 최소 {repeat}회 평균)")
+    print("=" * 50)
+    print(f"   {'형식':<9} {'KB':>6} {'헤더 검증':>10} {'기존 검증':>10} {'기존+표시':>11} {'전체 디코딩':>11} "
+          f"{'보관 KB (원본/디코딩)':>20}")
+    for label, data in samples.items():
+        assert validate_image(data)[0] is not None
+        header_us = per_call_us(validate_image, data, repeat * 50)
+        legacy_us = per_call_us(legacy_validate, data, repeat * 50)
+        display_us = per_call_us(legacy_validate_and_display, data, repeat)
+        decode_us = per_call_us(full_decode, data, repeat)
+        print(f"   {label:<9} {len(data) / 1024:6.0f} {header_us:8.1f}µs {legacy_us:8.1f}µs "
+              f"{display_us / 1000:9.1f}ms {decode_us / 1000:9.1f}ms "
+              f"{len(data) / 1024:10.0f} / {SIZE[0] * SIZE[1] * 3 / 1024:.0f}")
+    print("\n   헤더 검증 경로는 표시할 때 받은 바이트를 그대로 보내므로 '기존+표시'의 재인코딩 비용이 없음")
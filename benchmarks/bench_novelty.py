@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+참신도 검사: 전수 자카드 비교 vs MinHash + LSH (NoveltyIndex) 벤치마크
+과거 항목 수별 후보 1개당 검사 시간과, 전수 비교 기준 중복 판정 일치율을 측정
+
+사용법: python benchmarks/bench_novelty.py [후보수]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import NoveltyIndex, generate_unique_topics
+from mv_core.novelty import DEFAULT_THRESHOLD, shingles
+
+
+def exact_nearest(history_shingles, text):
+    """전수 비교 최대 자카드"""
+    query = shingles(text)
+    best = 0.0
+    for grams in history_shingles:
+        union = len(query | grams)
+        if union:
+            best = max(best, len(query & grams) / union)
+    return best
+
+
+if __name__ == "__main__":
+    query_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    queries = generate_unique_topics(query_count, seed=2)
+
+    print("=" * 50)
+    print(f"참신도 검사 벤치마크 (후보 {query_count}개, 임계값 {DEFAULT_THRESHOLD})")
+    print("=" * 50)
+    for history_size in (100, 1000, 5000):
+        history = generate_unique_topics(history_size, seed=1)
+
+        start = time.perf_counter()
+        index = NoveltyIndex()
+        index.add_many((topic, "주제") for topic in history)
+        build = time.perf_counter() - start
+
+        history_shingles = [shingles(topic) for topic in history]
+        start = time.perf_counter()
+        exact = [exact_nearest(history_shingles, q) >= DEFAULT_THRESHOLD for q in queries]
+        exact_time = (time.perf_counter() - start) / query_count
+
+        start = time.perf_counter()
+        approx = [not index.is_novel(q) for q in queries]
+        approx_time = (time.perf_counter() - start) / query_count
+
+        agree = sum(a == b for a, b in zip(exact, approx)) / query_count
+        print(f"\n[과거 항목 {history_size}개] 인덱스 구축 {build * 1000:.0f}ms")
+        print(f"   전수 자카드   {exact_time * 1e6:8.0f} µs/후보  중복 {sum(exact)}개")
+        print(f"   MinHash+LSH   {approx_time * 1e6:8.0f} µs/후보  중복 {sum(approx)}개  일치율 {agree:.1%}")
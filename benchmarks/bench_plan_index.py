@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+CompiledPlan 마이크로벤치마크 (턴테이블 20개 × 씬 300개)
+사용법: python benchmarks/bench_plan_index.py [반복횟수]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import CompiledPlan, json_profile_to_ultra_detailed_text
+
+
+def legacy_apply_json_profiles_to_prompt(base_prompt, used_turntables, turntable_data):
+    """기존 구현 (카테고리별 선형 탐색 + 매 호출 프로필 변환) - 비교 기준"""
+    if not used_turntables or not turntable_data:
+        return base_prompt
+    character_profiles, location_profiles, object_profiles = [], [], []
+    for tt_ref in used_turntables:
+        found = False
+        for item in turntable_data.get('characters', []):
+            if item.get('id') == tt_ref:
+                name = item.get('name_en', item.get('name', 'Character'))
+                if 'json_profile' in item:
+                    detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
+                    if detailed:
+                        character_profiles.append(f"({name}: {detailed})")
+                found = True
+                break
+        if found: continue
+        for item in turntable_data.get('locations', []):
+            if item.get('id') == tt_ref:
+                if 'json_profile' in item:
+                    detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
+                    if detailed:
+                        location_profiles.append(detailed)
+                found = True
+                break
+        if found: continue
+        for cat in ['props', 'vehicles']:
+            for item in turntable_data.get(cat, []):
+                if item.get('id') == tt_ref:
+                    if 'json_profile' in item:
+                        detailed = json_profile_to_ultra_detailed_text(item['json_profile'])
+                        if detailed:
+                            object_profiles.append(detailed)
+                    break
+    final_parts = []
+    if character_profiles: final_parts.append("**CHARACTERS:** " + ", ".join(character_profiles))
+    if location_profiles: final_parts.append("**LOCATION:** " + " | ".join(location_profiles))
+    if object_profiles: final_parts.append("**OBJECTS:** " + ", ".join(object_profiles))
+    final_parts.append("**SCENE ACTION:** " + base_prompt)
+    return "\n".join(final_parts)
+
+
+def make_plan(n_items=20, n_scenes=300, seed=42):
+    """턴테이블 n_items개 (캐릭터/장소/소품/차량), 씬 n_scenes개 합성 기획안"""
+    rng = random.Random(seed)
+    turntable = {'characters': [], 'locations': [], 'props': [], 'vehicles': []}
+    counts = {'characters': n_items * 2 // 5, 'locations': n_items * 3 // 10, 'props': n_items // 5}
+    counts['vehicles'] = n_items - sum(counts.values())
+    for cat, count in counts.items():
+        for i in range(count):
+            item_id = f"{cat[:4]}{i + 1}"
+            if cat == 'characters':
+                profile = {
+                    "physical": {"age": "27", "height_cm": 172, "body_type": "athletic", "skin_tone": "#E8C4A0", "skin_texture": "light freckles"},
+                    "face": {"shape": "oval", "eyes": {"color": "#3B2F2F", "shape": "almond"}, "nose": "straight", "lips": {"color": "#C96A6A", "shape": "full"}},
+                    "hair": {"color_primary": "#1A1A1A", "length_cm": 35, "style": "wolf cut", "texture": "wavy"},
+                    "clothing": {"top": {"color": "#202020", "material": "leather", "type": "biker jacket"}, "bottom": {"color": "#333", "material": "denim", "type": "jeans"}},
+                    "accessories": ["silver ring", "choker"],
+                    "distinctive_features": ["scar over left eyebrow"],
+                }
+            elif cat == 'locations':
+                profile = {
+                    "location_type": "neon alley", "architecture": {"style": "brutalist", "materials": ["concrete", "steel"]},
+                    "lighting": {"time": "23:40", "color_temperature": "3200K", "key_color": "#FF2E88"},
+                    "weather": {"condition": "rain", "humidity_percent": 90},
+                    "color_palette": {"dominant": "#0B0F2B", "secondary": "#FF2E88", "accent": "#00E5FF"},
+                    "atmosphere": "tense",
+                }
+            elif cat == 'props':
+                profile = {"name": "vintage camera", "dimensions": "12x8x6cm", "color": "#111", "material": "brass", "finish": "matte"}
+            else:
+                profile = {"make": "Porsche", "model": "911", "year": 1987, "color": "#C0C0C0"}
+            turntable[cat].append({"id": item_id, "name": item_id, "name_en": item_id.title(), "json_profile": profile,
+                                   "views": [{"view_type": f"view{v}", "prompt": f"{item_id} view {v}"} for v in range(3)]})
+    ids = [item['id'] for items in turntable.values() for item in items]
+    scenes = [{"scene_num": i + 1, "image_prompt": f"scene {i + 1} action, dynamic angle", "used_turntables": rng.sample(ids, rng.randint(2, 4))}
+              for i in range(n_scenes)]
+    return {"turntable": turntable, "scenes": scenes}
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    plan = make_plan()
+    turntable = plan['turntable']
+    scenes = plan['scenes']
+
+    # 결과 동일성 확인
+    compiled = CompiledPlan(plan)
+    for idx, scene in enumerate(scenes):
+        expected = legacy_apply_json_profiles_to_prompt(scene['image_prompt'], scene['used_turntables'], turntable)
+        assert compiled.scene_prompt(idx) == expected, f"scene {idx} mismatch"
+
+    def legacy_all():
+        for scene in scenes:
+            legacy_apply_json_profiles_to_prompt(scene['image_prompt'], scene['used_turntables'], turntable)
+
+    def compiled_cold():
+        CompiledPlan(plan).scene_prompts()
+
+    warm = CompiledPlan(plan)
+    warm.scene_prompts()
+
+    print("=" * 50)
+    print(f"CompiledPlan 벤치마크 (턴테이블 20개 × 씬 {len(scenes)}개, best of {repeat})")
+    print("=" * 50)
+    legacy_ms = timed(legacy_all, repeat)
+    cold_ms = timed(compiled_cold, repeat)
+    warm_ms = timed(warm.scene_prompts, repeat)
+    print(f"   기존 선형 탐색 (씬 전체):     {legacy_ms:8.2f} ms")
+    print(f"   CompiledPlan 생성+전체 프롬프트: {cold_ms:8.2f} ms  (x{legacy_ms / cold_ms:.1f})")
+    print(f"   CompiledPlan 캐시 재조회:     {warm_ms:8.2f} ms  (x{legacy_ms / max(warm_ms, 1e-6):.1f})")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+이미지 품질 게이트 벤치마크 (이미지 1장당 검사 비용)
+- 형식별 (JPEG / PNG / WebP) × 크기별 (프리뷰 512x288, 원본 1024x576 / 1024x1024)
+- 팔레트 비교 포함 / 제외, 비율이 어긋나 디코딩 없이 끝나는 경우
+- 첫 검사 비용 (numpy / PIL import + 팔레트 마스크 계산)은 따로 표시
+
+사용법: python benchmarks/bench_quality_gate.py [반복횟수]
+"""
+import os
+import sys
+import time
+import timeit
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import QualityGate
+
+SIZES = [(512, 288), (1024, 576), (1024, 1024)]
+PALETTE = ["#0B0F2B", "#FF2E88", "#00E5FF"]
+
+
+def sample_image(size):
+    """노이즈 + 그라데이션 (실제 생성 이미지와 비슷한 압축률)"""
+    from PIL import Image
+
+    noise = Image.effect_noise(size, 48)
+    gradient = Image.linear_gradient("L").resize(size)
+    return Image.merge("RGB", (noise, gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def encode(img, fmt, **params):
+    buffer = BytesIO()
+    img.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+def per_call_ms(fn, repeat):
+    return min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat * 1000
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    gate = QualityGate()
+
+    print("=" * 50)
+    print(f"이미지 품질 게이트 벤치마크 (최소 {repeat}회 평균)")
+    print("=" * 50)
+
+    first = encode(sample_image(SIZES[0]), "JPEG", quality=90)
+    started = time.perf_counter()
+    gate.check(first, *SIZES[0], PALETTE)
+    print(f"   첫 검사 (import + 팔레트 마스크): {(time.perf_counter() - started) * 1000:.1f}ms\n")
+
+    print(f"   {'형식':<9} {'크기':>10} {'KB':>6} {'팔레트 제외':>11} {'팔레트 포함':>11} {'비율 불일치':>11}")
+    for width, height in SIZES:
+        img = sample_image((width, height))
+        for label, fmt, params in (("JPEG q90", "JPEG", {"quality": 90}), ("PNG", "PNG", {}),
+                                   ("WebP q80", "WEBP", {"quality": 80})):
+            data = encode(img, fmt, **params)
+            plain_ms = per_call_ms(lambda: gate.check(data, width, height), repeat)
+            palette_ms = per_call_ms(lambda: gate.check(data, width, height, PALETTE), repeat)
+            aspect_ms = per_call_ms(lambda: gate.check(data, width, height * 2), repeat * 10)
+            print(f"   {label:<9} {f'{width}x{height}':>10} {len(data) / 1024:6.0f} {plain_ms:9.2f}ms "
+                  f"{palette_ms:9.2f}ms {aspect_ms:9.3f}ms")
+
+    stats = gate.stats()
+    print(f"\n   누적: 검사 {stats['checked']}회 · 평균 {stats['mean_ms']:.2f}ms")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+다중 세션 부하 테스트 (실제 streamlit run 서버 + 로컬 대역 서버)
+브라우저 대신 웹소켓(/_stcore/stream)으로 BackMsg를 보내 세션 N개가 동시에 실제 앱 흐름을 진행:
+  첫 화면 → 주제 입력 후 "🚀 프로젝트 생성"(기획안) → "🎨 모든 씬 이미지 생성" → "🎨 모든 턴테이블 이미지 생성"
+  → 재실행(내보내기 포함 전체 화면)
+
+- 세션별 단계 지연 (p50/p95/최대), 앱 예외 수
+- 서버 프로세스 CPU% / RSS / 스레드 수를 /proc에서 주기적으로 샘플링 (Linux)
+- 결과는 benchmarks/session_load_history.jsonl에 한 줄씩 추가 (커밋 해시 포함)
+- --max-p95 초: 세션 전체 p95가 넘으면 종료 코드 1 (회귀 감지용)
+
+프래그먼트 자동 재실행(run_every)은 보내지 않음 → 실제 브라우저보다 부하가 약간 낮게 측정됨
+
+사용법:
+    python benchmarks/bench_sessions.py [--sessions N] [--ramp 초] [--latency 초] [--image-per-mp 초]
+                                        [--error-rate 비율] [--rate-limit 비율] [--no-turntable]
+                                        [--max-p95 초] [--no-record]
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import warnings
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+warnings.simplefilter("ignore")
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+from benchmarks.bench_cold_start import current_commit
+from benchmarks.fake_services import FakeServices
+from mv_core.tracing import percentile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_PATH = os.path.join(ROOT, "app.py")
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "session_load_history.jsonl")
+STAGES = ("load", "plan", "scenes", "turntable", "exports")
+RUN_TIMEOUT_SECONDS = 600
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+TOPICS = ("비 내리는 네온 서울의 댄서", "새벽 한강을 달리는 러닝 크루", "폐공장에서 열리는 비밀 공연",
+          "첫눈 오는 날의 재회", "우주 정거장의 마지막 콘서트")
+
+
+# ------------------------------------------------------------------
+# 서버 프로세스 측정
+# ------------------------------------------------------------------
+def read_process_stats(pid):
+    """/proc에서 (누적 CPU 초, RSS MB, 스레드 수) - 읽을 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            status = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS   # utime + stime
+    rss_mb = int(status["VmRSS"].split()[0]) / 1024
+    return cpu_seconds, rss_mb, int(status["Threads"])
+
+
+class ProcessSampler:
+    """백그라운드 스레드로 interval마다 서버 프로세스 측정 → samples [{t, cpu_pct, rss_mb, threads, active}]"""
+
+    def __init__(self, pid, interval=0.5, active=lambda: 0):
+        self.pid = pid
+        self.interval = interval
+        self.active = active
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        started = time.perf_counter()
+        previous = read_process_stats(self.pid)
+        last = started
+        while not self._stop.wait(self.interval):
+            current = read_process_stats(self.pid)
+            now = time.perf_counter()
+            if current is None or previous is None:
+                break
+            self.samples.append({"t": now - started, "cpu_pct": (current[0] - previous[0]) / (now - last) * 100,
+                                 "rss_mb": current[1], "threads": current[2], "active": self.active()})
+            previous, last = current, now
+
+    def summary(self):
+        if not self.samples:
+            return {}
+        return {
+            "cpu_mean_pct": sum(s["cpu_pct"] for s in self.samples) / len(self.samples),
+            "cpu_peak_pct": max(s["cpu_pct"] for s in self.samples),
+            "rss_start_mb": self.samples[0]["rss_mb"],
+            "rss_peak_mb": max(s["rss_mb"] for s in self.samples),
+            "threads_start": self.samples[0]["threads"],
+            "threads_peak": max(s["threads"] for s in self.samples),
+        }
+
+
+# ------------------------------------------------------------------
+# 서버 기동
+# ------------------------------------------------------------------
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app_server(env, workdir, timeout=60):
+    """streamlit run app.py (workdir/.streamlit/secrets.toml에 가짜 키) → (process, port)"""
+    os.makedirs(os.path.join(workdir, ".streamlit"), exist_ok=True)
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w", encoding="utf-8") as f:
+        f.write('GOOGLE_API_KEY = "fake"\n')
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.abspath(APP_PATH), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false", "--server.enableXsrfProtection", "false",
+         "--server.fileWatcherType", "none"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    start = time.perf_counter()
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, port
+        except OSError:
+            pass
+        if process.poll() is not None or time.perf_counter() - start > timeout:
+            process.kill()
+            raise RuntimeError("streamlit 서버 기동 실패")
+        time.sleep(0.1)
+
+
+# ------------------------------------------------------------------
+# 세션 (웹소켓 클라이언트)
+# ------------------------------------------------------------------
+class AppSession:
+    """브라우저 탭 하나 흉내 - 스크립트 실행 요청 후 script_finished까지 ForwardMsg 수신
+
+    값 위젯(주제 입력)은 이후 실행에도 계속 보내고, 버튼 트리거는 해당 실행에만 보냄
+    """
+
+    def __init__(self, port, timeout=RUN_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self.ws = connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None,
+                          open_timeout=30)
+        self.widgets = {}      # 라벨 → 위젯 id (마지막 실행 기준)
+        self.values = {}       # 위젯 id → 유지할 WidgetState
+        self.exceptions = []
+        self.received_bytes = 0
+
+    def close(self):
+        self.ws.close()
+
+    def widget_id(self, label):
+        """라벨에 label이 들어간 위젯 id"""
+        for widget_label, widget_id in self.widgets.items():
+            if label in widget_label:
+                return widget_id
+        raise KeyError(f"위젯 없음: {label}")
+
+    def set_text(self, label, value):
+        widget_id = self.widget_id(label)
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    def run(self, click=None):
+        """스크립트 1회 실행 (click: 누를 버튼 라벨) → 경과 초"""
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        states = list(self.values.values())
+        if click:
+            states.append(WidgetState(id=self.widget_id(click), trigger_value=True))
+        message.rerun_script.widget_states.widgets.extend(states)
+
+        started = time.perf_counter()
+        self.ws.send(message.SerializeToString())
+        widgets = {}
+        while True:
+            data = self.ws.recv(timeout=self.timeout)
+            self.received_bytes += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                inner = getattr(element, element.WhichOneof("type"))
+                if element.WhichOneof("type") == "exception":
+                    self.exceptions.append(inner.message[:200])
+                elif getattr(inner, "id", "") and getattr(inner, "label", ""):
+                    widgets[inner.label] = inner.id
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("앱 컴파일 오류")
+                if forward.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    break
+        self.widgets = widgets or self.widgets
+        return time.perf_counter() - started
+
+
+def run_session(port, index, turntable=True):
+    """세션 1개 흐름 → {단계: 초, "total", "exceptions", "bytes", "error"}"""
+    result = {"index": index}
+    started = time.perf_counter()
+    try:
+        session = AppSession(port)
+        try:
+            result["load"] = session.run()
+            session.set_text("영상 주제", TOPICS[index % len(TOPICS)])
+            result["plan"] = session.run(click="프로젝트 생성")
+            result["scenes"] = session.run(click="모든 씬 이미지 생성")
+            if turntable:
+                result["turntable"] = session.run(click="모든 턴테이블 이미지 생성")
+            result["exports"] = session.run()
+        finally:
+            session.close()
+        result["exceptions"] = session.exceptions
+        result["bytes"] = session.received_bytes
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {str(e)[:120]}"
+    result["total"] = time.perf_counter() - started
+    return result
+
+
+def stage_summary(results):
+    """성공 세션의 단계별 {p50, p95, max} (초)"""
+    summary = {}
+    for stage in STAGES + ("total",):
+        values = sorted(r[stage] for r in results if "error" not in r and stage in r)
+        if values:
+            summary[stage] = {"p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "max": values[-1]}
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다중 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--ramp", type=float, default=5.0, help="세션 시작을 이 시간(초)에 걸쳐 분산")
+    parser.add_argument("--latency", type=float, default=0.1, help="서비스 공통 기본 지연 (초)")
+    parser.add_argument("--image-per-mp", type=float, default=1.0, help="이미지 메가픽셀당 추가 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--no-turntable", action="store_true")
+    parser.add_argument("--sample-interval", type=float, default=0.5)
+    parser.add_argument("--max-p95", type=float, default=None, help="세션 전체 p95 한도 (초)")
+    parser.add_argument("--no-record", action="store_true")
+    args = parser.parse_args()
+
+    services = FakeServices()
+    services.set_faults("all", latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit)
+    services.set_faults("pollinations", per_mp=args.image_per_mp)
+    services.set_faults("segmind", per_mp=args.image_per_mp)
+    services.set_faults("gemini", per_token=0.0005)
+
+    active = [0]
+    active_lock = threading.Lock()
+    results = [None] * args.sessions
+
+    def worker(index):
+        time.sleep(args.ramp * index / max(1, args.sessions))
+        with active_lock:
+            active[0] += 1
+        try:
+            results[index] = run_session(port, index, turntable=not args.no_turntable)
+        finally:
+            with active_lock:
+                active[0] -= 1
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, **services.env(), MV_TRACE_DIR=os.path.join(workdir, "traces"))
+        process, port = start_app_server(env, workdir)
+        sampler = ProcessSampler(process.pid, args.sample_interval, active=lambda: active[0]).start()
+        try:
+            started = time.perf_counter()
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            sampler.stop()
+            process.terminate()
+            process.wait(timeout=10)
+            services.shutdown()
+
+    failed = [r for r in results if "error" in r]
+    exceptions = sum(len(r.get("exceptions", ())) for r in results)
+    stages = stage_summary(results)
+    server = sampler.summary()
+
+    print("=" * 50)
+    print(f"다중 세션 부하 테스트 (세션 {args.sessions}개, 램프 {args.ramp}s, "
+          f"턴테이블 {'제외' if args.no_turntable else '포함'})")
+    print(f"대역 지연 {args.latency}s + 이미지 {args.image_per_mp}s/MP, 오류 {args.error_rate:.0%}, "
+          f"429 {args.rate_limit:.0%}")
+    print("=" * 50)
+    print(f"   경과 {elapsed:.1f}s | 완료 {args.sessions - len(failed)}/{args.sessions} | "
+          f"앱 예외 {exceptions} | 세션 {(args.sessions - len(failed)) / elapsed * 60:.1f}/분")
+
+    print(f"\n   {'단계':<10} {'p50':>8} {'p95':>8} {'최대':>8}")
+    for stage, row in stages.items():
+        print(f"   {stage:<10} {row['p50']:7.2f}s {row['p95']:7.2f}s {row['max']:7.2f}s")
+
+    if server:
+        print(f"\n   서버 CPU 평균 {server['cpu_mean_pct']:.0f}% / 최대 {server['cpu_peak_pct']:.0f}% | "
+              f"RSS {server['rss_start_mb']:.0f} → 최대 {server['rss_peak_mb']:.0f} MB | "
+              f"스레드 {server['threads_start']} → 최대 {server['threads_peak']}")
+        print(f"\n   {'시각':>6} {'세션':>4} {'CPU%':>6} {'RSS MB':>7} {'스레드':>5}")
+        step = max(1, len(sampler.samples) // 12)
+        for sample in sampler.samples[::step]:
+            print(f"   {sample['t']:5.1f}s {sample['active']:4d} {sample['cpu_pct']:6.0f} {sample['rss_mb']:7.0f} "
+                  f"{sample['threads']:5d}")
+
+    for r in failed[:5]:
+        print(f"   ⚠️ 세션 {r['index']}: {r['error']}")
+    for message in sorted({m for r in results for m in r.get("exceptions", ())})[:5]:
+        print(f"   ⚠️ 앱 예외: {message}")
+
+    record = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "sessions": args.sessions,
+        "turntable": not args.no_turntable,
+        "failed": len(failed),
+        "exceptions": exceptions,
+        "elapsed_s": round(elapsed, 2),
+        "stages": {stage: {k: round(v, 3) for k, v in row.items()} for stage, row in stages.items()},
+        "server": {k: round(v, 1) for k, v in server.items()},
+    }
+    if not args.no_record:
+        with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"\n기록: {os.path.relpath(HISTORY_PATH, ROOT)}")
+
+    total_p95 = stages.get("total", {}).get("p95")
+    if failed or (args.max_p95 is not None and (total_p95 is None or total_p95 > args.max_p95)):
+        sys.exit(1)
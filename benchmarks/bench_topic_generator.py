@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+중복 없는 대량 주제 생성 처리량 벤치마크
+- 기존 방식: generate_trending_topic() 반복 호출 + set으로 중복 제거
+- iter_unique_topics(): 무작위 / 균등 커버리지 모드
+
+사용법: python benchmarks/bench_topic_generator.py [주제수]
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import TRENDING_KEYWORDS, generate_trending_topic, iter_unique_topics, topic_space_size
+
+
+def naive_unique(count, seed):
+    rng = random.Random(seed)
+    seen = set()
+    topics = []
+    while len(topics) < count:
+        topic = generate_trending_topic(rng)
+        if topic not in seen:
+            seen.add(topic)
+            topics.append(topic)
+    return topics
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def keyword_spread(topics, category):
+    counts = Counter(value for topic in topics for value in TRENDING_KEYWORDS[category] if value in topic)
+    values = [counts.get(value, 0) for value in TRENDING_KEYWORDS[category]]
+    return min(values), max(values)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print("=" * 50)
+    print(f"주제 생성 벤치마크 ({count:,}개, 전체 조합 {topic_space_size():,}개)")
+    print("=" * 50)
+    runs = [
+        ("기존 반복 호출 + set", lambda: naive_unique(count, 1)),
+        ("iter_unique_topics (무작위)", lambda: list(iter_unique_topics(count, seed=1, balanced=False))),
+        ("iter_unique_topics (균등)", lambda: list(iter_unique_topics(count, seed=1))),
+    ]
+    sample = min(count, 3000)
+    for label, fn in runs:
+        elapsed, topics = timed(fn)
+        assert len(set(topics)) == count
+        low, high = keyword_spread(topics[:sample], "characters")
+        print(f"   {label:<28} {elapsed:6.2f}s  {count / elapsed:9,.0f}개/s  "
+              f"앞 {sample}개 캐릭터 사용 횟수 {low}~{high}")
+
+    start = time.perf_counter()
+    first = next(iter_unique_topics(seed=1))
+    print(f"\n   스트림 첫 주제까지: {(time.perf_counter() - start) * 1000:.2f} ms")
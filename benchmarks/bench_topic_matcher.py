@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+주제 → 자동 영상 설정 매처 벤치마크 (기존 부분 문자열 검사 vs 컴파일된 트라이 정규식)
+사용법: python benchmarks/bench_topic_matcher.py [주제수]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mv_core import TopicKeywordMatcher, analyze_topic_for_auto_settings, analyze_topics_for_auto_settings
+from mv_core.topic_settings import GENRE_KEYWORDS, MUSIC_KEYWORDS, VISUAL_KEYWORDS
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures", "auto_settings_regression.json")
+
+
+def legacy_analyze_topic_for_auto_settings(topic):
+    """기존 구현 (매 호출 사전 생성 + 키워드별 부분 문자열 검사) - 비교 기준"""
+    topic_lower = topic.lower()
+
+    # 키워드 매핑 사전
+    genre_keywords = {
+        0: ["액션", "action", "전쟁", "war", "전투", "battle", "싸움", "fight", "추격", "chase", "폭발", "explosion"],
+        1: ["sf", "sci-fi", "우주", "space", "미래", "future", "로봇", "robot", "외계인", "alien", "우주선"],
+        2: ["판타지", "fantasy", "마법", "magic", "용", "dragon", "기사", "knight", "엘프", "elf", "던전"],
+        3: ["공포", "horror", "호러", "귀신", "ghost", "좀비", "zombie", "무서운", "scary", "심리", "psychological"],
+        4: ["사랑", "love", "연애", "romance", "이별", "breakup", "그리움", "longing", "첫사랑", "고백"],
+        5: ["느와르", "noir", "범죄", "crime", "탐정", "detective", "미스터리", "mystery", "암흑가"],
+        6: ["사이버펑크", "cyberpunk", "네온", "neon", "해커", "hacker", "디스토피아", "매트릭스"],
+        7: ["종말", "apocalypse", "폐허", "ruins", "서바이벌", "survival", "황무지", "wasteland"],
+        8: ["추상", "abstract", "초현실", "surreal", "꿈", "dream", "환각", "무의식"],
+        9: ["퍼포먼스", "performance", "무대", "stage", "라이브", "live", "콘서트", "concert"],
+        10: ["스토리", "story", "이야기", "narrative", "드라마", "drama", "서사"],
+        11: ["실험", "experimental", "아방가르드", "avant-garde", "예술", "art"],
+        12: ["애니메이션", "animation", "애니", "anime", "만화", "cartoon", "일본", "japan"],
+        13: ["다큐", "documentary", "실제", "real", "현실", "reality", "인터뷰"],
+        16: ["댄스", "dance", "춤", "안무", "choreography", "발레", "ballet", "힙합댄스"],
+        17: ["시", "poem", "시적", "poetic", "감성", "emotional", "서정"],
+        18: ["사회", "social", "비판", "critique", "메시지", "message", "현대사회"],
+        19: ["우주공포", "cosmic", "크툴루", "lovecraft", "미지", "unknown"],
+        20: ["마술적", "magical realism", "기묘한", "strange", "일상속비일상"],
+        21: ["미래도시", "dystopia", "통제사회", "빅브라더", "감시"],
+        22: ["역사", "historical", "시대극", "왕조", "중세", "고대"],
+        23: ["일상", "daily", "slice of life", "평범한", "소소한"]
+    }
+
+    visual_keywords = {
+        0: ["실사", "realistic", "영화", "cinematic", "현실적"],
+        1: ["초고화질", "8k", "4k", "하이퍼", "hyper", "극사실"],
+        2: ["애니", "anime", "망가", "manga", "일본애니", "셀애니"],
+        3: ["3d", "픽사", "pixar", "디즈니", "disney", "cg"],
+        4: ["2d", "셀", "전통", "hand-drawn"],
+        5: ["수채화", "watercolor", "파스텔", "부드러운"],
+        6: ["유화", "oil painting", "고전", "classical", "르네상스"],
+        7: ["사이버펑크", "cyberpunk", "네온", "neon", "미래도시"],
+        8: ["다크판타지", "dark fantasy", "고딕", "gothic", "어둠"],
+        9: ["파스텔", "pastel", "dreamy", "몽환", "부드러운"],
+        10: ["흑백", "b&w", "black and white", "모노크롬", "필름누아르"],
+        11: ["레트로", "retro", "80년대", "80s", "vhs", "복고"],
+        12: ["베이퍼웨이브", "vaporwave", "증기파", "핑크", "보라"],
+        13: ["로파이", "lo-fi", "인디", "indie", "그런지"],
+        14: ["패션", "fashion", "하이패션", "에디토리얼", "보그"],
+        15: ["다큐", "documentary", "거친", "gritty", "리얼"],
+        16: ["초현실", "surrealist", "달리", "마그리트", "기묘한"],
+        17: ["미니멀", "minimal", "심플", "simple", "깔끔한"],
+        18: ["맥시멀", "maximalist", "화려한", "바로크", "baroque"],
+        19: ["글리치", "glitch", "디지털", "digital", "노이즈"]
+    }
+
+    music_keywords = {
+        0: ["팝", "pop", "대중", "mainstream"],
+        1: ["록", "rock", "기타", "guitar", "밴드"],
+        2: ["힙합", "hip-hop", "랩", "rap", "비트"],
+        3: ["일렉", "electronic", "edm", "클럽", "club"],
+        4: ["알앤비", "r&b", "소울", "soul", "감미로운"],
+        5: ["재즈", "jazz", "스윙", "swing", "블루스"],
+        6: ["클래식", "classical", "오케스트라", "피아노", "바이올린"],
+        7: ["메탈", "metal", "헤비", "heavy", "하드록"],
+        8: ["인디", "indie", "독립", "alternative"],
+        9: ["케이팝", "k-pop", "kpop", "아이돌", "idol"],
+        10: ["로파이", "lo-fi", "lofi", "잔잔한", "공부"],
+        11: ["트랩", "trap", "808", "베이스"],
+        12: ["하우스", "house", "디스코", "disco"],
+        13: ["테크노", "techno", "언더그라운드"],
+        14: ["앰비언트", "ambient", "분위기", "배경음악"],
+        15: ["신스웨이브", "synthwave", "레트로", "80년대음악"],
+        16: ["퐁크", "phonk", "drift", "드리프트"],
+        17: ["드릴", "drill", "영국", "uk"],
+        18: ["아프로비트", "afrobeat", "아프리카"],
+        19: ["라틴", "latin", "레게톤", "살사"],
+        20: ["포크", "folk", "어쿠스틱", "acoustic"],
+        21: ["컨트리", "country", "미국남부"],
+        22: ["오케스트라", "orchestral", "cinematic", "영화음악", "웅장"],
+        23: ["실험음악", "experimental", "노이즈"],
+        24: ["포스트록", "post-rock", "슬로우"],
+        25: ["드림팝", "dream pop", "몽환적"],
+        26: ["슈게이징", "shoegaze", "노이즈팝"]
+    }
+
+    def find_best_match(keywords_dict, default=0):
+        scores = {idx: 0 for idx in keywords_dict}
+        for idx, keywords in keywords_dict.items():
+            for keyword in keywords:
+                if keyword in topic_lower:
+                    scores[idx] += 1
+
+        max_score = max(scores.values())
+        if max_score > 0:
+            for idx, score in scores.items():
+                if score == max_score:
+                    return idx
+        return default
+
+    genre_idx = find_best_match(genre_keywords, 0)
+    visual_idx = find_best_match(visual_keywords, 0)
+    music_idx = find_best_match(music_keywords, 0)
+
+    # 장르-스타일 연관성 보정
+    genre_visual_mapping = {
+        6: 7,   # Cyberpunk → Cyberpunk Neon
+        2: 8,   # Dark Fantasy → Dark Fantasy Gothic
+        12: 2,  # Anime/Animation → Anime/Manga
+        3: 8,   # Psychological Horror → Dark Fantasy Gothic
+        5: 10,  # Neo-Noir → Black & White Film Noir
+        22: 6,  # Historical Epic → Oil Painting Classical
+    }
+
+    genre_music_mapping = {
+        6: 15,  # Cyberpunk → Synthwave
+        12: 9,  # Anime/Animation → K-Pop or J-Pop related
+        22: 22, # Historical Epic → Orchestral/Cinematic
+        3: 14,  # Psychological Horror → Ambient
+        1: 3,   # Sci-Fi Epic → Electronic/EDM
+    }
+
+    # 스타일이 기본값이면 장르에 맞춰 보정
+    if visual_idx == 0 and genre_idx in genre_visual_mapping:
+        visual_idx = genre_visual_mapping[genre_idx]
+
+    if music_idx == 0 and genre_idx in genre_music_mapping:
+        music_idx = genre_music_mapping[genre_idx]
+
+    return genre_idx, visual_idx, music_idx
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with open(FIXTURE, encoding="utf-8") as f:
+        corpus = [entry["topic"] for entry in json.load(f)["topics"]]
+    topics = (corpus * (count // len(corpus) + 1))[:count]
+
+    substring = TopicKeywordMatcher(
+        {"genre": GENRE_KEYWORDS, "visual": VISUAL_KEYWORDS, "music": MUSIC_KEYWORDS}, word_boundaries=False)
+
+    print("=" * 50)
+    print(f"자동 영상 설정 매처 벤치마크 (주제 {count}개, 평균 {sum(map(len, topics)) / count:.0f}자)")
+    print("=" * 50)
+    legacy_ms, legacy_out = timed(lambda: [legacy_analyze_topic_for_auto_settings(t) for t in topics])
+    substring_ms, substring_out = timed(lambda: [analyze_topic_for_auto_settings(t, substring) for t in topics])
+    compiled_ms, compiled_out = timed(lambda: analyze_topics_for_auto_settings(topics))
+    assert substring_out == legacy_out, "부분 문자열 모드 결과 불일치"
+    changed = sum(a != b for a, b in zip(legacy_out, compiled_out))
+
+    print(f"   기존 구현:                {legacy_ms:8.1f} ms  ({legacy_ms * 1000 / count:6.1f} µs/주제)")
+    print(f"   컴파일 (부분 문자열 모드): {substring_ms:8.1f} ms  ({substring_ms * 1000 / count:6.1f} µs/주제, x{legacy_ms / substring_ms:.1f})")
+    print(f"   컴파일 (경계 규칙, 기본):  {compiled_ms:8.1f} ms  ({compiled_ms * 1000 / count:6.1f} µs/주제, x{legacy_ms / compiled_ms:.1f})")
+    print(f"   경계 규칙으로 결과가 바뀐 주제: {changed}/{count}")
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+로컬 대역 서버 모음 (포트 하나에 경로로 구분)
+- Gemini      POST /v1beta/models/{model}:generateContent  → 기획안 JSON / 키워드 필터 / 콘셉트(단건·일괄) / 바이럴 주제
+- Pollinations GET /prompt/{prompt}?width=&height=&seed=   → 요청 크기의 합성 PNG
+- Segmind     POST /v1/sdxl1.0-txt2img                     → img_width × img_height 합성 PNG (x-api-key 필요)
+                                                              base64=true면 {"image": base64 (samples > 1이면 목록)}
+- JSONBin     GET /v3/b/{bin}/latest, PUT /v3/b/{bin}     → 메모리 저장 (X-Master-Key 필요)
+- Trends      GET /trends/rss?geo=                         → tests/fixtures/trends_kr.xml
+
+서비스별 장애 주입: latency(초) + jitter(초, 균등) + per_mp(메가픽셀당 초, 이미지만) + per_token(출력 토큰당 초, Gemini만)
+                 + error_rate(500) + rate_limit_rate(429, Retry-After: 1)
+env()가 돌려주는 환경 변수(MV_*_URL 등)를 설정하면 mv_core가 이 서버로 요청
+
+사용법:
+    python benchmarks/fake_services.py [포트] [--latency 초] [--jitter 초] [--per-token 초] [--error-rate 비율] [--rate-limit 비율]
+"""
+import argparse
+import ast
+import base64
+import json
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures")
+SERVICES = ("gemini", "pollinations", "segmind", "jsonbin", "trends")
+DEFAULT_FAULTS = {"latency": 0.0, "jitter": 0.0, "per_mp": 0.0, "per_token": 0.0, "error_rate": 0.0,
+                  "rate_limit_rate": 0.0}
+
+SCENE_COUNT_RE = re.compile(r"Generate exactly (\d+) scenes\.")
+FILTER_INPUT_RE = re.compile(r"트렌드 키워드: (\[.*?\])")
+BATCH_INPUT_RE = re.compile(r"^(\d+)\. 트렌드 키워드: (.*?) \|", re.MULTILINE)
+SINGLE_INPUT_RE = re.compile(r"- 트렌드 키워드: (.*)")
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (영문 4자 ≈ 1토큰, 한글 1.5자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    other_chars = len(text) - ascii_chars
+    return max(1, round(ascii_chars / 4 + other_chars / 1.5))
+
+
+# ------------------------------------------------------------------
+# 가짜 응답
+# ------------------------------------------------------------------
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+_PLAN_TEMPLATE = json.loads(_load_fixture("plan_neon_seoul.json"))
+_TRENDS_RSS = _load_fixture("trends_kr.xml").encode("utf-8")
+
+
+def fake_plan(scene_count):
+    """픽스처 기획안을 요청한 씬 수로 늘리거나 줄임 (씬 번호 다시 매김)"""
+    plan = json.loads(json.dumps(_PLAN_TEMPLATE))
+    template_scenes = plan["scenes"]
+    plan["scenes"] = [dict(template_scenes[i % len(template_scenes)], scene_num=i + 1) for i in range(scene_count)]
+    return plan
+
+
+def fake_concept(keyword):
+    return (f"A lone dancer drifts through a rain-soaked neon alley as the city hums with {keyword}, "
+            f"her reflection splitting across puddles into a crowd of strangers. "
+            f"Handheld tracking shots, teal-and-magenta grading and slow-motion sparks turn {keyword} "
+            f"into a story about finding yourself in the noise.")
+
+
+def fake_response_text(prompt):
+    """프롬프트 형태에 맞는 가짜 응답"""
+    scene_count = SCENE_COUNT_RE.search(prompt)
+    if scene_count:
+        return "```json\n" + json.dumps(fake_plan(int(scene_count.group(1))), ensure_ascii=False, indent=2) + "\n```"
+    if "filtered_keywords" in prompt:
+        match = FILTER_INPUT_RE.search(prompt)
+        keywords = ast.literal_eval(match.group(1)) if match else []
+        filtered = [{"keyword": kw, "angle": f"{kw}를 퍼포먼스 영상으로", "concept_hint": "네온, 원테이크"}
+                    for kw in keywords[:5]]
+        return json.dumps({"filtered_keywords": filtered}, ensure_ascii=False)
+    batch = BATCH_INPUT_RE.findall(prompt)
+    if batch:
+        entries = [{"index": int(i), "keyword": kw, "concept": fake_concept(kw)} for i, kw in batch]
+        return "```json\n" + json.dumps(entries, ensure_ascii=False, indent=2) + "\n```"
+    single = SINGLE_INPUT_RE.search(prompt)
+    return fake_concept(single.group(1).strip() if single else "the trend")
+
+
+def synthetic_png(width, height, seed=0):
+    """요청 크기의 합성 PNG (세로 그라데이션 + 시드별 색, PIL 없이 생성)"""
+    rng = random.Random(seed)
+    base = [rng.randint(40, 200) for _ in range(3)]
+    rows = []
+    for y in range(height):
+        shade = y * 80 // max(1, height - 1)
+        pixel = bytes(min(255, c + shade) for c in base)
+        rows.append(b"\x00" + pixel * width)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"".join(rows), 1))
+            + chunk(b"IEND", b""))
+
+
+# ------------------------------------------------------------------
+# 서버
+# ------------------------------------------------------------------
+class FakeServices:
+    """대역 서버 묶음 (백그라운드 스레드)
+
+    faults: {서비스: {latency, jitter, per_mp, per_token, error_rate, rate_limit_rate}} - 실행 중 set_faults로 변경 가능
+    snapshot(): {서비스: {"requests", "errors", "rate_limited"}} (gemini는 prompt_tokens / output_tokens 추가)
+    """
+
+    def __init__(self, port=0, faults=None, seed=0):
+        self.faults = {service: dict(DEFAULT_FAULTS) for service in SERVICES}
+        for service, values in (faults or {}).items():
+            self.set_faults(service, **values)
+        self.stats = {service: {"requests": 0, "errors": 0, "rate_limited": 0} for service in SERVICES}
+        self.stats["gemini"].update(prompt_tokens=0, output_tokens=0)
+        self.bins = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def set_faults(self, service, **values):
+        """서비스 하나의 장애 설정 변경 (service="all"이면 전부)"""
+        for name in SERVICES if service == "all" else (service,):
+            unknown = set(values) - set(DEFAULT_FAULTS)
+            if unknown:
+                raise ValueError(f"unknown fault: {sorted(unknown)}")
+            self.faults[name].update(values)
+
+    def env(self):
+        """mv_core가 이 서버를 쓰게 하는 환경 변수"""
+        return {
+            "MV_GEMINI_API_ENDPOINT": self.base_url,
+            "MV_POLLINATIONS_BASE_URL": f"{self.base_url}/prompt/",
+            "MV_SEGMIND_URL": f"{self.base_url}/v1/sdxl1.0-txt2img",
+            "MV_JSONBIN_API_URL": f"{self.base_url}/v3",
+            "MV_TRENDS_RSS_URL": f"{self.base_url}/trends/rss?geo={{geo}}",
+        }
+
+    @contextmanager
+    def applied(self):
+        """with 블록 동안 env()를 os.environ에 적용"""
+        previous = {key: os.environ.get(key) for key in self.env()}
+        os.environ.update(self.env())
+        try:
+            yield self
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def snapshot(self):
+        """서비스별 통계 복사본"""
+        with self._lock:
+            return {service: dict(stat) for service, stat in self.stats.items()}
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _inject(self, service, megapixels=0.0):
+        """장애 주입 → 보낼 오류 상태 코드 (정상이면 None)"""
+        faults = self.faults[service]
+        with self._lock:
+            self.stats[service]["requests"] += 1
+            roll = self._rng.random()
+            delay = faults["latency"] + self._rng.uniform(0, faults["jitter"]) + faults["per_mp"] * megapixels
+            status = None
+            if roll < faults["rate_limit_rate"]:
+                status = 429
+                self.stats[service]["rate_limited"] += 1
+            elif roll < faults["rate_limit_rate"] + faults["error_rate"]:
+                status = 500
+                self.stats[service]["errors"] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return status
+
+    def _make_handler(self):
+        services = self
+
+        class FakeServicesHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, body=b"", content_type="application/json", headers=None):
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_fault(self, status):
+                headers = {"Retry-After": "1"} if status == 429 else None
+                self._send(status, {"error": {"code": status, "message": "injected fault"}}, headers=headers)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+            def do_GET(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                if parsed.path.startswith("/prompt/"):
+                    width, height = int(query.get("width", 512)), int(query.get("height", 512))
+                    status = services._inject("pollinations", width * height / 1e6)
+                    if status:
+                        return self._send_fault(status)
+                    return self._send(200, synthetic_png(width, height, int(query.get("seed", 0))), "image/jpeg")
+                if parsed.path.startswith("/v3/b/") and parsed.path.endswith("/latest"):
+                    status = services._inject("jsonbin")
+                    if status:
+                        return self._send_fault(status)
+                    if not self.headers.get("X-Master-Key"):
+                        return self._send(401, {"message": "X-Master-Key required"})
+                    bin_id = parsed.path.split("/")[3]
+                    return self._send(200, {"record": services.bins.get(bin_id, {"projects": []}),
+                                            "metadata": {"id": bin_id}})
+                if parsed.path == "/trends/rss":
+                    status = services._inject("trends")
+                    if status:
+                        return self._send_fault(status)
+                    return self._send(200, _TRENDS_RSS, "application/rss+xml; charset=utf-8")
+                self._send(404, {"message": "not found"})
+
+            def do_POST(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                body = self._read_json()
+                if parsed.path.endswith(":generateContent"):
+                    status = services._inject("gemini")
+                    if status:
+                        return self._send_fault(status)
+                    prompt = "".join(part.get("text", "") for content in body.get("contents", [])
+                                     for part in content.get("parts", []))
+                    text = fake_response_text(prompt)
+                    prompt_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(text)
+                    with services._lock:
+                        services.stats["gemini"]["prompt_tokens"] += prompt_tokens
+                        services.stats["gemini"]["output_tokens"] += output_tokens
+                    time.sleep(services.faults["gemini"]["per_token"] * output_tokens)
+                    return self._send(200, {
+                        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                                        "finishReason": "STOP", "index": 0}],
+                        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+                                          "totalTokenCount": prompt_tokens + output_tokens},
+                    })
+                if parsed.path == "/v1/sdxl1.0-txt2img":
+                    width, height = int(body.get("img_width", 1024)), int(body.get("img_height", 1024))
+                    status = services._inject("segmind", width * height / 1e6 * int(body.get("samples", 1)))
+                    if status:
+                        return self._send_fault(status)
+                    if not self.headers.get("x-api-key"):
+                        return self._send(401, {"message": "x-api-key required"})
+                    seed, samples = int(body.get("seed", 0)), int(body.get("samples", 1))
+                    if body.get("base64"):
+                        images = [base64.b64encode(synthetic_png(width, height, seed + i)).decode("ascii")
+                                  for i in range(samples)]
+                        return self._send(200, {"image": images if samples > 1 else images[0]})
+                    return self._send(200, synthetic_png(width, height, seed), "image/jpeg")
+                self._send(404, {"message": "not found"})
+
+            def do_PUT(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                if parsed.path.startswith("/v3/b/"):
+                    body = self._read_json()
+                    status = services._inject("jsonbin")
+                    if status:
+                        return self._send_fault(status)
+                    if not self.headers.get("X-Master-Key"):
+                        return self._send(401, {"message": "X-Master-Key required"})
+                    bin_id = parsed.path.split("/")[3]
+                    services.bins[bin_id] = body
+                    return self._send(200, {"record": body, "metadata": {"parentId": bin_id}})
+                self._send(404, {"message": "not found"})
+
+            def log_message(self, format, *args):
+                pass
+
+        return FakeServicesHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 대역 서버 모음")
+    parser.add_argument("port", nargs="?", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--per-token", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    args = parser.parse_args()
+
+    services = FakeServices(args.port)
+    services.set_faults("all", latency=args.latency, jitter=args.jitter, per_token=args.per_token, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit)
+    print(f"대역 서버: {services.base_url}")
+    for key, value in services.env().items():
+        print(f"export {key}='{value}'")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        services.shutdown()
+        sys.exit(0)
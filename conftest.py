@@ -0,0 +1,2 @@
+# 루트의 test_gemini_models.py / test_nanobanana.py 는 API 키가 필요한 수동 실행 스크립트
+collect_ignore = ["test_gemini_models.py", "test_nanobanana.py"]
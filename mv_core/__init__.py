@@ -0,0 +1,139 @@
+"""
+AI MV Director Pro 코어 (Streamlit 의존성 없음)
+"""
+from .profiles import (
+    TURNTABLE_CATEGORIES,
+    TurntableIndex,
+    apply_json_profiles_to_prompt,
+    json_profile_to_ultra_detailed_text,
+    profile_palette,
+)
+from .plan_index import CompiledPlan, turntable_key
+from .prompt_budget import PROVIDER_PROMPT_LIMITS, budget_prompt
+from .providers import (
+    AUTO_ENGINE,
+    ENGINE_STYLE_FAMILIES,
+    IMAGE_ENGINES,
+    POLLINATIONS_BASE_URL,
+    build_pollinations_url,
+    engine_for_model,
+    enhance_prompt_for_provider,
+    pollinations_model_for,
+    style_family_for,
+)
+from .trends import GOOGLE_TRENDS_RSS_URL, TrendFeed, parse_trends_rss
+from .concepts import (
+    DEFAULT_PREFETCH_TOP_N,
+    ConceptPrefetcher,
+    build_batch_concept_prompt,
+    build_concept_prompt,
+    concept_key,
+    fallback_concept,
+    keyword_fields,
+    parse_concept_array,
+)
+from .topic_settings import (
+    TOPIC_MATCHER,
+    TopicKeywordMatcher,
+    analyze_topic_for_auto_settings,
+    analyze_topics_for_auto_settings,
+)
+from .topics import (
+    TOPIC_TEMPLATES,
+    TRENDING_KEYWORDS,
+    generate_trending_topic,
+    generate_unique_topics,
+    iter_unique_topics,
+    topic_space_size,
+)
+from .novelty import NoveltyIndex, pick_novel, project_texts
+from .keyword_filter import (
+    DEFAULT_TOP_K,
+    KeywordFilter,
+    build_filter_prompt,
+    estimate_tokens,
+    keyword_relevance,
+    profile_terms,
+    rank_keywords,
+)
+from .catalog import (
+    CATEGORY_PROFILES,
+    FALLBACK_TREND_KEYWORDS,
+    MUSIC_GENRES,
+    SEASONAL_KEYWORDS,
+    VIDEO_GENRES,
+    VISUAL_STYLE_EMPHASIS,
+    VISUAL_STYLES,
+    get_category_profile,
+    get_seasonal_keywords,
+    get_visual_style_emphasis,
+)
+from .callbacks import CallbackQueue, null_event, null_log, null_notify, null_progress
+from .llm import (
+    generate_viral_concept_from_keyword,
+    generate_viral_concepts_batch,
+    configure_gemini,
+    generate_with_fallback,
+    get_viral_topic_with_ai,
+    llm_filter_keywords,
+)
+from .planning import PlanGenerationError, clean_json_text, generate_plan, get_system_prompt
+from .exports import (
+    create_html_export,
+    create_json_export,
+    create_text_export,
+    export_project_json,
+    prepare_project_for_save,
+)
+from .storage import (
+    JSONBIN_API_URL,
+    add_project_to_list,
+    delete_project_from_list,
+    load_project_list_from_jsonbin,
+    save_project_list_to_jsonbin,
+)
+from .images import (
+    budget_prompt_with_log,
+    generate_image_pollinations,
+    generate_image_segmind,
+    generate_image_with_fallback,
+    generate_segmind_samples,
+    generate_preview_images,
+    get_preview_size,
+    image_generation_steps,
+    parse_segmind_samples,
+    run_steps,
+)
+from .tracing import (
+    SpanSink,
+    Tracer,
+    activate_tracer,
+    span,
+    stage_percentiles,
+    traced_sleep,
+    use_tracer,
+)
+from .generation_events import GenerationEventStore, histogram_quantile, sparkline
+from .engine_bench import (
+    BENCH_PROMPTS,
+    EngineBenchHistory,
+    benchmark_engines,
+    choose_engine,
+    engine_stats,
+    fetch_engine_image,
+    summarize_bench,
+)
+from .endpoints import (
+    gemini_api_endpoint,
+    jsonbin_api_url,
+    pollinations_base_url,
+    segmind_url,
+    trends_rss_url,
+)
+from .singleflight import SingleFlight, request_key
+from .image_bytes import ImageBytes, is_truncated, placeholder_hashes, read_image_header, validate_image
+from .variations import DEFAULT_VARIATIONS, MAX_VARIATIONS, VariationSet, generate_variations, variation_seeds
+from .quality_gate import QualityGate, frame_metrics, hex_to_rgb
+from .image_hash import DEFAULT_MAX_DISTANCE, duplicate_groups, find_near_duplicates, find_reusable, flagged_keys, hamming, image_hash
+from .manifest import JobManifest, project_id, prompt_hash, run_batch, submit_batch
+from .scheduler import DEFAULT_SCHEDULER_WORKERS, PRIORITY_CLASSES, GenerationScheduler
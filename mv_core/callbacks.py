@@ -0,0 +1,50 @@
+"""
+UI 없이 코어를 쓸 때의 기본 콜백
+- log(message, level): 이미지 생성 로그 (level: info, success, warn, error, model)
+- notify(message, level): 사용자 알림 (level: info, success, warn / Streamlit에서는 warn만 경고, 나머지는 토스트)
+- progress(done, total, message): 진행률
+- event(provider, model, outcome, latency_ms, attempt, http, detail, megapixels): 이미지 요청 결과
+  (GenerationEventStore.record와 같은 모양)
+"""
+import threading
+
+
+def null_log(message, level="info"):
+    """로그 버림"""
+
+
+def null_notify(message, level="info"):
+    """알림 버림"""
+
+
+def null_progress(done, total, message=""):
+    """진행률 버림"""
+
+
+def null_event(provider, model, outcome, latency_ms=None, attempt=1, http=None, detail="", megapixels=None):
+    """요청 결과 버림"""
+
+
+class CallbackQueue:
+    """작업 스레드의 log/event 호출을 모아 두었다가 호출한 스레드에서 순서대로 전달
+
+    Streamlit 콜백은 스크립트 스레드에서만 세션에 접근할 수 있음
+    """
+
+    def __init__(self):
+        self._calls = []
+        self._lock = threading.Lock()
+
+    def log(self, *args, **kwargs):
+        with self._lock:
+            self._calls.append(("log", args, kwargs))
+
+    def event(self, *args, **kwargs):
+        with self._lock:
+            self._calls.append(("event", args, kwargs))
+
+    def replay(self, log, event):
+        with self._lock:
+            calls, self._calls = self._calls, []
+        for kind, args, kwargs in calls:
+            (log if kind == "log" else event)(*args, **kwargs)
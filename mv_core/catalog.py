@@ -0,0 +1,233 @@
+"""
+카테고리 / 장르 / 스타일 조회 테이블
+모듈 로드 시 한 번만 만들어 두고 Streamlit 재실행마다 다시 만들지 않음
+"""
+from datetime import datetime
+
+# ------------------------------------------------------------------
+# 트렌드 스카우터: 시즌 키워드 + 영상 카테고리 프로필
+# ------------------------------------------------------------------
+SEASONAL_KEYWORDS = {
+    1: ["새해", "신년", "겨울", "설날", "다이어트", "새출발", "목표", "결심"],
+    2: ["발렌타인", "졸업", "입시", "봄", "설렘", "고백", "초콜릿"],
+    3: ["봄", "벚꽃", "새학기", "입학", "취업", "이직", "새출발"],
+    4: ["봄꽃", "벚꽃", "여행", "피크닉", "청춘", "자연"],
+    5: ["어버이날", "가정의달", "어린이날", "감사", "가족", "선물"],
+    6: ["여름", "휴가", "바다", "페스티벌", "청량", "에너지"],
+    7: ["여름휴가", "바캉스", "해변", "물놀이", "시원함", "열정"],
+    8: ["말복", "여름끝", "가을준비", "개학", "추억", "밤"],
+    9: ["가을", "추석", "단풍", "감성", "쓸쓸함", "회고"],
+    10: ["할로윈", "가을", "단풍", "공포", "미스터리", "변신"],
+    11: ["빼빼로데이", "수능", "가을끝", "쓸쓸함", "위로", "응원"],
+    12: ["크리스마스", "연말", "겨울", "눈", "회고", "송년", "파티", "선물"]
+}
+
+# 영상 카테고리별 전문 키워드 & 특성
+CATEGORY_PROFILES = {
+    "뮤직비디오": {
+        "keywords": ["퍼포먼스", "안무", "립싱크", "원테이크", "컬러그레이딩", "아티스트", "앨범", "컴백",
+                    "비주얼", "세트", "로케이션", "스토리텔링", "감성", "에너지", "바이브"],
+        "themes": ["사랑", "이별", "자유", "반항", "꿈", "열정", "고독", "희망", "파티", "밤"],
+        "visual_refs": ["Hype Williams", "Dave Meyers", "Joseph Kahn", "Michel Gondry", "Spike Jonze"],
+        "style_guide": "강렬한 비주얼, 아티스트 중심, 음악과 싱크, 감정 극대화"
+    },
+    "단편영화": {
+        "keywords": ["내러티브", "캐릭터", "플롯", "트위스트", "대사", "연기", "촬영", "조명",
+                    "사운드디자인", "편집", "컷", "시퀀스", "클라이맥스", "엔딩"],
+        "themes": ["인간관계", "성장", "상실", "발견", "갈등", "화해", "비밀", "운명", "선택"],
+        "visual_refs": ["Sundance", "Cannes Short", "Korean Short Film", "A24 style"],
+        "style_guide": "15분 이내, 명확한 서사 구조, 강렬한 엔딩, 캐릭터 아크"
+    },
+    "장편영화": {
+        "keywords": ["3막구조", "캐릭터아크", "서브플롯", "장르", "톤", "페이싱", "시네마토그래피",
+                    "프로덕션디자인", "캐스팅", "스코어", "VFX", "로케이션"],
+        "themes": ["영웅의여정", "복수", "사랑", "생존", "정의", "가족", "전쟁", "모험", "미스터리"],
+        "visual_refs": ["Christopher Nolan", "Denis Villeneuve", "Bong Joon-ho", "Park Chan-wook"],
+        "style_guide": "90분 이상, 복잡한 캐릭터, 다층적 스토리, 영화적 스케일"
+    },
+    "실험영화/아트필름": {
+        "keywords": ["추상", "비선형", "시적", "상징", "메타포", "텍스처", "사운드스케이프",
+                    "슬로우시네마", "미니멀", "초현실", "꿈", "무의식", "시간"],
+        "themes": ["존재", "시간", "공간", "기억", "정체성", "죽음", "탄생", "순환", "카오스"],
+        "visual_refs": ["Terrence Malick", "Tarkovsky", "David Lynch", "Maya Deren", "Stan Brakhage"],
+        "style_guide": "실험적 형식, 비선형 내러티브, 시각적 시, 감각적 경험"
+    },
+    "상업광고/CF": {
+        "keywords": ["브랜드", "제품", "USP", "타겟", "CTA", "후킹", "15초", "30초",
+                    "슬로건", "로고", "팩샷", "모델", "라이프스타일"],
+        "themes": ["욕망", "해결책", "변화", "행복", "성공", "젊음", "트렌드", "프리미엄"],
+        "visual_refs": ["Apple", "Nike", "Samsung", "Coca-Cola style"],
+        "style_guide": "짧고 임팩트있게, 브랜드 메시지 명확, 감정 자극, 기억에 남는 비주얼"
+    },
+    "브랜드필름": {
+        "keywords": ["브랜드스토리", "가치", "미션", "비전", "헤리티지", "장인정신",
+                    "인터뷰", "비하인드", "프로세스", "철학", "커뮤니티"],
+        "themes": ["진정성", "장인정신", "혁신", "전통", "미래", "사람", "열정", "품질"],
+        "visual_refs": ["Patagonia", "Apple Behind the Mac", "Nike Origin stories"],
+        "style_guide": "2-5분, 브랜드 철학 전달, 감성적 연결, 다큐멘터리 터치"
+    },
+    "패션필름": {
+        "keywords": ["룩북", "컬렉션", "런웨이", "에디토리얼", "모델", "스타일링", "무드",
+                    "시즌", "트렌드", "하이패션", "스트릿", "꾸뛰르"],
+        "themes": ["아름다움", "욕망", "정체성", "변신", "시대정신", "반항", "우아함"],
+        "visual_refs": ["Nick Knight", "Steven Meisel", "Helmut Newton", "Guy Bourdin"],
+        "style_guide": "비주얼 중심, 옷이 주인공, 무드와 분위기, 아트디렉션 중요"
+    },
+    "애니메이션": {
+        "keywords": ["캐릭터디자인", "스토리보드", "애니메틱", "키프레임", "인비트윈",
+                    "2D", "3D", "스톱모션", "로토스코핑", "셀애니", "모션캡처"],
+        "themes": ["성장", "모험", "우정", "가족", "판타지", "SF", "코미디", "액션"],
+        "visual_refs": ["Pixar", "Studio Ghibli", "Spider-Verse", "Arcane", "Makoto Shinkai"],
+        "style_guide": "캐릭터 매력, 세계관 구축, 움직임의 미학, 컬러 팔레트"
+    },
+    "다큐멘터리": {
+        "keywords": ["인터뷰", "아카이브", "보이스오버", "현장", "리서치", "팩트",
+                    "주제", "시점", "증언", "기록", "관찰", "탐사"],
+        "themes": ["진실", "사회", "환경", "인물", "역사", "문화", "과학", "예술"],
+        "visual_refs": ["Ken Burns", "Werner Herzog", "Netflix Documentary style"],
+        "style_guide": "사실 기반, 깊이있는 리서치, 인간적 스토리, 사회적 임팩트"
+    },
+    "시네마틱 브이로그": {
+        "keywords": ["일상", "여행", "라이프스타일", "ASMR", "POV", "타임랩스",
+                    "드론", "짐벌", "컬러그레이딩", "음악선곡", "보이스오버"],
+        "themes": ["일상의발견", "여행", "도전", "성장", "힐링", "영감", "루틴"],
+        "visual_refs": ["Sam Kolder", "Peter McKinnon", "Casey Neistat", "Korean vlog style"],
+        "style_guide": "개인 시점, 영화적 촬영, 감성 편집, 음악과 조화"
+    },
+    "콘서트/공연영상": {
+        "keywords": ["멀티캠", "라이브", "무대", "조명", "음향", "관객", "앙코르",
+                    "백스테이지", "리허설", "셋리스트", "퍼포먼스"],
+        "themes": ["에너지", "열정", "교감", "감동", "축제", "음악의힘"],
+        "visual_refs": ["Beyoncé Homecoming", "BTS concert films", "Coldplay live"],
+        "style_guide": "다이나믹한 카메라워크, 아티스트와 관객 교감, 음악 중심"
+    },
+    "트레일러/티저": {
+        "keywords": ["후킹", "빌드업", "클라이맥스", "컷", "사운드디자인", "타이틀",
+                    "릴리즈데이트", "미스터리", "서스펜스", "하이라이트"],
+        "themes": ["기대감", "궁금증", "스케일", "충격", "감동예고"],
+        "visual_refs": ["Marvel trailers", "A24 trailers", "Nolan film trailers"],
+        "style_guide": "30초-2분, 핵심만 보여주기, 궁금증 유발, 강렬한 마무리"
+    },
+    "모션그래픽": {
+        "keywords": ["타이포", "인포그래픽", "로고애니메이션", "트랜지션", "이펙트",
+                    "일러스트", "아이콘", "데이터비주얼", "키네틱타이포"],
+        "themes": ["정보전달", "브랜딩", "설명", "강조", "시각화"],
+        "visual_refs": ["Buck Design", "Pentagram", "ManvsMachine", "Ordinary Folk"],
+        "style_guide": "깔끔한 디자인, 명확한 정보 전달, 트렌디한 움직임"
+    },
+    "VFX/시각효과": {
+        "keywords": ["CGI", "합성", "매트페인팅", "파티클", "시뮬레이션", "트래킹",
+                    "로토", "키잉", "3D모델링", "렌더링", "디스트럭션"],
+        "themes": ["불가능을가능하게", "스펙터클", "초현실", "SF", "판타지", "재난"],
+        "visual_refs": ["ILM", "Weta", "Marvel VFX", "Blade Runner 2049"],
+        "style_guide": "시각적 스펙터클, 현실과 CG의 조화, 기술적 완성도"
+    },
+    "드라마/웹드라마": {
+        "keywords": ["에피소드", "시리즈", "캐릭터아크", "클리프행어", "시즌",
+                    "파일럿", "앙상블", "서브플롯", "빌런", "로맨스라인"],
+        "themes": ["사랑", "복수", "성장", "가족", "직장", "학교", "범죄", "판타지"],
+        "visual_refs": ["Netflix K-drama", "HBO style", "웹드라마 vertical format"],
+        "style_guide": "에피소드 구조, 캐릭터 중심, 다음화 기대감, 시리즈 아크"
+    }
+}
+
+DEFAULT_SEASONAL_KEYWORDS = ["트렌드", "바이럴"]
+DEFAULT_CATEGORY = "뮤직비디오"
+
+# 구글 트렌드 실패 시 대체 키워드
+FALLBACK_TREND_KEYWORDS = [
+    "AI", "챗GPT", "메타버스", "NFT", "비트코인", "테슬라",
+    "넷플릭스", "유튜브", "틱톡", "인스타", "K-pop", "BTS",
+    "여행", "맛집", "카페", "패션", "뷰티", "헬스", "명상",
+    "재테크", "부동산", "주식", "창업", "부업", "N잡"
+]
+
+
+def get_category_profile(category):
+    """카테고리별 프로필 반환 (없으면 뮤직비디오)"""
+    return CATEGORY_PROFILES.get(category, CATEGORY_PROFILES[DEFAULT_CATEGORY])
+
+
+def get_seasonal_keywords(month=None):
+    """해당 월(기본: 현재 월)에 맞는 시즌 키워드 반환"""
+    return SEASONAL_KEYWORDS.get(month or datetime.now().month, DEFAULT_SEASONAL_KEYWORDS)
+
+
+# ------------------------------------------------------------------
+# 장르/스타일 (확장)
+# ------------------------------------------------------------------
+VIDEO_GENRES = [
+    "Action/Thriller", "Sci-Fi Epic", "Dark Fantasy", "Psychological Horror", "Romantic Drama", 
+    "Neo-Noir", "Cyberpunk", "Post-Apocalyptic", "Surreal/Abstract", "Music Video (Performance)",
+    "Music Video (Narrative)", "Experimental Art Film", "Anime/Animation", "Documentary Style",
+    "Found Footage", "One-Shot/Long Take", "Dance Film", "Visual Poem", "Social Commentary",
+    "Cosmic Horror", "Magical Realism", "Dystopian Future", "Historical Epic", "Slice of Life"
+]
+
+VISUAL_STYLES = [
+    "Photorealistic/Cinematic", "Hyperrealistic 8K", "Anime/Manga", "3D Pixar Style", 
+    "2D Traditional Animation", "Watercolor Painting", "Oil Painting Classical", "Cyberpunk Neon",
+    "Dark Fantasy Gothic", "Pastel Dreamy", "Black & White Film Noir", "Retro 80s VHS",
+    "Vaporwave Aesthetic", "Lo-Fi Indie", "High Fashion Editorial", "Gritty Documentary",
+    "Surrealist Art", "Minimalist Clean", "Maximalist Baroque", "Glitch Art Digital"
+]
+
+MUSIC_GENRES = [
+    "Pop", "Rock", "Hip-Hop/Rap", "Electronic/EDM", "R&B/Soul", "Jazz", "Classical",
+    "Metal", "Indie", "K-Pop", "Lo-Fi", "Trap", "House", "Techno", "Ambient",
+    "Synthwave", "Phonk", "Drill", "Afrobeat", "Latin", "Folk", "Country",
+    "Orchestral/Cinematic", "Experimental", "Post-Rock", "Dream Pop", "Shoegaze"
+]
+
+
+# ------------------------------------------------------------------
+# 비주얼 스타일 강조 (포토리얼리스틱 대폭 강화)
+# ------------------------------------------------------------------
+# 포토리얼리스틱 계열 강력한 프롬프트
+PHOTO_EMPHASIS = """(EXTREMELY DETAILED REAL PHOTO:1.5), (8k resolution:1.2), (photorealistic:1.4), 
+RAW photo, Fujifilm XT3, shot on 50mm lens, f/1.8, natural skin texture, visible pores, soft lighting, 
+detailed eyes, distinct facial features, hyper-detailed, no CGI, no 3D render look, 
+authentic human imperfections, cinematic lighting, masterpiece, best quality"""
+
+VISUAL_STYLE_EMPHASIS = {
+    "Photorealistic/Cinematic": PHOTO_EMPHASIS,
+    "Hyperrealistic 8K": PHOTO_EMPHASIS + ", RED V-RAPTOR 8K, documentary style",
+    
+    "Anime/Manga": """anime style, manga illustration, cel-shaded, vibrant anime colors, 
+expressive anime eyes, clean linework, anime aesthetic, Studio Ghibli quality,
+Makoto Shinkai lighting, detailed anime backgrounds""",
+    
+    "3D Pixar Style": """3D rendered, Pixar Animation Studios quality, CGI animation, 
+smooth gradients, subsurface scattering, ray-traced lighting, 
+Disney/Pixar character design, expressive 3D characters""",
+    
+    "Cyberpunk Neon": """cyberpunk aesthetic, neon lights, synthwave colors, 
+futuristic cityscape, rain-slicked streets, holographic advertisements,
+Blade Runner 2049 cinematography, volumetric fog, RGB lighting,
+dark with vibrant neon accents, tech-noir atmosphere""",
+    
+    "Dark Fantasy Gothic": """dark fantasy, gothic architecture, moody atmosphere, 
+dramatic chiaroscuro lighting, mysterious fog, medieval dark aesthetics,
+Game of Thrones visual quality, dark romanticism, ominous shadows""",
+    
+    "Black & White Film Noir": """black and white cinematography, high contrast,
+dramatic shadows, film noir lighting, 1940s Hollywood style,
+venetian blind shadows, fog-filled streets, classic cinema look""",
+    
+    "Retro 80s VHS": """1980s aesthetic, VHS quality, scan lines, chromatic aberration,
+neon colors, analog warmth, retro futurism, Stranger Things vibe,
+practical effects look, vintage film grain""",
+    
+    "High Fashion Editorial": """high fashion photography, Vogue editorial quality,
+dramatic fashion lighting, avant-garde styling, luxury aesthetic,
+shot by Mario Testino, couture fashion, editorial composition""",
+    
+    "Surrealist Art": """surrealist art style, Salvador Dali inspired, 
+dreamlike imagery, impossible geometry, melting reality,
+symbolic visual metaphors, subconscious imagery, Magritte influence"""
+}
+
+
+def get_visual_style_emphasis(visual_style):
+    """비주얼 스타일 → 이미지 프롬프트 강조 구문 (표에 없으면 기본 품질 구문)"""
+    return VISUAL_STYLE_EMPHASIS.get(visual_style, f"{visual_style}, high quality, professional")
@@ -0,0 +1,317 @@
+"""
+스카우트 키워드 콘셉트 생성
+- 콘셉트 프롬프트 구성 (키워드 1개 / 여러 키워드 일괄)
+- 일괄 응답(JSON 배열) 파싱
+- 상위 N개 키워드 콘셉트 선계산 + (keyword, angle, channel_category) 캐시
+"""
+import json
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_PREFETCH_TOP_N = 5
+DEFAULT_MAX_WORKERS = 3
+MAX_CACHED_CONCEPTS = 200
+
+
+def concept_key(keyword_data, channel_category):
+    """키워드(문자열 또는 {keyword, angle, ...}) → 캐시 키"""
+    if isinstance(keyword_data, dict):
+        return (keyword_data.get("keyword", ""), keyword_data.get("angle", ""), channel_category)
+    return (keyword_data, "", channel_category)
+
+
+def keyword_fields(keyword_data):
+    """키워드(문자열 또는 dict) → (keyword, angle, concept_hint)"""
+    if isinstance(keyword_data, dict):
+        return (keyword_data.get("keyword", keyword_data), keyword_data.get("angle", ""),
+                keyword_data.get("concept_hint", ""))
+    return keyword_data, "", ""
+
+
+def fallback_concept(keyword, channel_category, profile):
+    """LLM 실패 시 기본 콘셉트"""
+    return f"A {channel_category} inspired visual story about {keyword}, {profile['style_guide']}, cinematic and emotionally compelling"
+
+
+# ------------------------------------------------------------------
+# 프롬프트 구성
+# ------------------------------------------------------------------
+def build_concept_prompt(keyword_data, channel_category, profile):
+    """키워드 1개 콘셉트 요청 프롬프트"""
+    keyword, angle, concept_hint = keyword_fields(keyword_data)
+    return f"""'{channel_category}' 영상 콘셉트를 만들어줘.
+
+## 카테고리 특성
+- 비주얼 레퍼런스: {', '.join(profile['visual_refs'][:3])}
+- 스타일 가이드: {profile['style_guide']}
+- 주요 테마: {', '.join(profile['themes'][:4])}
+
+## 입력
+- 트렌드 키워드: {keyword}
+- 활용 각도: {angle}
+- 콘셉트 힌트: {concept_hint}
+
+## 요청
+위 정보를 바탕으로 '{channel_category}'에 최적화된 영상 콘셉트를 작성해.
+
+포함할 내용:
+1. 독특한 주인공/캐릭터 또는 피사체
+2. 시각적으로 인상적인 배경/장소
+3. 핵심 감정/테마/메시지
+4. {channel_category}에 맞는 비주얼 스타일
+
+2-3문장으로 영화 같은 콘셉트를 영어로 작성해 (이미지 생성용)."""
+
+
+def build_batch_concept_prompt(keyword_list, channel_category, profile):
+    """여러 키워드 콘셉트를 한 번에 요청하는 프롬프트 (카테고리 특성은 한 번만)"""
+    inputs = []
+    for i, keyword_data in enumerate(keyword_list, start=1):
+        keyword, angle, concept_hint = keyword_fields(keyword_data)
+        inputs.append(f"{i}. 트렌드 키워드: {keyword} | 활용 각도: {angle} | 콘셉트 힌트: {concept_hint}")
+    return f"""'{channel_category}' 영상 콘셉트를 키워드별로 만들어줘.
+
+## 카테고리 특성
+- 비주얼 레퍼런스: {', '.join(profile['visual_refs'][:3])}
+- 스타일 가이드: {profile['style_guide']}
+- 주요 테마: {', '.join(profile['themes'][:4])}
+
+## 입력 ({len(keyword_list)}개)
+{chr(10).join(inputs)}
+
+## 요청
+각 입력마다 '{channel_category}'에 최적화된 영상 콘셉트를 작성해.
+
+포함할 내용:
+1. 독특한 주인공/캐릭터 또는 피사체
+2. 시각적으로 인상적인 배경/장소
+3. 핵심 감정/테마/메시지
+4. {channel_category}에 맞는 비주얼 스타일
+
+콘셉트는 각각 2-3문장, 영화 같은 영어 문장으로 (이미지 생성용).
+
+## 출력 형식 (JSON 배열만, 입력 순서대로 {len(keyword_list)}개)
+[
+    {{"index": 1, "keyword": "입력 키워드", "concept": "English concept..."}}
+]"""
+
+
+# ------------------------------------------------------------------
+# 일괄 응답 파싱
+# ------------------------------------------------------------------
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+_OBJECT_RE = re.compile(r"\{[^{}]*\}")
+
+
+def _concept_from_entry(entry):
+    if isinstance(entry, str):
+        return entry.strip() or None
+    if isinstance(entry, dict):
+        concept = entry.get("concept")
+        if isinstance(concept, str) and concept.strip():
+            return concept.strip()
+    return None
+
+
+def _entry_index(entry, position, count):
+    """항목의 0 기반 위치 (index 필드가 유효하면 우선, 아니면 배열 순서)"""
+    if isinstance(entry, dict):
+        index = entry.get("index")
+        if isinstance(index, int) and 1 <= index <= count:
+            return index - 1
+    return position
+
+
+def parse_concept_array(text, count):
+    """일괄 응답 → 길이 count의 콘셉트 리스트 (파싱 못 한 항목은 None)
+
+    코드 펜스/앞뒤 설명문을 허용하고, 배열 전체가 깨졌으면 개별 객체라도 건짐.
+    """
+    results = [None] * count
+    if not text:
+        return results
+
+    fenced = _CODE_FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    entries = None
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            entries = json.loads(text[start:end + 1])
+        except ValueError:
+            entries = None
+    if not isinstance(entries, list):
+        # 잘린 응답 / 쉼표 누락 등: 완결된 객체만 개별 파싱
+        entries = []
+        for match in _OBJECT_RE.finditer(text):
+            try:
+                entries.append(json.loads(match.group()))
+            except ValueError:
+                continue
+
+    for position, entry in enumerate(entries):
+        index = _entry_index(entry, position, count)
+        if index < count and results[index] is None:
+            results[index] = _concept_from_entry(entry)
+    return results
+
+
+# ------------------------------------------------------------------
+# 선계산 + 캐시
+# ------------------------------------------------------------------
+class ConceptPrefetcher:
+    """콘셉트 생성 함수를 감싼 병렬 선계산 + 캐시
+
+    generate_fn(keyword_data, channel_category, *args) → 콘셉트 문자열
+    batch_fn(keyword_list, channel_category, *args) → 콘셉트 리스트 (선택, 있으면 선계산을 1회 호출로)
+    - prefetch(): 상위 N개를 스레드 풀에 제출 (이미 캐시됐거나 진행 중이면 건너뜀)
+    - get(): 캐시/진행 중 결과를 기다려 반환, 없거나 선계산이 실패했으면 즉시 생성
+    - cancel_pending(group): 사용자가 하나를 고르면 그 그룹(세션)이 요청한 것 중 아직 시작 안 한 작업 취소
+      (세션 간 공유 객체 → 다른 그룹도 요청한 키는 그 그룹이 남아 있는 한 취소하지 않음)
+    """
+
+    def __init__(self, generate_fn, batch_fn=None, max_workers=DEFAULT_MAX_WORKERS, max_cached=MAX_CACHED_CONCEPTS):
+        self.generate_fn = generate_fn
+        self.batch_fn = batch_fn
+        self.max_cached = max_cached
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="concept")
+        self._concepts = OrderedDict()  # key → 콘셉트
+        self._futures = {}              # key → Future (진행/대기 중)
+        self._groups = {}               # key → 선계산을 요청한 그룹 집합 (진행/대기 중인 키만)
+        self._lock = threading.Lock()
+
+    def _forget(self, key):
+        """진행/대기 기록 삭제 (잠금 안에서 호출)"""
+        self._futures.pop(key, None)
+        self._groups.pop(key, None)
+
+    def _store(self, key, concept):
+        with self._lock:
+            self._concepts[key] = concept
+            self._concepts.move_to_end(key)
+            while len(self._concepts) > self.max_cached:
+                self._concepts.popitem(last=False)
+            self._forget(key)
+
+    def _run(self, key, keyword_data, channel_category, args):
+        try:
+            concept = self.generate_fn(keyword_data, channel_category, *args)
+        except Exception:
+            with self._lock:
+                self._forget(key)
+            raise
+        self._store(key, concept)
+        return concept
+
+    def _run_batch(self, pending, channel_category, args):
+        """일괄 생성: 취소되지 않은 항목만 한 번에 요청하고 키별 Future에 결과 전달
+
+        결과가 모자라거나 None인 항목은 예외로 끝냄 (Future가 끝나지 않은 채 남지 않도록)
+        """
+        live = [(key, kw, future) for key, kw, future in pending if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            concepts = list(self.batch_fn([kw for _, kw, _ in live], channel_category, *args))
+        except Exception as e:
+            self._fail(live, e)
+            return
+        missing = []
+        for index, (key, keyword_data, future) in enumerate(live):
+            concept = concepts[index] if index < len(concepts) else None
+            if concept is None:
+                missing.append((key, keyword_data, future))
+                continue
+            self._store(key, concept)
+            future.set_result(concept)
+        if missing:
+            self._fail(missing, ValueError(f"일괄 응답에 콘셉트 없음 ({len(concepts)}/{len(live)}개 받음)"))
+
+    def _fail(self, items, error):
+        with self._lock:
+            for key, _, future in items:
+                self._forget(key)
+                future.set_exception(error)
+
+    def prefetch(self, keywords, channel_category, *args, top_n=DEFAULT_PREFETCH_TOP_N, group=None):
+        """상위 top_n개 키워드 콘셉트 생성을 제출 → 새로 제출한 키 리스트
+
+        batch_fn이 있고 새 키워드가 2개 이상이면 하나의 일괄 요청으로 제출.
+        group: 요청한 쪽 (세션) - 이미 진행 중인 키도 이 그룹을 추가해 cancel_pending(group)의 대상으로 기록
+        """
+        new_keywords = []
+        with self._lock:
+            for keyword_data in keywords[:top_n]:
+                key = concept_key(keyword_data, channel_category)
+                if key in self._concepts:
+                    continue
+                self._groups.setdefault(key, set()).add(group)
+                if key in self._futures:
+                    continue
+                if any(key == k for k, _ in new_keywords):
+                    continue
+                new_keywords.append((key, keyword_data))
+
+            if self.batch_fn is not None and len(new_keywords) > 1:
+                pending = []
+                for key, keyword_data in new_keywords:
+                    future = Future()
+                    self._futures[key] = future
+                    pending.append((key, keyword_data, future))
+                self._executor.submit(self._run_batch, pending, channel_category, args)
+            else:
+                for key, keyword_data in new_keywords:
+                    self._futures[key] = self._executor.submit(self._run, key, keyword_data, channel_category, args)
+        return [key for key, _ in new_keywords]
+
+    def peek(self, keyword_data, channel_category):
+        """준비된 콘셉트 (아직이면 None, 기다리지 않음)"""
+        return self._concepts.get(concept_key(keyword_data, channel_category))
+
+    def get(self, keyword_data, channel_category, *args):
+        """콘셉트 반환 (캐시 → 진행 중 작업 대기 → 직접 생성 순)
+
+        선계산이 취소됐거나 실패했으면 (일괄 호출 오류 / 일괄 응답에 빠진 키워드) 이 키워드만 직접 생성
+        """
+        key = concept_key(keyword_data, channel_category)
+        with self._lock:
+            if key in self._concepts:
+                self._concepts.move_to_end(key)
+                return self._concepts[key]
+            future = self._futures.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:   # CancelledError 포함
+                pass
+        return self._run(key, keyword_data, channel_category, args)
+
+    def cancel_pending(self, group=None):
+        """group이 요청한 선계산 중 아직 시작하지 않은 것 취소 → 취소 개수
+
+        다른 그룹도 요청한 키는 이 그룹만 빼고 유지, 실행 중인 요청은 끝까지 진행
+        group=None: 그룹과 관계없이 모두 취소
+        """
+        cancelled = 0
+        with self._lock:
+            for key, future in list(self._futures.items()):
+                groups = self._groups.get(key, set())
+                if group is not None:
+                    if group not in groups:
+                        continue
+                    groups.discard(group)
+                    if groups:
+                        continue
+                if future.cancel():
+                    self._forget(key)
+                    cancelled += 1
+        return cancelled
+
+    def pending_count(self):
+        """대기/진행 중 작업 수"""
+        with self._lock:
+            return sum(1 for future in self._futures.values() if not future.done())
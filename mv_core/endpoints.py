@@ -0,0 +1,43 @@
+"""
+외부 서비스 주소 (환경 변수로 교체 가능 → 로컬 대역 서버로 오프라인 측정)
+호출 시점에 읽으므로 실행 중에 환경 변수를 바꿔도 다음 요청부터 적용
+
+- MV_GEMINI_API_ENDPOINT   : Gemini REST 엔드포인트 (지정 시 google.generativeai를 REST 전송으로 연결)
+- MV_POLLINATIONS_BASE_URL : Pollinations 이미지 경로 (.../prompt/)
+- MV_SEGMIND_URL           : Segmind SDXL txt2img 엔드포인트
+- MV_JSONBIN_API_URL       : JSONBin API (.../v3)
+- MV_TRENDS_RSS_URL        : Google Trends RSS 주소 템플릿 ({geo} 포함)
+"""
+import os
+
+GEMINI_API_ENDPOINT_ENV = "MV_GEMINI_API_ENDPOINT"
+POLLINATIONS_BASE_URL_ENV = "MV_POLLINATIONS_BASE_URL"
+SEGMIND_URL_ENV = "MV_SEGMIND_URL"
+JSONBIN_API_URL_ENV = "MV_JSONBIN_API_URL"
+TRENDS_RSS_URL_ENV = "MV_TRENDS_RSS_URL"
+
+DEFAULT_POLLINATIONS_BASE_URL = "https://image.pollinations.ai/prompt/"
+DEFAULT_SEGMIND_URL = "https://api.segmind.com/v1/sdxl1.0-txt2img"
+DEFAULT_JSONBIN_API_URL = "https://api.jsonbin.io/v3"
+DEFAULT_TRENDS_RSS_URL = "https://trends.google.com/trends/trendingsearches/daily/rss?geo={geo}"
+
+
+def gemini_api_endpoint():
+    """Gemini REST 엔드포인트 (기본 None = SDK 기본값)"""
+    return os.getenv(GEMINI_API_ENDPOINT_ENV) or None
+
+
+def pollinations_base_url():
+    return os.getenv(POLLINATIONS_BASE_URL_ENV) or DEFAULT_POLLINATIONS_BASE_URL
+
+
+def segmind_url():
+    return os.getenv(SEGMIND_URL_ENV) or DEFAULT_SEGMIND_URL
+
+
+def jsonbin_api_url():
+    return os.getenv(JSONBIN_API_URL_ENV) or DEFAULT_JSONBIN_API_URL
+
+
+def trends_rss_url():
+    return os.getenv(TRENDS_RSS_URL_ENV) or DEFAULT_TRENDS_RSS_URL
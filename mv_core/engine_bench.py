@@ -0,0 +1,205 @@
+"""
+이미지 엔진 벤치마크 + 자동 선택
+- 고정 프롬프트 세트를 엔진별로 동시에 요청 → 첫 바이트(TTFB), 전체 지연, 바이트, 실패율, 출력 해상도
+- 결과는 JSONL로 누적 저장, 최근 기록 + 실시간 생성 통계로 엔진별 상태 계산
+  (벤치마크는 512x512, 실제 생성은 원본 크기 → 둘 다 메가픽셀당 지연 p50으로 비교)
+- Auto 엔진: 비주얼 스타일 계열(실사/애니/3D/다크) 안에서 가장 빠른 정상 엔진을 요청마다 선택
+requests는 호출 시점에 import
+"""
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .endpoints import segmind_url
+from .image_bytes import validate_image
+from .images import segmind_payload
+from .providers import (ENGINE_STYLE_FAMILIES, IMAGE_ENGINES, build_pollinations_url, engine_for_model,
+                        enhance_prompt_for_provider, pollinations_model_for, style_family_for)
+
+BENCH_PROMPTS = (
+    "A lone figure walking through neon-lit rain at night, city reflections",
+    "Sunlit wheat field at golden hour, wind, wide shot",
+    "Close-up portrait of a musician on stage, dramatic rim light",
+)
+BENCH_SIZE = (512, 512)
+BENCH_TIMEOUT_SECONDS = 60
+BENCH_MAX_WORKERS = 8
+MAX_BENCH_AGE_SECONDS = 24 * 3600   # 자동 선택에 쓰는 벤치마크 기록 유효 기간
+HEALTHY_SUCCESS_RATE = 0.7
+MAX_REJECT_RATE = 0.5               # 응답은 오지만 절반 이상이 검증/품질 게이트에서 거부되면 비정상
+MIN_SAMPLES = 2                     # 이보다 적으면 상태 판단 보류 (정상으로 간주)
+
+
+# ------------------------------------------------------------------
+# 측정
+# ------------------------------------------------------------------
+def fetch_engine_image(engine, prompt, width, height, timeout=BENCH_TIMEOUT_SECONDS, segmind_key=None, seed=None):
+    """엔진 1회 요청 → {ok, http, ttfb_ms, total_ms, bytes, width, height, error}"""
+    import requests
+
+    seed = seed if seed is not None else random.randint(0, 999999)
+    enhanced = enhance_prompt_for_provider(prompt, engine)
+    result = {"ok": False, "http": None, "ttfb_ms": None, "total_ms": None, "bytes": 0,
+              "width": None, "height": None, "error": ""}
+    started = time.perf_counter()
+    try:
+        if "Segmind" in engine:
+            if not segmind_key:
+                result["error"] = "no key"
+                return result
+            response = requests.post(segmind_url(), json=segmind_payload(enhanced, width, height, seed),
+                                     headers={'x-api-key': segmind_key}, timeout=timeout, stream=True)
+        else:
+            url = build_pollinations_url(enhanced, width, height, pollinations_model_for(engine), seed)
+            response = requests.get(url, timeout=timeout, stream=True)
+        chunks = []
+        with response:
+            for chunk in response.iter_content(chunk_size=16384):
+                if result["ttfb_ms"] is None:
+                    result["ttfb_ms"] = (time.perf_counter() - started) * 1000
+                chunks.append(chunk)
+        content = b"".join(chunks)
+        result.update(http=response.status_code, bytes=len(content), total_ms=(time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            result["error"] = f"HTTP {response.status_code}"
+        else:
+            # 벤치마크는 요청 크기가 작을 수 있어 최소 변 길이는 보지 않음
+            img, reason = validate_image(content, min_side=1)
+            if img is None:
+                result["error"] = reason
+            else:
+                result["width"], result["height"] = img.size
+                result["ok"] = True
+    except Exception as e:
+        result["total_ms"] = (time.perf_counter() - started) * 1000
+        result["error"] = str(e)[:120]
+    return result
+
+
+def benchmark_engines(engines=IMAGE_ENGINES, prompts=BENCH_PROMPTS, width=BENCH_SIZE[0], height=BENCH_SIZE[1],
+                      fetch=fetch_engine_image, max_workers=BENCH_MAX_WORKERS, **fetch_kwargs):
+    """모든 (엔진, 프롬프트) 조합을 동시에 요청 → 기록 목록 (엔진/프롬프트 순서 유지)"""
+    run_at = time.time()
+    jobs = [(engine, idx, prompt) for engine in engines for idx, prompt in enumerate(prompts)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda job: fetch(job[0], job[2], width, height, **fetch_kwargs), jobs))
+    return [{"at": run_at, "engine": engine, "prompt_idx": idx, "requested": [width, height], **result}
+            for (engine, idx, _), result in zip(jobs, results)]
+
+
+def summarize_bench(records):
+    """기록 → {엔진: {runs, failures, failure_rate, ttfb_p50_ms, total_p50_ms, ms_per_mp_p50, mean_bytes, resolution}}"""
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["engine"], []).append(record)
+    summary = {}
+    for engine, items in grouped.items():
+        ok = [item for item in items if item["ok"]]
+        resolutions = Counter(f"{item['width']}x{item['height']}" for item in ok)
+        summary[engine] = {
+            "runs": len(items),
+            "failures": len(items) - len(ok),
+            "failure_rate": (len(items) - len(ok)) / len(items),
+            "ttfb_p50_ms": statistics.median(item["ttfb_ms"] for item in ok) if ok else None,
+            "total_p50_ms": statistics.median(item["total_ms"] for item in ok) if ok else None,
+            "ms_per_mp_p50": statistics.median(item["total_ms"] / (item["width"] * item["height"] / 1e6)
+                                               for item in ok) if ok else None,
+            "mean_bytes": sum(item["bytes"] for item in ok) / len(ok) if ok else 0,
+            "resolution": resolutions.most_common(1)[0][0] if resolutions else None,
+        }
+    return summary
+
+
+class EngineBenchHistory:
+    """벤치마크 기록 JSONL 저장소 (프로세스 공유, 쓰기 잠금)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, records):
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load(self, max_age_seconds=MAX_BENCH_AGE_SECONDS, now=None):
+        """최근 기록 (max_age_seconds=None이면 전체, 깨진 줄은 건너뜀)"""
+        if not os.path.exists(self.path):
+            return []
+        cutoff = None if max_age_seconds is None else (now or time.time()) - max_age_seconds
+        records = []
+        with self._lock, open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if cutoff is None or record.get("at", 0) >= cutoff:
+                    records.append(record)
+        return records
+
+
+# ------------------------------------------------------------------
+# 자동 선택
+# ------------------------------------------------------------------
+def engine_stats(bench_records=(), event_rows=(), min_samples=MIN_SAMPLES):
+    """엔진별 {samples, success_rate, reject_rate, ms_per_mp, source}
+
+    ms_per_mp: 메가픽셀당 지연 p50 (벤치마크 512x512와 원본 크기 생성을 같은 단위로 비교)
+    최근 실시간 요청(GenerationEventStore.summary의 recent_*)이 min_samples 이상이면 우선, 아니면 벤치마크 기록
+    (최근 요청이 모두 실패해 지연을 모르면 지연만 벤치마크 값 유지)
+    success_rate는 거부를 뺀 요청 기준, reject_rate는 검증/품질 게이트 거부 비율 (벤치마크는 거부 판정 없음 → 0)
+    """
+    stats = {}
+    for engine, row in summarize_bench(bench_records).items():
+        stats[engine] = {"samples": row["runs"], "success_rate": 1 - row["failure_rate"], "reject_rate": 0.0,
+                         "ms_per_mp": row["ms_per_mp_p50"], "source": "bench"}
+    for row in event_rows:
+        engine = engine_for_model(row["provider"], row["model"])
+        if engine is None or row["recent_requests"] < min_samples:
+            continue
+        ms_per_mp = row["recent_ms_per_mp"]
+        if ms_per_mp is None:
+            ms_per_mp = (stats.get(engine) or {}).get("ms_per_mp")
+        stats[engine] = {"samples": row["recent_requests"], "success_rate": row["recent_success_rate"],
+                         "reject_rate": row["recent_reject_rate"], "ms_per_mp": ms_per_mp, "source": "live"}
+    return stats
+
+
+def choose_engine(visual_style, stats, engines=IMAGE_ENGINES, segmind_available=False, min_samples=MIN_SAMPLES,
+                  healthy_rate=HEALTHY_SUCCESS_RATE, max_reject_rate=MAX_REJECT_RATE):
+    """Auto 엔진 → (엔진, 사유)
+
+    1) 비주얼 스타일 계열의 엔진 중 정상(성공률 ≥ healthy_rate + 거부율 < max_reject_rate, 또는 표본 부족)이면서
+       가장 빠른 엔진
+    2) 계열에 정상 엔진이 없으면 전체 엔진 중 가장 빠른 정상 엔진
+    3) 모두 비정상이면 계열 첫 엔진
+    지연 시간을 모르는 엔진은 측정된 엔진보다 뒤, 동률이면 목록 순서
+    """
+    engines = [engine for engine in engines if segmind_available or "Segmind" not in engine]
+    family = style_family_for(visual_style)
+    family_engines = [engine for engine in engines if family is None or ENGINE_STYLE_FAMILIES.get(engine) == family]
+    family_engines = family_engines or engines
+
+    def healthy(engine):
+        stat = stats.get(engine)
+        if stat is None or stat["samples"] < min_samples:
+            return True
+        return (stat["success_rate"] or 0) >= healthy_rate and (stat.get("reject_rate") or 0) < max_reject_rate
+
+    def speed(engine):
+        latency = (stats.get(engine) or {}).get("ms_per_mp")
+        return (latency is None, latency or 0, engines.index(engine))
+
+    for pool, reason in ((family_engines, f"스타일 계열 {family or '범용'}"), (engines, "계열 엔진 비정상 → 전체")):
+        candidates = [engine for engine in pool if healthy(engine)]
+        if candidates:
+            return min(candidates, key=speed), reason
+    return family_engines[0], "정상 엔진 없음"
@@ -0,0 +1,287 @@
+"""
+기획안 내보내기 (JSON / 텍스트 / HTML) + 프로젝트 저장 형식
+"""
+import json
+from datetime import datetime
+
+
+def prepare_project_for_save(plan_data, topic="", settings=None):
+    """프로젝트 데이터를 저장용으로 준비 (이미지 제외)"""
+    save_data = {
+        "version": "1.0",
+        "saved_at": datetime.now().isoformat(),
+        "topic": topic,
+        "settings": settings or {},
+        "plan_data": plan_data
+    }
+    return save_data
+
+
+def export_project_json(plan_data, topic="", settings=None):
+    """프로젝트를 JSON 문자열로 내보내기"""
+    save_data = prepare_project_for_save(plan_data, topic, settings)
+    return json.dumps(save_data, ensure_ascii=False, indent=2)
+
+
+def create_json_export(plan_data):
+    """JSON 형식 내보내기"""
+    return json.dumps(plan_data, ensure_ascii=False, indent=2)
+
+
+def create_text_export(plan_data):
+    """텍스트 형식 내보내기"""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("AI MV DIRECTOR PRO - 프로젝트 기획서")
+    lines.append("=" * 80)
+    lines.append(f"생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append("")
+    
+    lines.append(f"프로젝트: {plan_data.get('project_title', '')}")
+    lines.append(f"Project: {plan_data.get('project_title_en', '')}")
+    lines.append(f"컨셉: {plan_data.get('logline', '')}")
+    lines.append(f"Concept: {plan_data.get('logline_en', '')}")
+    lines.append("")
+    
+    if 'director_vision' in plan_data:
+        lines.append("-" * 40)
+        lines.append("DIRECTOR'S VISION")
+        lines.append("-" * 40)
+        lines.append(plan_data['director_vision'])
+        lines.append("")
+    
+    if 'youtube' in plan_data:
+        yt = plan_data['youtube']
+        lines.append("-" * 40)
+        lines.append("YOUTUBE")
+        lines.append("-" * 40)
+        lines.append(f"제목: {yt.get('title', '')}")
+        lines.append(f"설명:\n{yt.get('description', '')}")
+        lines.append(f"태그: {yt.get('hashtags', '')}")
+        lines.append("")
+    
+    if 'music' in plan_data:
+        music = plan_data['music']
+        lines.append("-" * 40)
+        lines.append("MUSIC / SUNO AI")
+        lines.append("-" * 40)
+        lines.append(f"스타일: {music.get('style', '')}")
+        lines.append("")
+        lines.append("[STYLE TAGS]")
+        lines.append(music.get('style_tags', ''))
+        lines.append("")
+        lines.append("[VOCAL DIRECTION]")
+        lines.append(music.get('vocal_direction', ''))
+        lines.append("")
+        lines.append("[INSTRUMENTATION]")
+        lines.append(music.get('instrumentation', ''))
+        lines.append("")
+        lines.append("[PRODUCTION]")
+        lines.append(music.get('production', ''))
+        lines.append("")
+        lines.append("[SONG STRUCTURE]")
+        lines.append(music.get('song_structure', ''))
+        lines.append("")
+        lines.append("[COMPLETE LYRICS]")
+        lines.append(music.get('lyrics_full', ''))
+        lines.append("")
+    
+    if 'turntable' in plan_data:
+        tt = plan_data['turntable']
+        lines.append("-" * 40)
+        lines.append("TURNTABLE SHEETS")
+        lines.append("-" * 40)
+        
+        for cat in ['characters', 'locations', 'props', 'vehicles']:
+            if cat in tt and tt[cat]:
+                lines.append(f"\n[{cat.upper()}]")
+                for item in tt[cat]:
+                    lines.append(f"\n  {item.get('name', '')} ({item.get('id', '')})")
+                    if 'views' in item:
+                        for view in item['views']:
+                            lines.append(f"    - {view.get('view_type', '')}: {view.get('prompt', '')}")
+        lines.append("")
+    
+    if 'scenes' in plan_data:
+        lines.append("-" * 40)
+        lines.append("STORYBOARD")
+        lines.append("-" * 40)
+        for scene in plan_data['scenes']:
+            lines.append(f"\n[SCENE {scene.get('scene_num', '')}] {scene.get('timecode', '')}")
+            lines.append(f"  액션: {scene.get('action', '')}")
+            if 'camera' in scene and isinstance(scene['camera'], dict):
+                cam = scene['camera']
+                lines.append(f"  카메라: {cam.get('shot_type', '')} / {cam.get('movement', '')} / {cam.get('lens', '')}")
+            lines.append(f"  이미지 프롬프트: {scene.get('image_prompt', '')}")
+            lines.append(f"  비디오 프롬프트: {scene.get('video_prompt', '')}")
+    
+    return "\n".join(lines)
+
+
+def create_html_export(plan_data):
+    """HTML 형식 내보내기"""
+    html = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{plan_data.get('project_title', 'MV Project')}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Pretendard', -apple-system, sans-serif; background: #0a0a0a; color: #fff; line-height: 1.6; }}
+        .container {{ max-width: 1200px; margin: 0 auto; padding: 40px 20px; }}
+        h1 {{ font-size: 3em; margin-bottom: 10px; background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }}
+        h2 {{ font-size: 1.8em; margin: 40px 0 20px; padding-bottom: 10px; border-bottom: 2px solid #333; }}
+        h3 {{ font-size: 1.3em; margin: 20px 0 10px; color: #667eea; }}
+        .section {{ background: #111; border-radius: 12px; padding: 25px; margin: 20px 0; border: 1px solid #222; }}
+        .meta {{ color: #888; font-size: 0.9em; margin-bottom: 30px; }}
+        .prompt-box {{ background: #1a1a2e; border-left: 4px solid #667eea; padding: 15px; margin: 10px 0; border-radius: 0 8px 8px 0; font-family: monospace; font-size: 0.9em; white-space: pre-wrap; word-break: break-all; }}
+        .scene {{ background: #0f0f1a; border-radius: 8px; padding: 20px; margin: 15px 0; border: 1px solid #1a1a2e; }}
+        .scene-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px; }}
+        .scene-num {{ background: linear-gradient(135deg, #667eea, #764ba2); padding: 5px 15px; border-radius: 20px; font-weight: bold; }}
+        .timecode {{ color: #888; font-family: monospace; }}
+        .tag {{ display: inline-block; background: #222; padding: 4px 12px; border-radius: 15px; margin: 4px; font-size: 0.85em; }}
+        .turntable {{ background: #1a1a0a; border: 2px solid #ffd700; border-radius: 12px; padding: 20px; margin: 15px 0; }}
+        .copy-btn {{ background: #667eea; color: white; border: none; padding: 8px 16px; border-radius: 5px; cursor: pointer; font-size: 0.85em; }}
+        .copy-btn:hover {{ background: #764ba2; }}
+        .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }}
+        pre {{ white-space: pre-wrap; word-wrap: break-word; }}
+        .suno-section {{ background: #1a0a1a; border: 1px solid #722ed1; border-radius: 8px; padding: 15px; margin: 10px 0; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🎬 {plan_data.get('project_title', '')}</h1>
+        <p class="meta">{plan_data.get('project_title_en', '')} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
+        
+        <div class="section">
+            <h2>📋 프로젝트 개요</h2>
+            <p><strong>컨셉:</strong> {plan_data.get('logline', '')}</p>
+            <p><strong>Concept:</strong> {plan_data.get('logline_en', '')}</p>
+            <p><strong>Director's Vision:</strong> {plan_data.get('director_vision', '')}</p>
+        </div>
+"""
+    
+    # YouTube
+    if 'youtube' in plan_data:
+        yt = plan_data['youtube']
+        html += f"""
+        <div class="section">
+            <h2>📺 YouTube</h2>
+            <h3>제목</h3>
+            <div class="prompt-box">{yt.get('title', '')}</div>
+            <h3>설명</h3>
+            <div class="prompt-box">{yt.get('description', '')}</div>
+            <h3>해시태그</h3>
+            <div class="prompt-box">{yt.get('hashtags', '')}</div>
+        </div>
+"""
+    
+    # Music
+    if 'music' in plan_data:
+        music = plan_data['music']
+        html += f"""
+        <div class="section">
+            <h2>🎵 Music / Suno AI</h2>
+            <div class="suno-section">
+                <h3>Style Tags</h3>
+                <div class="prompt-box">{music.get('style_tags', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>Vocal Direction</h3>
+                <div class="prompt-box">{music.get('vocal_direction', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>Instrumentation</h3>
+                <div class="prompt-box">{music.get('instrumentation', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>Production</h3>
+                <div class="prompt-box">{music.get('production', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>Song Structure</h3>
+                <div class="prompt-box">{music.get('song_structure', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>Complete Lyrics</h3>
+                <div class="prompt-box">{music.get('lyrics_full', '')}</div>
+            </div>
+            <div class="suno-section">
+                <h3>🎹 Complete Suno Prompt (Copy All)</h3>
+                <div class="prompt-box">{music.get('suno_prompt_combined', '')}</div>
+            </div>
+        </div>
+"""
+    
+    # Turntable
+    if 'turntable' in plan_data:
+        tt = plan_data['turntable']
+        html += """
+        <div class="section">
+            <h2>🎭 Turntable Reference Sheets</h2>
+"""
+        for cat in ['characters', 'locations', 'props', 'vehicles']:
+            if cat in tt and tt[cat]:
+                html += f"<h3>{cat.upper()}</h3><div class='grid'>"
+                for item in tt[cat]:
+                    html += f"""
+                    <div class="turntable">
+                        <h4>{item.get('name', '')} ({item.get('id', '')})</h4>
+"""
+                    if 'views' in item:
+                        for view in item['views']:
+                            html += f"""
+                        <p><strong>{view.get('view_type', '')}:</strong></p>
+                        <div class="prompt-box">{view.get('prompt', '')}</div>
+"""
+                    html += "</div>"
+                html += "</div>"
+        html += "</div>"
+    
+    # Scenes
+    if 'scenes' in plan_data:
+        html += """
+        <div class="section">
+            <h2>🎬 Storyboard</h2>
+"""
+        for scene in plan_data['scenes']:
+            camera_info = ""
+            if 'camera' in scene and isinstance(scene['camera'], dict):
+                cam = scene['camera']
+                camera_info = f"{cam.get('shot_type', '')} | {cam.get('movement', '')} | {cam.get('lens', '')} | {cam.get('angle', '')}"
+            
+            html += f"""
+            <div class="scene">
+                <div class="scene-header">
+                    <span class="scene-num">Scene {scene.get('scene_num', '')}</span>
+                    <span class="timecode">{scene.get('timecode', '')}</span>
+                </div>
+                <p><strong>Action:</strong> {scene.get('action', '')}</p>
+                <p><strong>Camera:</strong> {camera_info}</p>
+                <p><strong>Emotion:</strong> {scene.get('emotion', '')}</p>
+                <h4>Image Prompt:</h4>
+                <div class="prompt-box">{scene.get('image_prompt', '')}</div>
+                <h4>Video Prompt:</h4>
+                <div class="prompt-box">{scene.get('video_prompt', '')}</div>
+            </div>
+"""
+        html += "</div>"
+    
+    html += """
+    </div>
+    <script>
+        document.querySelectorAll('.prompt-box').forEach(box => {{
+            box.style.cursor = 'pointer';
+            box.title = 'Click to copy';
+            box.addEventListener('click', () => {{
+                navigator.clipboard.writeText(box.textContent);
+                const original = box.style.borderColor;
+                box.style.borderColor = '#00ff00';
+                setTimeout(() => box.style.borderColor = original, 500);
+            }});
+        }});
+    </script>
+</body>
+</html>"""
+    return html
@@ -0,0 +1,141 @@
+"""
+이미지 생성 이벤트 저장소
+- 링 버퍼(deque)에 최근 이벤트 보관 (로그 메시지 + 요청 결과)
+- 공급자/모델별 결과 카운터 (success, http_error, rejected, exception, fallback) + 지연 시간 히스토그램
+  rejected: HTTP 200이지만 헤더 검증/품질 게이트에서 거부된 응답 (사유는 detail) → 서비스 오류와 따로 집계
+- 최근 요청 창 (개수 + 시간 제한): 성공률, 메가픽셀당 지연 p50 → Auto 엔진이 현재 상태에 반응
+"""
+import bisect
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+OUTCOMES = ("success", "http_error", "rejected", "exception", "fallback")
+DEFAULT_CAPACITY = 500
+# 히스토그램 상한 (ms) - 마지막 구간은 +Inf
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 60000)
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+RECENT_WINDOW = 20                  # 공급자/모델별 최근 요청 수
+RECENT_SECONDS = 15 * 60            # 이보다 오래된 요청은 최근 창에서 제외
+
+
+def histogram_quantile(counts, q, buckets=LATENCY_BUCKETS_MS):
+    """구간별 개수 → q 분위수가 속한 구간 상한 (ms, +Inf 구간이면 마지막 상한, 비었으면 None)"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        seen += count
+        if seen >= rank and count:
+            return buckets[min(i, len(buckets) - 1)]
+    return buckets[-1]
+
+
+def sparkline(counts):
+    """히스토그램 → 한 줄 막대 문자열"""
+    peak = max(counts) if counts else 0
+    if not peak:
+        return ""
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[(c * top + peak - 1) // peak] if c else " " for c in counts)
+
+
+class GenerationEventStore:
+    """생성 이벤트 링 버퍼 + 공급자/모델별 누적 통계 (스레드 안전)
+
+    log(message, level): 텍스트 로그 (add_image_log 대체)
+    record(provider, model, outcome, latency_ms, ...): 요청 1회 결과
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._events = deque(maxlen=capacity)
+        self._stats = {}   # (공급자, 모델) → {"outcomes", "histogram", "latency_sum_ms", "latency_count", "last_at", "recent"}
+        self._lock = threading.Lock()
+        self.version = 0   # 변경될 때마다 증가 (화면 갱신 여부 판단용)
+
+    def _append(self, event):
+        self._events.append(event)
+        self.version += 1
+
+    def log(self, message, level="info"):
+        """텍스트 로그 이벤트 (level: info, success, warn, error, model)"""
+        with self._lock:
+            self._append({"time": datetime.now().strftime("%H:%M:%S"), "level": level, "message": message})
+
+    def record(self, provider, model, outcome, latency_ms=None, attempt=1, http=None, detail="", megapixels=None):
+        """요청 결과 기록 (fallback은 지연 시간 없이 카운터만)
+
+        megapixels: 요청한 총 화소 (가로×세로×장수 / 1e6) - 크기가 다른 요청끼리 지연 비교용
+        """
+        if outcome not in OUTCOMES:
+            raise ValueError(f"unknown outcome: {outcome}")
+        with self._lock:
+            stat = self._stats.setdefault((provider, model), {
+                "outcomes": dict.fromkeys(OUTCOMES, 0), "histogram": [0] * (len(self.buckets) + 1),
+                "latency_sum_ms": 0.0, "latency_count": 0, "last_at": 0.0, "recent": deque(maxlen=RECENT_WINDOW)})
+            stat["outcomes"][outcome] += 1
+            stat["last_at"] = time.time()
+            if outcome != "fallback":
+                stat["recent"].append((stat["last_at"], outcome, latency_ms, megapixels))
+            if latency_ms is not None:
+                stat["histogram"][bisect.bisect_left(self.buckets, latency_ms)] += 1
+                stat["latency_sum_ms"] += latency_ms
+                stat["latency_count"] += 1
+            self._append({"time": datetime.now().strftime("%H:%M:%S"), "level": "success" if outcome == "success" else "warn",
+                          "provider": provider, "model": model, "outcome": outcome, "latency_ms": latency_ms,
+                          "attempt": attempt, "http": http, "detail": detail})
+
+    def recent(self, limit=30):
+        """최근 이벤트 (오래된 것 → 최신)"""
+        with self._lock:
+            events = list(self._events)
+        return events[-limit:]
+
+    def summary(self, now=None):
+        """공급자/모델별 요약 행 목록 (요청 수 많은 순)
+
+        recent_*: 최근 RECENT_WINDOW건 중 RECENT_SECONDS 이내 요청만 (ms_per_mp는 성공 + 크기를 아는 요청)
+        recent_success_rate: 거부를 뺀 요청 중 성공 비율 (서비스 상태), recent_reject_rate: 전체 중 거부 비율
+        """
+        with self._lock:
+            items = [(key, {**stat, "outcomes": dict(stat["outcomes"]), "histogram": list(stat["histogram"]),
+                            "recent": list(stat["recent"])})
+                     for key, stat in self._stats.items()]
+        cutoff = (now or time.time()) - RECENT_SECONDS
+        rows = []
+        for (provider, model), stat in items:
+            outcomes = stat["outcomes"]
+            requests_made = sum(count for outcome, count in outcomes.items() if outcome != "fallback")
+            recent = [entry for entry in stat["recent"] if entry[0] >= cutoff]
+            answered = [entry for entry in recent if entry[1] != "rejected"]
+            per_mp = [latency / megapixels for _, outcome, latency, megapixels in recent
+                      if outcome == "success" and latency is not None and megapixels]
+            rows.append({
+                "provider": provider,
+                "model": model,
+                "requests": requests_made,
+                **outcomes,
+                "success_rate": outcomes["success"] / requests_made if requests_made else None,
+                "mean_ms": stat["latency_sum_ms"] / stat["latency_count"] if stat["latency_count"] else None,
+                "p50_ms": histogram_quantile(stat["histogram"], 0.5, self.buckets),
+                "p95_ms": histogram_quantile(stat["histogram"], 0.95, self.buckets),
+                "histogram": stat["histogram"],
+                "last_at": stat["last_at"],
+                "recent_requests": len(recent),
+                "recent_success_rate": (sum(entry[1] == "success" for entry in answered) / len(answered)
+                                        if answered else None),
+                "recent_reject_rate": (len(recent) - len(answered)) / len(recent) if recent else None,
+                "recent_ms_per_mp": statistics.median(per_mp) if per_mp else None,
+            })
+        return sorted(rows, key=lambda row: (-row["requests"] - row["fallback"], row["provider"], row["model"]))
+
+    def clear_log(self):
+        """이벤트 버퍼만 비움 (통계 유지)"""
+        with self._lock:
+            self._events.clear()
+            self.version += 1
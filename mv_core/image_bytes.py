@@ -0,0 +1,144 @@
+"""
+이미지 응답 검증 (헤더만 읽음, 전체 디코딩 없음)
+- PNG / JPEG / WebP 헤더에서 형식과 가로/세로 크기
+- 너무 짧은 응답, 잘린 파일(끝 표식 없음), 너무 작은 이미지, 알려진 공급자 오류 이미지(sha256) 거부
+- 통과한 응답은 ImageBytes(받은 바이트 그대로 + format/size 속성)로 전달 → 표시/저장 시 재인코딩 없음
+"""
+import hashlib
+import os
+import struct
+
+MIN_IMAGE_BYTES = 1000
+MIN_IMAGE_SIDE = 100
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_IEND = b"IEND\xaeB`\x82"
+# JPEG SOF 마커 (C4=DHT, C8=JPG, CC=DAC 제외)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+# 공급자가 200으로 돌려주는 오류/대기 이미지 (발견하면 sha256 추가)
+# 배포 환경에서는 MV_PLACEHOLDER_SHA256 (쉼표 구분)으로 코드 수정 없이 추가
+KNOWN_PLACEHOLDER_SHA256 = frozenset()
+
+
+class ImageBytes(bytes):
+    """검증된 이미지 원본 바이트 (bytes 그대로 사용 가능 + format / size / width / height)
+
+    seed: 생성 요청에 실제로 쓰인 시드 (생성 함수가 채움, 모르면 None)
+    """
+
+    def __new__(cls, data, format, width, height, seed=None):
+        obj = super().__new__(cls, data)
+        obj.format = format
+        obj.size = (width, height)
+        obj.seed = seed
+        return obj
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def __repr__(self):
+        return f"<ImageBytes {self.format} {self.size[0]}x{self.size[1]} {len(self)}B>"
+
+
+def _png_size(data):
+    if len(data) >= 24 and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    return None
+
+
+def _jpeg_size(data):
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:   # 채움 바이트
+            i += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker == 0xDA:   # SOS - 크기 정보 없이 스캔 시작
+            return None
+        (length,) = struct.unpack(">H", data[i + 2:i + 4])
+        if marker in JPEG_SOF_MARKERS:
+            if i + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None
+
+
+def _webp_size(data):
+    if len(data) < 30:
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 " and data[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and data[20] == 0x2F:
+        (bits,) = struct.unpack("<I", data[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
+
+
+def read_image_header(data):
+    """헤더 → (형식, 가로, 세로) / 모르는 형식이거나 헤더가 깨졌으면 None"""
+    if data.startswith(PNG_SIGNATURE):
+        fmt, size = "PNG", _png_size(data)
+    elif data.startswith(b"\xff\xd8\xff"):
+        fmt, size = "JPEG", _jpeg_size(data)
+    elif data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+        fmt, size = "WEBP", _webp_size(data)
+    else:
+        return None
+    return (fmt, *size) if size else None
+
+
+def is_truncated(data, fmt):
+    """끝 표식으로 잘린 파일 판단 (PNG IEND, JPEG EOI, WebP RIFF 길이)"""
+    if fmt == "PNG":
+        return PNG_IEND not in data[-32:]
+    if fmt == "JPEG":
+        return not data.rstrip(b"\x00").endswith(b"\xff\xd9")
+    if fmt == "WEBP":
+        (riff_size,) = struct.unpack("<I", data[4:8])
+        return len(data) < riff_size + 8
+    return False
+
+
+def placeholder_hashes():
+    """알려진 오류 이미지 sha256 (코드 목록 + MV_PLACEHOLDER_SHA256)"""
+    extra = os.getenv("MV_PLACEHOLDER_SHA256", "")
+    return KNOWN_PLACEHOLDER_SHA256 | {value.strip().lower() for value in extra.split(",") if value.strip()}
+
+
+def validate_image(data, min_side=MIN_IMAGE_SIDE, min_bytes=MIN_IMAGE_BYTES, placeholders=None):
+    """응답 바이트 검증 → (ImageBytes, None) / 실패 시 (None, 사유)
+
+    사유: "too small"(바이트), "unknown format", "truncated", "tiny WxH", "placeholder"
+    """
+    if len(data) < min_bytes:
+        return None, "too small"
+    header = read_image_header(data)
+    if header is None:
+        return None, "unknown format"
+    fmt, width, height = header
+    if is_truncated(data, fmt):
+        return None, "truncated"
+    if min(width, height) < min_side:
+        return None, f"tiny {width}x{height}"
+    placeholders = placeholder_hashes() if placeholders is None else placeholders
+    if placeholders and hashlib.sha256(data).hexdigest() in placeholders:
+        return None, "placeholder"
+    return ImageBytes(data, fmt, width, height), None
@@ -0,0 +1,141 @@
+"""
+지각 해시(pHash / dHash)로 프로젝트 안의 거의 같은 이미지 찾기
+- phash: 32x32 회색조 → 2D DCT → 저주파 8x8이 중앙값보다 큰지 (64비트)
+- dhash: 9x8 회색조 → 가로로 이웃한 픽셀 밝기 비교 (64비트, 더 빠르고 덜 엄격)
+- 해시는 이미지 객체에 1회 계산 후 캐시 (ImageBytes)
+- 최종 프롬프트가 완전히 같은 항목은 생성하지 않고 이미지를 그대로 재사용
+numpy / PIL은 첫 해시 계산 때 import (앱 콜드 스타트에서 제외)
+"""
+from functools import lru_cache
+from io import BytesIO
+
+DEFAULT_MAX_DISTANCE = 6     # 64비트 중 다른 비트 수 - 이 이하면 거의 같은 이미지
+HASH_METHODS = ("phash", "dhash")
+
+
+def _grayscale(data, width, height):
+    """축소 디코딩 → (height, width) float32 회색조"""
+    import numpy as np
+    from PIL import Image
+
+    img = Image.open(BytesIO(data))
+    img.draft("L", (width * 4, height * 4))
+    img = img.convert("L").resize((width, height), Image.Resampling.BILINEAR)
+    return np.asarray(img, dtype=np.float32)
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(size):
+    """DCT-II 변환 행렬 (정규화 생략 - 중앙값 비교에는 필요 없음)"""
+    import numpy as np
+
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    return np.cos(np.pi * (2 * n + 1) * k / (2 * size)).astype(np.float32)
+
+
+def phash(data, hash_size=8, dct_size=32):
+    """pHash (hash_size² 비트 정수)"""
+    import numpy as np
+
+    matrix = _dct_matrix(dct_size)
+    low = (matrix @ _grayscale(data, dct_size, dct_size) @ matrix.T)[:hash_size, :hash_size]
+    # DC 성분(평균 밝기)은 중앙값 계산에서 제외
+    median = np.median(low.ravel()[1:])
+    return _bits_to_int(low > median)
+
+
+def dhash(data, hash_size=8):
+    """dHash (hash_size² 비트 정수)"""
+    pixels = _grayscale(data, hash_size + 1, hash_size)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def hamming(a, b):
+    """두 해시의 다른 비트 수"""
+    return bin(a ^ b).count("1")
+
+
+def image_hash(img, method="phash"):
+    """이미지 바이트 → 해시 (이미지 객체에 방법별로 캐시, 디코딩할 수 없으면 None)"""
+    cache = getattr(img, "_mv_hashes", None)
+    if cache is not None and method in cache:
+        return cache[method]
+    try:
+        value = (phash if method == "phash" else dhash)(img)
+    except Exception:
+        value = None
+    if hasattr(img, "__dict__"):
+        if cache is None:
+            cache = img._mv_hashes = {}
+        cache[method] = value
+    return value
+
+
+def find_near_duplicates(images, max_distance=DEFAULT_MAX_DISTANCE, method="phash"):
+    """{키: 이미지} → 거의 같은 쌍 [(키 a, 키 b, 거리)] (거리 → 입력 순서)"""
+    import numpy as np
+
+    keys, hashes = [], []
+    for key, img in images.items():
+        value = image_hash(img, method) if img is not None else None
+        if value is not None:
+            keys.append(key)
+            hashes.append(value)
+    if len(keys) < 2:
+        return []
+    values = np.asarray(hashes, dtype=np.uint64)
+    xor = values[:, None] ^ values[None, :]
+    distances = np.unpackbits(xor.view(np.uint8), axis=-1).reshape(len(keys), len(keys), -1).sum(axis=-1)
+    rows, cols = np.nonzero(np.triu(distances <= max_distance, k=1))
+    pairs = [(keys[i], keys[j], int(distances[i, j])) for i, j in zip(rows, cols)]
+    return sorted(pairs, key=lambda pair: pair[2])
+
+
+def duplicate_groups(pairs):
+    """쌍 목록 → 연결된 묶음 [[키, ...]] (묶음 안 순서는 처음 나온 순서, 첫 키가 원본)"""
+    parent, order = {}, {}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for a, b, _ in pairs:
+        for key in (a, b):
+            if key not in parent:
+                parent[key] = key
+                order[key] = len(order)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            if order[root_b] < order[root_a]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+    groups = {}
+    for key in sorted(parent, key=order.get):
+        groups.setdefault(find(key), []).append(key)
+    return list(groups.values())
+
+
+def flagged_keys(groups):
+    """묶음마다 첫 항목(원본)을 남기고 나머지 = 다시 생성할 키"""
+    return [key for group in groups for key in group[1:]]
+
+
+def find_reusable(key, requests, images):
+    """requests {키: (프롬프트, 가로, 세로)} 중 key와 완전히 같은 요청의 이미지가 있으면 그 키 (없으면 None)"""
+    target = requests.get(key)
+    if target is None:
+        return None
+    for other, request in requests.items():
+        if other != key and request == target and images.get(other) is not None:
+            return other
+    return None
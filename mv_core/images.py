@@ -0,0 +1,453 @@
+"""
+이미지 생성 (Segmind + Pollinations 폴백)
+requests는 호출 시점에 import, 로그/진행률은 콜백으로 전달
+응답은 헤더만 검증하고 디코딩 없이 ImageBytes(원본 바이트)로 전달
+"""
+import base64
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from .callbacks import CallbackQueue, null_event, null_log, null_progress
+from .endpoints import segmind_url
+from .image_bytes import validate_image
+from .plan_index import CompiledPlan
+from .prompt_budget import budget_prompt
+from .providers import build_pollinations_url, enhance_prompt_for_provider, pollinations_model_for
+from .singleflight import request_key
+from .tracing import span, traced_sleep
+
+PREVIEW_PAUSE_SECONDS = 0.3
+RETRY_DELAY_SECONDS = 1.5
+SEGMIND_MODEL = "sdxl1.0"
+
+
+def segmind_payload(prompt, width, height, seed=None, samples=1):
+    """Segmind SDXL 1.0 요청 본문 (samples > 1이면 여러 장을 base64 JSON으로 받음)"""
+    return {
+        "prompt": prompt,
+        "negative_prompt": "ugly, tiling, poorly drawn hands, poorly drawn feet, poorly drawn face, out of frame, extra limbs, disfigured, deformed, body out of frame, blurry, bad anatomy, blurred, watermark, grainy, signature, cut off, draft",
+        "style": "cinematic",
+        "samples": samples,
+        "scheduler": "UniPC",
+        "num_inference_steps": 25,
+        "guidance_scale": 7.5,
+        "seed": seed if seed is not None else random.randint(1, 10000000),
+        "img_width": width,
+        "img_height": height,
+        "base64": samples > 1
+    }
+
+
+def generate_image_segmind(prompt, width, height, api_key, log=null_log, event=null_event, seed=None, quality=None,
+                           palette=None):
+    """Segmind API를 사용한 이미지 생성 → ImageBytes (실패 시 None)
+
+    quality: QualityGate - 품질 미달이면 None (호출 쪽이 Pollinations로 폴백)
+    """
+    import requests
+
+    if not api_key:
+        log("Segmind: API 키 없음", "error")
+        return None
+
+    log("Segmind (SDXL 1.0) 모델 요청 중...", "model")
+    payload = segmind_payload(prompt, width, height, seed)
+    headers = {'x-api-key': api_key}
+
+    with span("image.request", provider="segmind", attempt=1, width=width, height=height) as request:
+        started = time.perf_counter()
+        try:
+            response = requests.post(segmind_url(), json=payload, headers=headers, timeout=60)
+            request.set(http=response.status_code, bytes=len(response.content))
+            if response.status_code == 200:
+                img, reason = validate_image(response.content)
+                if img is not None and quality is not None:
+                    reason = quality_reason(quality, img, width, height, palette)
+                    img = None if reason else img
+                if img is not None:
+                    img.seed = payload["seed"]
+                    event("Segmind", SEGMIND_MODEL, "success", (time.perf_counter() - started) * 1000, http=200,
+                          megapixels=width * height / 1e6)
+                    log(f"Segmind SDXL 1.0 성공! 크기: {img.size[0]}x{img.size[1]}", "success")
+                    return img
+                request.set(status="rejected", reject=reason)
+                event("Segmind", SEGMIND_MODEL, "rejected", (time.perf_counter() - started) * 1000, http=200,
+                      detail=reason)
+                log(f"Segmind 응답 거부: {reason}", "error")
+            else:
+                request.set(status=f"http_{response.status_code}")
+                event("Segmind", SEGMIND_MODEL, "http_error", (time.perf_counter() - started) * 1000,
+                      http=response.status_code)
+                log(f"Segmind 실패: HTTP {response.status_code}", "error")
+        except Exception as e:
+            request.set(status="error", error=str(e)[:200])
+            event("Segmind", SEGMIND_MODEL, "exception", (time.perf_counter() - started) * 1000, detail=str(e)[:80])
+            log(f"Segmind 예외: {str(e)[:80]}", "error")
+    return None
+
+
+def parse_segmind_samples(content):
+    """samples > 1 응답 → 이미지 바이트 목록
+
+    base64 JSON ({"image": 문자열|목록} 또는 {"images": 목록}, data: URI 접두어 허용) / 이미지 바이트 그대로면 1장
+    """
+    if not content.lstrip().startswith(b"{"):
+        return [content]
+    body = json.loads(content)
+    encoded = body.get("images", body.get("image", []))
+    if isinstance(encoded, str):
+        encoded = [encoded]
+    return [base64.b64decode(item.split(",", 1)[1] if item.startswith("data:") else item) for item in encoded]
+
+
+def generate_segmind_samples(prompt, width, height, api_key, samples, log=null_log, event=null_event, seed=None,
+                             quality=None, palette=None):
+    """Segmind 요청 1번으로 여러 장 생성 → ImageBytes 목록 (거부된 장은 빠짐, 실패 시 빈 목록)"""
+    import requests
+
+    if not api_key:
+        log("Segmind: API 키 없음", "error")
+        return []
+
+    log(f"Segmind (SDXL 1.0) {samples}장 요청 중...", "model")
+    payload = segmind_payload(prompt, width, height, seed, samples=samples)
+    headers = {'x-api-key': api_key}
+
+    with span("image.request", provider="segmind", attempt=1, width=width, height=height,
+              samples=samples) as request:
+        started = time.perf_counter()
+        try:
+            response = requests.post(segmind_url(), json=payload, headers=headers, timeout=60 + 15 * samples)
+            request.set(http=response.status_code, bytes=len(response.content))
+            latency_ms = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                request.set(status=f"http_{response.status_code}")
+                event("Segmind", SEGMIND_MODEL, "http_error", latency_ms, http=response.status_code)
+                log(f"Segmind 실패: HTTP {response.status_code}", "error")
+                return []
+            images, reasons = [], []
+            for i, data in enumerate(parse_segmind_samples(response.content)):
+                # Segmind는 seed부터 samples장을 이어서 생성 → i번째 장의 시드는 seed + i
+                img, reason = validate_image(data)
+                if img is not None and quality is not None:
+                    reason = quality_reason(quality, img, width, height, palette)
+                    img = None if reason else img
+                if img is not None:
+                    img.seed = payload["seed"] + i
+                    images.append(img)
+                else:
+                    reasons.append(reason)
+            request.set(received=len(images) + len(reasons), accepted=len(images))
+            if reasons:
+                request.set(reject=", ".join(reasons))
+                log(f"Segmind 응답 일부 거부 ({len(reasons)}장): {', '.join(reasons)}", "warn")
+            if images:
+                event("Segmind", SEGMIND_MODEL, "success", latency_ms, http=200,
+                      megapixels=width * height * samples / 1e6)
+                log(f"Segmind SDXL 1.0 성공! {len(images)}/{samples}장", "success")
+            else:
+                request.set(status="rejected")
+                event("Segmind", SEGMIND_MODEL, "rejected", latency_ms, http=200,
+                      detail=", ".join(reasons) or "no images")
+            return images
+        except Exception as e:
+            request.set(status="error", error=str(e)[:200])
+            event("Segmind", SEGMIND_MODEL, "exception", (time.perf_counter() - started) * 1000, detail=str(e)[:80])
+            log(f"Segmind 예외: {str(e)[:80]}", "error")
+    return []
+
+
+def quality_reason(quality, img, width, height, palette):
+    """품질 게이트 거부 사유 ("quality: ..." / 통과하면 None)"""
+    reason, _ = quality.check(img, width, height, palette)
+    return f"quality: {reason}" if reason else None
+
+
+def budget_prompt_with_log(prompt, provider, log=null_log):
+    """공급자 길이 한도 적용 + 제거 내역 로그"""
+    budgeted, cuts = budget_prompt(prompt, provider)
+    if cuts:
+        log(f"프롬프트 축소 ({len(prompt)}→{len(budgeted)}자): {', '.join(cuts)}", "warn")
+    return budgeted
+
+
+def generate_image_with_fallback(prompt, width, height, provider, max_retries=3, segmind_key=None, log=null_log,
+                                 event=null_event, seed=None, flight=None, quality=None, palette=None):
+    """이미지 생성 시도 및 폴백 로직 (Pollinations 모델 세분화 적용) → (이미지, 실제 엔진) / 실패 시 (None, None)
+
+    segmind_key가 없으면 SEGMIND_API_KEY 환경 변수 사용
+    event: 요청마다 결과 전달 (Segmind → Pollinations 폴백은 Segmind의 "fallback"으로 기록)
+    seed: 없으면 요청마다 무작위
+    flight: SingleFlight - 같은 (프롬프트, 크기, 엔진, 시드) 요청이 진행 중이면 그 결과를 공유
+    quality: QualityGate - 응답마다 실행, 미달이면 재시도 예산 안에서 새 시드로 다시 요청
+    palette: 장소 color_palette 색 목록 (품질 게이트의 팔레트 비교용)
+    """
+    return run_steps(image_generation_steps(prompt, width, height, provider, max_retries, segmind_key, log, event,
+                                            seed, flight, quality, palette))
+
+
+def run_steps(steps):
+    """단계 제너레이터를 현재 스레드에서 끝까지 실행 → 반환값
+
+    yield 값: 다음 요청까지 기다릴 초 (재시도 간격) 또는 threading.Event (같은 요청을 실행 중인 쪽의 완료)
+    """
+    try:
+        pause = next(steps)
+        while True:
+            if isinstance(pause, threading.Event):
+                pause.wait()
+            elif pause:
+                traced_sleep(pause, reason="image_retry")
+            pause = next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+
+def image_generation_steps(prompt, width, height, provider, max_retries=3, segmind_key=None, log=null_log,
+                           event=null_event, seed=None, flight=None, quality=None, palette=None):
+    """generate_image_with_fallback의 단계 버전 (제너레이터) - 요청 1건마다 yield, 반환값은 같음
+
+    GenerationScheduler에 제출하면 요청 사이마다 작업자를 놓음 (재시도 중인 일괄 작업이 클릭을 막지 않음)
+    """
+    with span("image.generate", provider=provider, width=width, height=height) as generate:
+        steps = _fallback_steps(prompt, width, height, provider, max_retries, segmind_key, log, event, seed,
+                                quality=quality, palette=palette)
+        if flight is None:
+            img, actual_provider = yield from steps
+        else:
+            key = request_key(prompt, width, height, provider, seed, quality is not None, palette)
+            call, leader = flight.begin("image", key)
+            if leader:
+                try:
+                    result = yield from steps
+                except GeneratorExit:
+                    flight.finish("image", key, call, error=CancelledError())
+                    raise
+                except BaseException as e:
+                    flight.finish("image", key, call, error=e)
+                    raise
+                flight.finish("image", key, call, result=result)
+                img, actual_provider = result
+            else:
+                steps.close()
+                with span("singleflight.wait", namespace="image"):
+                    started = time.perf_counter()
+                    yield call.done
+                img, actual_provider = flight.shared_result("image", call, started)
+                generate.set(coalesced=True)
+                log(f"동일 요청 진행 중 → 결과 공유 ({actual_provider or '실패'})", "info")
+        generate.set(status="ok" if img else "failed", actual_provider=actual_provider)
+        return img, actual_provider
+
+
+def _fallback_steps(prompt, width, height, provider, max_retries, segmind_key, log, event, seed, quality=None,
+                    palette=None):
+    # 프롬프트 보정 (퀄리티 향상)
+    with span("image.prompt_build"):
+        enhanced = enhance_prompt_for_provider(prompt, provider)
+        
+    log(f"이미지 생성 시작 | 선택 엔진: {provider} | 크기: {width}x{height}", "info")
+
+    # 1. Segmind 시도
+    if "Segmind" in provider:
+        log("1단계: Segmind (SDXL) 시도", "info")
+        sg_api_key = segmind_key or os.getenv("SEGMIND_API_KEY")
+        if sg_api_key:
+            img = generate_image_segmind(budget_prompt_with_log(enhanced, "segmind", log), width, height, sg_api_key,
+                                         log, event, seed, quality=quality, palette=palette)
+            if img:
+                return img, "Segmind (SDXL 1.0)"
+            event("Segmind", SEGMIND_MODEL, "fallback", detail="request failed")
+            log("Segmind 실패 → Pollinations 폴백 진행", "warn")
+            yield 0   # Segmind 요청과 Pollinations 요청 사이
+        else:
+            event("Segmind", SEGMIND_MODEL, "fallback", detail="no key")
+            log("Segmind API 키 없음 → Pollinations 자동 전환", "warn")
+
+    # 2. Pollinations
+    return (yield from pollinations_steps(enhanced, width, height, provider, max_retries, log, event, seed,
+                                          is_fallback="Segmind" in provider, quality=quality, palette=palette))
+
+
+def generate_image_pollinations(enhanced, width, height, provider, max_retries=3, log=null_log, event=null_event,
+                                seed=None, is_fallback=False, quality=None, palette=None):
+    """Pollinations 요청 (재시도 포함) → (ImageBytes, 실제 엔진) / 실패 시 (None, None)
+
+    enhanced: 공급자 보정이 끝난 프롬프트 (길이 한도는 여기서 적용)
+    quality: 품질 미달이면 새 시드로 재시도 (같은 시드는 같은 이미지), 예산을 다 쓰면 팔레트만 어긋난 이미지는 사용
+    반환 이미지의 seed 속성 = 실제로 그 이미지를 만든 시드 (재시도로 바뀌었을 수 있음)
+    """
+    return run_steps(pollinations_steps(enhanced, width, height, provider, max_retries, log, event, seed, is_fallback,
+                                        quality, palette))
+
+
+def pollinations_steps(enhanced, width, height, provider, max_retries=3, log=null_log, event=null_event, seed=None,
+                       is_fallback=False, quality=None, palette=None):
+    """generate_image_pollinations의 단계 버전 (시도 사이마다 재시도 간격을 yield)"""
+    import requests
+
+    # Pollinations 모델 매핑 (핵심 수정 부분)
+    # provider 이름에 따라 최적 모델 파라미터 설정
+    seed = seed if seed is not None else random.randint(0, 999999)
+    poll_model = pollinations_model_for(provider)
+    # URL 길이 한도 내로 축소 (긴 URL은 실패/잘림으로 재시도만 낭비)
+    with span("image.prompt_build", target="pollinations"):
+        budgeted = budget_prompt_with_log(enhanced, "pollinations", log)
+        url = build_pollinations_url(budgeted, width, height, poll_model, seed)
+    soft_reject = None   # 팔레트만 어긋난 마지막 이미지 (재시도 예산을 다 쓰면 사용)
+
+    log_prefix = "폴백 → " if is_fallback else ""
+    log(f"{log_prefix}Pollinations [{poll_model}] 모델 요청", "model")
+
+    # 재시도 로직
+    for attempt in range(max_retries):
+        with span("image.request", provider=f"pollinations/{poll_model}", attempt=attempt + 1,
+                  width=width, height=height) as request:
+            started = time.perf_counter()
+            try:
+                # 타임아웃을 넉넉히 설정 (고화질 모델은 시간 걸림)
+                response = requests.get(url, timeout=60)
+                request.set(http=response.status_code, bytes=len(response.content))
+                latency_ms = (time.perf_counter() - started) * 1000
+
+                if response.status_code == 200:
+                    # 헤더만 읽어 형식/크기/잘림/오류 이미지 확인 (디코딩 없음)
+                    img, reason = validate_image(response.content)
+                    if img is not None:
+                        img.seed = seed
+                    if img is not None and quality is not None:
+                        reason = quality_reason(quality, img, width, height, palette)
+                        if reason:
+                            if quality.is_soft(reason.split(": ", 1)[1]):
+                                soft_reject = img
+                            img = None
+                            # 같은 시드는 같은 이미지를 돌려주므로 다음 시도는 새 시드
+                            seed = random.randint(0, 999999)
+                            url = build_pollinations_url(budgeted, width, height, poll_model, seed)
+                    if img is not None:
+                        actual_provider = f"Pollinations {poll_model}"
+                        if is_fallback:
+                            actual_provider += " (폴백)"
+                        event("Pollinations", poll_model, "success", latency_ms, attempt + 1, http=200,
+                              megapixels=width * height / 1e6)
+                        log(f"생성 성공! ({poll_model})", "success")
+                        return img, actual_provider
+                    request.set(status="rejected", reject=reason)
+                    event("Pollinations", poll_model, "rejected", latency_ms, attempt + 1, http=200,
+                          detail=reason)
+                    log(f"응답 거부 ({attempt+1}/{max_retries}): {reason}", "warn")
+                else:
+                    request.set(status=f"http_{response.status_code}")
+                    event("Pollinations", poll_model, "http_error", latency_ms, attempt + 1, http=response.status_code)
+                    log(f"응답 오류 ({attempt+1}/{max_retries}): {response.status_code}", "warn")
+
+            except Exception as e:
+                request.set(status="error", error=str(e)[:200])
+                event("Pollinations", poll_model, "exception", (time.perf_counter() - started) * 1000, attempt + 1,
+                      detail=str(e)[:80])
+                log(f"생성 실패 ({attempt+1}/{max_retries}): {str(e)[:30]}", "error")
+
+        if attempt < max_retries - 1:
+            yield RETRY_DELAY_SECONDS
+
+    if soft_reject is not None:
+        log("품질 재시도 예산 소진 → 팔레트가 어긋난 마지막 이미지 사용", "warn")
+        actual_provider = f"Pollinations {poll_model}" + (" (폴백)" if is_fallback else "")
+        return soft_reject, actual_provider
+    log("모든 이미지 생성 시도 실패", "error")
+    return None, None
+
+
+def get_preview_size(width, height):
+    """프리뷰용 저화질 사이즈 계산 (원본의 50% 또는 최대 512px)"""
+    scale = min(512 / max(width, height), 0.5)
+    preview_w = max(256, int(width * scale))
+    preview_h = max(256, int(height * scale))
+    # 8의 배수로 맞춤 (이미지 생성 모델 요구사항)
+    preview_w = (preview_w // 8) * 8
+    preview_h = (preview_h // 8) * 8
+    return preview_w, preview_h
+
+
+def generate_preview_images(plan_data, img_width, img_height, provider, use_json=True, max_retries=2, compiled=None,
+                            on_image=None, segmind_key=None, log=null_log, progress=null_progress,
+                            pause=PREVIEW_PAUSE_SECONDS, event=null_event, pick_provider=None, flight=None,
+                            quality=None, scheduler=None):
+    """모든 씬의 프리뷰 이미지를 생성 → 생성 개수
+
+    on_image(scene_num, img, actual_provider): 이미지가 하나 나올 때마다 호출
+    compiled: 재사용할 CompiledPlan (없으면 새로 컴파일)
+    pick_provider(): 씬마다 엔진을 고를 때 (Auto 엔진) - 없으면 provider 고정
+    flight: SingleFlight (다른 세션의 같은 프리뷰 요청과 합치기)
+    quality: QualityGate (씬에 쓰인 장소의 color_palette와 비교)
+    최종 프롬프트가 앞 씬과 완전히 같으면 생성하지 않고 그 이미지를 재사용
+    scheduler: 공유 GenerationScheduler에 씬마다 "preview" 우선순위로 제출 (클릭한 이미지가 먼저 처리됨)
+    """
+    scenes = (plan_data or {}).get('scenes', [])
+    if not scenes:
+        return 0
+
+    # 프리뷰용 저화질 사이즈
+    preview_w, preview_h = get_preview_size(img_width, img_height)
+    compiled = compiled or CompiledPlan(plan_data)
+
+    generated_count = 0
+    reused = {}   # 최종 프롬프트 → (이미지, 실제 엔진)
+    total_scenes = len(scenes)
+    with span("preview.batch", provider=provider, scenes=total_scenes) as batch:
+        for idx, scene in enumerate(scenes):
+            scene_num = scene.get('scene_num', idx + 1)
+            progress(idx, total_scenes, f"🎨 프리뷰 이미지 생성 중... ({idx + 1}/{total_scenes}) - Scene {scene_num}")
+
+            # 이미지 프롬프트 가져오기
+            if not scene.get('image_prompt', ''):
+                continue
+
+            with span("preview.scene", scene=scene_num) as scene_span:
+                # JSON 프로필 적용 (컴파일된 프롬프트)
+                final_prompt = compiled.scene_prompt(idx, use_json)
+                if final_prompt in reused:
+                    img, actual_provider = reused[final_prompt]
+                    log(f"Scene {scene_num}: 앞 씬과 프롬프트가 같아 이미지 재사용", "info")
+                    scene_span.set(status="reused")
+                    if on_image:
+                        on_image(scene_num, img, actual_provider)
+                    generated_count += 1
+                    progress(idx + 1, total_scenes, "")
+                    continue
+
+                # 프리뷰 이미지 생성
+                scene_provider = pick_provider() if pick_provider else provider
+                if scheduler is not None:
+                    queue = CallbackQueue()
+                    job = scheduler.submit(image_generation_steps, final_prompt, preview_w, preview_h,
+                                           scene_provider, max_retries, segmind_key=segmind_key, log=queue.log,
+                                           event=queue.event, flight=flight, quality=quality,
+                                           palette=compiled.scene_palette(idx), priority="preview")
+                    try:
+                        img, actual_provider = job.result()
+                    finally:
+                        queue.replay(log, event)
+                else:
+                    img, actual_provider = generate_image_with_fallback(final_prompt, preview_w, preview_h,
+                                                                        scene_provider, max_retries,
+                                                                        segmind_key=segmind_key, log=log,
+                                                                        event=event, flight=flight, quality=quality,
+                                                                        palette=compiled.scene_palette(idx))
+                if img:
+                    reused[final_prompt] = (img, actual_provider)
+                    if on_image:
+                        on_image(scene_num, img, actual_provider)
+                    generated_count += 1
+                else:
+                    scene_span.set(status="failed")
+
+            progress(idx + 1, total_scenes, "")
+            traced_sleep(pause, reason="preview_pause")  # API 부하 방지
+        batch.set(generated=generated_count)
+
+    return generated_count
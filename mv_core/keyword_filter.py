@@ -0,0 +1,181 @@
+"""
+트렌드 키워드 채널 필터
+- 카테고리 프로필(keywords, themes, visual_refs, style_guide) 대비 로컬 관련도 점수 → 상위 K개만 LLM에 전달
+- LLM 필터 결과 캐시: (전달한 키워드 집합 해시, 카테고리)
+- 로컬 사전 필터 / 캐시로 아낀 추정 토큰 집계
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_TOP_K = 12
+MAX_CACHED_FILTERS = 100
+
+# 프로필 필드별 가중치 (style_guide는 쉼표로 나눈 구문 단위)
+PROFILE_FIELD_WEIGHTS = {"keywords": 1.0, "themes": 1.0, "visual_refs": 0.8, "style_guide": 0.6}
+CONTAINMENT_FACTOR = 0.9    # "컴백" ⊂ "뉴진스 컴백" 처럼 한쪽이 다른 쪽을 포함
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (영문 4자 ≈ 1토큰, 한글 1.5자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    other_chars = len(text) - ascii_chars
+    return max(1, round(ascii_chars / 4 + other_chars / 1.5))
+
+
+def _normalize(text):
+    return _NON_WORD_RE.sub("", str(text).lower())
+
+
+def _bigrams(normalized):
+    if len(normalized) < 2:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+# ------------------------------------------------------------------
+# 로컬 관련도 점수
+# ------------------------------------------------------------------
+def profile_terms(profile):
+    """카테고리 프로필 → [(정규화 용어, 문자 bigram 집합, 가중치), ...]"""
+    terms = []
+    for field, weight in PROFILE_FIELD_WEIGHTS.items():
+        values = profile.get(field, [])
+        if isinstance(values, str):
+            values = values.split(",")
+        for value in values:
+            normalized = _normalize(value)
+            if normalized:
+                terms.append((normalized, _bigrams(normalized), weight))
+    return terms
+
+
+def keyword_relevance(keyword, terms):
+    """키워드 하나의 관련도 (0~1): 프로필 용어와의 일치 > 포함 > 문자 bigram Dice 계수 중 최댓값"""
+    normalized = _normalize(keyword)
+    if not normalized:
+        return 0.0
+    grams = _bigrams(normalized)
+    best = 0.0
+    for term, term_grams, weight in terms:
+        if normalized == term:
+            score = weight
+        elif len(term) >= 2 and len(normalized) >= 2 and (term in normalized or normalized in term):
+            score = weight * CONTAINMENT_FACTOR
+        else:
+            overlap = len(grams & term_grams)
+            if not overlap:
+                continue
+            score = weight * 2 * overlap / (len(grams) + len(term_grams))
+        if score > best:
+            best = score
+    return best
+
+
+def rank_keywords(keywords, profile, top_k=DEFAULT_TOP_K):
+    """관련도 순 상위 top_k개 → (전달할 키워드, 제외된 키워드)
+
+    점수가 같으면 입력 순서 유지 (구글 트렌드는 검색량 순으로 들어옴).
+    """
+    unique = list(dict.fromkeys(kw for kw in keywords if str(kw).strip()))
+    if len(unique) <= top_k:
+        return unique, []
+    terms = profile_terms(profile)
+    order = sorted(range(len(unique)), key=lambda i: (-keyword_relevance(unique[i], terms), i))
+    keep = set(order[:top_k])
+    return ([kw for i, kw in enumerate(unique) if i in keep],
+            [kw for i, kw in enumerate(unique) if i not in keep])
+
+
+# ------------------------------------------------------------------
+# LLM 필터 프롬프트
+# ------------------------------------------------------------------
+def build_filter_prompt(keywords, channel_category, profile):
+    """채널 카테고리 키워드 필터 프롬프트"""
+    return f"""너는 '{channel_category}' 분야 전문 영상 기획자야.
+
+## 카테고리 특성
+- 핵심 키워드: {', '.join(profile['keywords'][:8])}
+- 주요 테마: {', '.join(profile['themes'][:6])}
+- 스타일 가이드: {profile['style_guide']}
+
+## 작업
+다음 트렌드 키워드에서 '{channel_category}' 영상 콘텐츠로 연결할 수 있는 것만 선택해.
+각 키워드를 '{channel_category}'의 특성에 맞게 어떻게 활용할 수 있는지 구체적으로 제안해.
+
+트렌드 키워드: {keywords}
+
+## 출력 형식 (JSON)
+{{
+    "filtered_keywords": [
+        {{"keyword": "선택한키워드", "angle": "{channel_category}에서의 구체적 활용법", "concept_hint": "영상 콘셉트 힌트"}}
+    ]
+}}
+
+반드시 {channel_category}과 연결 가능한 키워드만 선택하고, 억지 연결은 하지 마."""
+
+
+def keyword_set_key(keywords, channel_category):
+    """(키워드 집합 해시, 카테고리) 캐시 키 (순서 무관)"""
+    digest = hashlib.sha1("\n".join(sorted(set(map(str, keywords)))).encode("utf-8")).hexdigest()
+    return digest, channel_category
+
+
+# ------------------------------------------------------------------
+# 사전 필터 + 캐시
+# ------------------------------------------------------------------
+class KeywordFilter:
+    """로컬 사전 필터 → LLM 필터 (결과 캐시)
+
+    llm_filter_fn(keywords, channel_category, *args) → [{keyword, angle, concept_hint}, ...]
+    (실패 시 예외를 던져야 캐시되지 않음, 빈 결과도 캐시하지 않음)
+    """
+
+    def __init__(self, llm_filter_fn, top_k=DEFAULT_TOP_K, max_cached=MAX_CACHED_FILTERS):
+        self.llm_filter_fn = llm_filter_fn
+        self.top_k = top_k
+        self.max_cached = max_cached
+        self._results = OrderedDict()   # (해시, 카테고리) → 필터 결과
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "cache_hits": 0, "keywords_in": 0, "keywords_sent": 0,
+                      "full_prompt_tokens": 0, "sent_prompt_tokens": 0}
+
+    def filter(self, keywords, channel_category, profile, *args):
+        """상위 K개만 LLM에 보내 필터링 → (필터 결과, 이번 호출 리포트)"""
+        sent, dropped = rank_keywords(keywords, profile, self.top_k)
+        full_tokens = estimate_tokens(build_filter_prompt(sent + dropped, channel_category, profile))
+        sent_tokens = estimate_tokens(build_filter_prompt(sent, channel_category, profile))
+        key = keyword_set_key(sent, channel_category)
+
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+        if cached is None:
+            result = self.llm_filter_fn(sent, channel_category, *args)
+            if result:
+                with self._lock:
+                    self._results[key] = result
+                    while len(self._results) > self.max_cached:
+                        self._results.popitem(last=False)
+        else:
+            result = cached
+
+        report = {"keywords_in": len(sent) + len(dropped), "keywords_sent": len(sent), "dropped": dropped,
+                  "cache_hit": cached is not None, "full_prompt_tokens": full_tokens,
+                  "sent_prompt_tokens": 0 if cached is not None else sent_tokens}
+        report["tokens_saved"] = report["full_prompt_tokens"] - report["sent_prompt_tokens"]
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["cache_hits"] += report["cache_hit"]
+            for field in ("keywords_in", "keywords_sent", "full_prompt_tokens", "sent_prompt_tokens"):
+                self.stats[field] += report[field]
+        return result, report
+
+    def tokens_saved(self):
+        """누적 절감 추정 토큰 (사전 필터 없이 매번 전체를 보냈을 때 대비, 입력 프롬프트 기준)"""
+        with self._lock:
+            return self.stats["full_prompt_tokens"] - self.stats["sent_prompt_tokens"]
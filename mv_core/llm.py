@@ -0,0 +1,132 @@
+"""
+Gemini 호출 (google.generativeai는 호출 시점에 import)
+- 기획안 생성용 모델 폴백
+- AI 바이럴 주제 / 스카우트 키워드 필터 / 키워드 콘셉트 (단건, 일괄)
+"""
+import json
+import re
+
+from .callbacks import null_notify
+from .catalog import get_category_profile
+from .endpoints import gemini_api_endpoint
+from .concepts import build_batch_concept_prompt, build_concept_prompt, fallback_concept, keyword_fields, parse_concept_array
+from .keyword_filter import build_filter_prompt
+from .singleflight import request_key
+from .topics import generate_trending_topic
+from .tracing import span, traced_sleep
+
+
+def configure_gemini(api_key):
+    """google.generativeai 설정 후 모듈 반환 (MV_GEMINI_API_ENDPOINT가 있으면 그 주소로 REST 연결)"""
+    import google.generativeai as genai
+
+    endpoint = gemini_api_endpoint()
+    if endpoint:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=api_key)
+    return genai
+
+
+def generate_with_fallback(prompt, api_key, model_name, notify=null_notify, flight=None):
+    """원본 작동 버전 기반 - 단순화 → (응답 텍스트, 사용한 모델)
+
+    선택 모델이 실패하면 기본 모델 순서대로 재시도 (다음 모델로 넘어갈 때마다 notify, level "info")
+    flight: SingleFlight - 같은 (모델, 프롬프트, API 키) 요청이 진행 중이면 그 응답을 공유
+    (키가 다른 세션끼리는 합치지 않음 → 남의 키 할당량/오류를 공유하지 않음, 키는 해시로만 보관)
+    """
+    if flight is None:
+        return _generate_with_fallback(prompt, api_key, model_name, notify)
+    result, shared = flight.do("llm", request_key(model_name, prompt, api_key),
+                               lambda: _generate_with_fallback(prompt, api_key, model_name, notify))
+    if shared:
+        notify(f"🔗 동일 요청 진행 중 → 응답 공유 ({result[1]})")
+    return result
+
+
+def _generate_with_fallback(prompt, api_key, model_name, notify):
+    genai = configure_gemini(api_key)
+    models_to_try = [model_name, "gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"]
+
+    for model in models_to_try:
+        with span("llm.call", model=model, purpose="plan", prompt_bytes=len(prompt.encode("utf-8"))) as call:
+            try:
+                gen_model = genai.GenerativeModel(model)
+                response = gen_model.generate_content(prompt, generation_config={"temperature": 0.8, "max_output_tokens": 8192})
+                call.set(bytes=len(response.text.encode("utf-8")))
+                return response.text, model
+            except Exception as e:
+                call.set(status="error", error=str(e)[:200])
+                notify(f"⚠️ {model} 실패: {str(e)[:30]}...")
+        traced_sleep(1, reason="model_fallback")
+    raise Exception("All models failed")
+
+
+def get_viral_topic_with_ai(api_key, model_name):
+    """AI 바이럴 주제 1개 (실패 시 템플릿 주제)"""
+    try:
+        genai = configure_gemini(api_key)
+        model = genai.GenerativeModel(model_name)
+        prompt = """Generate ONE highly creative, viral-worthy music video concept. 
+        Be specific, cinematic, and emotionally compelling. Include:
+        - Unique character/protagonist
+        - Vivid setting/location
+        - Core emotion/theme
+        - Visual style reference
+        Keep it to 2-3 sentences. Make it feel like a blockbuster movie pitch."""
+        with span("llm.call", model=model_name, purpose="viral_topic") as call:
+            response = model.generate_content(prompt)
+            call.set(bytes=len(response.text.encode("utf-8")))
+        return response.text.strip().strip('"')
+    except:
+        return generate_trending_topic()
+
+
+def llm_filter_keywords(keywords, channel_category, api_key, model_name):
+    """LLM으로 채널 카테고리에 맞는 키워드만 필터링 (실패 시 예외)"""
+    genai = configure_gemini(api_key)
+    model = genai.GenerativeModel(model_name)
+    with span("llm.call", model=model_name, purpose="keyword_filter", keywords=len(keywords)) as call:
+        response = model.generate_content(build_filter_prompt(keywords, channel_category, get_category_profile(channel_category)))
+        text = response.text
+        call.set(bytes=len(text.encode("utf-8")))
+
+    # JSON 추출
+    match = re.search(r'\{[\s\S]*\}', text)
+    if match:
+        data = json.loads(match.group())
+        return data.get("filtered_keywords", [])
+    return []
+
+
+def generate_viral_concept_from_keyword(keyword_data, channel_category, api_key, model_name):
+    """필터링된 키워드로 바이럴 콘셉트 생성 (강화된 버전)"""
+    profile = get_category_profile(channel_category)
+    try:
+        genai = configure_gemini(api_key)
+        model = genai.GenerativeModel(model_name)
+        with span("llm.call", model=model_name, purpose="concept") as call:
+            response = model.generate_content(build_concept_prompt(keyword_data, channel_category, profile))
+            call.set(bytes=len(response.text.encode("utf-8")))
+        return response.text.strip()
+    except:
+        return fallback_concept(keyword_fields(keyword_data)[0], channel_category, profile)
+
+
+def generate_viral_concepts_batch(keyword_list, channel_category, api_key, model_name):
+    """여러 키워드 콘셉트를 한 번의 LLM 호출(JSON 배열)로 생성 → 키워드 순서의 콘셉트 리스트
+
+    호출이 실패하면 예외 (스팬에 error 기록), 파싱 못 한 항목은 None (스팬 status="partial")
+    → ConceptPrefetcher가 해당 Future를 실패로 끝내고 get()에서 키워드별 단독 생성으로 넘어감
+    """
+    profile = get_category_profile(channel_category)
+    with span("llm.call", model=model_name, purpose="concept_batch", keywords=len(keyword_list)) as call:
+        genai = configure_gemini(api_key)
+        model = genai.GenerativeModel(model_name)
+        response = model.generate_content(build_batch_concept_prompt(keyword_list, channel_category, profile))
+        concepts = parse_concept_array(response.text, len(keyword_list))
+        parsed = sum(concept is not None for concept in concepts)
+        call.set(bytes=len(response.text.encode("utf-8")), parsed=parsed)
+        if parsed < len(keyword_list):
+            call.set(status="partial")
+    return concepts
@@ -0,0 +1,242 @@
+"""
+이어서 생성할 수 있는 일괄 생성 작업 기록 (디스크 매니페스트)
+- 프로젝트마다 폴더 하나: manifest.json + images/<항목 키>.<확장자>
+- 항목: 키 (scene_N / tt_KEY) → 최종 프롬프트 해시, 요청 크기, 상태 (pending / done / failed), 이미지 경로, 엔진, 시드
+- settings: 요청을 만든 앱 설정 (이미지 크기, JSON 프로필 여부) → 프로젝트를 다시 열 때 같은 요청으로 복원
+- 이미지가 나올 때마다 파일 + 매니페스트를 원자적으로 기록 → 탭이 닫히거나 서버가 재시작돼도 완료분은 남음
+- 이어서 생성: 완료됐고 프롬프트가 같고 파일이 있는 항목은 건너뜀
+- 프로젝트 불러오기: 완료 항목 이미지를 키별로 디스크에서 복원 (저장된 해시 기준, 네트워크 요청 없음)
+- submit_batch: 항목마다 GenerationScheduler 작업 1개 (백그라운드, 기록은 작업 스레드에서)
+"""
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+import time
+
+from .callbacks import null_log, null_progress
+from .image_bytes import ImageBytes, read_image_header
+from .tracing import span
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+IMAGE_DIR = "images"
+STATUSES = ("pending", "done", "failed")
+EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+
+def project_id(plan_data):
+    """기획안 내용 → 프로젝트 폴더 이름 (같은 기획안을 다시 불러오면 같은 ID)"""
+    canonical = json.dumps(plan_data or {}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def prompt_hash(prompt, width, height):
+    """최종 프롬프트 + 크기 해시 (프롬프트가 바뀐 항목은 완료로 보지 않음)"""
+    return hashlib.sha256(f"{width}x{height}\n{prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class JobManifest:
+    """프로젝트 하나의 일괄 생성 기록 (프로세스 공유, 읽기/쓰기 모두 잠금)
+
+    항목 dict는 바꿀 때마다 새로 만들어 넣음 → items / settings는 잠금 안에서 뜬 얕은 복사본
+    """
+
+    def __init__(self, root, project):
+        self.directory = os.path.join(root, project)
+        self.path = os.path.join(self.directory, MANIFEST_FILE)
+        self.project = project
+        self._lock = threading.Lock()
+        self._items, self._settings = self._read()
+
+    @property
+    def items(self):
+        with self._lock:
+            return dict(self._items)
+
+    @property
+    def settings(self):
+        with self._lock:
+            return dict(self._settings)
+
+    def _read(self):
+        """저장된 (항목, 설정) (파일이 없거나 깨졌으면 빈 기록)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if not isinstance(data, dict):
+            return {}, {}
+        items, settings = data.get("items"), data.get("settings")
+        return (items if isinstance(items, dict) else {}), (settings if isinstance(settings, dict) else {})
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "project": self.project, "updated_at": time.time(),
+                "settings": self._settings, "items": self._items}
+        _write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8"))
+
+    def update_settings(self, **settings):
+        """요청을 만든 앱 설정 기록 (바뀐 값이 있을 때만 저장)"""
+        with self._lock:
+            if all(self._settings.get(name) == value for name, value in settings.items()):
+                return
+            self._settings.update(settings)
+            self._save()
+
+    def _image_path(self, item):
+        return os.path.join(self.directory, item["path"]) if item.get("path") else None
+
+    def is_done(self, key, request):
+        """완료 + 프롬프트 해시 일치 + 이미지 파일 있음"""
+        with self._lock:
+            item = self._items.get(key)
+        if not item or item.get("status") != "done" or item.get("prompt_hash") != prompt_hash(*request):
+            return False
+        path = self._image_path(item)
+        return path is not None and os.path.exists(path)
+
+    def todo(self, requests):
+        """requests {키: (프롬프트, 가로, 세로)} 중 아직 생성해야 할 키 (입력 순서)"""
+        return [key for key, request in requests.items() if not self.is_done(key, request)]
+
+    def start(self, keys, requests):
+        """이번 배치에서 생성할 항목을 pending으로 기록"""
+        with self._lock:
+            for key in keys:
+                self._items[key] = {"prompt_hash": prompt_hash(*requests[key]), "size": list(requests[key][1:]),
+                                    "status": "pending", "path": None, "updated_at": time.time()}
+            self._save()
+
+    def record_done(self, key, request, img, provider=None):
+        """이미지 파일 저장 후 완료 기록"""
+        fmt = getattr(img, "format", None) or (read_image_header(bytes(img)) or ("",))[0]
+        safe_key = re.sub(r"[^\w-]", "_", key)
+        relative = os.path.join(IMAGE_DIR, f"{safe_key}.{EXTENSIONS.get(fmt, 'bin')}")
+        with self._lock:
+            os.makedirs(os.path.join(self.directory, IMAGE_DIR), exist_ok=True)
+            _write_atomic(os.path.join(self.directory, relative), bytes(img))
+            self._items[key] = {"prompt_hash": prompt_hash(*request), "size": list(request[1:]), "status": "done",
+                                "path": relative, "provider": provider, "seed": getattr(img, "seed", None),
+                                "updated_at": time.time()}
+            self._save()
+
+    def record_failed(self, key, request, error=""):
+        with self._lock:
+            self._items[key] = {"prompt_hash": prompt_hash(*request), "size": list(request[1:]), "status": "failed",
+                                "path": None, "error": str(error)[:200], "updated_at": time.time()}
+            self._save()
+
+    def restore(self, requests=None):
+        """완료 항목의 이미지를 디스크에서 읽기 → {키: (ImageBytes, 엔진)}
+
+        requests 없음: 저장된 해시 그대로 키별 복원 (프로젝트 불러오기 - 현재 세션의 크기/설정과 무관)
+        requests를 주면 프롬프트 해시가 같은 항목만 (기획안이 바뀐 항목은 제외)
+        """
+        restored = {}
+        with span("manifest.restore", project=self.project) as restore_span:
+            for key, item in self.items.items():
+                if requests is not None and (key not in requests or not self.is_done(key, requests[key])):
+                    continue
+                if item.get("status") != "done":
+                    continue
+                try:
+                    with open(self._image_path(item), "rb") as f:
+                        data = f.read()
+                except (OSError, TypeError):
+                    continue
+                header = read_image_header(data)
+                if header is None:
+                    continue
+                restored[key] = (ImageBytes(data, *header, seed=item.get("seed")), item.get("provider"))
+            restore_span.set(restored=len(restored))
+        return restored
+
+    def counts(self, requests=None):
+        """상태별 개수 (requests를 주면 그 항목만, 기록이 없거나 프롬프트가 바뀌면 pending)"""
+        counts = dict.fromkeys(STATUSES, 0)
+        items = self.items
+        for key in requests if requests is not None else items:
+            item = items.get(key) or {}
+            status = item.get("status", "pending")
+            if requests is not None and status == "done" and not self.is_done(key, requests[key]):
+                status = "pending"
+            counts[status if status in counts else "pending"] += 1
+        return counts
+
+
+def run_batch(manifest, requests, generate, on_image=None, resume=False, log=null_log, progress=null_progress):
+    """requests {키: (프롬프트, 가로, 세로)}를 순서대로 생성하며 매니페스트에 기록 → 이번에 완료한 개수
+
+    generate(key) → (이미지, 실제 엔진) / on_image(key, img, provider): 완료할 때마다
+    resume=True: 완료 항목은 건너뛰고 실패/대기 항목만 생성
+    """
+    keys = manifest.todo(requests) if resume else list(requests)
+    skipped = len(requests) - len(keys)
+    done = 0
+    with span("manifest.batch", project=manifest.project, items=len(requests), skipped=skipped) as batch:
+        if resume and skipped:
+            log(f"이어서 생성: 완료된 {skipped}개 건너뜀, {len(keys)}개 남음", "info")
+        manifest.start(keys, requests)
+        for index, key in enumerate(keys):
+            progress(index, len(keys), key)
+            try:
+                img, provider = generate(key)
+            except Exception as e:
+                manifest.record_failed(key, requests[key], e)
+                log(f"{key}: 생성 오류 ({str(e)[:80]})", "error")
+                continue
+            if img:
+                manifest.record_done(key, requests[key], img, provider)
+                if on_image:
+                    on_image(key, img, provider)
+                done += 1
+            else:
+                manifest.record_failed(key, requests[key], "no image")
+        progress(len(keys), len(keys), "")
+        batch.set(done=done, failed=len(keys) - done)
+    return done
+
+
+def _run_item(manifest, key, request, generate):
+    """작업 스레드: 생성 + 매니페스트 기록 → (이미지, 실제 엔진)
+
+    generate(key)가 단계 제너레이터를 돌려주면 그대로 이어서 실행 (요청 사이마다 스케줄러가 작업자를 놓음)
+    """
+    try:
+        result = generate(key)
+        if inspect.isgenerator(result):
+            result = yield from result
+        img, provider = result
+    except Exception as e:
+        manifest.record_failed(key, request, e)
+        raise
+    if img:
+        manifest.record_done(key, request, img, provider)
+    else:
+        manifest.record_failed(key, request, "no image")
+    return img, provider
+
+
+def submit_batch(manifest, requests, generate, scheduler, priority_of=None, resume=False, group=None):
+    """requests를 스케줄러 작업으로 제출 (기다리지 않음) → {키: Future}
+
+    generate(key) → (이미지, 실제 엔진) 또는 같은 값을 반환하는 단계 제너레이터 (image_generation_steps)
+    : 작업 스레드에서 실행되므로 UI/세션에 접근하지 않아야 함
+    priority_of(key) → 우선순위 (없으면 모두 "backfill") / resume=True: 완료 항목 제외
+    """
+    keys = manifest.todo(requests) if resume else list(requests)
+    manifest.start(keys, requests)
+    return {key: scheduler.submit(_run_item, manifest, key, requests[key], generate,
+                                  priority=priority_of(key) if priority_of else "backfill", group=group)
+            for key in keys}
@@ -0,0 +1,147 @@
+"""
+주제 참신도 인덱스 (MinHash + LSH)
+과거 주제 / 로그라인 / 프로젝트 제목과 새 후보의 유사도를 빠르게 추정해 중복에 가까운 후보를 걸러냄
+"""
+import re
+import zlib
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32          # 밴드 32 × 4행: 자카드 0.6이면 99%, 0.3이면 23% 확률로 후보가 됨
+# 템플릿 주제는 틀 문장이 겹쳐 슬롯 절반이 달라도 0.5 안팎이 나오므로 0.6부터 중복으로 봄
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_SHINGLE_SIZE = 3
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_text(text):
+    """소문자 + 구두점 제거 + 공백 정리"""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """정규화된 문자 n-gram 집합 (한글/영문 공통)"""
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def project_texts(project):
+    """저장된 프로젝트 → 인덱싱할 (텍스트, 출처) 리스트 (주제, 제목, 로그라인)"""
+    plan = project.get("plan_data") or {}
+    title = plan.get("project_title", "")
+    texts = [(project.get("topic", ""), f"프로젝트 주제: {title}")]
+    for field in ("project_title", "project_title_en", "logline", "logline_en"):
+        texts.append((plan.get(field, ""), f"프로젝트 {field}: {title}"))
+    return [(text, source) for text, source in texts if isinstance(text, str) and text.strip()]
+
+
+class NoveltyIndex:
+    """MinHash 시그니처 + LSH 밴드 버킷
+
+    - add(text): 인덱스에 추가 (같은 정규화 텍스트는 한 번만)
+    - nearest(text): 가장 비슷한 기존 항목 (자카드, 텍스트, 출처)
+      LSH 버킷이 겹친 후보만 shingle 집합으로 정확한 자카드를 계산 (MinHash 추정 오차로 인한 오탐 방지)
+    - is_novel(text): 임계값 미만이면 True
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS, threshold=DEFAULT_THRESHOLD,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        import numpy as np  # 인덱스를 처음 만들 때 로드 (앱 콜드 스타트에서 제외)
+
+        rng = np.random.default_rng(seed)
+        # multiply-shift 해시: ((a * x + b) mod 2^64) >> 32, a는 홀수
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._shingles = []
+        self._texts = []
+        self._sources = []
+        self._ids = {}          # 정규화 텍스트 → 항목 번호
+        self._buckets = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, text):
+        return normalize_text(text) in self._ids
+
+    def signature(self, grams):
+        """shingle 집합 → MinHash 시그니처 (num_perm개 uint32 최솟값)"""
+        import numpy as np
+
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        with np.errstate(over="ignore"):
+            permuted = (np.multiply.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, text, source=""):
+        """인덱스에 추가 → 새로 추가됐으면 True"""
+        normalized = normalize_text(text or "")
+        if not normalized or normalized in self._ids:
+            return False
+        grams = frozenset(shingles(normalized, self.shingle_size))
+        signature = self.signature(grams)
+        entry_id = len(self._texts)
+        self._ids[normalized] = entry_id
+        self._shingles.append(grams)
+        self._texts.append(text)
+        self._sources.append(source)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(entry_id)
+        return True
+
+    def add_many(self, items):
+        """[(텍스트, 출처), ...] 일괄 추가 → 새로 추가된 개수"""
+        return sum(self.add(text, source) for text, source in items)
+
+    def nearest(self, text):
+        """가장 비슷한 기존 항목 → (자카드, 텍스트, 출처), 후보가 없으면 (0.0, None, None)"""
+        normalized = normalize_text(text or "")
+        if normalized in self._ids:
+            idx = self._ids[normalized]
+            return 1.0, self._texts[idx], self._sources[idx]
+        if not normalized or not self._texts:
+            return 0.0, None, None
+        grams = shingles(normalized, self.shingle_size)
+        signature = self.signature(grams)
+
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        best = (0.0, None, None)
+        for idx in candidates:
+            score = len(grams & self._shingles[idx]) / len(grams | self._shingles[idx])
+            if score > best[0]:
+                best = (score, self._texts[idx], self._sources[idx])
+        return best
+
+    def is_novel(self, text, threshold=None):
+        """기존 항목과의 유사도가 임계값 미만인지"""
+        return self.nearest(text)[0] < (self.threshold if threshold is None else threshold)
+
+
+def pick_novel(generate_fn, index, max_tries=5, threshold=None):
+    """참신한 후보가 나올 때까지 다시 뽑기 → (후보, 유사도, 시도 횟수)
+
+    max_tries 안에 못 찾으면 가장 덜 비슷했던 후보를 반환
+    """
+    best = None
+    for attempt in range(1, max_tries + 1):
+        candidate = generate_fn()
+        score = index.nearest(candidate)[0]
+        if score < (index.threshold if threshold is None else threshold):
+            return candidate, score, attempt
+        if best is None or score < best[1]:
+            best = (candidate, score)
+    return best[0], best[1], max_tries
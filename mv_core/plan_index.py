@@ -0,0 +1,88 @@
+"""
+컴파일된 기획안 뷰 - plan_data 버전당 1회 생성
+씬/턴테이블 최종 프롬프트를 미리 계산해 재실행마다 반복되는 프로필 변환을 제거
+"""
+from collections.abc import Hashable
+
+from .profiles import TURNTABLE_CATEGORIES, TurntableIndex, profile_palette
+
+
+def turntable_key(cat, item, view):
+    """턴테이블 이미지 키 (세션의 turntable_images 키와 동일)"""
+    return f"{cat}_{item.get('id', '')}_{view.get('view_type', '')}"
+
+
+class CompiledPlan:
+    """plan_data의 조회/프롬프트 캐시
+
+    plan_data가 교체되면 새로 생성해야 함 (is_current로 확인).
+    프롬프트는 use_json 값별로 첫 요청 시 계산 후 캐시.
+    """
+
+    def __init__(self, plan_data):
+        self.plan_data = plan_data
+        self.turntable = plan_data.get('turntable') or {}
+        self.scenes = plan_data.get('scenes') or []
+        self.index = TurntableIndex(self.turntable)
+
+        # 턴테이블 뷰 (키 → (카테고리, 아이템, 뷰)) - 표시 순서 유지
+        self.turntable_views = {}
+        for cat in TURNTABLE_CATEGORIES:
+            for item in self.turntable.get(cat) or []:
+                for view in item.get('views') or []:
+                    self.turntable_views.setdefault(turntable_key(cat, item, view), (cat, item, view))
+
+        self._scene_prompts = {}
+        self._turntable_prompts = {}
+
+    def is_current(self, plan_data):
+        """같은 plan_data 객체에서 컴파일된 것인지 여부"""
+        return self.plan_data is plan_data
+
+    def scene_prompt(self, scene_idx, use_json=True):
+        """씬 이미지 생성에 사용될 최종 프롬프트"""
+        key = (scene_idx, bool(use_json))
+        prompt = self._scene_prompts.get(key)
+        if prompt is None:
+            scene = self.scenes[scene_idx]
+            prompt = scene.get('image_prompt', '')
+            if use_json and 'used_turntables' in scene and self.turntable:
+                prompt = self.index.inject(prompt, scene['used_turntables'])
+            self._scene_prompts[key] = prompt
+        return prompt
+
+    def scene_prompts(self, use_json=True):
+        """모든 씬의 최종 프롬프트 리스트"""
+        return [self.scene_prompt(i, use_json) for i in range(len(self.scenes))]
+
+    def turntable_prompt(self, tt_key, use_json=True):
+        """턴테이블 뷰 이미지 생성에 사용될 최종 프롬프트"""
+        key = (tt_key, bool(use_json))
+        prompt = self._turntable_prompts.get(key)
+        if prompt is None:
+            _, item, view = self.turntable_views[tt_key]
+            prompt = view.get('prompt', '')
+            if use_json:
+                detailed = self.index.profile_text(item)
+                if detailed:
+                    prompt = f"{detailed}, {prompt}"
+            self._turntable_prompts[key] = prompt
+        return prompt
+
+    def scene_palette(self, scene_idx):
+        """씬에 쓰인 장소들의 color_palette 색 목록 (품질 검사용, 장소가 없으면 빈 목록)"""
+        colors = []
+        for tt_ref in self.scenes[scene_idx].get('used_turntables') or []:
+            item = self.index.locations.get(tt_ref) if isinstance(tt_ref, Hashable) else None
+            if item is not None:
+                colors.extend(color for color in profile_palette(item.get('json_profile')) if color not in colors)
+        return colors
+
+    def turntable_palette(self, tt_key):
+        """장소 턴테이블 뷰의 color_palette 색 목록 (캐릭터/소품은 빈 목록)"""
+        cat, item, _ = self.turntable_views[tt_key]
+        return profile_palette(item.get('json_profile')) if cat == 'locations' else []
+
+    def turntable_prompts(self, use_json=True):
+        """모든 턴테이블 뷰의 최종 프롬프트 (키 → 프롬프트)"""
+        return {tt_key: self.turntable_prompt(tt_key, use_json) for tt_key in self.turntable_views}
@@ -0,0 +1,374 @@
+"""
+기획안 생성
+- LLM 응답 JSON 정리
+- 시스템 프롬프트 (전문가 수준)
+- 기획안 생성 (모델 폴백 + JSON 파싱 재시도)
+"""
+import json
+import re
+
+from .callbacks import null_notify
+from .catalog import get_visual_style_emphasis
+from .llm import generate_with_fallback
+from .tracing import span, traced_sleep
+
+PLAN_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 2
+
+
+class PlanGenerationError(Exception):
+    """기획안 생성 최종 실패 (raw_text: 마지막 LLM 원본 응답, 없으면 None)"""
+
+    def __init__(self, message, raw_text=None):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+# ------------------------------------------------------------------
+# JSON 정리 함수 (개선됨)
+# ------------------------------------------------------------------
+def clean_json_text(text):
+    """LLM 응답 → json.loads 가능한 JSON 문자열 (코드 펜스/주석/후행 쉼표/문자열 내 제어 문자 정리)"""
+    if not text:
+        return ""
+
+    original_text = text
+
+    # 1. ```json ... ``` 블록에서 추출
+    match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
+    if match:
+        text = match.group(1)
+    else:
+        # 2. ``` ... ``` 블록에서 추출
+        match = re.search(r"```\s*(.*?)\s*```", text, re.DOTALL)
+        if match:
+            text = match.group(1)
+        else:
+            # 3. { 로 시작하고 } 로 끝나는 JSON 객체 찾기
+            match = re.search(r'(\{[\s\S]*\})', text)
+            if match:
+                text = match.group(1)
+
+    text = text.strip()
+
+    # JSON이 비어있으면 원본에서 다시 시도
+    if not text or text == "":
+        # 원본에서 첫 번째 { 부터 마지막 } 까지 추출
+        start_idx = original_text.find('{')
+        end_idx = original_text.rfind('}')
+        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+            text = original_text[start_idx:end_idx + 1]
+
+    # JSON 정리
+    text = re.sub(r',\s*}', '}', text)
+    text = re.sub(r',\s*]', ']', text)
+    text = re.sub(r'//.*?\n', '\n', text)
+    # 여러 줄 주석 제거
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+
+    # JSON 문자열 내의 제어 문자 이스케이프 처리
+    def escape_control_chars_in_strings(json_str):
+        result = []
+        in_string = False
+        escape_next = False
+
+        for char in json_str:
+            if escape_next:
+                result.append(char)
+                escape_next = False
+                continue
+
+            if char == '\\':
+                result.append(char)
+                escape_next = True
+                continue
+
+            if char == '"':
+                in_string = not in_string
+                result.append(char)
+                continue
+
+            if in_string:
+                if char == '\n':
+                    result.append('\\n')
+                elif char == '\r':
+                    result.append('\\r')
+                elif char == '\t':
+                    result.append('\\t')
+                elif ord(char) < 32:
+                    result.append(f'\\u{ord(char):04x}')
+                else:
+                    result.append(char)
+            else:
+                result.append(char)
+
+        return ''.join(result)
+
+    text = escape_control_chars_in_strings(text)
+    return text
+
+
+# ------------------------------------------------------------------
+# 시스템 프롬프트 (전문가 수준 - 수정됨)
+# ------------------------------------------------------------------
+def get_system_prompt(topic, scene_count, options, genre, visual_style, music_genre, use_json, expert_mode, seconds_per_scene):
+    """기획안 생성 시스템 프롬프트"""
+    story_elements = []
+    if options.get('use_arc'): story_elements.append("three-act structure with setup-confrontation-resolution")
+    if options.get('use_sensory'): story_elements.append("rich sensory details (visual, auditory, tactile)")
+    if options.get('use_dynamic'): story_elements.append("dynamic pacing with rhythm variations")
+    if options.get('use_emotional'): story_elements.append("emotional arc with clear beats")
+    if options.get('use_climax'): story_elements.append("building tension to powerful climax")
+    if options.get('use_trial'): story_elements.append("protagonist trials and obstacles")
+    if options.get('use_symbolic'): story_elements.append("symbolic imagery and visual metaphors")
+    if options.get('use_twist'): story_elements.append("unexpected twist or revelation")
+    
+    story_instruction = ", ".join(story_elements) if story_elements else "cinematic narrative flow"
+    visual_emphasis = get_visual_style_emphasis(visual_style)
+    
+    expert_instruction = ""
+    if expert_mode:
+        expert_instruction = """
+
+EXPERT MODE - INDUSTRY PROFESSIONAL STANDARDS:
+
+You are working at the level of top-tier music video directors (Hype Williams, Dave Meyers, Joseph Kahn, CHEZ, Woogie Kim).
+
+CINEMATOGRAPHY MASTERY:
+- Camera movements: Specify exact dolly/crane/steadicam/gimbal movements with timing
+- Lens choices: Indicate focal length (14mm wide, 50mm standard, 85mm portrait, 200mm telephoto)
+- Depth of field: Specify f-stop for each shot (f/1.4 shallow, f/8 deep)
+- Lighting setups: Key, fill, rim, practical lights with color temperature (2700K warm, 5600K daylight)
+
+COLOR SCIENCE:
+- Color palette: Specify exact HEX codes for dominant, secondary, accent colors
+- LUT reference: Reference specific color grades (Teal & Orange, Film Noir, Kodak Vision3)
+- Contrast ratio: Specify shadow/highlight relationship
+"""
+
+    # 실사 강조 (강력한 규칙 추가)
+    photorealistic_extra = ""
+    if "Photorealistic" in visual_style or "Hyperrealistic" in visual_style:
+        photorealistic_extra = """
+
+CRITICAL - PHOTOREALISTIC REQUIREMENTS (MUST FOLLOW):
+ALL prompts MUST include:
+- "RAW photo, 8k resolution, photorealistic, dslr, soft lighting, high quality, film grain"
+- "REAL HUMAN, natural skin texture, visible pores, imperfections, peach fuzz, realistic eyes"
+- "No CGI, No 3D render look, No illustration style"
+- "Shot on Fujifilm XT3 or ARRI Alexa"
+"""
+
+    json_detail = ""
+    if use_json:
+        json_detail = f"""
+
+ULTRA-DETAILED JSON PROFILES (SOURCE OF TRUTH - STRONGEST ENFORCEMENT):
+
+1. **SOURCE OF TRUTH RULE**: The 'json_profile' field is the ONLY valid source for physical appearance.
+2. **NEGATIVE CONSTRAINT FOR SCENES**: In the 'scenes' -> 'image_prompt' field, you MUST NOT describe the character's appearance (hair color, clothes, face). 
+   - **WRONG**: "A handsome man with blue hair and a leather jacket running in the rain."
+   - **CORRECT**: "A man running in the rain, dynamic angle, intense expression."
+   (The system will automatically INJECT the detailed description from 'json_profile' at the beginning of the prompt. If you repeat it, it causes conflicts.)
+
+3. **MANDATORY**: You MUST generate a turntable entry for **EVERY** single character, location, prop, and vehicle that appears.
+4. **DETAIL**: Provide specific HEX codes, materials, brands, and exact measurements.
+
+For CHARACTERS:
+{{
+  "physical": {{ "age": "exact age", "height_cm": number, "body_type": "detailed", "skin_tone": "#HEX", "skin_texture": "pores/freckles/scars" }},
+  "face": {{ "shape": "...", "eyes": {{"color": "#HEX", "shape": "..."}}, "nose": "...", "lips": "...", "hair": {{"color": "#HEX", "style": "..."}} }},
+  "clothing": {{ "top": {{"color": "#HEX", "material": "..."}}, "bottom": "...", "shoes": "...", "accessories": "..." }},
+  "expression": "default emotional state"
+}}
+
+For LOCATIONS:
+{{
+  "location_type": "exact place",
+  "architecture": "style and materials",
+  "lighting": {{"time": "HH:MM", "source": "sun/neon", "color_temp": "K"}},
+  "palette": {{"dominant": "#HEX", "accent": "#HEX"}}
+}}
+"""
+
+    turntable_instruction = """
+
+TURNTABLE REFERENCE SHEETS (COMPREHENSIVE & MANDATORY):
+
+You MUST create turntable entries for ALL distinct elements.
+
+FOR EACH CHARACTER (Mandatory Views):
+- View 1: "full_turntable" -> PROMPT MUST BE: "character sheet, split screen, 4 distinct views, front view, side view, back view, 3/4 view, same character in all views, full body shot, white background, high resolution"
+- View 2: "face_detail" (Extreme close-up, pore details, eyes)
+- View 3: "expression_sheet" (Neutral, Joy, Anger, Sorrow, Surprise)
+- View 4: "fashion_detail" (Clothing texture, shoes, accessories)
+- View 5: "cinematic_portrait" (Best lighting, shallow depth of field)
+
+FOR EACH LOCATION:
+- View 1: "establishing_shot" (Wide angle, entire scale)
+- View 2: "lighting_study" (Same angle, Day vs Night vs Golden Hour)
+- View 3: "texture_details" (Wall materials, floor, key props)
+
+FOR OBJECTS/VEHICLES:
+- View 1: "studio_product_shot" (Clean background, 3 angles)
+- View 2: "in_situ" (Object in the scene environment)
+"""
+
+    video_prompt_instruction = """
+VIDEO PROMPT UPGRADE (CRITICAL):
+The 'video_prompt' field must be highly detailed for AI Video Generators (Runway Gen-2, Pika, Kling).
+Format: "[Camera Movement] + [Subject Action] + [Physics/Environment] + [Technical Specs]"
+Example: "Slow dolly zoom in on character's eye, tear rolling down cheek, hair blowing gently in wind, rain falling in background, volumetric lighting, 8k resolution, high fidelity, 120fps smooth motion, shallow depth of field."
+NEVER use simple phrases like "Man walking". Be specific about speed, weight, lighting changes, and atmosphere.
+"""
+
+    return f"""You are an ELITE music video director working at the highest industry standards.
+Create an ULTRA-DETAILED production plan in VALID JSON format.
+
+PROJECT BRIEF:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Theme: "{topic}"
+Genre: {genre}
+Visual Style: {visual_style}
+Music Genre: {music_genre}
+Duration: {scene_count} scenes × {seconds_per_scene} seconds
+Story Elements: {story_instruction}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+VISUAL STYLE ENFORCEMENT:
+ALL image prompts MUST begin with: "{visual_emphasis}"
+{photorealistic_extra}
+{expert_instruction}
+{json_detail}
+{turntable_instruction}
+{video_prompt_instruction}
+
+JSON FORMAT RULES:
+- Use double quotes ONLY
+- NO trailing commas
+- NO comments
+- Escape special characters
+
+RETURN THIS EXACT JSON STRUCTURE:
+{{
+  "project_title": "Title in Korean",
+  "project_title_en": "Title in English",
+  "logline": "One-sentence concept in Korean",
+  "logline_en": "One-sentence concept in English",
+  "director_vision": "2-3 sentences about artistic vision",
+  
+  "youtube": {{
+    "title": "Viral title",
+    "description": "SEO description",
+    "hashtags": "tags..."
+  }},
+  
+  "music": {{
+    "style": "Korean description",
+    "style_tags": "genre, mood, bpm",
+    "vocal_direction": "details...",
+    "instrumentation": "details...",
+    "song_structure": "intro-verse-chorus...",
+    "lyrics_full": "lyrics...",
+    "suno_prompt_combined": "full prompt..."
+  }},
+  
+  "turntable": {{
+    "characters": [
+      {{
+        "id": "char1",
+        "name": "Name",
+        "name_en": "Name English",
+        "json_profile": {{ ...FULL PHYSICAL/CLOTHING PROFILE... }},
+        "views": [
+            {{ "view_type": "full_turntable", "prompt": "{visual_emphasis}, character sheet, split screen, 4 distinct views, front view, side view, back view, 3/4 view, same character, full body, white background" }},
+            {{ "view_type": "face_detail", "prompt": "{visual_emphasis}, extreme close up, face detail..." }},
+            {{ "view_type": "expression_sheet", "prompt": "..." }},
+            {{ "view_type": "fashion_detail", "prompt": "..." }},
+            {{ "view_type": "cinematic_portrait", "prompt": "..." }}
+        ]
+      }}
+      // GENERATE OBJECTS FOR ALL CHARACTERS
+    ],
+    "locations": [
+      {{
+        "id": "loc1",
+        "name": "Name",
+        "json_profile": {{ ...FULL LOCATION PROFILE... }},
+        "views": [
+            {{ "view_type": "establishing_shot", "prompt": "..." }},
+            {{ "view_type": "lighting_study", "prompt": "..." }},
+            {{ "view_type": "texture_details", "prompt": "..." }}
+        ]
+      }}
+      // GENERATE OBJECTS FOR ALL LOCATIONS
+    ],
+    "props": [
+      {{
+        "id": "prop1",
+        "name": "Name",
+        "json_profile": {{ ... }},
+        "views": [ ... ]
+      }}
+    ],
+    "vehicles": []
+  }},
+  
+  "scenes": [
+    {{
+      "scene_num": 1,
+      "timecode": "00:00-...",
+      "act": "1",
+      "action": "Description in Korean",
+      "emotion": "Emotion",
+      "camera": {{ "shot_type": "...", "movement": "...", "lens": "..." }},
+      "used_turntables": ["char1", "loc1"],
+      "image_prompt": "{visual_emphasis}, [SCENE ACTION], [CAMERA ANGLE]. (DO NOT describe appearance here. Focus on action.)",
+      "video_prompt": "CRITICAL: Highly detailed prompt for Runway/Pika. Camera movement + Action + Physics + Technicals. Minimum 20 words."
+    }}
+  ]
+}}
+
+Generate exactly {scene_count} scenes.
+ENSURE ALL CHARACTERS/LOCATIONS mentioned in scenes have a corresponding entry in 'turntable'.
+"""
+
+
+# ------------------------------------------------------------------
+# 기획안 생성
+# ------------------------------------------------------------------
+def generate_plan(topic, api_key, model_name, scene_count, options, genre, visual_style, music_genre, use_json,
+                  expert_mode, seconds_per_scene, notify=null_notify, retry_delay=RETRY_DELAY_SECONDS, flight=None):
+    """기획안 생성 → plan_data (최종 실패 시 PlanGenerationError)
+
+    JSON 파싱 실패/호출 실패는 PLAN_ATTEMPTS번까지 재시도하고 재시도마다 notify(..., "warn")
+    flight: SingleFlight (같은 프롬프트의 동시 요청과 Gemini 호출 합치기)
+    """
+    with span("plan", model=model_name, scenes=scene_count):
+        with span("plan.prompt_build") as build:
+            prompt = get_system_prompt(topic, scene_count, options, genre, visual_style, music_genre, use_json,
+                                       expert_mode, seconds_per_scene)
+            build.set(bytes=len(prompt.encode("utf-8")))
+        response_text = None
+        for attempt in range(PLAN_ATTEMPTS):
+            with span("plan.attempt", attempt=attempt + 1) as attempt_span:
+                try:
+                    response_text, used_model = generate_with_fallback(prompt, api_key, model_name, notify=notify,
+                                                                       flight=flight)
+                    with span("plan.json_clean", bytes=len(response_text.encode("utf-8"))):
+                        cleaned = clean_json_text(response_text)
+                    with span("plan.json_parse", bytes=len(cleaned.encode("utf-8"))):
+                        plan_data = json.loads(cleaned)
+                    notify(f"✅ 생성 완료 ({used_model})", "success")
+                    return plan_data
+                except json.JSONDecodeError as e:
+                    attempt_span.set(status="json_error")
+                    if attempt == PLAN_ATTEMPTS - 1:
+                        raise PlanGenerationError(f"JSON 파싱 실패: {str(e)}", response_text) from e
+                    notify(f"JSON 파싱 재시도 중... ({attempt+1}/{PLAN_ATTEMPTS}) - {str(e)[:50]}", "warn")
+                except Exception as e:
+                    attempt_span.set(status="error", error=str(e)[:200])
+                    if attempt == PLAN_ATTEMPTS - 1:
+                        raise PlanGenerationError(f"생성 실패: {e}", response_text) from e
+                    notify(f"재시도 중... ({attempt+1}/{PLAN_ATTEMPTS}) - {str(e)[:100]}", "warn")
+            traced_sleep(retry_delay, reason="plan_retry")
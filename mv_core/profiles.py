@@ -0,0 +1,246 @@
+"""
+JSON 프로필 → 프롬프트 텍스트 변환 및 턴테이블 인덱스
+(Streamlit 의존성 없음 - 앱/벤치마크/워커 공용)
+"""
+from collections.abc import Hashable
+
+TURNTABLE_CATEGORIES = ['characters', 'locations', 'props', 'vehicles']
+
+# ------------------------------------------------------------------
+# JSON 프로필 텍스트 변환 (개선된 버전)
+# ------------------------------------------------------------------
+def json_profile_to_ultra_detailed_text(profile):
+    """JSON 프로필의 모든 중첩 필드를 상세 텍스트로 변환"""
+    parts = []
+    
+    if not isinstance(profile, dict):
+        return ""
+    
+    # 1. PHYSICAL (Physical Appearance)
+    if 'physical' in profile and isinstance(profile['physical'], dict):
+        phys = profile['physical']
+        phys_desc = []
+        if 'age' in phys: phys_desc.append(f"Age: {phys['age']}")
+        if 'height_cm' in phys: phys_desc.append(f"Height: {phys['height_cm']}cm")
+        if 'body_type' in phys: phys_desc.append(f"Body: {phys['body_type']}")
+        if 'skin_tone' in phys: phys_desc.append(f"Skin Tone: {phys['skin_tone']}")
+        if 'skin_texture' in phys: phys_desc.append(f"Skin Texture: {phys['skin_texture']}")
+        if phys_desc: parts.append("PHYSICAL[" + ", ".join(phys_desc) + "]")
+    
+    # 2. FACE (Facial Details)
+    if 'face' in profile and isinstance(profile['face'], dict):
+        face = profile['face']
+        face_desc = []
+        if 'shape' in face: face_desc.append(f"Face Shape: {face['shape']}")
+        
+        if 'eyes' in face and isinstance(face['eyes'], dict):
+            eyes = face['eyes']
+            eye_str = []
+            if 'color' in eyes: eye_str.append(f"{eyes['color']}")
+            if 'shape' in eyes: eye_str.append(eyes['shape'])
+            if 'size' in eyes: eye_str.append(eyes['size'])
+            if 'special' in eyes: eye_str.append(eyes['special'])
+            face_desc.append(f"Eyes: {' '.join(eye_str)}")
+            
+        if 'lips' in face and isinstance(face['lips'], dict):
+            lips = face['lips']
+            lip_str = []
+            if 'color' in lips: lip_str.append(lips['color'])
+            if 'shape' in lips: lip_str.append(lips['shape'])
+            if 'texture' in lips: lip_str.append(lips['texture'])
+            face_desc.append(f"Lips: {' '.join(lip_str)}")
+            
+        if 'nose' in face: face_desc.append(f"Nose: {face['nose']}")
+        if 'jawline' in face: face_desc.append(f"Jawline: {face['jawline']}")
+        if 'skin_details' in face: face_desc.append(f"Face Details: {face['skin_details']}")
+        
+        if 'hair' in face: # Handle nested hair in face if structured that way
+             if isinstance(face['hair'], dict):
+                 h = face['hair']
+                 face_desc.append(f"Hair: {h.get('color', '')} {h.get('style', '')}")
+        
+        if face_desc: parts.append("FACE[" + ", ".join(face_desc) + "]")
+    
+    # 3. HAIR (Hair Details - Main)
+    if 'hair' in profile and isinstance(profile['hair'], dict):
+        hair = profile['hair']
+        hair_desc = []
+        if 'color_primary' in hair: hair_desc.append(f"Color: {hair['color_primary']}")
+        if 'color_secondary' in hair: hair_desc.append(f"Highlights: {hair['color_secondary']}")
+        if 'length_cm' in hair: hair_desc.append(f"Length: {hair['length_cm']}cm")
+        if 'style' in hair: hair_desc.append(f"Style: {hair['style']}")
+        if 'texture' in hair: hair_desc.append(f"Texture: {hair['texture']}")
+        if hair_desc: parts.append("HAIR[" + ", ".join(hair_desc) + "]")
+    
+    # 4. CLOTHING (Detailed Outfit)
+    if 'clothing' in profile and isinstance(profile['clothing'], dict):
+        cloth = profile['clothing']
+        outfit_desc = []
+        for piece in ['top', 'bottom', 'shoes', 'outerwear']:
+            if piece in cloth and isinstance(cloth[piece], dict):
+                item = cloth[piece]
+                item_details = []
+                if 'color' in item: item_details.append(item['color'])
+                if 'material' in item: item_details.append(item['material'])
+                if 'type' in item: item_details.append(item['type'])
+                if 'fit' in item: item_details.append(f"fit: {item['fit']}")
+                if 'details' in item: item_details.append(f"detail: {item['details']}")
+                if item_details:
+                    outfit_desc.append(f"{piece.upper()}: {' '.join(item_details)}")
+        if outfit_desc: parts.append("OUTFIT[" + ", ".join(outfit_desc) + "]")
+    
+    # 5. ACCESSORIES & FEATURES
+    if 'accessories' in profile and isinstance(profile['accessories'], list) and profile['accessories']:
+        parts.append("ACCESSORIES[" + ", ".join(profile['accessories']) + "]")
+    
+    if 'distinctive_features' in profile and isinstance(profile['distinctive_features'], list) and profile['distinctive_features']:
+        parts.append("FEATURES[" + ", ".join(profile['distinctive_features']) + "]")
+        
+    # 6. LOCATION / ENVIRONMENT
+    if 'location_type' in profile:
+        loc_desc = [f"Type: {profile['location_type']}"]
+        
+        if 'architecture' in profile and isinstance(profile['architecture'], dict):
+            arch = profile['architecture']
+            if 'style' in arch: loc_desc.append(f"Style: {arch['style']}")
+            if 'materials' in arch and isinstance(arch['materials'], list): 
+                loc_desc.append(f"Materials: {', '.join(arch['materials'])}")
+        
+        if 'lighting' in profile and isinstance(profile['lighting'], dict):
+            light = profile['lighting']
+            light_strs = []
+            if 'time' in light: light_strs.append(f"Time: {light['time']}")
+            if 'color_temperature' in light: light_strs.append(light['color_temperature'])
+            if 'key_color' in light: light_strs.append(f"Key: {light['key_color']}")
+            if 'fill_color' in light: light_strs.append(f"Fill: {light['fill_color']}")
+            if 'special_effects' in light: light_strs.append(light['special_effects'])
+            loc_desc.append(f"LIGHTING: {' '.join(light_strs)}")
+            
+        if 'weather' in profile and isinstance(profile['weather'], dict):
+            w = profile['weather']
+            w_strs = []
+            if 'condition' in w: w_strs.append(w['condition'])
+            if 'humidity_percent' in w: w_strs.append(f"Humidity: {w['humidity_percent']}%")
+            loc_desc.append(f"WEATHER: {' '.join(w_strs)}")
+            
+        if 'color_palette' in profile and isinstance(profile['color_palette'], dict):
+            cp = profile['color_palette']
+            cp_strs = []
+            if 'dominant' in cp: cp_strs.append(f"Dom: {cp['dominant']}")
+            if 'secondary' in cp: cp_strs.append(f"Sec: {cp['secondary']}")
+            if 'accent' in cp: cp_strs.append(f"Acc: {cp['accent']}")
+            loc_desc.append(f"PALETTE: {' '.join(cp_strs)}")
+            
+        if 'atmosphere' in profile: loc_desc.append(f"Mood: {profile['atmosphere']}")
+        parts.append("LOCATION[" + " | ".join(loc_desc) + "]")
+
+    # 7. PROPS / VEHICLES
+    if 'make' in profile and 'model' in profile: # Vehicle
+        veh_desc = f"VEHICLE[{profile.get('color', '')} {profile.get('make', '')} {profile.get('model', '')}, {profile.get('year', '')}]"
+        parts.append(veh_desc)
+        
+    if 'dimensions' in profile: # Prop
+        prop_desc = f"PROP[{profile.get('color', '')} {profile.get('material', '')} {profile.get('name', '')}, {profile.get('finish', '')} finish]"
+        parts.append(prop_desc)
+    
+    return " ".join(parts)
+
+def profile_palette(profile):
+    """장소 json_profile의 color_palette → 색 목록 (dominant, secondary, accent 순서, 없으면 빈 목록)"""
+    palette = (profile or {}).get('color_palette')
+    if not isinstance(palette, dict):
+        return []
+    return [palette[key] for key in ('dominant', 'secondary', 'accent') if isinstance(palette.get(key), str)]
+
+# ------------------------------------------------------------------
+# 턴테이블 인덱스 (id → 아이템, 프로필 텍스트 메모이제이션)
+# ------------------------------------------------------------------
+class TurntableIndex:
+    """turntable 데이터를 1회 스캔해 만든 id 조회 테이블
+
+    조회 우선순위는 기존 선형 탐색과 동일: characters → locations → props/vehicles
+    (props와 vehicles에 같은 id가 있으면 둘 다 OBJECTS로 주입)
+    """
+
+    def __init__(self, turntable_data):
+        self.characters = {}
+        self.locations = {}
+        self.objects = {}
+        self._profile_text = {}
+
+        turntable_data = turntable_data or {}
+        for item in turntable_data.get('characters') or []:
+            self.characters.setdefault(item.get('id'), item)
+        for item in turntable_data.get('locations') or []:
+            self.locations.setdefault(item.get('id'), item)
+        for cat in ['props', 'vehicles']:
+            seen = set()
+            for item in turntable_data.get(cat) or []:
+                item_id = item.get('id')
+                if item_id not in seen:
+                    seen.add(item_id)
+                    self.objects.setdefault(item_id, []).append(item)
+
+    def profile_text(self, item):
+        """아이템 json_profile의 상세 텍스트 (아이템당 1회만 변환)"""
+        key = id(item)
+        cached = self._profile_text.get(key)
+        if cached is None:
+            cached = json_profile_to_ultra_detailed_text(item['json_profile']) if 'json_profile' in item else ""
+            self._profile_text[key] = cached
+        return cached
+
+    def inject(self, base_prompt, used_turntables):
+        """apply_json_profiles_to_prompt와 동일한 결과를 인덱스 조회로 생성"""
+        if not used_turntables:
+            return base_prompt
+
+        character_profiles = []
+        location_profiles = []
+        object_profiles = []
+
+        for tt_ref in used_turntables:
+            if not isinstance(tt_ref, Hashable):
+                continue
+
+            item = self.characters.get(tt_ref)
+            if item is not None:
+                detailed = self.profile_text(item)
+                if detailed:
+                    name = item.get('name_en', item.get('name', 'Character'))
+                    character_profiles.append(f"({name}: {detailed})")
+                continue
+
+            item = self.locations.get(tt_ref)
+            if item is not None:
+                detailed = self.profile_text(item)
+                if detailed:
+                    location_profiles.append(detailed)
+                continue
+
+            for item in self.objects.get(tt_ref, []):
+                detailed = self.profile_text(item)
+                if detailed:
+                    object_profiles.append(detailed)
+
+        # 프롬프트 조합: 캐릭터 스펙 -> 장소 스펙 -> 액션(기본 프롬프트)
+        final_parts = []
+
+        if character_profiles:
+            final_parts.append("**CHARACTERS:** " + ", ".join(character_profiles))
+
+        if location_profiles:
+            final_parts.append("**LOCATION:** " + " | ".join(location_profiles))
+
+        if object_profiles:
+            final_parts.append("**OBJECTS:** " + ", ".join(object_profiles))
+
+        final_parts.append("**SCENE ACTION:** " + base_prompt)
+
+        return "\n".join(final_parts)
+
+def apply_json_profiles_to_prompt(base_prompt, used_turntables, turntable_data):
+    """JSON 프로필을 프롬프트에 강력하게 주입"""
+    if not used_turntables or not turntable_data:
+        return base_prompt
+    return TurntableIndex(turntable_data).inject(base_prompt, used_turntables)
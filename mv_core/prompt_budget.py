@@ -0,0 +1,192 @@
+"""
+공급자별 프롬프트 길이 예산
+중복 구문 제거 → 우선순위 낮은 프로필 필드 제거 → 끝 구문 제거 → 강제 자르기 순으로 한도 내로 축소
+"""
+import re
+import urllib.parse
+
+# 공급자별 한도
+# - pollinations: 프롬프트가 GET 경로에 들어가므로 URL 인코딩 후 길이 기준
+#   (쿼리 파라미터 포함 요청 경로가 4KB 안쪽에 머물도록 여유를 둠)
+# - segmind: JSON POST 본문이므로 문자 수 기준
+PROVIDER_PROMPT_LIMITS = {
+    "pollinations": {"max_length": 3500, "measure": "url"},
+    "segmind": {"max_length": 2000, "measure": "chars"},
+}
+
+# 제거 우선순위 (앞쪽부터 먼저 제거)
+# location: LOCATION[...] 내부 " | " 구분 하위 필드 / tag: TAG[...] 블록 전체
+PROFILE_DROP_ORDER = [
+    ("WEATHER", "location"),
+    ("Mood", "location"),
+    ("Materials", "location"),
+    ("ACCESSORIES", "tag"),
+    ("FEATURES", "tag"),
+    ("PROP", "tag"),
+    ("VEHICLE", "tag"),
+    ("PALETTE", "location"),
+    ("LIGHTING", "location"),
+    ("FACE", "tag"),
+    ("OUTFIT", "tag"),
+    ("PHYSICAL", "tag"),
+    ("HAIR", "tag"),
+    ("LOCATION", "tag"),
+]
+
+SECTION_MARKER = "**"
+SCENE_ACTION_MARKER = "**SCENE ACTION:**"
+_SECTION_PREFIX_RE = re.compile(r"^\*\*[A-Z ]+:\*\*\s*")
+
+
+def provider_budget_key(provider):
+    """엔진 라벨 또는 공급자 키 → PROVIDER_PROMPT_LIMITS 키"""
+    return "segmind" if "segmind" in provider.lower() else "pollinations"
+
+
+def measure_prompt(text, measure):
+    """한도 비교용 길이 (url: URL 인코딩 후 길이, chars: 문자 수)"""
+    if measure == "url":
+        return len(urllib.parse.quote(text))
+    return len(text)
+
+
+def split_phrases(text):
+    """괄호/대괄호 밖의 쉼표·줄바꿈 기준으로 구문 분리"""
+    phrases = []
+    current = []
+    depth = 0
+    for char in text:
+        if char in "([":
+            depth += 1
+        elif char in ")]" and depth > 0:
+            depth -= 1
+        if depth == 0 and char in ",\n":
+            phrases.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    phrases.append("".join(current))
+    return [p.strip() for p in phrases if p.strip()]
+
+
+def join_phrases(phrases):
+    """구문 재조합 (섹션 마커로 시작하는 구문은 새 줄)"""
+    result = ""
+    for phrase in phrases:
+        if not result:
+            result = phrase
+        elif phrase.startswith(SECTION_MARKER):
+            result += "\n" + phrase
+        else:
+            result += ", " + phrase
+    return result
+
+
+def dedupe_phrases(phrases):
+    """대소문자/공백 차이를 무시한 중복 구문 제거 (첫 등장 유지) → (구문, 제거 개수)"""
+    seen = set()
+    kept = []
+    removed = 0
+    for phrase in phrases:
+        # 섹션 마커("**SCENE ACTION:** ...")는 비교에서 제외하고 마커 자체는 유지
+        marker = _SECTION_PREFIX_RE.match(phrase)
+        body = phrase[marker.end():] if marker else phrase
+        normalized = " ".join(body.lower().split())
+        if normalized in seen:
+            removed += 1
+            if marker:
+                kept.append(marker.group().strip())
+            continue
+        if normalized:
+            seen.add(normalized)
+        kept.append(" ".join(phrase.split()))
+    return kept, removed
+
+
+def _without_empty_sections(text):
+    """내용이 비어버린 섹션 마커 구문 제거"""
+    phrases = [p for p in split_phrases(text)
+               if not (_SECTION_PREFIX_RE.fullmatch(p + " ") and not p.startswith(SCENE_ACTION_MARKER))]
+    return join_phrases(phrases)
+
+
+def _drop_profile_field(text, label, kind):
+    if kind == "location":
+        pattern = r"\s*\|\s*" + re.escape(label) + r":[^|\]]*"
+    else:
+        pattern = r"\s*\b" + re.escape(label) + r"\[[^\[\]]*\]"
+    text, count = re.subn(pattern, "", text)
+    if count:
+        # 비어버린 캐릭터 그룹 / 섹션 정리
+        text = re.sub(r"\((\w[^():]*):\s*\)", r"(\1)", text)
+        text = _without_empty_sections(text)
+    return text, count
+
+
+def _hard_truncate(text, max_length, measure):
+    """길이 한도에 맞게 뒤에서 자르기 (URL 기준이면 인코딩 길이로 이분 탐색)"""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if measure_prompt(text[:mid], measure) <= max_length:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip(" ,")
+
+
+def budget_prompt(prompt, provider, max_length=None):
+    """공급자 한도에 맞게 프롬프트 축소 → (프롬프트, 제거 내역 리스트)
+
+    이미 한도 안이면 원문을 그대로 반환 (제거 내역은 빈 리스트).
+    """
+    limits = PROVIDER_PROMPT_LIMITS[provider_budget_key(provider)]
+    measure = limits["measure"]
+    if max_length is None:
+        max_length = limits["max_length"]
+
+    if measure_prompt(prompt, measure) <= max_length:
+        return prompt, []
+
+    cuts = []
+
+    # 1. 반복 구문 제거 (스타일 강조 반복, 보정 태그 중복 등)
+    phrases, removed = dedupe_phrases(split_phrases(prompt))
+    text = join_phrases(phrases)
+    if removed:
+        cuts.append(f"중복 구문 {removed}개")
+    if measure_prompt(text, measure) <= max_length:
+        return text, cuts
+
+    # 2. 우선순위 낮은 프로필 필드부터 제거
+    for label, kind in PROFILE_DROP_ORDER:
+        text, count = _drop_profile_field(text, label, kind)
+        if count:
+            cuts.append(f"프로필 {label}" + (f" ×{count}" if count > 1 else ""))
+            if measure_prompt(text, measure) <= max_length:
+                return text, cuts
+
+    # 3. 남은 프로필 섹션 전체 제거 (SCENE ACTION만 유지)
+    phrases = split_phrases(text)
+    action_idx = next((i for i, p in enumerate(phrases) if p.startswith(SCENE_ACTION_MARKER)), None)
+    if action_idx:
+        phrases = phrases[action_idx:]
+        cuts.append("프로필 섹션 전체")
+        if measure_prompt(join_phrases(phrases), measure) <= max_length:
+            return join_phrases(phrases), cuts
+
+    # 4. 끝 구문부터 제거 (첫 구문은 유지)
+    dropped = 0
+    while len(phrases) > 1 and measure_prompt(join_phrases(phrases), measure) > max_length:
+        phrases.pop()
+        dropped += 1
+    if dropped:
+        cuts.append(f"끝 구문 {dropped}개")
+    text = join_phrases(phrases)
+
+    # 5. 그래도 넘으면 강제 자르기
+    if measure_prompt(text, measure) > max_length:
+        text = _hard_truncate(text, max_length, measure)
+        cuts.append("강제 자르기")
+
+    return text, cuts
@@ -0,0 +1,91 @@
+"""
+이미지 공급자별 프롬프트 보정 / 모델 매핑 / 요청 URL 구성
+"""
+import urllib.parse
+
+from .endpoints import DEFAULT_POLLINATIONS_BASE_URL, pollinations_base_url
+
+POLLINATIONS_BASE_URL = DEFAULT_POLLINATIONS_BASE_URL
+
+# 사이드바 "엔진" 선택지
+IMAGE_ENGINES = [
+    "Pollinations Flux-Realism 📸",   # [추천] 극실사/영화용 (최고 퀄리티)
+    "Pollinations Flux-Anime 🎨",     # 애니메이션/일러스트용
+    "Pollinations Flux-3D 🧊",        # 3D 렌더링/픽사 스타일
+    "Pollinations Dark 🌑",           # 어둡고 분위기 있는 스타일
+    "Pollinations Turbo ⚡",          # 속도 최우선 (퀄리티 낮음)
+    "Segmind (SDXL)"                  # 키 필요
+]
+AUTO_ENGINE = "Auto (가장 빠른 정상 엔진) 🏁"
+
+# 엔진별 스타일 계열 (None = 범용)
+ENGINE_STYLE_FAMILIES = {
+    "Pollinations Flux-Realism 📸": "realism",
+    "Pollinations Flux-Anime 🎨": "anime",
+    "Pollinations Flux-3D 🧊": "3d",
+    "Pollinations Dark 🌑": "dark",
+    "Pollinations Turbo ⚡": None,
+    "Segmind (SDXL)": "realism",
+}
+
+# 비주얼 스타일 → 스타일 계열 (없으면 범용 = 모든 엔진 후보)
+VISUAL_STYLE_FAMILIES = {
+    "Photorealistic/Cinematic": "realism",
+    "Hyperrealistic 8K": "realism",
+    "High Fashion Editorial": "realism",
+    "Gritty Documentary": "realism",
+    "Black & White Film Noir": "realism",
+    "Anime/Manga": "anime",
+    "2D Traditional Animation": "anime",
+    "Watercolor Painting": "anime",
+    "Pastel Dreamy": "anime",
+    "3D Pixar Style": "3d",
+    "Dark Fantasy Gothic": "dark",
+}
+
+
+def style_family_for(visual_style):
+    """비주얼 스타일 → 스타일 계열 (realism / anime / 3d / dark, 범용이면 None)"""
+    return VISUAL_STYLE_FAMILIES.get(visual_style)
+
+
+def engine_for_model(provider, model):
+    """이벤트의 (공급자, 모델) → 엔진 라벨 (알 수 없으면 None)"""
+    if provider == "Segmind":
+        return "Segmind (SDXL)"
+    for engine in IMAGE_ENGINES:
+        if "Segmind" not in engine and pollinations_model_for(engine) == model:
+            return engine
+    return None
+
+
+def enhance_prompt_for_provider(prompt, provider):
+    """프롬프트 보정 (퀄리티 향상 태그 추가)"""
+    enhanced = f"{prompt}, highly detailed, 8k resolution, cinematic lighting"
+    if "Anime" in provider:
+        enhanced += ", anime style, studio ghibli, makoto shinkai"
+    elif "Realism" in provider:
+        enhanced += ", photorealistic, raw photo, dslr, soft lighting"
+    return enhanced
+
+
+def pollinations_model_for(provider):
+    """엔진 라벨 → Pollinations 모델 파라미터"""
+    if "Realism" in provider:
+        return "flux-realism" # 실사 전용
+    elif "Anime" in provider:
+        return "flux-anime"   # 애니 전용
+    elif "3D" in provider:
+        return "flux-3d"      # 3D 전용
+    elif "Dark" in provider:
+        return "any-dark"     # 다크 판타지 전용
+    elif "Turbo" in provider:
+        return "turbo"        # 속도 전용
+    return "flux"             # 기본
+
+
+def build_pollinations_url(prompt, width, height, poll_model, seed, base_url=None):
+    """Pollinations GET 요청 URL (프롬프트는 경로에 URL 인코딩, base_url 기본값은 MV_POLLINATIONS_BASE_URL 또는 공식 주소)"""
+    base_url = base_url or pollinations_base_url()
+    encoded_prompt = urllib.parse.quote(prompt)
+    return f"{base_url}{encoded_prompt}?width={width}&height={height}&model={poll_model}&nologo=true&seed={seed}&enhance=true"
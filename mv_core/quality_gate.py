@@ -0,0 +1,160 @@
+"""
+이미지 품질 게이트 (CPU, NumPy) - 사용자에게 보이기 전에 불량 프레임 거부
+- 화면 비율: 헤더 크기 vs 요청 크기 (ratio_map) - 디코딩 없음
+- 빈 화면: 축소 디코딩한 휘도의 표준편차 + 히스토그램 엔트로피
+- 팔레트: 16단계 RGB 히스토그램 중 장소 color_palette 색 근처 칸의 비율
+numpy / PIL은 첫 검사 때 import (앱 콜드 스타트에서 제외)
+"""
+import math
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from io import BytesIO
+
+from .image_bytes import read_image_header
+from .tracing import span
+
+SAMPLE_SIZE = 128            # 짧은 변 기준 축소 크기 (JPEG는 draft로 디코딩 자체를 축소)
+MIN_LUMA_STD = 6.0           # 0~255 휘도 표준편차 (단색/거의 단색 프레임)
+MIN_ENTROPY_BITS = 2.5       # 64칸 휘도 히스토그램 엔트로피 (최대 6비트)
+ASPECT_TOLERANCE = 0.04      # 요청 비율 대비 상대 오차
+PALETTE_RADIUS = 96          # RGB 거리 (최대 441) - 이 안이면 팔레트 색으로 봄
+MIN_PALETTE_SHARE = 0.03     # 팔레트 근처 픽셀 비율이 이보다 낮으면 다른 장면으로 판단
+HIST_LEVELS = 16             # 채널당 히스토그램 단계 (16³ = 4096칸)
+
+
+def hex_to_rgb(value):
+    """'#RRGGBB' / 'RRGGBB' / '#RGB' → (r, g, b) / 형식이 아니면 None"""
+    text = str(value).strip().lstrip("#")
+    if len(text) == 3:
+        text = "".join(c * 2 for c in text)
+    if len(text) != 6:
+        return None
+    try:
+        return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _palette_bins(palette, radius):
+    """팔레트 색 (RGB 튜플들) → 4096칸 중 팔레트 근처 칸 마스크 (팔레트별 1회 계산)"""
+    import numpy as np
+
+    step = 256 // HIST_LEVELS
+    centers = (np.arange(HIST_LEVELS) * step + step // 2).astype(np.float32)
+    grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 3)
+    colors = np.asarray(palette, dtype=np.float32)
+    distances = np.sqrt(((grid[:, None, :] - colors[None, :, :]) ** 2).sum(axis=-1)).min(axis=1)
+    return distances <= radius
+
+
+def _sample_pixels(data, sample_size):
+    """축소 디코딩 → (N, 3) uint8 RGB 픽셀"""
+    import numpy as np
+    from PIL import Image
+
+    img = Image.open(BytesIO(data))
+    img.draft("RGB", (sample_size, sample_size))
+    img = img.convert("RGB")
+    factor = min(img.size) // sample_size
+    if factor > 1:
+        img = img.reduce(factor)
+    return np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+
+
+def frame_metrics(pixels, palette=None, radius=PALETTE_RADIUS):
+    """픽셀 → {luma_std, entropy, palette_share(팔레트가 있을 때)}"""
+    import numpy as np
+
+    rgb = pixels.astype(np.float32)
+    luma = rgb @ np.asarray([0.299, 0.587, 0.114], dtype=np.float32)
+    counts = np.bincount(np.minimum(luma, 255).astype(np.uint8) >> 2, minlength=64)
+    probs = counts[counts > 0] / len(luma)
+    metrics = {"luma_std": float(luma.std()), "entropy": max(0.0, float(-(probs * np.log2(probs)).sum()))}
+    if palette:
+        quantized = (pixels >> (8 - int(math.log2(HIST_LEVELS)))).astype(np.int32)
+        hist = np.bincount((quantized[:, 0] * HIST_LEVELS + quantized[:, 1]) * HIST_LEVELS + quantized[:, 2],
+                           minlength=HIST_LEVELS ** 3)
+        metrics["palette_share"] = float(hist[_palette_bins(tuple(palette), radius)].sum() / len(pixels))
+    return metrics
+
+
+class QualityGate:
+    """반환된 이미지마다 실행하는 품질 검사 (프로세스 공유 가능, 통계는 잠금으로 보호)
+
+    check(img, width, height, palette) → (거부 사유 또는 None, 지표)
+    사유: "aspect 1.00≠1.78", "undecodable", "blank (std 2.1)", "low entropy (1.2 bits)", "off-palette (1%)"
+    """
+
+    SOFT_REASONS = ("off-palette",)   # 재시도 예산을 다 쓰면 그래도 쓸 수 있는 사유
+
+    def __init__(self, min_luma_std=MIN_LUMA_STD, min_entropy=MIN_ENTROPY_BITS, aspect_tolerance=ASPECT_TOLERANCE,
+                 min_palette_share=MIN_PALETTE_SHARE, palette_radius=PALETTE_RADIUS, sample_size=SAMPLE_SIZE):
+        self.min_luma_std = min_luma_std
+        self.min_entropy = min_entropy
+        self.aspect_tolerance = aspect_tolerance
+        self.min_palette_share = min_palette_share
+        self.palette_radius = palette_radius
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._rejected = Counter()
+        self._total_ms = 0.0
+
+    def check(self, img, width=None, height=None, palette=None):
+        """이미지 바이트 (ImageBytes 또는 bytes) 검사 → (사유 또는 None, 지표)
+
+        width/height: 요청 크기 (없으면 비율 검사 생략), palette: 장소 색 목록 ('#RRGGBB', 없으면 생략)
+        """
+        started = time.perf_counter()
+        with span("quality.check") as check_span:
+            reason, metrics = self._check(img, width, height, palette)
+            metrics["ms"] = (time.perf_counter() - started) * 1000
+            check_span.set(status="rejected" if reason else "ok", **({"reject": reason} if reason else {}))
+        with self._lock:
+            self._checked += 1
+            self._total_ms += metrics["ms"]
+            if reason:
+                self._rejected[reason.split(" ")[0]] += 1
+        return reason, metrics
+
+    def _check(self, img, width, height, palette):
+        size = getattr(img, "size", None)
+        if size is None:
+            header = read_image_header(img)
+            size = header[1:] if header else None
+        metrics = {}
+        if width and height and size:
+            aspect, expected = size[0] / size[1], width / height
+            metrics["aspect"] = aspect
+            if abs(aspect - expected) / expected > self.aspect_tolerance:
+                return f"aspect {aspect:.2f}≠{expected:.2f}", metrics
+
+        colors = [rgb for rgb in (hex_to_rgb(color) for color in palette or []) if rgb]
+        try:
+            pixels = _sample_pixels(img, self.sample_size)
+        except Exception:
+            return "undecodable", metrics
+        metrics.update(frame_metrics(pixels, colors, self.palette_radius))
+        if metrics["luma_std"] < self.min_luma_std:
+            return f"blank (std {metrics['luma_std']:.1f})", metrics
+        if metrics["entropy"] < self.min_entropy:
+            return f"low entropy ({metrics['entropy']:.1f} bits)", metrics
+        if colors and metrics["palette_share"] < self.min_palette_share:
+            return f"off-palette ({metrics['palette_share']:.0%})", metrics
+        return None, metrics
+
+    def is_soft(self, reason):
+        return reason.startswith(self.SOFT_REASONS)
+
+    def stats(self):
+        """{checked, rejected, reasons: {사유 종류: 횟수}, mean_ms}"""
+        with self._lock:
+            return {
+                "checked": self._checked,
+                "rejected": sum(self._rejected.values()),
+                "reasons": dict(self._rejected),
+                "mean_ms": self._total_ms / self._checked if self._checked else 0.0,
+            }
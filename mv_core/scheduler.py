@@ -0,0 +1,234 @@
+"""
+이미지 생성 작업 우선순위 스케줄러 (프로세스 공유 작업 풀 하나)
+- 우선순위: interactive(사용자 클릭 1건) > on_screen(보이는 씬) > preview(프리뷰) > backfill(원본 일괄) > prefetch(추측 선생성)
+- 작업 1개 = 이미지 요청 1건 → 쉬는 작업자는 항상 대기열에서 가장 높은 우선순위부터 꺼냄
+  (이미 시작한 요청은 끊지 않음 = 요청 경계에서 선점, 100장 일괄 중에도 클릭은 다음 빈자리로)
+- 대기 중인 작업은 우선순위 변경 (페이지 이동 → on_screen 승격) / 취소 가능
+- 작업은 제출한 스레드의 contextvars를 복사해 실행 (요청 스팬이 제출한 세션 트레이서에 기록)
+- 단계 작업: fn이 제너레이터를 돌려주면 yield마다 작업자를 놓고 같은 우선순위로 대기열에 다시 들어감
+  (yield 값 = 다음 단계까지 기다릴 초 또는 threading.Event) → 재시도가 많은 요청도 시도 1번씩만 작업자를 잡음
+"""
+import contextvars
+import heapq
+import inspect
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+
+from .tracing import span
+
+PRIORITY_CLASSES = ("interactive", "on_screen", "preview", "backfill", "prefetch")
+DEFAULT_SCHEDULER_WORKERS = 4
+WAIT_SAMPLES = 200   # 우선순위별 대기 시간 기록 개수 (최근 것만)
+EVENT_POLL_SECONDS = 0.05   # threading.Event를 yield한 단계 작업의 확인 간격
+
+
+class _Job:
+    __slots__ = ("future", "fn", "args", "kwargs", "context", "priority", "group", "queued_at", "steps", "step",
+                 "ready_at", "wait")
+
+    def __init__(self, future, fn, args, kwargs, context, priority, group):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context
+        self.priority = priority
+        self.group = group
+        self.queued_at = time.perf_counter()
+        self.steps = None      # 단계 작업의 제너레이터 (첫 단계를 실행한 뒤)
+        self.step = 0
+        self.ready_at = None   # 다음 단계를 기다리는 중이면 그 시각 (monotonic)
+        self.wait = None       # 다음 단계 전에 기다릴 threading.Event
+
+
+class GenerationScheduler:
+    """우선순위 대기열 + 작업자 스레드 max_workers개 (첫 제출 때 시작)"""
+
+    def __init__(self, max_workers=DEFAULT_SCHEDULER_WORKERS):
+        self.max_workers = max_workers
+        self._heap = []                        # (우선순위 순위, 제출 순번, 작업)
+        self._delayed = []                     # (다음 단계 시각, 순번, 작업) - 재시도 대기 중인 단계 작업
+        self._jobs = {}                        # Future → 대기 중인 작업 (다음 단계를 기다리는 단계 작업 포함)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition(threading.RLock())
+        self._workers = []
+        self._running = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_CLASSES}
+        self._completed = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._closed = False
+
+    @staticmethod
+    def _rank(priority):
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"알 수 없는 우선순위: {priority} (가능: {', '.join(PRIORITY_CLASSES)})")
+        return PRIORITY_CLASSES.index(priority)
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (self._rank(job.priority), next(self._sequence), job))
+
+    def submit(self, fn, *args, priority="backfill", group=None, **kwargs):
+        """작업 제출 → Future (group: 나중에 한꺼번에 승격/취소할 묶음 이름)"""
+        rank = self._rank(priority)
+        future = Future()
+        job = _Job(future, fn, args, kwargs, contextvars.copy_context(), priority, group)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("스케줄러가 종료됨")
+            self._jobs[future] = job
+            heapq.heappush(self._heap, (rank, next(self._sequence), job))
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"gen-scheduler-{len(self._workers)}",
+                                          daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+        return future
+
+    def promote(self, futures, priority):
+        """아직 시작하지 않은 작업을 priority로 올림 (더 높은 우선순위인 작업은 그대로) → 바꾼 개수"""
+        rank = self._rank(priority)
+        changed = 0
+        with self._condition:
+            for future in futures:
+                job = self._jobs.get(future)
+                if job is not None and self._rank(job.priority) > rank:
+                    # 예전 힙 항목은 꺼낼 때 우선순위가 달라 버려짐 (다음 단계를 기다리는 중이면 그때 새 우선순위로)
+                    job.priority = priority
+                    if job.ready_at is None:
+                        self._push(job)
+                    changed += 1
+        return changed
+
+    def cancel(self, futures=None, group=None):
+        """실행 중이 아닌 작업 취소 (futures 목록 또는 group) → 취소한 개수
+
+        다음 단계를 기다리던 단계 작업은 제너레이터를 닫고 Future를 CancelledError로 끝냄
+        """
+        with self._condition:
+            targets = list(futures) if futures is not None else [
+                future for future, job in self._jobs.items() if job.group == group]
+            cancelled = 0
+            for future in targets:
+                job = self._jobs.pop(future, None)
+                if job is None:
+                    continue
+                if job.steps is None:
+                    cancelled += future.cancel()
+                    continue
+                job.context.run(job.steps.close)
+                future.set_exception(CancelledError())
+                self._completed[job.priority] += 1
+                cancelled += 1
+        return cancelled
+
+    def _requeue(self, job, pause):
+        """단계 작업의 다음 단계를 대기열에 (잠금 안에서 호출)"""
+        self._jobs[job.future] = job
+        if isinstance(pause, threading.Event):
+            job.wait = pause
+            pause = EVENT_POLL_SECONDS if not pause.is_set() else 0
+        if pause:
+            job.ready_at = time.monotonic() + pause
+            heapq.heappush(self._delayed, (job.ready_at, next(self._sequence), job))
+        else:
+            job.queued_at = time.perf_counter()
+            self._push(job)
+        self._condition.notify()
+
+    def _release_delayed(self):
+        """시각이 된 단계 작업을 우선순위 대기열로 (잠금 안에서 호출) → 다음 확인까지 남은 초 (없으면 None)"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, job = heapq.heappop(self._delayed)
+            if self._jobs.get(job.future) is not job:
+                continue
+            if job.wait is not None and not job.wait.is_set():
+                job.ready_at = now + EVENT_POLL_SECONDS
+                heapq.heappush(self._delayed, (job.ready_at, next(self._sequence), job))
+                continue
+            job.ready_at, job.wait = None, None
+            job.queued_at = time.perf_counter()
+            self._push(job)
+        return self._delayed[0][0] - now if self._delayed else None
+
+    def _next_job(self):
+        """가장 높은 우선순위의 유효한 작업 (잠금 안에서 호출)"""
+        while self._heap:
+            rank, _, job = heapq.heappop(self._heap)
+            if self._jobs.get(job.future) is job and self._rank(job.priority) == rank:
+                del self._jobs[job.future]
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                timeout = self._release_delayed()
+                job = self._next_job()
+                while job is None:
+                    if self._closed and not self._delayed:
+                        return
+                    self._condition.wait(timeout)
+                    timeout = self._release_delayed()
+                    job = self._next_job()
+                waited_ms = (time.perf_counter() - job.queued_at) * 1000
+                self._waits[job.priority].append(waited_ms)
+                self._running[job.priority] += 1
+            priority, pause, finished = job.priority, None, True
+            try:
+                if job.steps is not None or job.future.set_running_or_notify_cancel():
+                    pause, finished = job.context.run(self._run, job, waited_ms)
+            finally:
+                with self._condition:
+                    self._running[priority] -= 1
+                    if finished:
+                        self._completed[priority] += 1
+                    else:
+                        self._requeue(job, pause)
+
+    @staticmethod
+    def _run(job, waited_ms):
+        """작업 1개 또는 단계 작업의 한 단계 실행 → (다음 단계까지 기다릴 값, 끝났는지)"""
+        with span("scheduler.job", priority=job.priority, wait_ms=round(waited_ms, 1), step=job.step):
+            try:
+                if job.steps is None:
+                    result = job.fn(*job.args, **job.kwargs)
+                    if not inspect.isgenerator(result):
+                        job.future.set_result(result)
+                        return None, True
+                    job.steps = result
+                pause = next(job.steps)
+            except StopIteration as stop:
+                job.future.set_result(stop.value)
+                return None, True
+            except BaseException as e:
+                job.future.set_exception(e)
+                return None, True
+            job.step += 1
+            return pause, False
+
+    def stats(self):
+        """우선순위별 {queued, running, completed, wait_p50_ms, wait_max_ms}"""
+        with self._condition:
+            queued = dict.fromkeys(PRIORITY_CLASSES, 0)
+            for job in self._jobs.values():
+                queued[job.priority] += 1
+            return {priority: {"queued": queued[priority], "running": self._running[priority],
+                               "completed": self._completed[priority],
+                               "wait_p50_ms": statistics.median(self._waits[priority]) if self._waits[priority] else None,
+                               "wait_max_ms": max(self._waits[priority]) if self._waits[priority] else None}
+                    for priority in PRIORITY_CLASSES}
+
+    def shutdown(self, cancel_pending=True):
+        """대기 작업 취소 (선택) 후 작업자 종료"""
+        with self._condition:
+            if cancel_pending:
+                self.cancel(list(self._jobs))
+            self._closed = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
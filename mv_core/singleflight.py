@@ -0,0 +1,109 @@
+"""
+동일 요청 합치기 (single-flight)
+- 같은 키의 요청이 진행 중이면 새로 보내지 않고 그 결과를 기다려 공유 (완료 후에는 보관하지 않음)
+- 프로세스 공유 → 세션이 달라도 합쳐짐 (앱에서는 st.cache_resource로 하나만 생성)
+- 네임스페이스(image, llm)별 요청/실행/합쳐짐/오류 카운터
+"""
+import hashlib
+import threading
+import time
+
+from .tracing import span
+
+
+def request_key(*parts):
+    """요청 구성 요소 → 짧은 키 (긴 프롬프트를 그대로 들고 있지 않도록 해시)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별 진행 중 호출 1개만 실행하고 결과 공유 (스레드 안전)
+
+    do(namespace, key, fn) → (결과, 공유 여부)
+    fn이 예외를 던지면 기다리던 요청도 같은 예외를 받음
+    begin / finish / shared_result: do()를 나눈 것 (스케줄러 단계 작업처럼 기다리는 방법을 호출 쪽이 정할 때)
+    """
+
+    def __init__(self):
+        self._calls = {}     # (네임스페이스, 키) → _Call
+        self._stats = {}     # 네임스페이스 → {"requests", "executed", "coalesced", "errors", "waited_ms"(합쳐진 요청 대기 합계)}
+        self._lock = threading.Lock()
+
+    def _stat(self, namespace):
+        return self._stats.setdefault(namespace, {"requests": 0, "executed": 0, "coalesced": 0, "errors": 0,
+                                                  "waited_ms": 0.0})
+
+    def do(self, namespace, key, fn):
+        call, leader = self.begin(namespace, key)
+        if not leader:
+            with span("singleflight.wait", namespace=namespace):
+                started = time.perf_counter()
+                call.done.wait()
+            return self.shared_result(namespace, call, started), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(namespace, key, call, error=e)
+            raise
+        self.finish(namespace, key, call, result=result)
+        return result, False
+
+    def begin(self, namespace, key):
+        """호출 등록 → (호출, 리더 여부)
+
+        리더는 직접 실행 후 finish, 나머지는 호출.done (threading.Event)을 기다린 뒤 shared_result
+        (do()를 쓸 수 없는 단계 작업용 - 기다리는 동안 작업자 스레드를 잡고 있지 않도록)
+        """
+        with self._lock:
+            stat = self._stat(namespace)
+            stat["requests"] += 1
+            call = self._calls.get((namespace, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(namespace, key)] = _Call()
+                stat["executed"] += 1
+            else:
+                stat["coalesced"] += 1
+        return call, leader
+
+    def finish(self, namespace, key, call, result=None, error=None):
+        """리더의 결과(또는 예외)를 기다리던 요청에 전달"""
+        call.result, call.error = result, error
+        with self._lock:
+            if error is not None:
+                self._stat(namespace)["errors"] += 1
+            del self._calls[(namespace, key)]
+        call.done.set()
+
+    def shared_result(self, namespace, call, started):
+        """끝난 호출의 결과 (리더가 예외로 끝났으면 같은 예외) - started: 기다리기 시작한 perf_counter"""
+        with self._lock:
+            self._stat(namespace)["waited_ms"] += (time.perf_counter() - started) * 1000
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self, namespace=None):
+        """진행 중인 호출 수"""
+        with self._lock:
+            return sum(1 for ns, _ in self._calls if namespace is None or ns == namespace)
+
+    def stats(self):
+        """네임스페이스별 카운터 복사본 + 합쳐진 비율"""
+        with self._lock:
+            return {namespace: {**stat, "coalesced_rate": stat["coalesced"] / stat["requests"] if stat["requests"] else 0.0}
+                    for namespace, stat in self._stats.items()}
@@ -0,0 +1,75 @@
+"""
+프로젝트 저장/불러오기 (JSONBin)
+requests는 호출 시점에 import, API 주소는 MV_JSONBIN_API_URL로 교체 가능
+"""
+from .endpoints import DEFAULT_JSONBIN_API_URL, jsonbin_api_url
+
+JSONBIN_API_URL = DEFAULT_JSONBIN_API_URL
+
+
+def load_project_list_from_jsonbin(bin_id, api_key):
+    """JSONBin에서 프로젝트 리스트 불러오기"""
+    import requests
+
+    headers = {"X-Master-Key": api_key}
+
+    try:
+        response = requests.get(f"{jsonbin_api_url()}/b/{bin_id}/latest", headers=headers, timeout=30)
+        if response.status_code == 200:
+            result = response.json()
+            record = result.get("record", {})
+            projects = record.get("projects", [])
+            return projects, None
+        else:
+            return [], f"불러오기 실패: {response.status_code}"
+    except Exception as e:
+        return [], f"불러오기 오류: {str(e)}"
+
+
+def save_project_list_to_jsonbin(projects, bin_id, api_key):
+    """JSONBin에 프로젝트 리스트 저장 (기존 bin 업데이트)"""
+    import requests
+
+    headers = {
+        "Content-Type": "application/json",
+        "X-Master-Key": api_key
+    }
+
+    data = {"projects": projects}
+
+    try:
+        response = requests.put(f"{jsonbin_api_url()}/b/{bin_id}", json=data, headers=headers, timeout=30)
+        if response.status_code == 200:
+            return True, None
+        else:
+            return False, f"저장 실패: {response.status_code} - {response.text[:100]}"
+    except Exception as e:
+        return False, f"저장 오류: {str(e)}"
+
+
+def add_project_to_list(new_project, projects, max_projects=50):
+    """프로젝트 리스트에 새 프로젝트 추가 (최대 개수 제한)"""
+    # 같은 제목이 있으면 업데이트
+    project_title = new_project.get('plan_data', {}).get('project_title', 'Untitled')
+    updated = False
+    for i, p in enumerate(projects):
+        if p.get('plan_data', {}).get('project_title') == project_title:
+            projects[i] = new_project
+            updated = True
+            break
+
+    if not updated:
+        projects.insert(0, new_project)  # 최신 항목을 맨 앞에
+
+    # 최대 개수 제한
+    if len(projects) > max_projects:
+        projects = projects[:max_projects]
+
+    return projects
+
+
+def delete_project_from_list(project_index, projects):
+    """프로젝트 리스트에서 삭제"""
+    if 0 <= project_index < len(projects):
+        del projects[project_index]
+    return projects
@@ -0,0 +1,276 @@
+"""
+주제 → 자동 영상 설정 (영상장르 / 비주얼스타일 / 음악장르 인덱스)
+세 분류의 키워드를 모듈 로드 시 해시 테이블로 컴파일해 주제를 한 번만 훑어 점수 계산
+(영문 단어 n-gram / 한글 연속 구간의 부분 문자열을 테이블에서 조회)
+
+매칭 규칙
+- 라틴 문자/숫자 키워드: 앞뒤가 영문·숫자가 아닐 때만 (heart → art, self → elf 오검출 방지)
+  단, 흔한 영어 어미는 허용 (dreamy → dream, dancer → dance)
+- 한 글자 한글 키워드 (시, 용, 춤 ...): 앞에 한글이 없고 뒤가 한글이 아니거나 조사일 때만 (도시 → 시 방지)
+- 그 외 한글 키워드: 부분 문자열 (첫사랑 → 사랑)
+"""
+import re
+
+GENRE_KEYWORDS = {
+    0: ["액션", "action", "전쟁", "war", "전투", "battle", "싸움", "fight", "추격", "chase", "폭발", "explosion"],
+    1: ["sf", "sci-fi", "우주", "space", "미래", "future", "로봇", "robot", "외계인", "alien", "우주선"],
+    2: ["판타지", "fantasy", "마법", "magic", "용", "dragon", "기사", "knight", "엘프", "elf", "던전"],
+    3: ["공포", "horror", "호러", "귀신", "ghost", "좀비", "zombie", "무서운", "scary", "심리", "psychological"],
+    4: ["사랑", "love", "연애", "romance", "이별", "breakup", "그리움", "longing", "첫사랑", "고백"],
+    5: ["느와르", "noir", "범죄", "crime", "탐정", "detective", "미스터리", "mystery", "암흑가"],
+    6: ["사이버펑크", "cyberpunk", "네온", "neon", "해커", "hacker", "디스토피아", "매트릭스"],
+    7: ["종말", "apocalypse", "폐허", "ruins", "서바이벌", "survival", "황무지", "wasteland"],
+    8: ["추상", "abstract", "초현실", "surreal", "꿈", "dream", "환각", "무의식"],
+    9: ["퍼포먼스", "performance", "무대", "stage", "라이브", "live", "콘서트", "concert"],
+    10: ["스토리", "story", "이야기", "narrative", "드라마", "drama", "서사"],
+    11: ["실험", "experimental", "아방가르드", "avant-garde", "예술", "art"],
+    12: ["애니메이션", "animation", "애니", "anime", "만화", "cartoon", "일본", "japan"],
+    13: ["다큐", "documentary", "실제", "real", "현실", "reality", "인터뷰"],
+    16: ["댄스", "dance", "춤", "안무", "choreography", "발레", "ballet", "힙합댄스"],
+    17: ["시", "poem", "시적", "poetic", "감성", "emotional", "서정"],
+    18: ["사회", "social", "비판", "critique", "메시지", "message", "현대사회"],
+    19: ["우주공포", "cosmic", "크툴루", "lovecraft", "미지", "unknown"],
+    20: ["마술적", "magical realism", "기묘한", "strange", "일상속비일상"],
+    21: ["미래도시", "dystopia", "통제사회", "빅브라더", "감시"],
+    22: ["역사", "historical", "시대극", "왕조", "중세", "고대"],
+    23: ["일상", "daily", "slice of life", "평범한", "소소한"]
+}
+
+VISUAL_KEYWORDS = {
+    0: ["실사", "realistic", "영화", "cinematic", "현실적"],
+    1: ["초고화질", "8k", "4k", "하이퍼", "hyper", "극사실"],
+    2: ["애니", "anime", "망가", "manga", "일본애니", "셀애니"],
+    3: ["3d", "픽사", "pixar", "디즈니", "disney", "cg"],
+    4: ["2d", "셀", "전통", "hand-drawn"],
+    5: ["수채화", "watercolor", "파스텔", "부드러운"],
+    6: ["유화", "oil painting", "고전", "classical", "르네상스"],
+    7: ["사이버펑크", "cyberpunk", "네온", "neon", "미래도시"],
+    8: ["다크판타지", "dark fantasy", "고딕", "gothic", "어둠"],
+    9: ["파스텔", "pastel", "dreamy", "몽환", "부드러운"],
+    10: ["흑백", "b&w", "black and white", "모노크롬", "필름누아르"],
+    11: ["레트로", "retro", "80년대", "80s", "vhs", "복고"],
+    12: ["베이퍼웨이브", "vaporwave", "증기파", "핑크", "보라"],
+    13: ["로파이", "lo-fi", "인디", "indie", "그런지"],
+    14: ["패션", "fashion", "하이패션", "에디토리얼", "보그"],
+    15: ["다큐", "documentary", "거친", "gritty", "리얼"],
+    16: ["초현실", "surrealist", "달리", "마그리트", "기묘한"],
+    17: ["미니멀", "minimal", "심플", "simple", "깔끔한"],
+    18: ["맥시멀", "maximalist", "화려한", "바로크", "baroque"],
+    19: ["글리치", "glitch", "디지털", "digital", "노이즈"]
+}
+
+MUSIC_KEYWORDS = {
+    0: ["팝", "pop", "대중", "mainstream"],
+    1: ["록", "rock", "기타", "guitar", "밴드"],
+    2: ["힙합", "hip-hop", "랩", "rap", "비트"],
+    3: ["일렉", "electronic", "edm", "클럽", "club"],
+    4: ["알앤비", "r&b", "소울", "soul", "감미로운"],
+    5: ["재즈", "jazz", "스윙", "swing", "블루스"],
+    6: ["클래식", "classical", "오케스트라", "피아노", "바이올린"],
+    7: ["메탈", "metal", "헤비", "heavy", "하드록"],
+    8: ["인디", "indie", "독립", "alternative"],
+    9: ["케이팝", "k-pop", "kpop", "아이돌", "idol"],
+    10: ["로파이", "lo-fi", "lofi", "잔잔한", "공부"],
+    11: ["트랩", "trap", "808", "베이스"],
+    12: ["하우스", "house", "디스코", "disco"],
+    13: ["테크노", "techno", "언더그라운드"],
+    14: ["앰비언트", "ambient", "분위기", "배경음악"],
+    15: ["신스웨이브", "synthwave", "레트로", "80년대음악"],
+    16: ["퐁크", "phonk", "drift", "드리프트"],
+    17: ["드릴", "drill", "영국", "uk"],
+    18: ["아프로비트", "afrobeat", "아프리카"],
+    19: ["라틴", "latin", "레게톤", "살사"],
+    20: ["포크", "folk", "어쿠스틱", "acoustic"],
+    21: ["컨트리", "country", "미국남부"],
+    22: ["오케스트라", "orchestral", "cinematic", "영화음악", "웅장"],
+    23: ["실험음악", "experimental", "노이즈"],
+    24: ["포스트록", "post-rock", "슬로우"],
+    25: ["드림팝", "dream pop", "몽환적"],
+    26: ["슈게이징", "shoegaze", "노이즈팝"]
+}
+
+# 장르-스타일 연관성 보정 (스타일이 기본값일 때)
+GENRE_VISUAL_MAPPING = {
+    6: 7,   # Cyberpunk → Cyberpunk Neon
+    2: 8,   # Dark Fantasy → Dark Fantasy Gothic
+    12: 2,  # Anime/Animation → Anime/Manga
+    3: 8,   # Psychological Horror → Dark Fantasy Gothic
+    5: 10,  # Neo-Noir → Black & White Film Noir
+    22: 6,  # Historical Epic → Oil Painting Classical
+}
+
+GENRE_MUSIC_MAPPING = {
+    6: 15,  # Cyberpunk → Synthwave
+    12: 9,  # Anime/Animation → K-Pop or J-Pop related
+    22: 22, # Historical Epic → Orchestral/Cinematic
+    3: 14,  # Psychological Horror → Ambient
+    1: 3,   # Sci-Fi Epic → Electronic/EDM
+}
+
+
+HANGUL_RE = re.compile(r"[가-힣]")
+HANGUL_RUN_RE = re.compile(r"[가-힣]+")
+LATIN_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# 영어 키워드 뒤에 붙어도 되는 어미
+LATIN_SUFFIXES = ["s", "es", "r", "rs", "er", "ers", "d", "ed", "ing", "y"]
+# 한 글자 한글 키워드 뒤에 붙어도 되는 조사
+HANGUL_PARTICLES = {"으로", "처럼", "에서", "이다", "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "로", "만"}
+
+
+def _is_latin_keyword(keyword):
+    return not HANGUL_RE.search(keyword)
+
+
+def _is_hangul_keyword(keyword):
+    return bool(re.fullmatch(r"[가-힣]+", keyword))
+
+
+def _boundary_ok(text, start, end, keyword):
+    """text[start:end] == keyword 위치가 매칭 규칙을 만족하는지 (테스트/검증용 기준 구현)"""
+    before = text[start - 1] if start > 0 else ""
+    rest = text[end:]
+    if _is_latin_keyword(keyword):
+        suffix = LATIN_TOKEN_RE.match(rest)
+        return not LATIN_TOKEN_RE.match(before) and (not suffix or suffix.group() in LATIN_SUFFIXES)
+    if len(keyword) == 1 and _is_hangul_keyword(keyword):
+        if HANGUL_RE.match(before):
+            return False
+        following = HANGUL_RUN_RE.match(rest)
+        return not following or following.group() in HANGUL_PARTICLES
+    return True
+
+
+class TopicKeywordMatcher:
+    """여러 분류({idx: [키워드]})를 한 번에 점수 매기는 컴파일된 매처
+
+    - 영문 한 단어 키워드: 주제의 단어(영문·숫자 연속)를 어미 변형까지 펼친 테이블에서 조회
+    - 영문 여러 단어 키워드 (sci-fi, dream pop): 부분 문자열 후보만 경계 검사
+    - 한글 키워드: 한글 연속 구간의 부분 문자열을 테이블에서 조회 (한 글자 키워드는 구간 맨 앞 + 조사만)
+    - 숫자+한글 혼합 키워드 (80년대): 부분 문자열 검사
+    word_boundaries=False면 기존 부분 문자열 동작과 동일 (회귀 비교용)
+    """
+
+    def __init__(self, taxonomies, word_boundaries=True):
+        self.taxonomies = taxonomies
+        self.word_boundaries = word_boundaries
+        # 키워드 → [(분류 이름, idx), ...]
+        self.targets = {}
+        for name, keyword_dict in taxonomies.items():
+            for idx, keywords in keyword_dict.items():
+                for keyword in keywords:
+                    self.targets.setdefault(keyword, []).append((name, idx))
+        # 동점 처리용 분류 사전 내 순서
+        self.rank = {(name, idx): pos for name, keyword_dict in taxonomies.items()
+                     for pos, idx in enumerate(keyword_dict)}
+
+        # 영문: 표면형(키워드 + 어미) → 키워드들
+        self.latin_forms = {}
+        self.latin_phrases = []
+        self.hangul_keywords = set()
+        self.hangul_max_len = 1
+        self.short_hangul_keywords = set()
+        self.mixed_keywords = []
+        for keyword in self.targets:
+            if _is_latin_keyword(keyword) and LATIN_TOKEN_RE.fullmatch(keyword):
+                for form in [keyword] + [keyword + suffix for suffix in LATIN_SUFFIXES]:
+                    self.latin_forms.setdefault(form, []).append(keyword)
+            elif _is_latin_keyword(keyword):
+                self.latin_phrases.append(keyword)
+            elif not _is_hangul_keyword(keyword):
+                self.mixed_keywords.append(keyword)
+            elif len(keyword) == 1:
+                self.short_hangul_keywords.add(keyword)
+            else:
+                self.hangul_keywords.add(keyword)
+                self.hangul_max_len = max(self.hangul_max_len, len(keyword))
+
+    @staticmethod
+    def _occurs_with_boundaries(text, keyword):
+        start = text.find(keyword)
+        while start != -1:
+            if _boundary_ok(text, start, start + len(keyword), keyword):
+                return True
+            start = text.find(keyword, start + 1)
+        return False
+
+    def find_keywords(self, topic):
+        """주제에 포함된 키워드 집합 (소문자 기준)"""
+        text = topic.lower()
+        if not self.word_boundaries:
+            return {keyword for keyword in self.targets if keyword in text}
+
+        found = set()
+
+        # 영문 단어
+        latin_forms = self.latin_forms
+        for token in LATIN_TOKEN_RE.findall(text):
+            keywords = latin_forms.get(token)
+            if keywords:
+                found.update(keywords)
+        for keyword in self.latin_phrases:
+            if keyword in text and self._occurs_with_boundaries(text, keyword):
+                found.add(keyword)
+
+        # 한글 연속 구간
+        hangul_keywords = self.hangul_keywords
+        max_len = self.hangul_max_len
+        for m in HANGUL_RUN_RE.finditer(text):
+            run = m.group()
+            length = len(run)
+            if run[0] in self.short_hangul_keywords and (length == 1 or run[1:] in HANGUL_PARTICLES):
+                found.add(run[0])
+            for a in range(length - 1):
+                for b in range(a + 2, min(a + max_len, length) + 1):
+                    if run[a:b] in hangul_keywords:
+                        found.add(run[a:b])
+
+        for keyword in self.mixed_keywords:
+            if keyword in text:
+                found.add(keyword)
+        return found
+
+    def scores(self, topic):
+        """{분류 이름: {idx: 매칭 키워드 수}}"""
+        scores = {name: dict.fromkeys(keyword_dict, 0) for name, keyword_dict in self.taxonomies.items()}
+        for keyword in self.find_keywords(topic):
+            for name, idx in self.targets[keyword]:
+                scores[name][idx] += 1
+        return scores
+
+    def best_matches(self, topic, default=0):
+        """{분류 이름: 최고 점수 idx} (동점이면 분류 사전에서 앞선 idx, 매칭이 없으면 default)"""
+        counts = {}
+        for keyword in self.find_keywords(topic):
+            for target in self.targets[keyword]:
+                counts[target] = counts.get(target, 0) + 1
+        best = dict.fromkeys(self.taxonomies, default)
+        best_key = {}
+        for (name, idx), score in counts.items():
+            key = (score, -self.rank[(name, idx)])
+            if name not in best_key or key > best_key[name]:
+                best_key[name] = key
+                best[name] = idx
+        return best
+
+
+TOPIC_MATCHER = TopicKeywordMatcher({"genre": GENRE_KEYWORDS, "visual": VISUAL_KEYWORDS, "music": MUSIC_KEYWORDS})
+
+
+def analyze_topic_for_auto_settings(topic, matcher=TOPIC_MATCHER):
+    """주제를 분석하여 최적의 영상장르, 비주얼스타일, 음악장르 인덱스를 반환"""
+    best = matcher.best_matches(topic)
+    genre_idx, visual_idx, music_idx = best["genre"], best["visual"], best["music"]
+
+    # 스타일이 기본값이면 장르에 맞춰 보정
+    if visual_idx == 0 and genre_idx in GENRE_VISUAL_MAPPING:
+        visual_idx = GENRE_VISUAL_MAPPING[genre_idx]
+
+    if music_idx == 0 and genre_idx in GENRE_MUSIC_MAPPING:
+        music_idx = GENRE_MUSIC_MAPPING[genre_idx]
+
+    return genre_idx, visual_idx, music_idx
+
+
+def analyze_topics_for_auto_settings(topics, matcher=TOPIC_MATCHER):
+    """여러 주제 일괄 분석 → [(genre_idx, visual_idx, music_idx), ...]"""
+    return [analyze_topic_for_auto_settings(topic, matcher) for topic in topics]
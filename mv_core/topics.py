@@ -0,0 +1,207 @@
+"""
+트렌드 주제 생성
+- generate_trending_topic(): 템플릿 1개 + 키워드 랜덤 조합 (단건)
+- iter_unique_topics(): 중복 없는 대량 주제 스트림 (시드, 카테고리 커버리지 균등 분배)
+"""
+import random
+import string
+
+# --- 확장된 트렌드 키워드 (대폭 확장) ---
+TRENDING_KEYWORDS = {
+    "emotions": [
+        "heartbreak", "hope", "nostalgia", "euphoria", "melancholy", "rage", "peace", "anxiety", "joy", "loneliness",
+        "obsession", "liberation", "despair", "ecstasy", "bittersweet", "rebellion", "serenity", "madness", "yearning", "triumph",
+        "betrayal", "redemption", "devotion", "confusion", "enlightenment", "paranoia", "bliss", "grief", "wonder", "defiance"
+    ],
+    "settings": [
+        "neon city", "abandoned subway", "rooftop at dawn", "underwater palace", "desert highway", "floating islands",
+        "dystopian Tokyo", "cyberpunk Seoul", "ancient temple", "space station", "frozen tundra", "volcanic landscape",
+        "bioluminescent forest", "steampunk factory", "art deco ballroom", "post-apocalyptic wasteland", "crystal cave",
+        "holographic nightclub", "zero gravity station", "ancient ruins", "mirror dimension", "time-frozen city",
+        "neon-lit rain street", "abandoned amusement park", "underground bunker", "floating market", "digital void",
+        "cherry blossom garden", "brutalist architecture", "venetian canals", "himalayan monastery"
+    ],
+    "characters": [
+        "lonely hacker", "rebel artist", "time traveler", "android musician", "street dancer", "wandering poet",
+        "revenge seeker", "fallen angel", "lost astronaut", "phantom thief", "cursed immortal", "dimension hopper",
+        "memory collector", "dream architect", "soul merchant", "reality bender", "shadow assassin", "light keeper",
+        "chaos agent", "harmony seeker", "digital ghost", "analog soul", "future prophet", "past hunter",
+        "emotion vampire", "hope dealer", "fear eater", "love warrior", "death dancer", "life singer"
+    ],
+    "aesthetics": [
+        "retro 80s", "vaporwave dreams", "dark academia", "y2k nostalgia", "minimalist void", "baroque luxury",
+        "glitch art", "neon noir", "pastel goth", "cyberpunk", "afrofuturism", "solarpunk", "dieselpunk",
+        "cottagecore nightmare", "liminal space", "dreamcore", "weirdcore", "ethereal maximalism", "brutalist elegance",
+        "bio-organic tech", "crystal punk", "holographic minimalism", "dark romanticism", "neo-tokyo", "cyber-shamanic",
+        "quantum aesthetic", "retro-futurism", "analog horror", "digital baroque", "neon gothic"
+    ],
+    "actions": [
+        "running through rain", "dancing in fire", "flying over city", "drowning in memories", "breaking free",
+        "searching for light", "falling through time", "rising from ashes", "chasing shadows", "embracing the void",
+        "shattering reality", "rebuilding self", "transcending dimension", "merging with machine", "escaping simulation",
+        "fighting inner demon", "reuniting souls", "sacrificing everything", "discovering truth", "accepting fate",
+        "defying gravity", "manipulating time", "bending light", "controlling elements", "summoning power"
+    ],
+    "times": [
+        "midnight", "golden hour", "endless night", "frozen moment", "parallel timeline", "infinite loop",
+        "last sunrise", "first snowfall", "summer's end", "dawn of chaos", "twilight zone", "eternal dusk",
+        "moment before impact", "second after rebirth", "edge of tomorrow", "yesterday's future", "timeless now",
+        "quantum midnight", "fractal dawn", "crystallized second"
+    ],
+    "trends_2025": [
+        "AI awakening", "metaverse escape", "climate dystopia", "gen-z rebellion", "digital detox", "virtual romance",
+        "blockchain dreams", "quantum love", "hologram memories", "synthetic emotions", "neural link love", "avatar identity",
+        "deep fake reality", "algorithmic fate", "carbon zero future", "biohacked beauty", "crypto collapse", "VR addiction",
+        "AI companion bond", "simulation theory", "consciousness upload", "memory marketplace", "emotion NFT", "dream streaming"
+    ],
+    "cinematic_styles": [
+        "Christopher Nolan epic", "Denis Villeneuve atmosphere", "David Fincher darkness", "Wes Anderson symmetry",
+        "Wong Kar-wai romance", "Park Chan-wook intensity", "Bong Joon-ho social", "Ridley Scott sci-fi",
+        "Guillermo del Toro fantasy", "Terrence Malick poetry", "Nicolas Winding Refn neon", "Gaspar Noé chaos",
+        "Kubrick precision", "Tarkovsky meditation", "Lynch surrealism", "Tarantino stylization"
+    ],
+    "music_moods": [
+        "anthemic euphoria", "melancholic beauty", "aggressive energy", "dreamy float", "dark intensity",
+        "playful chaos", "intimate whisper", "epic grandeur", "haunting mystery", "rebellious defiance",
+        "nostalgic warmth", "futuristic cold", "organic warmth", "synthetic precision", "raw emotion"
+    ]
+}
+
+TOPIC_TEMPLATES = [
+    "{character} experiencing {emotion} in a {setting} during {time}, {aesthetic} style, {action}",
+    "{emotion} journey of a {character} in {setting}, {aesthetic} vibes, {trend}",
+    "{cinematic} inspired: {character} {action} in {setting}, {aesthetic} aesthetic",
+    "{trend} era: {character} feeling {emotion}, {setting}, {time}",
+    "{aesthetic} music video: {character} in {setting}, {emotion} meets {music_mood}",
+    "Visual poem: {character} {action}, {setting} at {time}, {cinematic} cinematography",
+    "{music_mood} energy: {character} confronts {emotion} in {setting}, {trend}",
+    "Experimental: {character} trapped in {setting}, {aesthetic} meets {cinematic}",
+]
+
+# 템플릿 필드 → TRENDING_KEYWORDS 카테고리
+TEMPLATE_FIELDS = {
+    "emotion": "emotions",
+    "setting": "settings",
+    "character": "characters",
+    "aesthetic": "aesthetics",
+    "action": "actions",
+    "time": "times",
+    "trend": "trends_2025",
+    "cinematic": "cinematic_styles",
+    "music_mood": "music_moods",
+}
+
+# 연속 중복이 이만큼 나오면 조합이 바닥난 것으로 보고 스트림 종료
+MAX_CONSECUTIVE_DUPLICATES = 1000
+
+
+def generate_trending_topic(rng=random):
+    """더욱 다양한 주제 생성"""
+    template = rng.choice(TOPIC_TEMPLATES)
+    return template.format(**{field: rng.choice(TRENDING_KEYWORDS[category])
+                              for field, category in TEMPLATE_FIELDS.items()})
+
+
+def template_fields(template):
+    """템플릿에 쓰인 필드 이름 (등장 순서, 중복 제거)"""
+    fields = []
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field and field not in fields:
+            fields.append(field)
+    return fields
+
+
+def _positional_template(template, fields):
+    """'{character} in {setting}' → '{0} in {1}' (format 호출 비용 절감)"""
+    for i, field in enumerate(fields):
+        template = template.replace("{" + field + "}", "{" + str(i) + "}")
+    return template
+
+
+def topic_space_size(keywords=TRENDING_KEYWORDS, templates=TOPIC_TEMPLATES):
+    """만들 수 있는 서로 다른 주제 수"""
+    total = 0
+    for template in templates:
+        combos = 1
+        for field in template_fields(template):
+            combos *= len(keywords[TEMPLATE_FIELDS[field]])
+        total += combos
+    return total
+
+
+class _Deck:
+    """섞인 카드 더미: 전부 한 번씩 나온 뒤에야 다시 섞어 재사용"""
+
+    def __init__(self, size, rng):
+        self.size = size
+        self.rng = rng
+        self.cards = []
+
+    def draw(self):
+        if not self.cards:
+            self.cards = list(range(self.size))
+            self.rng.shuffle(self.cards)
+        return self.cards.pop()
+
+
+def iter_unique_topics(count=None, seed=None, balanced=True, keywords=TRENDING_KEYWORDS,
+                       templates=TOPIC_TEMPLATES, exclude=()):
+    """중복 없는 주제를 하나씩 생성 (count=None이면 조합이 바닥날 때까지)
+
+    balanced=True: 템플릿과 카테고리별 키워드를 섞인 더미에서 차례로 뽑아
+    모든 키워드가 한 번씩 쓰이기 전에는 같은 키워드를 다시 쓰지 않음
+    (템플릿마다 쓰는 필드가 달라 카테고리별로 독립적인 더미 사용)
+    exclude: 이미 쓴 주제 문자열 (결과에서 제외)
+    """
+    rng = random.Random(seed)
+    compiled = []
+    for template in templates:
+        fields = template_fields(template)
+        compiled.append((_positional_template(template, fields),
+                         [(field, keywords[TEMPLATE_FIELDS[field]]) for field in fields]))
+    capacity = topic_space_size(keywords, templates)
+    if count is None or count > capacity:
+        count = capacity
+
+    if balanced:
+        template_deck = _Deck(len(compiled), rng)
+        decks = {category: _Deck(len(values), rng) for category, values in keywords.items()}
+        draw_template = template_deck.draw
+
+        def draw_value(field, values):
+            return decks[TEMPLATE_FIELDS[field]].draw()
+    else:
+        n_templates = len(compiled)
+
+        def draw_template():
+            return int(rng.random() * n_templates)
+
+        def draw_value(field, values):
+            return int(rng.random() * len(values))
+
+    excluded = set(exclude)
+    seen = set()
+    produced = 0
+    misses = 0
+    while produced < count:
+        t = draw_template()
+        template, fields = compiled[t]
+        picks = tuple(draw_value(field, values) for field, values in fields)
+        key = (t,) + picks
+        if key in seen:
+            misses += 1
+            if misses >= MAX_CONSECUTIVE_DUPLICATES:
+                return
+            continue
+        seen.add(key)
+        topic = template.format(*[values[i] for (_, values), i in zip(fields, picks)])
+        if excluded and topic in excluded:
+            continue
+        misses = 0
+        produced += 1
+        yield topic
+
+
+def generate_unique_topics(count, seed=None, balanced=True, **kwargs):
+    """중복 없는 주제 count개 리스트"""
+    return list(iter_unique_topics(count, seed=seed, balanced=balanced, **kwargs))
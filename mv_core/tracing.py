@@ -0,0 +1,250 @@
+"""
+파이프라인 단계별 타이밍 스팬
+- span(name, **attrs): 중첩 가능한 컨텍스트 매니저 (활성 트레이서가 없으면 기록하지 않음)
+- Tracer: 세션별 스팬 보관 + 단계별 p50/p95
+- SpanSink: 프로세스 공유 → JSONL 파일 추가 + Prometheus 텍스트 노출 형식 파일
+"""
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SESSION_SPANS = 2000
+MAX_STAGE_SAMPLES = 1000          # Prometheus 분위수 계산용 단계별 최근 표본 수
+MAX_JSONL_BYTES = 20 * 1024 * 1024  # 넘으면 .1로 돌리고 새 파일
+QUANTILES = (0.5, 0.95)
+
+# 단계 이름 뒤에 붙여 구분하는 속성 (같은 단계라도 모델/공급자별로 따로 집계)
+STAGE_LABEL_ATTRS = ("model", "provider")
+
+_current_tracer = contextvars.ContextVar("mv_tracer", default=None)
+_current_span = contextvars.ContextVar("mv_span", default=None)
+
+
+class Span:
+    """진행 중인 스팬 (set으로 속성 추가, 끝나면 트레이서에 기록)"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration_ms", "attrs")
+
+    def __init__(self, name, parent=None, attrs=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration_ms = None
+        self.attrs = dict(attrs or {})
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        return {"name": self.name, "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+                "start": round(self.start, 6), "duration_ms": round(self.duration_ms or 0.0, 3),
+                "attrs": self.attrs}
+
+
+class _NullSpan:
+    """트레이서가 없을 때의 스팬 (속성 무시)"""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def span(name, **attrs):
+    """단계 스팬 (중첩 시 부모-자식 연결, 예외가 나면 status="error" 후 다시 던짐)
+
+    status 속성이 따로 지정되지 않으면 "ok"로 기록
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield _NULL_SPAN
+        return
+    current = Span(name, _current_span.get(), attrs)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs.setdefault("status", "error")
+        current.attrs.setdefault("error", f"{type(e).__name__}: {str(e)[:200]}")
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        current.attrs.setdefault("status", "ok")
+        _current_span.reset(token)
+        tracer.record(current)
+
+
+def traced_sleep(seconds, **attrs):
+    """time.sleep + "sleep" 스팬 (재시도 대기/부하 방지 대기도 단계로 집계)"""
+    if seconds <= 0:
+        return
+    with span("sleep", seconds=seconds, **attrs):
+        time.sleep(seconds)
+
+
+def activate_tracer(tracer):
+    """현재 실행 컨텍스트의 트레이서 지정 (Streamlit 스크립트 실행마다 호출)"""
+    _current_tracer.set(tracer)
+
+
+@contextmanager
+def use_tracer(tracer):
+    """with 블록 동안만 트레이서 지정"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+# ------------------------------------------------------------------
+# 집계
+# ------------------------------------------------------------------
+def stage_key(span_data):
+    """스팬 dict → 집계 키 ("llm.call · gemini-2.0-flash" 처럼 모델/공급자 포함)"""
+    attrs = span_data.get("attrs", {})
+    labels = [str(attrs[name]) for name in STAGE_LABEL_ATTRS if attrs.get(name)]
+    return " · ".join([span_data["name"]] + labels)
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 nearest-rank 분위수 (빈 목록이면 0)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def stage_percentiles(spans):
+    """스팬 dict 목록 → {단계: {count, p50_ms, p95_ms, total_ms, errors}} (누적 시간 큰 순)"""
+    grouped = {}
+    for data in spans:
+        grouped.setdefault(stage_key(data), []).append(data)
+    stats = {}
+    for key, items in grouped.items():
+        durations = sorted(item["duration_ms"] for item in items)
+        stats[key] = {
+            "count": len(items),
+            "p50_ms": percentile(durations, 0.5),
+            "p95_ms": percentile(durations, 0.95),
+            "total_ms": sum(durations),
+            "errors": sum(item["attrs"].get("status") not in ("ok", None) for item in items),
+        }
+    return dict(sorted(stats.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+class Tracer:
+    """세션별 스팬 보관 (최근 max_spans개) + 공유 싱크로 전달"""
+
+    def __init__(self, sink=None, max_spans=MAX_SESSION_SPANS):
+        self.sink = sink
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def record(self, current):
+        data = current.to_dict()
+        with self._lock:
+            self._spans.append(data)
+        if self.sink is not None:
+            self.sink.record(data)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def stage_stats(self):
+        return stage_percentiles(self.spans())
+
+    def to_jsonl(self):
+        return "".join(json.dumps(data, ensure_ascii=False) + "\n" for data in self.spans())
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+# ------------------------------------------------------------------
+# 프로세스 공유 싱크 (JSONL + Prometheus)
+# ------------------------------------------------------------------
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SpanSink:
+    """모든 세션의 스팬 → JSONL 추가 기록 + 단계별 요약 (Prometheus 텍스트 노출 형식)
+
+    prom_path가 있으면 최상위 스팬이 끝날 때마다 파일을 통째로 교체 (node_exporter textfile 수집기용)
+    """
+
+    def __init__(self, jsonl_path=None, prom_path=None, max_samples=MAX_STAGE_SAMPLES):
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.max_samples = max_samples
+        self._stages = {}   # (단계, 모델/공급자 라벨) → {"samples", "count", "sum_ms", "errors"}
+        self._lock = threading.Lock()
+
+    def record(self, data):
+        labels = tuple((name, str(data["attrs"][name])) for name in STAGE_LABEL_ATTRS if data["attrs"].get(name))
+        with self._lock:
+            stage = self._stages.setdefault((data["name"], labels), {
+                "samples": deque(maxlen=self.max_samples), "count": 0, "sum_ms": 0.0, "errors": 0})
+            stage["samples"].append(data["duration_ms"])
+            stage["count"] += 1
+            stage["sum_ms"] += data["duration_ms"]
+            stage["errors"] += data["attrs"].get("status") != "ok"
+            if self.jsonl_path:
+                self._append_jsonl(data)
+        if self.prom_path and data["parent_id"] is None:
+            self.write_prometheus()
+
+    def _append_jsonl(self, data):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.jsonl_path)), exist_ok=True)
+            if os.path.exists(self.jsonl_path) and os.path.getsize(self.jsonl_path) > MAX_JSONL_BYTES:
+                os.replace(self.jsonl_path, self.jsonl_path + ".1")
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            pass  # 기록 실패가 생성 파이프라인을 막지 않도록
+
+    def prometheus_text(self):
+        """단계별 summary(분위수/합계/개수) + 오류 카운터"""
+        with self._lock:
+            stages = [(name, labels, sorted(stage["samples"]), stage["count"], stage["sum_ms"], stage["errors"])
+                      for (name, labels), stage in sorted(self._stages.items())]
+        lines = ["# HELP mv_stage_duration_seconds Pipeline stage duration.",
+                 "# TYPE mv_stage_duration_seconds summary"]
+        errors = ["# HELP mv_stage_errors_total Pipeline stage spans that did not finish ok.",
+                  "# TYPE mv_stage_errors_total counter"]
+        for name, labels, samples, count, sum_ms, error_count in stages:
+            label_text = ",".join(f'{key}="{_escape_label(value)}"' for key, value in (("stage", name),) + labels)
+            for q in QUANTILES:
+                lines.append(f'mv_stage_duration_seconds{{{label_text},quantile="{q}"}} '
+                             f"{percentile(samples, q) / 1000:.6f}")
+            lines.append(f"mv_stage_duration_seconds_sum{{{label_text}}} {sum_ms / 1000:.6f}")
+            lines.append(f"mv_stage_duration_seconds_count{{{label_text}}} {count}")
+            errors.append(f"mv_stage_errors_total{{{label_text}}} {error_count}")
+        return "\n".join(lines + errors) + "\n"
+
+    def write_prometheus(self):
+        """Prometheus 텍스트를 임시 파일에 쓰고 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.prom_path)), exist_ok=True)
+            tmp_path = f"{self.prom_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, self.prom_path)
+        except OSError:
+            pass
@@ -0,0 +1,170 @@
+"""
+트렌드 피드 서비스 (구글 트렌드 RSS)
+지역(geo)별 TTL 캐시 + 만료 전 백그라운드 갱신 + 실패 시 이전 데이터 제공
+지역별 갱신은 single-flight → 캐시가 비었거나 만료된 순간 여러 세션이 조회해도 원본 요청은 1번
+"""
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from .endpoints import DEFAULT_TRENDS_RSS_URL, trends_rss_url
+from .singleflight import SingleFlight
+
+GOOGLE_TRENDS_RSS_URL = DEFAULT_TRENDS_RSS_URL
+
+# 피드는 하루에 몇 번 바뀌는 정도라 30분 캐시, 만료 20% 전부터 백그라운드 갱신
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_REFRESH_AHEAD = 0.2
+# 보여 줄 데이터 없이 실패하면 이 시간 동안은 다시 요청하지 않음 (원본 장애 중 조회마다 재요청 방지)
+DEFAULT_NEGATIVE_TTL_SECONDS = 30
+
+
+def _local_name(tag):
+    """'{namespace}approx_traffic' → 'approx_traffic'"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_trends_rss(chunks):
+    """RSS 바이트 청크를 점진적으로 파싱 → [{title, traffic, pub_date}, ...]
+
+    <item> 하나가 끝날 때마다 결과에 추가하고 요소를 비워 메모리를 유지.
+    (채널 <title>은 item 밖이라 자연스럽게 제외)
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    items = []
+
+    def drain():
+        for _, elem in parser.read_events():
+            if _local_name(elem.tag) != "item":
+                continue
+            fields = {_local_name(child.tag): (child.text or "").strip() for child in elem}
+            title = fields.get("title", "")
+            if len(title) > 1:
+                items.append({
+                    "title": title,
+                    "traffic": fields.get("approx_traffic", ""),
+                    "pub_date": fields.get("pubDate", ""),
+                })
+            elem.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        drain()
+    parser.close()
+    drain()
+    return items
+
+
+class TrendFeed:
+    """지역별 트렌드 피드 캐시
+
+    - get(geo): 캐시가 신선하면 즉시 반환, 만료가 가까우면 백그라운드 갱신을 걸고 반환
+    - 만료됐거나 캐시가 없으면 동기 갱신, 실패하면 이전(stale) 데이터 반환
+    - 이전 데이터도 없이 실패하면 negative_ttl 동안 None (그동안 재요청하지 않음)
+    - 같은 지역의 동기/백그라운드 갱신은 flight ("trends" 네임스페이스)로 합쳐 한 번만 요청
+    """
+
+    def __init__(self, url_template=None, ttl=DEFAULT_TTL_SECONDS,
+                 refresh_ahead=DEFAULT_REFRESH_AHEAD, timeout=10, clock=time.monotonic,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL_SECONDS, flight=None):
+        self.url_template = url_template
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_ahead = refresh_ahead
+        self.timeout = timeout
+        self.clock = clock
+        self.flight = flight or SingleFlight()
+        self._entries = {}      # geo → {"items", "fetched_at", "error"}
+        self._refreshing = {}   # geo → 백그라운드 갱신 스레드
+        self._lock = threading.Lock()
+
+    # --- 조회 ---
+    def get(self, geo="KR", limit=10):
+        """트렌드 항목 리스트 (없으면 None)"""
+        entry = self._entries.get(geo)
+        now = self.clock()
+
+        # 항목 없는 엔트리 = 실패 기록 → 짧은 TTL, 미리 갱신하지 않음
+        ttl = self.ttl if entry and entry["items"] else self.negative_ttl
+        if entry is None or now - entry["fetched_at"] >= ttl:
+            entry = self._refresh_expired(geo, entry)
+        elif entry["items"] and now - entry["fetched_at"] >= self.ttl * (1 - self.refresh_ahead):
+            self.refresh_in_background(geo)
+
+        if not entry or not entry["items"]:
+            return None
+        return entry["items"][:limit]
+
+    def keywords(self, geo="KR", limit=10):
+        """트렌드 키워드(제목)만"""
+        items = self.get(geo, limit)
+        return [item["title"] for item in items] if items else None
+
+    def status(self, geo="KR"):
+        """캐시 상태 (age 초, 항목 수, 마지막 오류, 갱신 중 여부)"""
+        entry = self._entries.get(geo)
+        thread = self._refreshing.get(geo)
+        return {
+            "age": None if entry is None else self.clock() - entry["fetched_at"],
+            "count": 0 if entry is None else len(entry["items"]),
+            "error": None if entry is None else entry["error"],
+            "refreshing": bool(thread and thread.is_alive()),
+        }
+
+    # --- 갱신 ---
+    def fetch(self, geo):
+        """RSS를 스트리밍으로 받아 점진 파싱 (실패 시 예외)"""
+        import requests
+
+        url = (self.url_template or trends_rss_url()).format(geo=geo)
+        with requests.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            return parse_trends_rss(response.iter_content(chunk_size=8192))
+
+    def refresh(self, geo):
+        """동기 갱신 → 캐시 엔트리 반환 (같은 지역 갱신이 진행 중이면 그 결과를 공유)"""
+        return self.flight.do("trends", geo, lambda: self._refresh(geo))[0]
+
+    def _refresh_expired(self, geo, seen):
+        """get()이 본 엔트리(seen)가 만료됐을 때의 갱신
+
+        리더가 되기 직전에 다른 세션의 갱신이 끝났으면 (엔트리가 바뀜) 다시 요청하지 않고 그 엔트리 사용
+        """
+        def run():
+            current = self._entries.get(geo)
+            return current if current is not seen else self._refresh(geo)
+
+        return self.flight.do("trends", geo, run)[0]
+
+    def _refresh(self, geo):
+        """원본 요청 1번 → 캐시 엔트리
+
+        실패하거나 빈 피드면 이전 항목을 유지하고 오류만 기록.
+        (fetched_at도 갱신해 실패한 원본을 TTL 동안, 이전 항목이 없으면 negative_ttl 동안 다시 두드리지 않음)
+        """
+        try:
+            items = self.fetch(geo)
+            if not items:
+                raise ValueError("빈 트렌드 피드")
+            entry = {"items": items, "fetched_at": self.clock(), "error": None}
+        except Exception as e:
+            previous = self._entries.get(geo)
+            if previous is None or not previous["items"]:
+                entry = {"items": [], "fetched_at": self.clock(), "error": str(e)}
+            else:
+                entry = dict(previous, fetched_at=self.clock(), error=str(e))
+        with self._lock:
+            self._entries[geo] = entry
+        return entry
+
+    def refresh_in_background(self, geo):
+        """지역별로 하나의 백그라운드 갱신만 실행 → 스레드 (이미 실행 중이면 그 스레드)"""
+        with self._lock:
+            thread = self._refreshing.get(geo)
+            if thread and thread.is_alive():
+                return thread
+            thread = threading.Thread(target=self.refresh, args=(geo,), daemon=True,
+                                      name=f"trend-refresh-{geo}")
+            self._refreshing[geo] = thread
+        thread.start()
+        return thread
@@ -0,0 +1,129 @@
+"""
+씬별 변형 후보 묶음 (대표 컷 고르기)
+- Segmind: samples=K 요청 1번으로 K장 (부족한 만큼 Pollinations로 채움)
+- Pollinations: 서로 다른 시드 K개를 동시에 요청
+- 후보는 ImageBytes(받은 바이트 그대로) + 시드 + 실제 엔진으로 보관 → 고를 때 추가 생성 요청 없음
+"""
+import contextvars
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from .callbacks import CallbackQueue, null_event, null_log
+from .images import SEGMIND_MODEL, budget_prompt_with_log, generate_segmind_samples, pollinations_steps, run_steps
+from .providers import enhance_prompt_for_provider
+from .tracing import span
+
+DEFAULT_VARIATIONS = 4
+MAX_VARIATIONS = 8
+VARIATION_MAX_WORKERS = 4
+SEED_STEP = 7919   # 이웃 시드끼리 구도가 겹치지 않도록 소수 간격
+
+
+def variation_seeds(count, base_seed=None):
+    """후보별 시드 (base_seed가 같으면 항상 같은 시드 목록)"""
+    base_seed = base_seed if base_seed is not None else random.randint(0, 999999)
+    return [(base_seed + i * SEED_STEP) % 1000000 for i in range(count)]
+
+
+class VariationSet:
+    """한 씬의 후보 목록 + 대표 컷 인덱스"""
+
+    def __init__(self, prompt, width, height):
+        self.prompt = prompt
+        self.width = width
+        self.height = height
+        self.candidates = []   # [{"image": ImageBytes, "seed": int, "provider": str}]
+        self.hero = None
+
+    def add(self, image, seed, provider):
+        self.candidates.append({"image": image, "seed": seed, "provider": provider})
+        if self.hero is None:
+            self.hero = 0
+
+    def pick(self, index):
+        """대표 컷 지정 → (이미지, 실제 엔진)"""
+        if not 0 <= index < len(self.candidates):
+            raise IndexError(f"후보 {index}번 없음 (후보 {len(self.candidates)}개)")
+        self.hero = index
+        return self.hero_image()
+
+    def hero_image(self):
+        """현재 대표 컷 → (이미지, 실제 엔진) / 후보가 없으면 (None, None)"""
+        if self.hero is None:
+            return None, None
+        candidate = self.candidates[self.hero]
+        return candidate["image"], candidate["provider"]
+
+    def total_bytes(self):
+        return sum(len(candidate["image"]) for candidate in self.candidates)
+
+    def __len__(self):
+        return len(self.candidates)
+
+
+def generate_variations(prompt, width, height, provider, count=DEFAULT_VARIATIONS, max_retries=2, segmind_key=None,
+                        log=null_log, event=null_event, base_seed=None, max_workers=VARIATION_MAX_WORKERS, quality=None,
+                        palette=None, scheduler=None, priority="interactive"):
+    """씬 하나의 후보 count장 → VariationSet (완료 순서와 관계없이 시드 순서)
+
+    Segmind 엔진이면 samples=count 요청 1번, 모자란 장수(키 없음/실패/거부)는 Pollinations 시드 병렬로 채움
+    quality / palette: 후보마다 품질 게이트 적용 (generate_image_with_fallback과 같음)
+    scheduler: 공유 GenerationScheduler에 시드별 요청을 priority로 제출 (없으면 자체 스레드 풀)
+    """
+    count = max(1, min(count, MAX_VARIATIONS))
+    seeds = variation_seeds(count, base_seed)
+    variations = VariationSet(prompt, width, height)
+
+    with span("variations.generate", provider=provider, count=count) as batch:
+        enhanced = enhance_prompt_for_provider(prompt, provider)
+        log(f"변형 후보 {count}장 생성 시작 | 엔진: {provider} | 크기: {width}x{height}", "info")
+
+        if "Segmind" in provider:
+            sg_api_key = segmind_key or os.getenv("SEGMIND_API_KEY")
+            if sg_api_key:
+                images = generate_segmind_samples(budget_prompt_with_log(enhanced, "segmind", log), width, height,
+                                                  sg_api_key, count, log, event, seed=seeds[0], quality=quality,
+                                                  palette=palette)
+                for img in images:
+                    variations.add(img, img.seed, "Segmind (SDXL 1.0)")
+                if len(images) < count:
+                    event("Segmind", SEGMIND_MODEL, "fallback", detail=f"{len(images)}/{count} samples")
+                    log(f"Segmind {len(images)}/{count}장 → 나머지는 Pollinations 폴백", "warn")
+            else:
+                event("Segmind", SEGMIND_MODEL, "fallback", detail="no key")
+                log("Segmind API 키 없음 → Pollinations 자동 전환", "warn")
+
+        remaining = seeds[len(variations):]
+        if remaining:
+            queue = CallbackQueue()
+
+            def steps(seed):
+                return pollinations_steps(enhanced, width, height, provider, max_retries, queue.log, queue.event,
+                                          seed, is_fallback="Segmind" in provider, quality=quality, palette=palette)
+
+            def run(seed):
+                return run_steps(steps(seed))
+
+            if scheduler is not None:
+                # 시도 1번씩 제출 (재시도 사이에는 작업자를 놓음)
+                futures = [scheduler.submit(steps, seed, priority=priority) for seed in remaining]
+                results = [future.result() for future in futures]
+            else:
+                # 스레드마다 현재 컨텍스트를 복사해야 요청 스팬이 이 배치 아래에 기록됨
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining))) as pool:
+                    futures = [pool.submit(contextvars.copy_context().run, run, seed) for seed in remaining]
+                    results = [future.result() for future in futures]
+            queue.replay(log, event)
+            for img, actual_provider in results:
+                if img is not None:
+                    # 품질 게이트 재시도로 시드가 바뀌었을 수 있으므로 이미지에 기록된 실제 시드 사용
+                    variations.add(img, img.seed, actual_provider)
+
+        batch.set(generated=len(variations), bytes=variations.total_bytes(),
+                  status="ok" if len(variations) else "failed")
+        if len(variations):
+            log(f"변형 후보 {len(variations)}/{count}장 준비 ({variations.total_bytes() / 1024:.0f}KB)", "success")
+        else:
+            log("변형 후보 생성 실패", "error")
+    return variations
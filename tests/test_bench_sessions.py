@@ -0,0 +1,27 @@
+"""
+다중 세션 부하 테스트 보조 함수 테스트 (서버 기동 없이)
+"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("websockets")
+bench_sessions = pytest.importorskip("benchmarks.bench_sessions")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc 필요")
+def test_read_process_stats_of_current_process():
+    cpu_seconds, rss_mb, threads = bench_sessions.read_process_stats(os.getpid())
+    assert cpu_seconds > 0 and rss_mb > 1 and threads >= 1
+    assert bench_sessions.read_process_stats(2 ** 22 + 1) is None
+
+
+def test_stage_summary_skips_failed_sessions():
+    results = [{"index": 0, "load": 1.0, "plan": 2.0, "total": 3.0},
+               {"index": 1, "load": 3.0, "plan": 4.0, "total": 7.0},
+               {"index": 2, "load": 9.0, "error": "TimeoutError", "total": 9.0}]
+    summary = bench_sessions.stage_summary(results)
+    assert summary["load"] == {"p50": 1.0, "p95": 3.0, "max": 3.0}
+    assert summary["total"]["max"] == 7.0
+    assert "scenes" not in summary
@@ -0,0 +1,28 @@
+"""
+조회 테이블 + 콜드 스타트 import 테스트
+"""
+import subprocess
+import sys
+
+from mv_core import (CATEGORY_PROFILES, VISUAL_STYLE_EMPHASIS, VISUAL_STYLES, get_category_profile,
+                     get_seasonal_keywords, get_visual_style_emphasis)
+
+
+def test_visual_style_emphasis_lookup():
+    assert get_visual_style_emphasis("Hyperrealistic 8K").startswith(VISUAL_STYLE_EMPHASIS["Photorealistic/Cinematic"])
+    assert get_visual_style_emphasis("Pastel Dreamy") == "Pastel Dreamy, high quality, professional"
+    assert set(VISUAL_STYLE_EMPHASIS) <= set(VISUAL_STYLES)
+
+
+def test_category_and_seasonal_fallbacks():
+    assert get_category_profile("없는 카테고리") is CATEGORY_PROFILES["뮤직비디오"]
+    assert "할로윈" in get_seasonal_keywords(10)
+    assert get_seasonal_keywords(13) == ["트렌드", "바이럴"]
+
+
+def test_core_import_skips_heavy_sdks_and_streamlit():
+    code = ("import sys, mv_core; "
+            "print(sorted(m for m in ('numpy', 'requests', 'PIL', 'google.generativeai', 'streamlit') "
+            "if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,243 @@
+"""
+스카우트 키워드 콘셉트 선계산 테스트 (지연을 흉내 낸 가짜 생성 함수)
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mv_core import (ConceptPrefetcher, Tracer, build_batch_concept_prompt, concept_key, generate_viral_concepts_batch,
+                     parse_concept_array, use_tracer)
+
+KEYWORDS = [
+    {"keyword": "뉴진스 컴백", "angle": "무대 뒤 이야기", "concept_hint": ""},
+    {"keyword": "가을 단풍", "angle": "계절 감성", "concept_hint": ""},
+    {"keyword": "한국시리즈", "angle": "응원 열기", "concept_hint": ""},
+    {"keyword": "할로윈", "angle": "코스튬 퍼레이드", "concept_hint": ""},
+    {"keyword": "AI", "angle": "미래 도시", "concept_hint": ""},
+]
+
+
+class SlowGenerator:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, keyword_data, channel_category, api_key, model_name):
+        with self.lock:
+            self.calls.append(keyword_data["keyword"])
+        time.sleep(self.delay)
+        return f"{channel_category}: {keyword_data['keyword']} ({keyword_data['angle']})"
+
+
+def test_concept_key_includes_angle_and_category():
+    assert concept_key(KEYWORDS[0], "뮤직비디오") == ("뉴진스 컴백", "무대 뒤 이야기", "뮤직비디오")
+    assert concept_key("AI", "뮤직비디오") == ("AI", "", "뮤직비디오")
+    assert concept_key(KEYWORDS[0], "먹방") != concept_key(KEYWORDS[0], "뮤직비디오")
+
+
+def test_prefetch_runs_concurrently():
+    gen = SlowGenerator(delay=0.2)
+    prefetcher = ConceptPrefetcher(gen, max_workers=5)
+    start = time.perf_counter()
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=5)
+    concepts = [prefetcher.get(kw, "뮤직비디오", "key", "model") for kw in KEYWORDS]
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.2 * 5 / 2
+    assert concepts[2] == "뮤직비디오: 한국시리즈 (응원 열기)"
+    assert len(gen.calls) == 5
+
+
+def test_clicks_served_from_cache():
+    gen = SlowGenerator(delay=0.01)
+    prefetcher = ConceptPrefetcher(gen)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=3)
+    prefetcher.get(KEYWORDS[0], "뮤직비디오", "key", "model")
+    prefetcher.get(KEYWORDS[1], "뮤직비디오", "key", "model")
+    # 같은 목록을 다시 선계산해도 중복 호출 없음
+    assert prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=3) == []
+    assert sorted(gen.calls) == sorted(kw["keyword"] for kw in KEYWORDS[:3])
+    assert prefetcher.peek(KEYWORDS[1], "뮤직비디오")
+
+
+def test_top_n_limits_prefetch():
+    gen = SlowGenerator(delay=0.01)
+    prefetcher = ConceptPrefetcher(gen)
+    submitted = prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=2)
+    assert len(submitted) == 2
+
+
+def test_cancel_pending_stops_early():
+    gen = SlowGenerator(delay=0.2)
+    prefetcher = ConceptPrefetcher(gen, max_workers=1)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=5)
+    # 사용자가 첫 키워드를 고름 → 아직 시작 안 한 나머지는 취소
+    concept = prefetcher.get(KEYWORDS[0], "뮤직비디오", "key", "model")
+    cancelled = prefetcher.cancel_pending()
+    time.sleep(0.3)
+    assert concept.endswith("(무대 뒤 이야기)")
+    assert cancelled >= 3
+    assert len(gen.calls) <= 2
+    assert prefetcher.pending_count() == 0
+
+
+def test_get_after_cancel_generates_directly():
+    gen = SlowGenerator(delay=0.05)
+    prefetcher = ConceptPrefetcher(gen, max_workers=1)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=5)
+    prefetcher.cancel_pending()
+    assert prefetcher.get(KEYWORDS[4], "뮤직비디오", "key", "model") == "뮤직비디오: AI (미래 도시)"
+
+
+def test_failed_generation_is_not_cached():
+    attempts = []
+
+    def flaky(keyword_data, channel_category, api_key, model_name):
+        attempts.append(keyword_data["keyword"])
+        if len(attempts) == 1:
+            raise RuntimeError("quota")
+        return "ok"
+
+    prefetcher = ConceptPrefetcher(flaky)
+    prefetcher.prefetch(KEYWORDS[:1], "뮤직비디오", "key", "model")
+    try:
+        prefetcher.get(KEYWORDS[0], "뮤직비디오", "key", "model")
+    except RuntimeError:
+        pass
+    assert prefetcher.get(KEYWORDS[0], "뮤직비디오", "key", "model") == "ok"
+
+
+# --- 일괄 생성 ---
+def test_parse_concept_array_with_fence_and_index():
+    text = """결과입니다:
+```json
+[
+  {"index": 2, "keyword": "가을 단풍", "concept": "Second."},
+  {"index": 1, "keyword": "뉴진스 컴백", "concept": "First."}
+]
+```"""
+    assert parse_concept_array(text, 3) == ["First.", "Second.", None]
+
+
+def test_parse_concept_array_plain_strings():
+    assert parse_concept_array('["A", "B"]', 2) == ["A", "B"]
+
+
+def test_parse_concept_array_salvages_truncated_response():
+    text = '[{"index": 1, "concept": "First."}, {"index": 2, "concept": "Sec'
+    assert parse_concept_array(text, 2) == ["First.", None]
+
+
+def test_parse_concept_array_garbage():
+    assert parse_concept_array("sorry, I can't help", 2) == [None, None]
+    assert parse_concept_array("", 1) == [None]
+
+
+def test_batch_prompt_sends_profile_once():
+    profile = {"visual_refs": ["Hype Williams"], "style_guide": "강렬한 비주얼", "themes": ["사랑"]}
+    prompt = build_batch_concept_prompt(KEYWORDS, "뮤직비디오", profile)
+    assert prompt.count("강렬한 비주얼") == 1
+    assert "5. 트렌드 키워드: AI | 활용 각도: 미래 도시" in prompt
+
+
+def test_prefetch_uses_single_batch_call():
+    batches = []
+
+    def batch(keyword_list, channel_category, api_key, model_name):
+        batches.append([kw["keyword"] for kw in keyword_list])
+        return [f"batch: {kw['keyword']}" for kw in keyword_list]
+
+    gen = SlowGenerator(delay=0.01)
+    prefetcher = ConceptPrefetcher(gen, batch_fn=batch)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=4)
+    assert prefetcher.get(KEYWORDS[3], "뮤직비디오", "key", "model") == "batch: 할로윈"
+    assert batches == [[kw["keyword"] for kw in KEYWORDS[:4]]]
+    assert gen.calls == []
+
+
+def test_batch_skips_cancelled_keywords():
+    release = threading.Event()
+    batches = []
+
+    def batch(keyword_list, channel_category, api_key, model_name):
+        batches.append([kw["keyword"] for kw in keyword_list])
+        return [kw["keyword"] for kw in keyword_list]
+
+    prefetcher = ConceptPrefetcher(SlowGenerator(), batch_fn=batch, max_workers=1)
+    # 작업자를 점유해 일괄 작업이 대기 상태에 머물게 함
+    prefetcher._executor.submit(release.wait)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=3)
+    assert prefetcher.cancel_pending() == 3
+    release.set()
+    prefetcher._executor.shutdown(wait=True)
+    assert batches == []
+
+
+def test_short_batch_response_fails_the_missing_futures():
+    def batch(keyword_list, channel_category, api_key, model_name):
+        return [f"batch: {kw['keyword']}" for kw in keyword_list[:2]]
+
+    release = threading.Event()
+    prefetcher = ConceptPrefetcher(lambda *args: "single", batch_fn=batch, max_workers=1)
+    prefetcher._executor.submit(release.wait)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=4)
+    futures = dict(prefetcher._futures)
+    release.set()
+    prefetcher._executor.shutdown(wait=True)
+    assert prefetcher.pending_count() == 0 and prefetcher._futures == {}
+    assert all(future.done() for future in futures.values())
+    assert prefetcher.peek(KEYWORDS[1], "뮤직비디오") == f"batch: {KEYWORDS[1]['keyword']}"
+    assert prefetcher.peek(KEYWORDS[3], "뮤직비디오") is None
+    assert isinstance(futures[concept_key(KEYWORDS[3], "뮤직비디오")].exception(), ValueError)
+
+
+def test_failed_batch_falls_back_to_single_generation_on_get():
+    gen = SlowGenerator(delay=0)
+
+    def batch(keyword_list, channel_category, api_key, model_name):
+        raise RuntimeError("quota")
+
+    prefetcher = ConceptPrefetcher(gen, batch_fn=batch)
+    prefetcher.prefetch(KEYWORDS, "뮤직비디오", "key", "model", top_n=3)
+    assert prefetcher.get(KEYWORDS[1], "뮤직비디오", "key", "model") == "뮤직비디오: 가을 단풍 (계절 감성)"
+    assert gen.calls == ["가을 단풍"]
+
+
+def fake_gemini(text=None, error=None):
+    def generate_content(prompt):
+        if error:
+            raise error
+        return SimpleNamespace(text=text)
+    return SimpleNamespace(GenerativeModel=lambda name: SimpleNamespace(generate_content=generate_content))
+
+
+def test_batch_llm_call_reports_partial_parse_and_raises_on_error(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr("mv_core.llm.configure_gemini", lambda api_key: fake_gemini('["A", null]'))
+    with use_tracer(tracer):
+        assert generate_viral_concepts_batch(KEYWORDS[:2], "뮤직비디오", "key", "model") == ["A", None]
+        monkeypatch.setattr("mv_core.llm.configure_gemini", lambda api_key: fake_gemini(error=TimeoutError("slow")))
+        with pytest.raises(TimeoutError):
+            generate_viral_concepts_batch(KEYWORDS[:2], "뮤직비디오", "key", "model")
+    partial, failed = [s["attrs"] for s in tracer.spans() if s["attrs"].get("purpose") == "concept_batch"]
+    assert partial["status"] == "partial" and partial["parsed"] == 1
+    assert failed["status"] == "error" and "slow" in failed["error"]
+
+
+def test_cancel_pending_only_touches_the_callers_group():
+    release = threading.Event()
+    prefetcher = ConceptPrefetcher(SlowGenerator(delay=0), max_workers=1)
+    prefetcher._executor.submit(release.wait)
+    prefetcher.prefetch(KEYWORDS[:3], "뮤직비디오", "key", "model", group="session-a")
+    prefetcher.prefetch(KEYWORDS[2:5], "뮤직비디오", "key", "model", group="session-b")   # 한국시리즈는 공유
+    futures = dict(prefetcher._futures)
+    # a 전용 2개만 취소, 두 세션이 같이 요청한 한국시리즈와 b의 키워드는 유지
+    assert prefetcher.cancel_pending("session-a") == 2
+    assert sorted(key[0] for key in prefetcher._futures) == ["AI", "한국시리즈", "할로윈"]
+    assert not any(future.cancelled() for key, future in futures.items() if key in prefetcher._futures)
+    release.set()
+    prefetcher._executor.shutdown(wait=True)
+    assert prefetcher.peek(KEYWORDS[2], "뮤직비디오") and prefetcher.peek(KEYWORDS[4], "뮤직비디오")
+    assert prefetcher.peek(KEYWORDS[0], "뮤직비디오") is None
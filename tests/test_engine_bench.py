@@ -0,0 +1,174 @@
+"""
+이미지 엔진 벤치마크 / Auto 엔진 선택 테스트
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+
+from mv_core import (AUTO_ENGINE, IMAGE_ENGINES, EngineBenchHistory, GenerationEventStore, benchmark_engines,
+                     choose_engine, engine_for_model, engine_stats, fetch_engine_image, style_family_for,
+                     summarize_bench)
+from mv_core import engine_bench
+from mv_core.generation_events import RECENT_SECONDS, RECENT_WINDOW
+
+REALISM, ANIME, THREE_D, DARK, TURBO, SEGMIND = IMAGE_ENGINES
+
+
+def fake_fetch(latencies, failing=()):
+    def fetch(engine, prompt, width, height):
+        ok = engine not in failing
+        return {"ok": ok, "http": 200 if ok else 502, "ttfb_ms": latencies[engine] / 4,
+                "total_ms": latencies[engine], "bytes": 40000 if ok else 0,
+                "width": width if ok else None, "height": height if ok else None, "error": "" if ok else "HTTP 502"}
+    return fetch
+
+
+LATENCIES = {REALISM: 3000, ANIME: 2500, THREE_D: 4000, DARK: 2000, TURBO: 800, SEGMIND: 5000}
+
+
+def test_benchmark_records_every_engine_and_prompt():
+    records = benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES, failing={DARK}))
+    assert len(records) == len(IMAGE_ENGINES) * 2
+    assert [r["engine"] for r in records[:2]] == [REALISM, REALISM]
+    summary = summarize_bench(records)
+    assert summary[TURBO]["total_p50_ms"] == 800 and summary[TURBO]["resolution"] == "512x512"
+    assert summary[DARK]["failure_rate"] == 1.0 and summary[DARK]["total_p50_ms"] is None
+
+
+def test_history_round_trip_and_age_filter(tmp_path):
+    history = EngineBenchHistory(str(tmp_path / "bench" / "engine_bench.jsonl"))
+    assert history.load() == []
+    records = benchmark_engines(engines=[TURBO], prompts=("a",), fetch=fake_fetch(LATENCIES))
+    history.append(records)
+    with open(history.path, "a", encoding="utf-8") as f:
+        f.write("{깨진 줄\n")
+    assert history.load() == records
+    assert history.load(max_age_seconds=60, now=records[0]["at"] + 3600) == []
+
+
+def test_style_families():
+    assert style_family_for("Anime/Manga") == "anime"
+    assert style_family_for("Hyperrealistic 8K") == "realism"
+    assert style_family_for("Vaporwave Aesthetic") is None
+    assert engine_for_model("Pollinations", "flux-3d") == THREE_D
+    assert engine_for_model("Segmind", "sdxl1.0") == SEGMIND
+    assert engine_for_model("Pollinations", "unknown") is None
+    assert AUTO_ENGINE not in IMAGE_ENGINES
+
+
+def test_auto_respects_style_family_and_health():
+    stats = engine_stats(benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES)))
+    # 범용 스타일은 전체 중 가장 빠른 엔진
+    assert choose_engine("Vaporwave Aesthetic", stats)[0] == TURBO
+    # 실사 계열은 Turbo가 더 빨라도 실사 엔진 중에서 (Segmind는 키가 있을 때만)
+    assert choose_engine("Photorealistic/Cinematic", stats)[0] == REALISM
+    fast_segmind = dict(stats, **{SEGMIND: dict(stats[SEGMIND], ms_per_mp=1000)})
+    assert choose_engine("Photorealistic/Cinematic", fast_segmind, segmind_available=True)[0] == SEGMIND
+    assert choose_engine("Photorealistic/Cinematic", fast_segmind)[0] == REALISM
+
+    # 계열 엔진이 비정상이면 전체 중 가장 빠른 정상 엔진
+    broken = engine_stats(benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES, failing={ANIME})))
+    engine, reason = choose_engine("Anime/Manga", broken)
+    assert engine == TURBO and "전체" in reason
+
+
+def test_live_stats_override_bench():
+    bench = benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES))
+    events = GenerationEventStore()
+    for _ in range(3):
+        events.record("Pollinations", "flux-anime", "http_error", 300, http=429)
+    events.record("Pollinations", "flux-3d", "success", 100)   # 표본 부족 → 벤치마크 유지
+    stats = engine_stats(bench, events.summary())
+    assert stats[ANIME]["source"] == "live" and stats[ANIME]["success_rate"] == 0.0
+    assert stats[THREE_D]["source"] == "bench"
+    assert choose_engine("Anime/Manga", stats)[0] == TURBO
+
+
+def test_live_rejections_mark_an_engine_unhealthy_separately():
+    bench = benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES))
+    events = GenerationEventStore()
+    events.record("Pollinations", "flux-anime", "success", 300, http=200)
+    for _ in range(2):
+        events.record("Pollinations", "flux-anime", "rejected", 300, http=200, detail="blank: std 0.0")
+    stats = engine_stats(bench, events.summary())
+    assert stats[ANIME]["success_rate"] == 1.0 and stats[ANIME]["reject_rate"] == pytest.approx(2 / 3)
+    assert stats[TURBO]["reject_rate"] == 0.0
+    assert choose_engine("Anime/Manga", stats)[0] == TURBO
+    events.record("Pollinations", "flux-anime", "success", 300, http=200)
+    events.record("Pollinations", "flux-anime", "success", 300, http=200)
+    assert choose_engine("Anime/Manga", engine_stats(bench, events.summary()))[0] == ANIME
+
+
+def test_bench_and_live_latency_are_compared_per_megapixel():
+    bench = benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES))
+    assert engine_stats(bench)[TURBO]["ms_per_mp"] == pytest.approx(800 / (512 * 512 / 1e6))
+    events = GenerationEventStore()
+    # 원본 1024x576 (0.59MP)에서 1.5초 = 벤치마크 512x512 0.8초보다 메가픽셀당 빠름
+    for _ in range(3):
+        events.record("Pollinations", "flux-anime", "success", 1500, http=200, megapixels=1024 * 576 / 1e6)
+    stats = engine_stats(bench, events.summary())
+    assert stats[ANIME]["source"] == "live" and stats[ANIME]["ms_per_mp"] < stats[TURBO]["ms_per_mp"]
+    assert choose_engine("Vaporwave Aesthetic", stats)[0] == ANIME
+
+
+def test_live_stats_use_only_the_recent_window():
+    bench = benchmark_engines(prompts=("a", "b"), fetch=fake_fetch(LATENCIES))
+    events = GenerationEventStore()
+    for _ in range(RECENT_WINDOW):
+        events.record("Pollinations", "flux-anime", "success", 500, http=200, megapixels=0.5)
+    for _ in range(RECENT_WINDOW):
+        events.record("Pollinations", "flux-anime", "success", 5000, http=200, megapixels=0.5)
+    row = events.summary()[0]
+    assert row["mean_ms"] == 2750 and row["recent_ms_per_mp"] == 10000   # 누적 평균이 아니라 최근 창
+    # 최근 창이 모두 오래되면 벤치마크로 돌아감
+    stale = engine_stats(bench, events.summary(now=time.time() + RECENT_SECONDS + 1))
+    assert stale[ANIME]["source"] == "bench"
+
+
+def _png(width, height):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="PNG", compress_level=0)
+    return buffer.getvalue()
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = _png(64, 48) if "flux-realism" in self.path else b"x"
+        self.send_response(200 if "turbo" not in self.path else 503)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_pollinations(monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("PIL")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/prompt/"
+    build = engine_bench.build_pollinations_url
+    monkeypatch.setattr(engine_bench, "build_pollinations_url",
+                        lambda *args, **kwargs: build(*args, base_url=base_url, **kwargs))
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_engine_image_measures_http(local_pollinations):
+    ok = fetch_engine_image(REALISM, "밤", 64, 48, timeout=10)
+    assert ok["ok"] and (ok["width"], ok["height"]) == (64, 48)
+    assert 0 < ok["ttfb_ms"] <= ok["total_ms"] and ok["bytes"] > 1000
+    assert fetch_engine_image(ANIME, "밤", 64, 48, timeout=10)["error"] == "too small"
+    assert fetch_engine_image(TURBO, "밤", 64, 48, timeout=10)["error"] == "HTTP 503"
+    assert fetch_engine_image(SEGMIND, "밤", 64, 48)["error"] == "no key"
@@ -0,0 +1,63 @@
+"""
+내보내기 / 프로젝트 리스트 / 프리뷰 이미지 일괄 생성 코어 테스트 (Streamlit 없이)
+"""
+import json
+from pathlib import Path
+
+from mv_core import (CompiledPlan, add_project_to_list, create_html_export, create_json_export, create_text_export,
+                     delete_project_from_list, export_project_json, generate_preview_images, get_preview_size)
+from mv_core import images
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_plan(name="plan_neon_seoul.json"):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def test_html_export_includes_turntable():
+    plan = load_plan()
+    html = create_html_export(plan)
+    assert "Turntable Reference Sheets" in html
+    assert plan['turntable']['characters'][0]['name'] in html
+    assert html.rstrip().endswith("</html>")
+
+
+def test_text_and_json_exports():
+    plan = load_plan("plan_pixel_rain.json")
+    assert json.loads(create_json_export(plan)) == plan
+    text = create_text_export(plan)
+    assert plan['project_title'] in text
+    saved = json.loads(export_project_json(plan, topic="비", settings={"scene_count": 6}))
+    assert saved["plan_data"] == plan and saved["topic"] == "비"
+
+
+def test_project_list_updates_by_title_and_caps_size():
+    projects = [{"plan_data": {"project_title": f"p{i}"}} for i in range(3)]
+    updated = add_project_to_list({"plan_data": {"project_title": "p1"}, "v": 2}, projects)
+    assert len(updated) == 3 and updated[1]["v"] == 2
+    updated = add_project_to_list({"plan_data": {"project_title": "new"}}, updated, max_projects=3)
+    assert [p["plan_data"]["project_title"] for p in updated] == ["new", "p0", "p1"]
+    assert len(delete_project_from_list(0, updated)) == 2
+    assert len(delete_project_from_list(9, updated)) == 2
+
+
+def test_preview_images_use_callbacks(monkeypatch):
+    plan = load_plan()
+    calls = []
+
+    def fake_generate(prompt, width, height, provider, max_retries=3, **callbacks):
+        calls.append((prompt, width, height))
+        return (f"img{len(calls)}", provider) if len(calls) != 2 else (None, None)
+
+    monkeypatch.setattr(images, "generate_image_with_fallback", fake_generate)
+    compiled = CompiledPlan(plan)
+    stored, steps = {}, []
+    count = generate_preview_images(plan, 1024, 576, "Pollinations Flux", compiled=compiled, pause=0,
+                                    on_image=lambda num, img, provider: stored.setdefault(num, img),
+                                    progress=lambda done, total, message="": steps.append(done))
+    scenes = plan['scenes']
+    assert count == len(scenes) - 1 and len(stored) == count
+    assert calls[0] == (compiled.scene_prompt(0, True), *get_preview_size(1024, 576))
+    assert steps[-1] == len(scenes)
+    assert generate_preview_images({}, 1024, 576, "Pollinations Flux", pause=0) == 0
@@ -0,0 +1,69 @@
+"""
+설정 가능한 서비스 주소 + 로컬 대역 서버 테스트
+"""
+import pytest
+
+from benchmarks.fake_services import FakeServices, fake_response_text
+from mv_core import (TrendFeed, build_pollinations_url, generate_image_with_fallback, get_viral_topic_with_ai,
+                     load_project_list_from_jsonbin, pollinations_base_url, save_project_list_to_jsonbin,
+                     segmind_url)
+
+
+@pytest.fixture
+def services(monkeypatch):
+    services = FakeServices(seed=1)
+    for key, value in services.env().items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setattr("mv_core.images.traced_sleep", lambda *args, **kwargs: None)
+    yield services
+    services.shutdown()
+
+
+def test_endpoint_defaults_and_env_override(monkeypatch):
+    monkeypatch.delenv("MV_POLLINATIONS_BASE_URL", raising=False)
+    assert build_pollinations_url("a cat", 64, 64, "flux", 1).startswith("https://image.pollinations.ai/prompt/")
+    monkeypatch.setenv("MV_POLLINATIONS_BASE_URL", "http://127.0.0.1:9/prompt/")
+    monkeypatch.setenv("MV_SEGMIND_URL", "http://127.0.0.1:9/v1/sdxl1.0-txt2img")
+    assert pollinations_base_url() == "http://127.0.0.1:9/prompt/"
+    assert build_pollinations_url("a cat", 64, 64, "flux", 1).startswith("http://127.0.0.1:9/prompt/a%20cat?")
+    assert segmind_url() == "http://127.0.0.1:9/v1/sdxl1.0-txt2img"
+
+
+def test_fake_gemini_plan_matches_requested_scene_count():
+    text = fake_response_text("...\nGenerate exactly 9 scenes.\n...")
+    assert text.startswith("```json") and text.count('"scene_num"') == 9
+
+
+def test_jsonbin_round_trip(services):
+    ok, error = save_project_list_to_jsonbin([{"plan_data": {"project_title": "네온 서울"}}], "bin1", "key")
+    assert ok and error is None
+    projects, error = load_project_list_from_jsonbin("bin1", "key")
+    assert error is None and projects[0]["plan_data"]["project_title"] == "네온 서울"
+    assert load_project_list_from_jsonbin("bin1", "")[1] == "불러오기 실패: 401"
+
+
+def test_trend_feed_and_images_use_configured_urls(services):
+    assert TrendFeed(ttl=60).get("KR")
+    img, provider = generate_image_with_fallback("neon alley", 320, 192, "Pollinations Turbo ⚡", max_retries=1)
+    assert img.size == (320, 192) and provider == "Pollinations turbo"
+    img, provider = generate_image_with_fallback("neon alley", 256, 256, "Segmind (SDXL)", segmind_key="key")
+    assert img.size == (256, 256) and provider == "Segmind (SDXL 1.0)"
+    stats = services.snapshot()
+    assert stats["trends"]["requests"] == 1 and stats["pollinations"]["requests"] == 1
+    assert stats["segmind"]["requests"] == 1
+
+
+def test_rate_limit_injection_is_retried_then_counted(services):
+    services.set_faults("pollinations", rate_limit_rate=1.0)
+    events = []
+    img, _ = generate_image_with_fallback("neon alley", 256, 256, "Pollinations Turbo ⚡", max_retries=2,
+                                          event=lambda *args, **kwargs: events.append((args, kwargs)))
+    assert img is None
+    assert [kwargs["http"] for _, kwargs in events] == [429, 429]
+    assert services.snapshot()["pollinations"]["rate_limited"] == 2
+
+
+def test_fake_gemini_serves_viral_topic(services):
+    pytest.importorskip("google.generativeai")
+    topic = get_viral_topic_with_ai("fake", "gemini-2.0-flash")
+    assert "dancer" in topic and services.snapshot()["gemini"]["requests"] == 1
@@ -0,0 +1,79 @@
+"""
+이미지 생성 이벤트 저장소 (링 버퍼 + 공급자/모델별 카운터/히스토그램) 테스트
+"""
+import pytest
+
+from mv_core import GenerationEventStore, generate_image_with_fallback, histogram_quantile, sparkline
+
+
+def test_ring_buffer_keeps_latest_events():
+    store = GenerationEventStore(capacity=3)
+    for i in range(5):
+        store.log(f"메시지 {i}")
+    assert [e["message"] for e in store.recent()] == ["메시지 2", "메시지 3", "메시지 4"]
+    assert store.version == 5
+    store.clear_log()
+    assert store.recent() == []
+
+
+def test_counters_and_histogram_per_model():
+    store = GenerationEventStore()
+    for latency in (300, 400, 1500, 9000):
+        store.record("Pollinations", "flux", "success", latency)
+    store.record("Pollinations", "flux", "http_error", 200, attempt=2, http=429)
+    store.record("Pollinations", "turbo", "exception", 60000, detail="timeout")
+    store.record("Segmind", "sdxl1.0", "fallback", detail="no key")
+
+    rows = {(row["provider"], row["model"]): row for row in store.summary()}
+    flux = rows[("Pollinations", "flux")]
+    assert flux["requests"] == 5 and flux["success"] == 4 and flux["http_error"] == 1
+    assert flux["success_rate"] == pytest.approx(0.8)
+    assert flux["p50_ms"] == 500 and flux["p95_ms"] == 16000
+    assert sum(flux["histogram"]) == 5
+    assert rows[("Segmind", "sdxl1.0")]["fallback"] == 1 and rows[("Segmind", "sdxl1.0")]["requests"] == 0
+    assert rows[("Segmind", "sdxl1.0")]["p50_ms"] is None
+    assert rows[("Pollinations", "turbo")]["histogram"][-2:] == [1, 0]
+    assert store.recent()[-1]["outcome"] == "fallback"
+
+    with pytest.raises(ValueError):
+        store.record("Pollinations", "flux", "timeout", 1)
+
+
+def test_rejections_are_counted_apart_from_service_errors():
+    store = GenerationEventStore()
+    store.record("Pollinations", "flux", "success", 300, http=200)
+    store.record("Pollinations", "flux", "http_error", 200, http=502)
+    store.record("Pollinations", "flux", "rejected", 300, http=200, detail="blank: std 0.0")
+    store.record("Pollinations", "flux", "rejected", 300, http=200, detail="truncated")
+    row = store.summary()[0]
+    assert row["requests"] == 4 and row["rejected"] == 2 and row["http_error"] == 1
+    assert row["success_rate"] == pytest.approx(0.25)
+    # 서비스 상태는 응답 거부를 빼고, 거부율은 따로
+    assert row["recent_success_rate"] == pytest.approx(0.5) and row["recent_reject_rate"] == pytest.approx(0.5)
+    assert store.recent()[-1]["detail"] == "truncated"
+
+
+def test_histogram_helpers():
+    assert histogram_quantile([0, 0, 0], 0.5) is None
+    assert histogram_quantile([1, 0, 1], 0.5, buckets=(100, 200)) == 100
+    assert histogram_quantile([0, 0, 2], 0.95, buckets=(100, 200)) == 200
+    assert sparkline([0, 0]) == "" and len(sparkline([1, 0, 5])) == 3
+
+
+def test_fallback_without_segmind_key_is_recorded(monkeypatch):
+    pytest.importorskip("requests")
+    import requests
+
+    monkeypatch.delenv("SEGMIND_API_KEY", raising=False)
+
+    def failing_get(url, timeout):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests, "get", failing_get)
+    monkeypatch.setattr("mv_core.tracing.time.sleep", lambda seconds: None)
+    store = GenerationEventStore()
+    img, provider = generate_image_with_fallback("서울의 밤", 512, 512, "Segmind (SDXL)", max_retries=2,
+                                                 event=store.record)
+    assert img is None and provider is None
+    outcomes = [(e["provider"], e["outcome"]) for e in store.recent()]
+    assert outcomes == [("Segmind", "fallback"), ("Pollinations", "exception"), ("Pollinations", "exception")]
@@ -0,0 +1,94 @@
+"""
+헤더만 읽는 이미지 응답 검증 테스트
+"""
+import hashlib
+from io import BytesIO
+
+import pytest
+
+from mv_core import (GenerationEventStore, ImageBytes, generate_image_segmind, generate_image_with_fallback, is_truncated,
+                     read_image_header, validate_image)
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def encode(fmt, size=(320, 200), **params):
+    img = Image.new("RGB", size)
+    img.putdata([(x % 256, y % 256, (x * y) % 256) for y in range(size[1]) for x in range(size[0])])
+    buffer = BytesIO()
+    img.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("fmt, params", [
+    ("PNG", {}),
+    ("JPEG", {"quality": 90}),
+    ("JPEG", {"progressive": True}),
+    ("WEBP", {"quality": 80}),
+    ("WEBP", {"lossless": True}),
+])
+def test_header_matches_pil(fmt, params):
+    data = encode(fmt, **params)
+    assert read_image_header(data) == (fmt, 320, 200)
+    img, reason = validate_image(data)
+    assert reason is None and isinstance(img, ImageBytes)
+    assert bytes(img) == data and img.format == fmt and img.size == Image.open(BytesIO(data)).size
+
+
+def test_truncated_responses_are_rejected():
+    for fmt in ("PNG", "JPEG", "WEBP"):
+        data = encode(fmt)
+        assert not is_truncated(data, fmt)
+        assert validate_image(data[:len(data) * 2 // 3]) == (None, "truncated")
+
+
+def test_small_unknown_and_tiny_images_are_rejected():
+    assert validate_image(b"x" * 10) == (None, "too small")
+    assert validate_image(b"<html>" + b"x" * 2000) == (None, "unknown format")
+    assert validate_image(encode("PNG", (64, 48)), min_bytes=0) == (None, "tiny 64x48")
+    assert validate_image(encode("PNG", (64, 48)), min_side=1, min_bytes=0)[1] is None
+
+
+def test_placeholder_hash_from_env(monkeypatch):
+    data = encode("JPEG")
+    monkeypatch.setenv("MV_PLACEHOLDER_SHA256", " " + hashlib.sha256(data).hexdigest().upper() + ",abc")
+    assert validate_image(data) == (None, "placeholder")
+    assert validate_image(data, placeholders=frozenset())[1] is None
+
+
+def test_pollinations_passes_raw_bytes_and_retries_rejected(monkeypatch):
+    requests = pytest.importorskip("requests")
+    good = encode("JPEG", (256, 144))
+    bodies = [good[:-200], good]
+    events = []
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+
+    monkeypatch.setattr(requests, "get", lambda url, timeout: Response(bodies.pop(0)))
+    monkeypatch.setattr("mv_core.images.traced_sleep", lambda *args, **kwargs: None)
+    img, provider = generate_image_with_fallback("neon", 256, 144, "Pollinations Turbo ⚡", max_retries=2,
+                                                 event=lambda *args, **kwargs: events.append((args[2], kwargs)))
+    assert bytes(img) == good and img.size == (256, 144) and provider == "Pollinations turbo"
+    assert [outcome for outcome, _ in events] == ["rejected", "success"]
+    assert events[0][1]["http"] == 200
+    assert events[0][1]["detail"] == "truncated"
+
+
+def test_segmind_rejection_is_its_own_outcome(monkeypatch):
+    requests = pytest.importorskip("requests")
+    good = encode("PNG", (256, 144))
+
+    class Response:
+        status_code = 200
+        content = good[:-200]
+
+    monkeypatch.setattr(requests, "post", lambda url, json, headers, timeout: Response())
+    store = GenerationEventStore()
+    assert generate_image_segmind("neon", 256, 144, "key", event=store.record) is None
+    row = store.summary()[0]
+    assert row["rejected"] == 1 and row["http_error"] == 0 and row["requests"] == 1
+    assert store.recent()[-1]["detail"] == "truncated" and store.recent()[-1]["http"] == 200
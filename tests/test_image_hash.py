@@ -0,0 +1,92 @@
+"""
+지각 해시 중복 검사 / 같은 프롬프트 재사용 테스트 (합성 이미지)
+"""
+from io import BytesIO
+
+import pytest
+
+from mv_core import (ImageBytes, duplicate_groups, find_near_duplicates, find_reusable, flagged_keys,
+                     generate_preview_images, hamming, image_hash)
+
+Image = pytest.importorskip("PIL.Image")
+np = pytest.importorskip("numpy")
+
+
+def encode(pixels, fmt="PNG", **params):
+    buffer = BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, format=fmt, **params)
+    height, width = pixels.shape[:2]
+    return ImageBytes(buffer.getvalue(), fmt, width, height)
+
+
+def scene(kind, width=512, height=288):
+    """구도가 다른 합성 장면 (kind별로 밝은 영역 위치가 다름)"""
+    rows, cols = np.mgrid[0:height, 0:width]
+    y, x = rows / height, cols / width
+    if kind == "sun":
+        luma = 255 * np.exp(-((x - 0.25) ** 2 + (y - 0.3) ** 2) * 12)
+    elif kind == "stripes":
+        luma = 127 + 127 * np.sin(x * 18)
+    else:
+        luma = 255 * y
+    return np.repeat(luma[..., None], 3, axis=2)
+
+
+def test_near_duplicates_survive_noise_and_recompression():
+    base = scene("sun")
+    noisy = base + np.random.default_rng(1).normal(0, 6, base.shape)
+    images = {"scene_1": encode(base), "scene_2": encode(noisy, "JPEG", quality=70), "scene_3": encode(scene("stripes"))}
+    pairs = find_near_duplicates(images)
+    assert [(a, b) for a, b, _ in pairs] == [("scene_1", "scene_2")]
+    assert pairs[0][2] <= 6
+    assert hamming(image_hash(images["scene_1"]), image_hash(images["scene_3"])) > 16
+
+
+def test_dhash_and_distance_threshold():
+    images = {"a": encode(scene("gradient")), "b": encode(scene("gradient") * 0.9 + 10), "c": encode(scene("sun"))}
+    assert [(a, b) for a, b, _ in find_near_duplicates(images, method="dhash")] == [("a", "b")]
+    assert find_near_duplicates({"a": images["a"], "c": images["c"]}, max_distance=64)[0][2] > 6
+
+
+def test_hash_is_cached_on_the_image_and_bad_bytes_are_skipped():
+    img = encode(scene("sun"))
+    first = image_hash(img)
+    assert img._mv_hashes == {"phash": first}
+    assert image_hash(img) == first
+    assert image_hash(ImageBytes(b"not an image" * 100, "PNG", 512, 288)) is None
+    assert find_near_duplicates({"a": img, "b": ImageBytes(b"junk" * 300, "PNG", 512, 288), "c": None}) == []
+
+
+def test_groups_keep_the_first_key_and_flag_the_rest():
+    pairs = [("s3", "s4", 2), ("s1", "s3", 4), ("t1", "t2", 5)]
+    groups = duplicate_groups(pairs)
+    assert groups == [["s3", "s4", "s1"], ["t1", "t2"]]
+    assert flagged_keys(groups) == ["s4", "s1", "t2"]
+    assert duplicate_groups([]) == [] and flagged_keys([]) == []
+
+
+def test_find_reusable_needs_identical_prompt_and_size():
+    requests = {"scene_1": ("neon city", 1024, 576), "scene_2": ("neon city", 1024, 576),
+                "scene_3": ("neon city", 1024, 1024), "scene_4": ("rain", 1024, 576)}
+    images = {"scene_1": b"img"}
+    assert find_reusable("scene_2", requests, images) == "scene_1"
+    assert find_reusable("scene_3", requests, images) is None
+    assert find_reusable("scene_1", requests, images) is None
+    assert find_reusable("missing", requests, images) is None
+
+
+def test_preview_batch_reuses_identical_final_prompts(monkeypatch):
+    calls = []
+
+    def fake_generate(prompt, *args, **kwargs):
+        calls.append(prompt)
+        return ImageBytes(f"image for {prompt}".encode(), "PNG", 512, 288), "Pollinations turbo"
+
+    monkeypatch.setattr("mv_core.images.generate_image_with_fallback", fake_generate)
+    plan = {"scenes": [{"scene_num": 1, "image_prompt": "neon city"}, {"scene_num": 2, "image_prompt": "rain"},
+                       {"scene_num": 3, "image_prompt": "neon city"}]}
+    received = {}
+    count = generate_preview_images(plan, 1024, 576, "Pollinations Turbo ⚡", use_json=False, pause=0,
+                                    on_image=lambda num, img, provider: received.__setitem__(num, img))
+    assert count == 3 and calls == ["neon city", "rain"]
+    assert received[3] is received[1]
@@ -0,0 +1,86 @@
+"""
+트렌드 키워드 로컬 사전 필터 + LLM 필터 캐시 테스트
+"""
+import pytest
+
+from mv_core import (CATEGORY_PROFILES, KeywordFilter, build_filter_prompt, estimate_tokens, keyword_relevance,
+                     profile_terms, rank_keywords)
+from mv_core.keyword_filter import keyword_set_key
+
+PROFILE = CATEGORY_PROFILES["뮤직비디오"]
+TRENDS = ["손흥민", "날씨", "뉴진스 컴백", "주식", "비트코인", "로또", "아이폰 17", "이별 노래",
+          "할로윈", "가을", "단풍", "퍼포먼스", "밤", "Spike Jonze 신작", "부동산", "환율"]
+
+
+def test_relevance_prefers_profile_terms():
+    terms = profile_terms(PROFILE)
+    assert keyword_relevance("퍼포먼스", terms) == 1.0
+    assert keyword_relevance("뉴진스 컴백", terms) > 0.5
+    assert keyword_relevance("Spike Jonze 신작", terms) > 0.5
+    assert keyword_relevance("비트코인", terms) == 0.0
+    assert keyword_relevance("", terms) == 0.0
+
+
+def test_rank_keeps_top_k_in_input_order():
+    sent, dropped = rank_keywords(TRENDS, PROFILE, top_k=6)
+    assert len(sent) == 6 and len(dropped) == len(TRENDS) - 6
+    assert {"퍼포먼스", "밤", "뉴진스 컴백", "이별 노래", "Spike Jonze 신작"} <= set(sent)
+    assert sent == [kw for kw in TRENDS if kw in sent]
+    # 동점(0점)은 입력 순서대로 채움
+    assert "손흥민" in sent
+
+
+def test_rank_sends_everything_when_small():
+    assert rank_keywords(["a", "b", "a"], PROFILE, top_k=5) == (["a", "b"], [])
+
+
+def test_filter_caches_by_keyword_set_and_category():
+    calls = []
+
+    def llm_filter(keywords, channel_category):
+        calls.append(list(keywords))
+        return [{"keyword": keywords[0], "angle": "", "concept_hint": ""}]
+
+    keyword_filter = KeywordFilter(llm_filter, top_k=6)
+    first, report = keyword_filter.filter(TRENDS, "뮤직비디오", PROFILE)
+    assert len(calls[0]) == 6 and not report["cache_hit"]
+    assert report["tokens_saved"] > 0
+
+    again, report = keyword_filter.filter(TRENDS + ["밤"], "뮤직비디오", PROFILE)
+    assert again == first and report["cache_hit"] and len(calls) == 1
+    assert report["tokens_saved"] == report["full_prompt_tokens"]
+
+    keyword_filter.filter(TRENDS, "단편영화", PROFILE)
+    assert len(calls) == 2
+    assert keyword_filter.stats["cache_hits"] == 1
+    assert keyword_filter.tokens_saved() > 0
+
+
+def test_cache_key_ignores_order():
+    assert keyword_set_key(["밤", "사랑"], "뮤직비디오") == keyword_set_key(["사랑", "밤", "밤"], "뮤직비디오")
+    assert keyword_set_key(["밤"], "뮤직비디오") != keyword_set_key(["밤"], "단편영화")
+
+
+def test_failures_and_empty_results_are_not_cached():
+    results = iter([RuntimeError("quota"), [], [{"keyword": "밤"}]])
+
+    def llm_filter(keywords, channel_category):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    keyword_filter = KeywordFilter(llm_filter, top_k=6)
+    with pytest.raises(RuntimeError):
+        keyword_filter.filter(TRENDS, "뮤직비디오", PROFILE)
+    assert keyword_filter.filter(TRENDS, "뮤직비디오", PROFILE)[0] == []
+    assert keyword_filter.filter(TRENDS, "뮤직비디오", PROFILE)[0] == [{"keyword": "밤"}]
+    assert keyword_filter.filter(TRENDS, "뮤직비디오", PROFILE)[1]["cache_hit"]
+
+
+def test_prompt_lists_only_sent_keywords():
+    sent, dropped = rank_keywords(TRENDS, PROFILE, top_k=6)
+    prompt = build_filter_prompt(sent, "뮤직비디오", PROFILE)
+    assert str(sent) in prompt
+    assert not any(f"'{kw}'" in prompt for kw in dropped)
+    assert estimate_tokens(prompt) < estimate_tokens(build_filter_prompt(TRENDS, "뮤직비디오", PROFILE))
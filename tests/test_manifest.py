@@ -0,0 +1,113 @@
+"""
+일괄 생성 매니페스트 테스트 (이어서 생성 / 디스크 복원)
+"""
+import json
+import os
+
+import pytest
+
+from mv_core import ImageBytes, JobManifest, project_id, prompt_hash, run_batch
+from benchmarks.fake_services import synthetic_png
+
+REQUESTS = {
+    "scene_1": ("neon city", 512, 288),
+    "scene_2": ("rain street", 512, 288),
+    "tt_characters_char1_face": ("face sheet", 1024, 1024),
+}
+
+
+def png(seed=0):
+    return ImageBytes(synthetic_png(512, 288, seed), "PNG", 512, 288, seed=seed)
+
+
+def test_ids_are_stable_and_prompt_sensitive():
+    plan = {"project_title": "네온", "scenes": [{"scene_num": 1}]}
+    assert project_id(plan) == project_id(json.loads(json.dumps(plan))) and len(project_id(plan)) == 16
+    assert project_id(plan) != project_id({**plan, "project_title": "비"})
+    assert prompt_hash("a", 512, 288) != prompt_hash("a", 288, 512) != prompt_hash("b", 512, 288)
+
+
+def test_batch_writes_images_and_survives_a_restart(tmp_path):
+    images = {"scene_1": png(1), "scene_2": None, "tt_characters_char1_face": png(3)}
+    stored = {}
+    done = run_batch(JobManifest(tmp_path, "p1"), REQUESTS, lambda key: (images[key], "Pollinations turbo"),
+                     on_image=lambda key, img, provider: stored.__setitem__(key, img))
+    assert done == 2 and set(stored) == {"scene_1", "tt_characters_char1_face"}
+
+    reopened = JobManifest(tmp_path, "p1")   # 서버 재시작 = 새 객체가 디스크에서 읽음
+    assert reopened.counts(REQUESTS) == {"pending": 0, "done": 2, "failed": 1}
+    restored = reopened.restore(REQUESTS)
+    img, provider = restored["scene_1"]
+    assert bytes(img) == bytes(images["scene_1"]) and img.size == (512, 288) and img.seed == 1
+    assert provider == "Pollinations turbo" and "scene_2" not in restored
+    assert os.path.exists(tmp_path / "p1" / "images" / "tt_characters_char1_face.png")
+
+
+def test_resume_skips_done_items_and_retries_the_rest(tmp_path):
+    manifest = JobManifest(tmp_path, "p1")
+    calls = []
+
+    def flaky(key):
+        calls.append(key)
+        if key == "scene_2" and calls.count(key) == 1:
+            raise TimeoutError("read timeout")
+        return png(len(calls)), "Segmind (SDXL 1.0)"
+
+    assert run_batch(manifest, REQUESTS, flaky) == 2
+    assert manifest.items["scene_2"]["status"] == "failed" and "timeout" in manifest.items["scene_2"]["error"]
+    assert run_batch(manifest, REQUESTS, flaky, resume=True) == 1
+    assert calls == ["scene_1", "scene_2", "tt_characters_char1_face", "scene_2"]
+    assert run_batch(manifest, REQUESTS, flaky, resume=True) == 0 and len(calls) == 4
+
+
+def test_changed_prompt_or_missing_file_is_not_done(tmp_path):
+    manifest = JobManifest(tmp_path, "p1")
+    run_batch(manifest, REQUESTS, lambda key: (png(), "Pollinations turbo"))
+    changed = {**REQUESTS, "scene_1": ("neon city at dawn", 512, 288)}
+    assert manifest.todo(changed) == ["scene_1"] and "scene_1" not in manifest.restore(changed)
+    os.remove(tmp_path / "p1" / manifest.items["scene_2"]["path"])
+    assert manifest.todo(REQUESTS) == ["scene_2"]
+
+
+def test_interrupted_batch_leaves_pending_items(tmp_path):
+    manifest = JobManifest(tmp_path, "p1")
+
+    def crash_on_second(key):
+        if key == "scene_2":
+            raise KeyboardInterrupt
+        return png(), "Pollinations turbo"
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(manifest, REQUESTS, crash_on_second)
+    reopened = JobManifest(tmp_path, "p1")
+    assert reopened.counts(REQUESTS) == {"pending": 2, "done": 1, "failed": 0}
+    assert reopened.todo(REQUESTS) == ["scene_2", "tt_characters_char1_face"]
+
+
+def test_corrupt_manifest_starts_empty(tmp_path):
+    (tmp_path / "p1").mkdir()
+    (tmp_path / "p1" / "manifest.json").write_text("{not json", encoding="utf-8")
+    manifest = JobManifest(tmp_path, "p1")
+    assert manifest.items == {} and manifest.restore() == {}
+
+
+def test_restore_by_key_uses_the_stored_settings_and_hash(tmp_path):
+    manifest = JobManifest(tmp_path, "p1")
+    manifest.update_settings(use_json_profiles=False, image_width=512, image_height=288)
+    run_batch(manifest, REQUESTS, lambda key: (png(), "Pollinations turbo"))
+
+    reopened = JobManifest(tmp_path, "p1")   # 기본 크기(1024x576)로 시작한 새 세션
+    assert reopened.settings == {"use_json_profiles": False, "image_width": 512, "image_height": 288}
+    assert set(reopened.restore()) == set(REQUESTS)
+    assert reopened.items["scene_1"]["size"] == [512, 288]
+    default_size = {key: (prompt, 1024, 576) for key, (prompt, _, _) in REQUESTS.items()}
+    assert reopened.restore(default_size) == {}
+
+
+def test_items_is_a_snapshot_taken_under_the_lock(tmp_path):
+    manifest = JobManifest(tmp_path, "p1")
+    snapshot = manifest.items
+    manifest.start(["scene_1"], REQUESTS)
+    assert snapshot == {} and manifest.items["scene_1"]["status"] == "pending"
+    snapshot["scene_2"] = {"status": "done"}
+    assert "scene_2" not in manifest.items
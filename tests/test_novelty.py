@@ -0,0 +1,82 @@
+"""
+주제 참신도 인덱스 테스트
+"""
+import itertools
+import time
+
+from mv_core import NoveltyIndex, generate_unique_topics, pick_novel, project_texts
+
+PAST_LOGLINE = "A lone astronaut dances on the moon while Earth burns behind her, neon tears floating in zero gravity"
+
+
+def test_exact_duplicate_scores_one():
+    index = NoveltyIndex()
+    index.add(PAST_LOGLINE, "로그라인")
+    score, text, source = index.nearest(PAST_LOGLINE.upper() + "!!")
+    assert score == 1.0
+    assert text == PAST_LOGLINE and source == "로그라인"
+    assert PAST_LOGLINE.lower() in index
+
+
+def test_near_duplicate_is_flagged():
+    index = NoveltyIndex()
+    index.add(PAST_LOGLINE)
+    near = "A lone astronaut dances on the moon while the Earth burns behind him, neon tears floating in zero gravity"
+    assert not index.is_novel(near)
+    assert index.nearest(near)[0] >= 0.6
+
+
+def test_unrelated_text_is_novel():
+    index = NoveltyIndex()
+    index.add(PAST_LOGLINE)
+    index.add("비 오는 서울 골목에서 혼자 춤추는 소녀")
+    assert index.nearest("사막 한가운데 버려진 놀이공원의 로봇 광대") == (0.0, None, None)
+    assert index.is_novel("A samurai cat guarding a ramen shop in a cyberpunk harbor")
+
+
+def test_add_is_idempotent():
+    index = NoveltyIndex()
+    assert index.add("Neon Seoul", "주제")
+    assert not index.add("  neon   seoul. ", "주제")
+    assert not index.add("", "빈 문자열")
+    assert len(index) == 1
+
+
+def test_project_texts_collects_topic_title_logline():
+    project = {
+        "topic": "네온 서울의 밤",
+        "plan_data": {"project_title": "네온 서울", "project_title_en": "Neon Seoul",
+                      "logline": "빗속의 도시를 달리는 소녀", "logline_en": "", "scenes": []},
+    }
+    texts = [text for text, _ in project_texts(project)]
+    assert texts == ["네온 서울의 밤", "네온 서울", "Neon Seoul", "빗속의 도시를 달리는 소녀"]
+    assert project_texts({"topic": "", "plan_data": None}) == []
+
+
+def test_pick_novel_rerolls_past_duplicates():
+    index = NoveltyIndex()
+    index.add(PAST_LOGLINE)
+    candidates = iter([PAST_LOGLINE, PAST_LOGLINE + ".", "A samurai cat guarding a ramen shop"])
+    candidate, score, attempts = pick_novel(lambda: next(candidates), index)
+    assert candidate == "A samurai cat guarding a ramen shop"
+    assert attempts == 3 and score < index.threshold
+
+
+def test_pick_novel_returns_least_similar_when_exhausted():
+    index = NoveltyIndex()
+    index.add(PAST_LOGLINE)
+    near = PAST_LOGLINE.replace("her", "him")
+    candidates = itertools.cycle([PAST_LOGLINE, near])
+    candidate, score, attempts = pick_novel(lambda: next(candidates), index, max_tries=4)
+    assert attempts == 4
+    assert candidate == near and score < 1.0
+
+
+def test_query_is_sub_millisecond():
+    index = NoveltyIndex()
+    index.add_many((topic, "주제") for topic in generate_unique_topics(2000, seed=11))
+    queries = generate_unique_topics(200, seed=12)
+    start = time.perf_counter()
+    for query in queries:
+        index.nearest(query)
+    assert (time.perf_counter() - start) / len(queries) < 1e-3
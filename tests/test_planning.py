@@ -0,0 +1,61 @@
+"""
+기획안 생성 코어 테스트 (Streamlit 없이)
+LLM 호출은 mv_core.planning.generate_with_fallback 대역으로 교체
+"""
+import json
+
+import pytest
+
+from mv_core import PlanGenerationError, clean_json_text, generate_plan, get_system_prompt
+from mv_core import planning
+
+OPTIONS = {"use_emotional": True, "use_climax": True, "use_trial": False, "use_symbolic": False, "use_twist": False}
+PLAN_ARGS = ("서울의 밤", "key", "gemini-2.0-flash", 4, OPTIONS, "K-POP", "Photorealistic/Cinematic", "K-POP",
+             True, True, 5)
+
+
+def test_clean_json_text_strips_fences_comments_and_trailing_commas():
+    text = '설명입니다\n```json\n{\n  "a": 1, // 주석\n  "b": [1, 2,],\n  /* 여러 줄\n  주석 */\n  "c": {"d": "x",},\n}\n```\n끝'
+    assert json.loads(clean_json_text(text)) == {"a": 1, "b": [1, 2], "c": {"d": "x"}}
+
+
+def test_clean_json_text_escapes_control_chars_in_strings():
+    text = '결과: {"title": "첫 줄\n둘째 줄\t탭"} 이상'
+    assert json.loads(clean_json_text(text)) == {"title": "첫 줄\n둘째 줄\t탭"}
+    assert clean_json_text("") == ""
+
+
+def test_system_prompt_reflects_options():
+    prompt = get_system_prompt("서울의 밤", 4, OPTIONS, "K-POP", "Photorealistic/Cinematic", "K-POP", True, True, 5)
+    assert "서울의 밤" in prompt and "Generate exactly 4 scenes." in prompt
+    assert "EXPERT MODE" in prompt and "PHOTOREALISTIC REQUIREMENTS" in prompt
+    assert "emotional arc with clear beats" in prompt
+    plain = get_system_prompt("서울의 밤", 4, {}, "K-POP", "Pastel Dreamy", "K-POP", False, False, 5)
+    assert "EXPERT MODE" not in plain and "PHOTOREALISTIC REQUIREMENTS" not in plain
+
+
+def test_generate_plan_retries_bad_json(monkeypatch):
+    responses = iter(["JSON 아님", '```json\n{"project_title": "밤",}\n```'])
+    monkeypatch.setattr(planning, "generate_with_fallback", lambda *a, **k: (next(responses), "gemini-2.0-flash"))
+    notes = []
+    plan = generate_plan(*PLAN_ARGS, notify=lambda message, level="info": notes.append(level), retry_delay=0)
+    assert plan == {"project_title": "밤"}
+    assert notes == ["warn", "success"]
+
+
+def test_generate_plan_raises_with_raw_text(monkeypatch):
+    monkeypatch.setattr(planning, "generate_with_fallback", lambda *a, **k: ("{깨진 JSON", "gemini-2.0-flash"))
+    with pytest.raises(PlanGenerationError) as excinfo:
+        generate_plan(*PLAN_ARGS, retry_delay=0)
+    assert "JSON 파싱 실패" in str(excinfo.value)
+    assert excinfo.value.raw_text == "{깨진 JSON"
+
+
+def test_generate_plan_wraps_call_failures(monkeypatch):
+    def failing(*args, **kwargs):
+        raise RuntimeError("All models failed")
+
+    monkeypatch.setattr(planning, "generate_with_fallback", failing)
+    with pytest.raises(PlanGenerationError) as excinfo:
+        generate_plan(*PLAN_ARGS, retry_delay=0)
+    assert "All models failed" in str(excinfo.value) and excinfo.value.raw_text is None
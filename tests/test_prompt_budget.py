@@ -0,0 +1,134 @@
+"""
+공급자별 프롬프트 예산 테스트
+실제 플랜 픽스처 + URL 길이 제한을 강제하는 로컬 Pollinations 대역 서버
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from mv_core import (
+    CompiledPlan,
+    budget_prompt,
+    build_pollinations_url,
+    enhance_prompt_for_provider,
+    pollinations_model_for,
+)
+from mv_core.prompt_budget import dedupe_phrases, measure_prompt, split_phrases
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PLAN_FILES = ["plan_neon_seoul.json", "plan_pixel_rain.json"]
+PROVIDER = "Pollinations Flux-Realism (실사 특화)"
+
+# 일반적인 프록시/서버의 요청 라인 한도
+MAX_REQUEST_PATH = 4096
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)
+
+
+class _LimitHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if len(self.path) > MAX_REQUEST_PATH:
+            self.send_response(414)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(PNG_1X1)))
+        self.end_headers()
+        self.wfile.write(PNG_1X1)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stand_in_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LimitHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/prompt/"
+    server.shutdown()
+    server.server_close()
+
+
+def load_plan_prompts():
+    prompts = []
+    for name in PLAN_FILES:
+        plan = json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+        compiled = CompiledPlan(plan)
+        prompts.extend(compiled.scene_prompts())
+        prompts.extend(compiled.turntable_prompts().values())
+    return prompts
+
+
+def request_status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def failure_rate(prompts, base_url, use_budget):
+    failures = 0
+    for i, prompt in enumerate(prompts):
+        enhanced = enhance_prompt_for_provider(prompt, PROVIDER)
+        if use_budget:
+            enhanced, _ = budget_prompt(enhanced, PROVIDER)
+        url = build_pollinations_url(enhanced, 1024, 576, pollinations_model_for(PROVIDER), i, base_url=base_url)
+        if request_status(url) != 200:
+            failures += 1
+    return failures / len(prompts)
+
+
+def test_failure_rate_drops_with_budget(stand_in_url):
+    prompts = load_plan_prompts()
+    before = failure_rate(prompts, stand_in_url, use_budget=False)
+    after = failure_rate(prompts, stand_in_url, use_budget=True)
+    assert before > 0
+    assert after == 0
+
+
+def test_short_prompt_untouched():
+    prompt = "a cat on a roof, night, neon"
+    assert budget_prompt(prompt, PROVIDER) == (prompt, [])
+
+
+def test_budgeted_prompts_fit_limits():
+    for prompt in load_plan_prompts():
+        for provider, measure, limit in [(PROVIDER, "url", 3500), ("Segmind (Flux)", "chars", 2000)]:
+            text, _ = budget_prompt(enhance_prompt_for_provider(prompt, provider), provider)
+            assert measure_prompt(text, measure) <= limit
+
+
+def test_scene_action_survives_budget():
+    plan = json.loads((FIXTURES / "plan_neon_seoul.json").read_text(encoding="utf-8"))
+    compiled = CompiledPlan(plan)
+    for idx, scene in enumerate(compiled.scenes):
+        action = scene["image_prompt"].rsplit(", ", 1)[-1]
+        text, _ = budget_prompt(enhance_prompt_for_provider(compiled.scene_prompt(idx), PROVIDER), PROVIDER)
+        assert action in text
+
+
+def test_low_priority_fields_dropped_first():
+    plan = json.loads((FIXTURES / "plan_neon_seoul.json").read_text(encoding="utf-8"))
+    prompt = CompiledPlan(plan).scene_prompt(1)
+    full_length = measure_prompt(prompt, "url")
+    text, cuts = budget_prompt(prompt, PROVIDER, max_length=full_length - 200)
+    assert cuts
+    assert "HAIR[" in text
+    assert "WEATHER" not in text
+
+
+def test_dedupe_ignores_section_prefix():
+    phrases = split_phrases("photorealistic, 8k, **SCENE ACTION:** photorealistic, running")
+    deduped, removed = dedupe_phrases(phrases)
+    assert removed == 1
+    assert deduped[-1] == "running"
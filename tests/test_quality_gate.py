@@ -0,0 +1,154 @@
+"""
+이미지 품질 게이트 테스트 (합성 이미지)
+"""
+from io import BytesIO
+
+import pytest
+
+from mv_core import (CompiledPlan, GenerationEventStore, QualityGate, generate_image_with_fallback, hex_to_rgb,
+                     profile_palette)
+
+Image = pytest.importorskip("PIL.Image")
+np = pytest.importorskip("numpy")
+
+NEON_PALETTE = ["#0B0F2B", "#FF2E88", "#00E5FF"]
+
+
+def encode(pixels, fmt="PNG"):
+    buffer = BytesIO()
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def neon_frame(width=512, height=288, seed=0):
+    """팔레트 색(남색 배경 + 분홍/청록 네온) + 노이즈"""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((height, width, 3))
+    frame[:] = (11, 15, 43)
+    frame[:, : width // 3] = (255, 46, 136)
+    frame[height // 2:, width // 2:] = (0, 229, 255)
+    return np.clip(frame + rng.normal(0, 25, frame.shape), 0, 255)
+
+
+def blank_frame(width=512, height=288):
+    """거의 단색 (압축돼도 최소 바이트 검사는 통과하도록 약한 노이즈)"""
+    return np.full((height, width, 3), 12) + np.random.default_rng(0).integers(0, 3, (height, width, 3))
+
+
+def green_frame(width=512, height=288):
+    """팔레트와 무관한 초록 그라데이션"""
+    ramp = np.linspace(120, 240, width)
+    frame = np.zeros((height, width, 3))
+    frame[..., 1] = ramp
+    frame[..., 0] = ramp / 4
+    return frame
+
+
+def test_palette_helpers():
+    assert hex_to_rgb("#FF2E88") == (255, 46, 136) and hex_to_rgb("0f0") == (0, 255, 0)
+    assert hex_to_rgb("neon pink") is None
+    assert profile_palette({"color_palette": {"accent": "#00E5FF", "dominant": "#0B0F2B"}}) == ["#0B0F2B", "#00E5FF"]
+    assert profile_palette({"color_palette": "pink"}) == [] and profile_palette(None) == []
+
+
+def test_plan_palettes_follow_used_locations():
+    plan = {
+        "turntable": {"locations": [{"id": "loc1", "json_profile": {"color_palette": {"dominant": "#0B0F2B"}},
+                                     "views": [{"view_type": "wide"}]}],
+                      "characters": [{"id": "char1", "views": [{"view_type": "face"}]}]},
+        "scenes": [{"used_turntables": ["char1", "loc1"]}, {"used_turntables": ["char1"]}, {}],
+    }
+    compiled = CompiledPlan(plan)
+    assert [compiled.scene_palette(i) for i in range(3)] == [["#0B0F2B"], [], []]
+    assert compiled.turntable_palette("locations_loc1_wide") == ["#0B0F2B"]
+    assert compiled.turntable_palette("characters_char1_face") == []
+
+
+@pytest.mark.parametrize("fmt", ["PNG", "JPEG", "WEBP"])
+def test_good_frame_passes(fmt):
+    reason, metrics = QualityGate().check(encode(neon_frame(), fmt), 512, 288, NEON_PALETTE)
+    assert reason is None
+    assert metrics["luma_std"] > 6 and metrics["entropy"] > 2.5 and metrics["palette_share"] > 0.5
+
+
+def test_wrong_aspect_is_rejected_without_decoding():
+    reason, metrics = QualityGate().check(encode(neon_frame(300, 300)), 512, 288)
+    assert reason == "aspect 1.00≠1.78" and set(metrics) == {"aspect", "ms"}
+    assert QualityGate().check(encode(neon_frame(300, 300)))[0] is None   # 요청 크기가 없으면 비율 검사 생략
+
+
+def test_blank_and_low_entropy_frames_are_rejected():
+    gate = QualityGate()
+    assert gate.check(encode(blank_frame()), 512, 288)[0].startswith("blank (std")
+    # 흑백 두 칸: 표준편차는 크지만 휘도 히스토그램은 1비트
+    split = np.zeros((288, 512, 3))
+    split[:, 256:] = 255
+    reason, metrics = gate.check(encode(split), 512, 288)
+    assert reason == "low entropy (1.0 bits)" and metrics["luma_std"] > 100
+
+
+def test_off_palette_is_a_soft_rejection():
+    gate = QualityGate()
+    reason, metrics = gate.check(encode(green_frame()), 512, 288, NEON_PALETTE)
+    assert reason.startswith("off-palette") and metrics["palette_share"] < 0.03
+    assert gate.is_soft(reason) and not gate.is_soft("blank (std 1.0)")
+    assert gate.check(encode(green_frame()), 512, 288)[0] is None         # 팔레트가 없으면 생략
+    assert gate.check(encode(green_frame()), 512, 288, ["not a color"])[0] is None
+
+
+def test_undecodable_body_and_stats():
+    gate = QualityGate()
+    data = encode(neon_frame())
+    assert gate.check(data[:400] + b"\x00" * 4000, 512, 288)[0] == "undecodable"
+    gate.check(data, 512, 288)
+    stats = gate.stats()
+    assert stats["checked"] == 2 and stats["rejected"] == 1 and stats["reasons"] == {"undecodable": 1}
+    assert stats["mean_ms"] > 0
+
+
+@pytest.fixture
+def pollinations(monkeypatch):
+    """요청 URL의 시드를 기록하고 준비된 응답을 차례로 돌려주는 가짜 requests.get"""
+    requests = pytest.importorskip("requests")
+    bodies, seeds = [], []
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+
+    def fake_get(url, timeout):
+        seeds.append(int(url.split("seed=")[1].split("&")[0]))
+        return Response(bodies.pop(0))
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr("mv_core.images.traced_sleep", lambda *args, **kwargs: None)
+    return bodies, seeds
+
+
+def test_rejected_frame_is_retried_with_a_new_seed(pollinations):
+    bodies, seeds = pollinations
+    bodies += [encode(blank_frame()), encode(neon_frame(), "JPEG")]
+    events = []
+    img, provider = generate_image_with_fallback("neon", 512, 288, "Pollinations Turbo ⚡", max_retries=3, seed=42,
+                                                 quality=QualityGate(), palette=NEON_PALETTE,
+                                                 event=lambda *args, **kwargs: events.append(kwargs.get("detail")))
+    assert img is not None and provider == "Pollinations turbo"
+    assert seeds[0] == 42 and seeds[1] != 42
+    assert img.seed == seeds[1]               # 반환 이미지의 seed는 실제로 그 이미지를 만든 시드
+    assert events[0].startswith("quality: blank")
+
+
+def test_hard_rejections_exhaust_budget_but_soft_ones_fall_back(pollinations):
+    bodies, seeds = pollinations
+    bodies += [encode(blank_frame())] * 2
+    store = GenerationEventStore()
+    assert generate_image_with_fallback("neon", 512, 288, "Pollinations Turbo ⚡", max_retries=2,
+                                        quality=QualityGate(), event=store.record) == (None, None)
+    row = store.summary()[0]
+    assert row["rejected"] == 2 and row["http_error"] == 0 and row["recent_reject_rate"] == 1.0
+    bodies += [encode(green_frame())] * 2
+    img, _ = generate_image_with_fallback("neon", 512, 288, "Pollinations Turbo ⚡", max_retries=2,
+                                          quality=QualityGate(), palette=NEON_PALETTE)
+    assert img is not None and img.seed == seeds[-1]
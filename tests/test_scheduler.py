@@ -0,0 +1,180 @@
+"""
+이미지 생성 우선순위 스케줄러 테스트
+"""
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from mv_core import (GenerationScheduler, ImageBytes, JobManifest, Tracer, image_generation_steps, submit_batch,
+                     use_tracer)
+from benchmarks.fake_services import FakeServices, synthetic_png
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("시간 초과")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = GenerationScheduler(max_workers=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def blocked(scheduler):
+    """작업자 1개를 막아 두는 작업 → 풀어 줄 Event"""
+    release, started = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit(block, priority="backfill")
+    started.wait(5)
+    return release
+
+
+def test_higher_priority_runs_first_at_the_next_request_boundary(scheduler):
+    release = blocked(scheduler)
+    order = []
+    futures = [scheduler.submit(order.append, name, priority=priority)
+               for name, priority in [("prefetch", "prefetch"), ("backfill-1", "backfill"), ("preview", "preview"),
+                                      ("backfill-2", "backfill"), ("click", "interactive"), ("visible", "on_screen")]]
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["click", "visible", "preview", "backfill-1", "backfill-2", "prefetch"]
+
+
+def test_promote_and_cancel_queued_jobs(scheduler):
+    release = blocked(scheduler)
+    order = []
+    first = scheduler.submit(order.append, "scene_1", priority="backfill", group="batch")
+    second = scheduler.submit(order.append, "scene_2", priority="backfill", group="batch")
+    third = scheduler.submit(order.append, "scene_3", priority="backfill", group="other")
+    assert scheduler.promote([second], "on_screen") == 1
+    assert scheduler.promote([second], "backfill") == 0          # 내리지는 않음
+    assert scheduler.cancel(group="other") == 1 and third.cancelled()
+    assert scheduler.stats()["backfill"]["queued"] == 1 and scheduler.stats()["on_screen"]["queued"] == 1
+    release.set()
+    first.result(timeout=5)
+    assert order == ["scene_2", "scene_1"]
+
+
+def test_exceptions_reach_the_future_and_stats_record_waits(scheduler):
+    with pytest.raises(ValueError, match="boom"):
+        scheduler.submit(lambda: (_ for _ in ()).throw(ValueError("boom")), priority="interactive").result(timeout=5)
+    scheduler.submit(lambda: None, priority="preview").result(timeout=5)
+    wait_until(lambda: scheduler.stats()["preview"]["completed"] == 1)
+    stats = scheduler.stats()
+    assert stats["interactive"]["wait_p50_ms"] is not None and stats["prefetch"]["wait_p50_ms"] is None
+    with pytest.raises(ValueError, match="알 수 없는 우선순위"):
+        scheduler.submit(lambda: None, priority="urgent")
+
+
+def test_pool_is_bounded_and_spans_follow_the_submitter():
+    scheduler = GenerationScheduler(max_workers=2)
+    tracer = Tracer()
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    with use_tracer(tracer):
+        futures = [scheduler.submit(job) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    scheduler.shutdown()
+    assert peak[0] == 2
+    spans = [s for s in tracer.spans() if s["name"] == "scheduler.job"]
+    assert len(spans) == 6 and all(s["attrs"]["priority"] == "backfill" for s in spans)
+
+
+def test_submit_batch_records_each_item_in_the_manifest(tmp_path, scheduler):
+    manifest = JobManifest(tmp_path, "p1")
+    requests = {"scene_1": ("neon", 512, 288), "scene_2": ("rain", 512, 288)}
+
+    def generate(key):
+        if key == "scene_2":
+            return None, None
+        return ImageBytes(synthetic_png(512, 288), "PNG", 512, 288), "Pollinations turbo"
+
+    futures = submit_batch(manifest, requests, generate, scheduler, priority_of=lambda key: "on_screen")
+    assert futures["scene_1"].result(timeout=5)[1] == "Pollinations turbo"
+    futures["scene_2"].result(timeout=5)
+    assert manifest.counts(requests) == {"pending": 0, "done": 1, "failed": 1}
+    assert list(submit_batch(manifest, requests, generate, scheduler, resume=True)) == ["scene_2"]
+
+
+def failing_attempts(attempts, latency, pause, log):
+    """재시도가 긴 실패 요청 흉내 (단계 작업: 시도 사이마다 yield)"""
+    for attempt in range(attempts):
+        log.append(attempt)
+        time.sleep(latency)
+        if attempt < attempts - 1:
+            yield pause
+    return None, None
+
+
+def test_retrying_backfill_jobs_release_workers_between_attempts():
+    scheduler = GenerationScheduler(max_workers=2)
+    attempts = [[], []]
+    backfill = [scheduler.submit(failing_attempts, 999, 0.05, 0.02, log, priority="backfill") for log in attempts]
+    wait_until(lambda: all(len(log) >= 2 for log in attempts))   # 두 작업 모두 재시도 중
+    clicked = time.perf_counter()
+    started = []
+    click = scheduler.submit(lambda: started.append(time.perf_counter() - clicked), priority="interactive")
+    click.result(timeout=5)
+    # 작업자가 모두 재시도 중인 작업에 잡혀 있어도 다음 시도 경계(시도 1번 ≈ 50ms)에서 시작
+    assert started[0] < 0.2
+
+    def cancel_all():
+        scheduler.cancel(backfill)   # 시도 중인 작업은 그 시도가 끝나 다시 대기할 때 취소됨
+        return all(future.done() for future in backfill)
+
+    wait_until(cancel_all)
+    with pytest.raises(CancelledError):
+        backfill[0].result(timeout=5)
+    assert all(len(log) < 999 for log in attempts)
+    scheduler.shutdown()
+
+
+def test_stepped_job_returns_the_generator_value_and_follows_promotion(scheduler):
+    release = blocked(scheduler)
+    order = []
+
+    def steps(name):
+        order.append(f"{name}-1")
+        yield 0
+        order.append(f"{name}-2")
+        return name
+
+    backfill = scheduler.submit(steps, "batch", priority="backfill")
+    preview = scheduler.submit(steps, "preview", priority="preview")
+    release.set()
+    assert backfill.result(timeout=5) == "batch" and preview.result(timeout=5) == "preview"
+    # 두 번째 단계도 같은 우선순위로 다시 대기 → preview가 두 단계 모두 먼저
+    assert order == ["preview-1", "preview-2", "batch-1", "batch-2"]
+
+
+def test_image_generation_steps_yield_between_pollinations_attempts(monkeypatch):
+    services = FakeServices(seed=1)
+    for key, value in services.env().items():
+        monkeypatch.setenv(key, value)
+    services.set_faults("pollinations", error_rate=1.0)
+    try:
+        pauses = list(image_generation_steps("neon", 64, 64, "Pollinations Turbo ⚡", max_retries=3))
+    finally:
+        services.shutdown()
+    assert pauses == [1.5, 1.5] and services.snapshot()["pollinations"]["requests"] == 3
@@ -0,0 +1,158 @@
+"""
+동일 요청 합치기 (single-flight) 테스트
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mv_core import ImageBytes, SingleFlight, generate_image_with_fallback, generate_with_fallback, request_key
+
+
+def wait_until(condition, timeout=5):
+    """조건이 참이 될 때까지 대기 (작업 스레드가 예외로 끝나도 테스트가 멈추지 않도록 제한 시간)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "제한 시간 초과"
+        time.sleep(0.001)
+
+
+def blocking_call(release, calls, result="done"):
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return result
+    return call
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+    leader = threading.Thread(target=flight.do, args=("llm", "k", blocking_call(release, calls)))
+    leader.start()
+    wait_until(lambda: flight.in_flight())
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "llm", "k", blocking_call(release, calls)) for _ in range(4)]
+        wait_until(lambda: flight.stats()["llm"]["coalesced"] >= 4)
+        release.set()
+        results = [future.result() for future in futures]
+    leader.join()
+    assert calls == [1]
+    assert results == [("done", True)] * 4
+    stats = flight.stats()["llm"]
+    assert (stats["requests"], stats["executed"], stats["coalesced"]) == (5, 1, 4)
+    assert stats["coalesced_rate"] == pytest.approx(0.8)
+    assert flight.in_flight() == 0
+
+
+def test_finished_calls_are_not_cached_and_keys_are_separate():
+    flight = SingleFlight()
+    assert flight.do("image", "a", lambda: 1) == (1, False)
+    assert flight.do("image", "a", lambda: 2) == (2, False)
+    assert flight.do("llm", "a", lambda: 3) == (3, False)
+    assert flight.stats()["image"]["executed"] == 2
+    assert request_key("p", 512, 512, None) != request_key("p", 512, 512, 7)
+
+
+def test_error_propagates_to_waiters():
+    flight, release = SingleFlight(), threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("All models failed")
+
+    outcomes = []
+
+    def call():
+        try:
+            flight.do("llm", "k", failing)
+        except RuntimeError as e:
+            outcomes.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.stats().get("llm", {}).get("requests", 0) >= 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert outcomes == ["All models failed"] * 3
+    assert flight.stats()["llm"]["errors"] == 1
+
+
+def test_image_requests_coalesce_and_share_the_same_bytes(monkeypatch):
+    release, calls = threading.Event(), []
+
+    def fake_steps(prompt, width, height, provider, max_retries, segmind_key, log, event, seed, **kwargs):
+        calls.append(seed)
+        release.wait(5)
+        return ImageBytes(b"png-%d" % seed, "PNG", width, height), "Pollinations turbo"
+        yield   # 단계 제너레이터
+
+    monkeypatch.setattr("mv_core.images._fallback_steps", fake_steps)
+    flight, results = SingleFlight(), []
+
+    def request(seed):
+        results.append(generate_image_with_fallback("neon", 64, 64, "Pollinations Turbo ⚡", seed=seed, flight=flight))
+
+    # 시드 7, 8 요청이 진행 중일 때 시드 7 요청이 하나 더 → 실제 호출 2회
+    threads = [threading.Thread(target=request, args=(seed,)) for seed in (7, 8)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.in_flight("image") >= 2)
+    threads.append(threading.Thread(target=request, args=(7,)))
+    threads[-1].start()
+    wait_until(lambda: flight.stats()["image"]["coalesced"] >= 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == [7, 8]
+    assert sorted(bytes(img) for img, _ in results) == [b"png-7", b"png-7", b"png-8"]
+    assert all(provider == "Pollinations turbo" for _, provider in results)
+
+
+def test_llm_follower_is_notified(monkeypatch):
+    release, calls, notes = threading.Event(), [], []
+
+    def fake_generate(prompt, api_key, model_name, notify):
+        calls.append(prompt)
+        release.wait(5)
+        return "{}", model_name
+
+    monkeypatch.setattr("mv_core.llm._generate_with_fallback", fake_generate)
+    flight = SingleFlight()
+    leader = threading.Thread(target=generate_with_fallback, args=("plan", "key", "gemini-2.0-flash"),
+                              kwargs={"flight": flight})
+    leader.start()
+    wait_until(lambda: flight.in_flight())
+    follower = threading.Thread(target=lambda: notes.append(
+        generate_with_fallback("plan", "key", "gemini-2.0-flash", notify=lambda m, level="info": notes.append(m),
+                               flight=flight)))
+    follower.start()
+    wait_until(lambda: flight.stats()["llm"]["coalesced"] >= 1)
+    release.set()
+    leader.join()
+    follower.join()
+    assert calls == ["plan"]
+    assert notes[0].startswith("🔗") and notes[1] == ("{}", "gemini-2.0-flash")
+
+
+def test_llm_requests_with_different_api_keys_are_not_shared(monkeypatch):
+    release, calls = threading.Event(), []
+
+    def fake_generate(prompt, api_key, model_name, notify):
+        calls.append(api_key)
+        release.wait(5)
+        return "{}", model_name
+
+    monkeypatch.setattr("mv_core.llm._generate_with_fallback", fake_generate)
+    flight = SingleFlight()
+    threads = [threading.Thread(target=generate_with_fallback, args=("plan", key, "gemini-2.0-flash"),
+                                kwargs={"flight": flight}) for key in ("key-a", "key-b")]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: len(calls) == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == ["key-a", "key-b"] and flight.stats()["llm"]["coalesced"] == 0
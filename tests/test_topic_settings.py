@@ -0,0 +1,88 @@
+"""
+주제 → 자동 영상 설정 매처 회귀 테스트
+fixtures/auto_settings_regression.json: 기존 analyze_topic_for_auto_settings(부분 문자열 매칭) 출력 기록
+"""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from mv_core import TOPIC_MATCHER, TopicKeywordMatcher, analyze_topic_for_auto_settings, analyze_topics_for_auto_settings
+from mv_core.topic_settings import GENRE_KEYWORDS, MUSIC_KEYWORDS, VISUAL_KEYWORDS, _boundary_ok
+
+REGRESSION = json.loads((Path(__file__).parent / "fixtures" / "auto_settings_regression.json").read_text(encoding="utf-8"))
+TOPICS = [entry["topic"] for entry in REGRESSION["topics"]]
+SUBSTRING_MATCHER = TopicKeywordMatcher(
+    {"genre": GENRE_KEYWORDS, "visual": VISUAL_KEYWORDS, "music": MUSIC_KEYWORDS}, word_boundaries=False)
+
+
+def legacy_keywords(topic):
+    """기존 방식: 모든 키워드에 대해 부분 문자열 검사"""
+    topic_lower = topic.lower()
+    return {keyword for keyword in TOPIC_MATCHER.targets if keyword in topic_lower}
+
+
+def test_substring_mode_matches_recorded_outputs():
+    for entry in REGRESSION["topics"]:
+        assert list(analyze_topic_for_auto_settings(entry["topic"], SUBSTRING_MATCHER)) == entry["expected"], entry["topic"]
+
+
+@pytest.mark.parametrize("topic", TOPICS)
+def test_boundaries_only_remove_in_word_hits(topic):
+    """경계 규칙 모드의 차이는 전부 '단어 안에 끼어 있던' 매칭 제거에서만 나와야 함"""
+    found = TOPIC_MATCHER.find_keywords(topic)
+    legacy = legacy_keywords(topic)
+    assert found <= legacy
+    text = topic.lower()
+    for keyword in legacy - found:
+        starts = [m.start() for m in re.finditer(f"(?={re.escape(keyword)})", text)]
+        assert not any(_boundary_ok(text, s, s + len(keyword), keyword) for s in starts), keyword
+
+
+def test_recorded_outputs_mostly_unchanged():
+    changed = sum(
+        list(analyze_topic_for_auto_settings(entry["topic"])) != entry["expected"] for entry in REGRESSION["topics"])
+    assert changed < len(TOPICS) * 0.3
+
+
+@pytest.mark.parametrize("topic, keyword", [
+    ("A heartbroken artist", "art"),
+    ("self-taught hunter", "elf"),
+    ("toward the warrior's end", "war"),
+    ("cinematography", "rap"),
+    ("trapped in a cave", "trap"),
+    ("도시의 시간", "시"),
+    ("노이즈팝", "팝"),
+])
+def test_in_word_hits_rejected(topic, keyword):
+    assert keyword not in TOPIC_MATCHER.find_keywords(topic)
+
+
+@pytest.mark.parametrize("topic, keyword", [
+    ("street dancer", "dance"),
+    ("dreamy float", "dream"),
+    ("post-rock", "rock"),
+    ("r&b night", "r&b"),
+    ("shot in 8k", "8k"),
+    ("시를 쓰는 소녀", "시"),
+    ("꿈, 그리고 춤", "춤"),
+    ("첫사랑", "사랑"),
+    ("우주공포", "우주"),
+])
+def test_words_and_inflections_matched(topic, keyword):
+    assert keyword in TOPIC_MATCHER.find_keywords(topic)
+
+
+def test_overlapping_keywords_all_counted():
+    assert {"우주", "우주공포"} <= TOPIC_MATCHER.find_keywords("우주공포")
+    assert {"dream pop", "pop"} <= TOPIC_MATCHER.find_keywords("dream pop")
+
+
+def test_genre_defaults_applied():
+    assert analyze_topic_for_auto_settings("사이버펑크 해커") == (6, 7, 15)
+    assert analyze_topic_for_auto_settings("") == (0, 0, 0)
+
+
+def test_batch_matches_single():
+    assert analyze_topics_for_auto_settings(TOPICS) == [analyze_topic_for_auto_settings(t) for t in TOPICS]
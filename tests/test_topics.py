@@ -0,0 +1,66 @@
+"""
+중복 없는 대량 주제 생성 테스트
+"""
+import itertools
+from collections import Counter
+
+from mv_core import TRENDING_KEYWORDS, generate_unique_topics, iter_unique_topics, topic_space_size
+from mv_core.topics import TEMPLATE_FIELDS, template_fields
+
+
+def test_topics_are_unique():
+    topics = generate_unique_topics(5000, seed=7)
+    assert len(topics) == len(set(topics)) == 5000
+
+
+def test_seed_is_reproducible():
+    assert generate_unique_topics(50, seed=42) == generate_unique_topics(50, seed=42)
+    assert generate_unique_topics(50, seed=42) != generate_unique_topics(50, seed=43)
+
+
+def test_stream_is_lazy():
+    stream = iter_unique_topics(seed=1)
+    first = list(itertools.islice(stream, 3))
+    assert len(first) == 3
+    assert next(stream) not in first
+
+
+def test_balanced_uses_every_keyword_before_reuse():
+    keywords = {category: values[:4] for category, values in TRENDING_KEYWORDS.items()}
+    templates = ["{emotion} in {setting}"]
+    topics = generate_unique_topics(4, seed=3, keywords=keywords, templates=templates)
+    emotions = [topic.split(" in ")[0] for topic in topics]
+    settings = [topic.split(" in ")[1] for topic in topics]
+    assert sorted(emotions) == sorted(keywords["emotions"])
+    assert sorted(settings) == sorted(keywords["settings"])
+
+
+def test_balanced_coverage_is_even():
+    topics = generate_unique_topics(2400, seed=5)
+    # 모든 템플릿에 character가 들어가므로 2400번 = 캐릭터 30개 × 80번
+    counts = Counter(c for topic in topics for c in TRENDING_KEYWORDS["characters"] if c in topic)
+    assert len(counts) == len(TRENDING_KEYWORDS["characters"])
+    assert max(counts.values()) - min(counts.values()) <= 10
+
+
+def test_stops_when_space_is_exhausted():
+    keywords = {category: values[:2] for category, values in TRENDING_KEYWORDS.items()}
+    templates = ["{emotion} in {setting}", "{trend} era"]
+    assert topic_space_size(keywords, templates) == 6
+    topics = list(iter_unique_topics(seed=0, keywords=keywords, templates=templates))
+    assert len(set(topics)) == 6
+    assert len(generate_unique_topics(100, seed=0, keywords=keywords, templates=templates)) == 6
+
+
+def test_exclude_skips_existing_topics():
+    keywords = {category: values[:2] for category, values in TRENDING_KEYWORDS.items()}
+    templates = ["{emotion} in {setting}"]
+    existing = generate_unique_topics(2, seed=1, keywords=keywords, templates=templates)
+    rest = generate_unique_topics(10, seed=2, keywords=keywords, templates=templates, exclude=existing)
+    assert len(rest) == 2
+    assert not set(rest) & set(existing)
+
+
+def test_template_fields_map_to_categories():
+    assert template_fields("{a} {b} {a}") == ["a", "b"]
+    assert set(TEMPLATE_FIELDS.values()) <= set(TRENDING_KEYWORDS)
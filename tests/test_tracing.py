@@ -0,0 +1,81 @@
+"""
+단계별 스팬 / 집계 / JSONL + Prometheus 출력 테스트
+"""
+import json
+
+import pytest
+
+from mv_core import SpanSink, Tracer, generate_plan, span, stage_percentiles, traced_sleep, use_tracer
+from mv_core import planning
+from mv_core.tracing import percentile
+
+OPTIONS = {"use_emotional": True}
+
+
+def test_spans_nest_and_record_attributes():
+    tracer = Tracer()
+    with use_tracer(tracer):
+        with span("plan", model="gemini-2.0-flash") as outer:
+            with span("plan.json_parse", bytes=120):
+                pass
+            outer.set(scenes=4)
+    inner, outer = tracer.spans()
+    assert inner["parent_id"] == outer["span_id"] and inner["trace_id"] == outer["trace_id"]
+    assert outer["parent_id"] is None
+    assert outer["attrs"] == {"model": "gemini-2.0-flash", "scenes": 4, "status": "ok"}
+    assert inner["attrs"]["bytes"] == 120 and inner["duration_ms"] >= 0
+
+
+def test_exceptions_mark_span_and_propagate():
+    tracer = Tracer()
+    with use_tracer(tracer), pytest.raises(ValueError):
+        with span("image.request", provider="segmind"):
+            raise ValueError("boom")
+    data = tracer.spans()[0]
+    assert data["attrs"]["status"] == "error" and "boom" in data["attrs"]["error"]
+
+
+def test_no_active_tracer_is_noop():
+    with span("plan") as current:
+        current.set(model="x")
+    traced_sleep(0)
+
+
+def test_stage_percentiles_group_by_model_and_provider():
+    spans = [{"name": "llm.call", "duration_ms": float(ms), "attrs": {"model": "flash", "status": "ok"}}
+             for ms in range(1, 101)]
+    spans.append({"name": "llm.call", "duration_ms": 5.0, "attrs": {"model": "pro", "status": "error"}})
+    stats = stage_percentiles(spans)
+    assert list(stats) == ["llm.call · flash", "llm.call · pro"]
+    assert stats["llm.call · flash"]["p50_ms"] == 50.0 and stats["llm.call · flash"]["p95_ms"] == 95.0
+    assert stats["llm.call · pro"]["errors"] == 1
+    assert percentile([], 0.5) == 0.0
+
+
+def test_sink_writes_jsonl_and_prometheus(tmp_path):
+    sink = SpanSink(str(tmp_path / "spans.jsonl"), str(tmp_path / "metrics.prom"))
+    with use_tracer(Tracer(sink)):
+        with span("plan"):
+            with span("image.request", provider='pollinations/"flux"', attempt=1) as request:
+                request.set(status="http_429")
+    lines = (tmp_path / "spans.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["image.request", "plan"]
+    prom = (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+    assert "# TYPE mv_stage_duration_seconds summary" in prom
+    assert 'mv_stage_duration_seconds_count{stage="plan"} 1' in prom
+    assert 'mv_stage_errors_total{stage="image.request",provider="pollinations/\\"flux\\""} 1' in prom
+    assert 'quantile="0.95"' in prom
+
+
+def test_generate_plan_emits_stage_spans(monkeypatch):
+    responses = iter(["JSON 아님", '{"project_title": "밤"}'])
+    monkeypatch.setattr(planning, "generate_with_fallback", lambda *a, **k: (next(responses), "gemini-2.0-flash"))
+    tracer = Tracer()
+    with use_tracer(tracer):
+        generate_plan("서울의 밤", "key", "gemini-2.0-flash", 4, OPTIONS, "K-POP", "Pastel Dreamy", "K-POP",
+                      False, False, 5, retry_delay=0)
+    names = [data["name"] for data in tracer.spans()]
+    assert names.count("plan.attempt") == 2 and names[-1] == "plan"
+    assert {"plan.prompt_build", "plan.json_clean", "plan.json_parse"} <= set(names)
+    attempts = [data for data in tracer.spans() if data["name"] == "plan.attempt"]
+    assert [a["attrs"]["status"] for a in attempts] == ["json_error", "ok"]
@@ -0,0 +1,171 @@
+"""
+트렌드 피드 캐시 테스트 (로컬 RSS 픽스처 서버)
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from mv_core import TrendFeed, parse_trends_rss
+
+RSS_BYTES = (Path(__file__).parent / "fixtures" / "trends_kr.xml").read_bytes()
+
+
+class RssServer:
+    """요청 수를 세고, fail=True면 503을 반환하는 RSS 픽스처 서버"""
+
+    def __init__(self):
+        self.hits = []
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+        server_state = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server_state.hits.append(self.path)
+                server_state.release.wait(5)
+                if server_state.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(RSS_BYTES)))
+                self.end_headers()
+                self.wfile.write(RSS_BYTES)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url_template = f"http://127.0.0.1:{self.httpd.server_address[1]}/rss?geo={{geo}}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def rss_server():
+    server = RssServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_feed(rss_server, clock, ttl=100):
+    return TrendFeed(url_template=rss_server.url_template, ttl=ttl, refresh_ahead=0.2, timeout=5, clock=clock)
+
+
+def test_parse_keeps_traffic_and_pub_date():
+    items = parse_trends_rss([RSS_BYTES])
+    assert [item["title"] for item in items] == ["뉴진스 컴백", "가을 단풍 명소", "한국시리즈", "할로윈 코스튬"]
+    assert items[0]["traffic"] == "200,000+"
+    assert items[0]["pub_date"] == "Mon, 19 Oct 2026 09:00:00 +0900"
+
+
+def test_parse_is_incremental():
+    chunks = [RSS_BYTES[i:i + 7] for i in range(0, len(RSS_BYTES), 7)]
+    assert parse_trends_rss(chunks) == parse_trends_rss([RSS_BYTES])
+
+
+def test_cached_within_ttl(rss_server, clock):
+    feed = make_feed(rss_server, clock)
+    first = feed.keywords("KR")
+    clock.now += 50
+    assert feed.keywords("KR") == first
+    assert len(rss_server.hits) == 1
+
+
+def test_cache_is_per_geo(rss_server, clock):
+    feed = make_feed(rss_server, clock)
+    feed.get("KR")
+    feed.get("US")
+    feed.get("KR")
+    assert rss_server.hits == ["/rss?geo=KR", "/rss?geo=US"]
+
+
+def test_background_refresh_before_expiry(rss_server, clock):
+    feed = make_feed(rss_server, clock)
+    feed.get("KR")
+    clock.now += 85
+    rss_server.release.clear()
+    items = feed.get("KR")
+    # 갱신 응답을 기다리지 않고 캐시된 항목을 즉시 반환
+    assert items and feed.status("KR")["refreshing"]
+    assert feed.refresh_in_background("KR") is feed._refreshing["KR"]
+    rss_server.release.set()
+    feed._refreshing["KR"].join(5)
+    assert len(rss_server.hits) == 2
+    assert feed.status("KR")["age"] == 0
+
+
+def test_expired_refreshes_synchronously(rss_server, clock):
+    feed = make_feed(rss_server, clock)
+    feed.get("KR")
+    clock.now += 150
+    feed.get("KR")
+    assert len(rss_server.hits) == 2
+
+
+@pytest.mark.parametrize("expired", [False, True])
+def test_concurrent_sessions_share_one_fetch_per_geo(rss_server, clock, expired):
+    feed = make_feed(rss_server, clock)
+    if expired:
+        feed.get("KR")
+        clock.now += 150
+    hits = len(rss_server.hits)
+    rss_server.release.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(feed.keywords("KR"))) for _ in range(5)]
+    threads.append(threading.Thread(target=lambda: results.append(feed.keywords("US"))))
+    for thread in threads:
+        thread.start()
+    for _ in range(500):
+        if feed.flight.stats().get("trends", {}).get("coalesced") == 4:
+            break
+        threading.Event().wait(0.01)
+    rss_server.release.set()
+    for thread in threads:
+        thread.join(5)
+    # 지역별로 원본 요청 1번 (KR 5세션 → 1번, US는 따로)
+    assert sorted(rss_server.hits[hits:]) == ["/rss?geo=KR", "/rss?geo=US"]
+    assert len(results) == 6 and all(keywords and keywords[0] == "뉴진스 컴백" for keywords in results)
+
+
+def test_serves_stale_on_error(rss_server, clock):
+    feed = make_feed(rss_server, clock)
+    fresh = feed.get("KR")
+    rss_server.fail = True
+    clock.now += 150
+    assert feed.get("KR") == fresh
+    assert "503" in feed.status("KR")["error"]
+
+
+def test_no_data_when_first_fetch_fails(rss_server, clock):
+    rss_server.fail = True
+    feed = make_feed(rss_server, clock)
+    assert feed.get("KR") is None
+    rss_server.fail = False
+    # 실패는 negative_ttl 동안만 기억 → 그동안은 원본에 다시 요청하지 않음
+    clock.now += feed.negative_ttl - 1
+    assert feed.get("KR") is None and len(rss_server.hits) == 1
+    clock.now += 1
+    assert feed.keywords("KR")[0] == "뉴진스 컴백"
+    assert len(rss_server.hits) == 2 and feed.status("KR")["error"] is None
@@ -0,0 +1,81 @@
+"""
+씬 변형 후보 묶음 테스트 (로컬 대역 서버)
+"""
+import base64
+
+import pytest
+
+from benchmarks.fake_services import FakeServices, synthetic_png
+from mv_core import Tracer, VariationSet, generate_variations, parse_segmind_samples, use_tracer, variation_seeds
+from mv_core.images import segmind_payload
+
+
+@pytest.fixture
+def services(monkeypatch):
+    services = FakeServices(seed=1)
+    for key, value in services.env().items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setattr("mv_core.images.traced_sleep", lambda *args, **kwargs: None)
+    yield services
+    services.shutdown()
+
+
+def test_seeds_are_distinct_and_reproducible():
+    seeds = variation_seeds(6, base_seed=999990)
+    assert len(set(seeds)) == 6 and seeds == variation_seeds(6, base_seed=999990)
+    assert all(0 <= seed < 1000000 for seed in seeds)
+
+
+def test_segmind_payload_and_sample_parsing():
+    assert segmind_payload("p", 64, 64, 1)["base64"] is False
+    payload = segmind_payload("p", 64, 64, 1, samples=3)
+    assert payload["samples"] == 3 and payload["base64"] is True
+    png = synthetic_png(8, 8)
+    encoded = base64.b64encode(png).decode("ascii")
+    assert parse_segmind_samples(png) == [png]
+    assert parse_segmind_samples(b'{"image": "%s"}' % encoded.encode()) == [png]
+    assert parse_segmind_samples(b'{"images": ["data:image/png;base64,%s"]}' % encoded.encode()) == [png]
+
+
+def test_segmind_returns_all_samples_in_one_request(services):
+    variations = generate_variations("neon rain", 512, 288, "Segmind (SDXL)", count=4, segmind_key="k",
+                                     base_seed=10)
+    assert len(variations) == 4 and services.snapshot()["segmind"]["requests"] == 1
+    assert services.snapshot()["pollinations"]["requests"] == 0
+    assert [candidate["seed"] for candidate in variations.candidates] == [10, 11, 12, 13]
+    assert len({bytes(candidate["image"]) for candidate in variations.candidates}) == 4
+
+
+def test_pollinations_requests_distinct_seeds_in_parallel(services):
+    services.set_faults("pollinations", latency=0.3)
+    tracer, logs, events = Tracer(), [], []
+    with use_tracer(tracer):
+        variations = generate_variations("neon rain", 512, 288, "Pollinations Turbo ⚡", count=4, base_seed=5,
+                                         log=lambda message, level="info": logs.append(level),
+                                         event=lambda *args, **kwargs: events.append(args[2]))
+    assert [candidate["seed"] for candidate in variations.candidates] == variation_seeds(4, base_seed=5)
+    assert {candidate["image"].size for candidate in variations.candidates} == {(512, 288)}
+    assert services.snapshot()["pollinations"]["requests"] == 4 and events == ["success"] * 4
+    batch = next(s for s in tracer.spans() if s["name"] == "variations.generate")
+    requests = [s for s in tracer.spans() if s["name"] == "image.request"]
+    # 요청 4개가 배치 아래에 기록되고, 동시에 실행돼 배치 시간은 요청 합보다 짧음
+    assert {s["trace_id"] for s in requests} == {batch["trace_id"]}
+    assert batch["duration_ms"] < sum(s["duration_ms"] for s in requests) * 0.6
+
+
+def test_segmind_without_key_falls_back_to_pollinations(services, monkeypatch):
+    monkeypatch.delenv("SEGMIND_API_KEY", raising=False)
+    variations = generate_variations("neon rain", 512, 288, "Segmind (SDXL)", count=2)
+    assert len(variations) == 2 and services.snapshot()["segmind"]["requests"] == 0
+    assert all(candidate["provider"].endswith("(폴백)") for candidate in variations.candidates)
+
+
+def test_pick_hero_from_stored_candidates():
+    variations = VariationSet("p", 64, 64)
+    assert variations.hero_image() == (None, None)
+    variations.add(b"a", 1, "A")
+    variations.add(b"bb", 2, "B")
+    assert variations.hero_image() == (b"a", "A")
+    assert variations.pick(1) == (b"bb", "B") and variations.hero == 1 and variations.total_bytes() == 3
+    with pytest.raises(IndexError):
+        variations.pick(2)